@@ -803,6 +803,12 @@ else:
                 st.session_state.pagina_atual = "dados_teste"
                 st.rerun()
 
+            if st.button("🩺 Qualidade dos Dados", key='qualidade_dados', use_container_width=True):
+                if st.session_state.get("pagina_atual") != "qualidade_dados":
+                    limpar_estados_dialogos()
+                st.session_state.pagina_atual = "qualidade_dados"
+                st.rerun()
+
     # CONTEÚDO DAS PÁGINAS
     if st.session_state.pagina_atual == "processo_alvaras":
         from processos import lista_alvaras
@@ -825,6 +831,9 @@ else:
     elif st.session_state.pagina_atual == "gerenciar_autocomplete":
         from components.gerenciar_autocomplete import interface_gerenciamento_autocomplete
         interface_gerenciamento_autocomplete()
+    elif st.session_state.pagina_atual == "qualidade_dados":
+        from components.qualidade_dados import interface_qualidade_dados
+        interface_qualidade_dados()
     elif st.session_state.pagina_atual == "dados_teste":
         # Página de dados de teste (apenas para Desenvolvedor)
         st.header("🧪 Dados de Teste - VERSÃO MELHORADA")
@@ -0,0 +1,34 @@
+"""
+Navegação entre as seções das páginas de processos
+st.tabs executa o corpo de todas as abas a cada rerun (formulário, lista de cards, AgGrid
+com geração de Excel/CSV, relatórios com PDF) mesmo com só uma visível. Aqui a seção
+ativa fica na sessão e a página executa apenas ela
+"""
+
+import streamlit as st
+
+def seletor_abas(abas, chave):
+    """
+    Barra de seções da página, com a seção ativa em st.session_state[chave].
+
+    Args:
+        abas: dict id -> rótulo, na ordem de exibição (a primeira é a inicial)
+        chave: chave da sessão da página (ex: "aba_ativa_rpv")
+
+    Returns:
+        str: id da seção ativa
+    """
+    opcoes = list(abas.keys())
+    if st.session_state.get(chave) not in abas:
+        st.session_state[chave] = opcoes[0]
+
+    aba = st.radio(
+        "Seção:",
+        options=opcoes,
+        format_func=lambda a: abas[a],
+        horizontal=True,
+        label_visibility="collapsed",
+        key=chave
+    )
+    st.markdown("---")
+    return aba
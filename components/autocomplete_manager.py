@@ -4,74 +4,355 @@ Salva e carrega entradas personalizadas de assuntos e órgãos no GitHub
 """
 
 import json
+import os
+import hashlib
+import threading
+import pandas as pd
 import streamlit as st
+from components.busca_textual import normalizar_texto, IndiceBusca
 
 # Arquivo para armazenar dados de autocomplete
 ARQUIVO_AUTOCOMPLETE = "autocomplete_data.json"
+ARQUIVO_AUTOCOMPLETE_LOCAL = "autocomplete_data_local.json"
+
+CATEGORIAS_AUTOCOMPLETE = [
+    "orgaos_judiciais",
+    "assuntos_beneficios",
+    "assuntos_rpv",
+    "orgaos_rpv",
+    "varas_rpv"
+]
+
+# Opções padrão de cada categoria (somadas às salvas no arquivo)
+OPCOES_BASE_AUTOCOMPLETE = {
+    "orgaos_judiciais": [
+        "TRIBUNAL REGIONAL FEDERAL DA 5.ª REGIÃO (TRF5)",
+    ],
+    "assuntos_beneficios": [
+        # Tipos de processo principais
+        "LOAS",
+        "LOAS DEFICIENTE",
+        "LOAS IDOSO",
+        "APOSENTADORIA POR INVALIDEZ",
+        "APOSENTADORIA POR IDADE",
+        "AUXÍLIO DOENÇA",
+        "AUXÍLIO ACIDENTE",
+        "PENSÃO POR MORTE",
+        "SALÁRIO MATERNIDADE",
+        "OUTROS",
+        # Assuntos específicos adicionais
+        "AUXÍLIO-DOENÇA",
+        "APOSENTADORIA ESPECIAL",
+        "BENEFÍCIO DE PRESTAÇÃO CONTINUADA (BPC)",
+        "REVISÃO DE BENEFÍCIO",
+        "DIFERENÇAS DE APOSENTADORIA",
+        "ABONO ANUAL (13º SALÁRIO)",
+        "AUXÍLIO-ALIMENTAÇÃO",
+        "LICENÇA-PRÊMIO"
+    ],
+    "assuntos_rpv": [
+        "APOSENTADORIA POR INVALIDEZ",
+        "APOSENTADORIA POR IDADE",
+        "APOSENTADORIA ESPECIAL",
+        "AUXILIO-DOENCA",
+        "AUXILIO-ACIDENTE",
+        "BENEFICIO DE PRESTACAO CONTINUADA (BPC)",
+        "PENSAO POR MORTE",
+        "SALARIO-MATERNIDADE",
+        "REVISAO DE BENEFICIO",
+        "DIFERENCAS DE APOSENTADORIA",
+        "ABONO ANUAL (13º SALARIO)",
+        "AUXILIO-ALIMENTACAO",
+        "ADICIONAL DE INSALUBRIDADE",
+        "ADICIONAL NOTURNO",
+        "HORAS EXTRAS",
+        "INDENIZACAO POR DANOS MORAIS",
+        "REINTEGRAÇÃO DE SERVIDOR",
+        "DIFERENÇAS SALARIAIS",
+        "LICENÇA-PRÊMIO"
+    ],
+    "orgaos_rpv": [
+        "TRIBUNAL REGIONAL FEDERAL 5ª REGIÃO (TRF5)",
+    ],
+    "varas_rpv": [
+        "1ª VARA CÍVEL",
+    ],
+}
+
+# =====================================
+# CACHE EM MEMÓRIA (COMPARTILHADO NO PROCESSO)
+# =====================================
+
+# Recarrega o JSON só quando o arquivo muda (mtime/tamanho e, se preciso, hash)
+_cache_autocomplete = {
+    "arquivo": None,
+    "assinatura": None,
+    "hash": None,
+    "dados": None,
+    "opcoes_versao": None,
+    "opcoes": {},
+    "indices": {}
+}
+_lock_autocomplete = threading.Lock()
+
+def _estrutura_vazia_autocomplete():
+    """Estrutura com todas as categorias vazias"""
+    return {categoria: [] for categoria in CATEGORIAS_AUTOCOMPLETE}
+
+def _arquivo_autocomplete_ativo():
+    """Arquivo do repositório, com fallback para o arquivo local"""
+    if os.path.exists(ARQUIVO_AUTOCOMPLETE):
+        return ARQUIVO_AUTOCOMPLETE
+    if os.path.exists(ARQUIVO_AUTOCOMPLETE_LOCAL):
+        return ARQUIVO_AUTOCOMPLETE_LOCAL
+    return None
+
+def _assinatura_arquivo(caminho):
+    stat = os.stat(caminho)
+    return (stat.st_mtime_ns, stat.st_size)
+
+def _atualizar_cache(cache, arquivo, assinatura, hash_conteudo, dados):
+    """Troca o conteúdo do cache de uma vez; as opções são recalculadas na próxima leitura"""
+    cache.update({
+        "arquivo": arquivo,
+        "assinatura": assinatura,
+        "hash": hash_conteudo,
+        "dados": dados
+    })
+
+def _recarregar_se_mudou(cache, arquivo):
+    """Relê o arquivo para o cache se mtime/tamanho mudaram e o conteúdo também (chamar com o lock)"""
+    assinatura = _assinatura_arquivo(arquivo)
+    if (cache["dados"] is not None
+            and cache["arquivo"] == arquivo
+            and cache["assinatura"] == assinatura):
+        return
+    
+    with open(arquivo, 'rb') as f:
+        conteudo = f.read()
+    hash_conteudo = hashlib.sha1(conteudo).hexdigest()
+    
+    # mtime mudou mas o conteúdo é o mesmo: só atualiza a assinatura
+    if cache["dados"] is not None and cache["hash"] == hash_conteudo:
+        cache["arquivo"] = arquivo
+        cache["assinatura"] = assinatura
+        return
+    
+    _atualizar_cache(cache, arquivo, assinatura, hash_conteudo, json.loads(conteudo.decode('utf-8')))
+
+def _escrever_json_atomico(cache, arquivo, dados):
+    """Grava o JSON de forma atômica e atualiza o cache (chamar com o lock adquirido)"""
+    conteudo = json.dumps(dados, indent=2, ensure_ascii=False).encode('utf-8')
+    
+    # Escreve em arquivo temporário e substitui: leitores nunca veem arquivo pela metade
+    arquivo_temp = f"{arquivo}.tmp"
+    with open(arquivo_temp, 'wb') as f:
+        f.write(conteudo)
+    os.replace(arquivo_temp, arquivo)
+    
+    _atualizar_cache(
+        cache,
+        arquivo,
+        _assinatura_arquivo(arquivo),
+        hashlib.sha1(conteudo).hexdigest(),
+        json.loads(conteudo.decode('utf-8'))
+    )
 
-def carregar_dados_autocomplete():
-    """Carrega dados de autocomplete do arquivo JSON do repositório"""
-    try:
-        import os
-        arquivo_repo = "autocomplete_data.json"
-        arquivo_local = "autocomplete_data_local.json"
+def _garantir_cache_autocomplete():
+    """Recarrega o cache se os arquivos mudaram e recalcula as listas de opções quando preciso"""
+    arquivo = _arquivo_autocomplete_ativo()
+    
+    with _lock_autocomplete:
+        if arquivo is None:
+            # Se não existir nenhum arquivo, criar estrutura vazia
+            _escrever_json_atomico(_cache_autocomplete, ARQUIVO_AUTOCOMPLETE, _estrutura_vazia_autocomplete())
+        else:
+            _recarregar_se_mudou(_cache_autocomplete, arquivo)
         
-        # Primeiro tentar carregar do arquivo do repositório
-        if os.path.exists(arquivo_repo):
-            with open(arquivo_repo, 'r', encoding='utf-8') as f:
-                dados = json.load(f)
-                # Garantir que todas as chaves existam
-                dados.setdefault("orgaos_judiciais", [])
-                dados.setdefault("assuntos_beneficios", [])
-                dados.setdefault("assuntos_rpv", [])
-                dados.setdefault("orgaos_rpv", [])
-                dados.setdefault("varas_rpv", [])
-                return dados
+        if os.path.exists(ARQUIVO_FREQUENCIAS):
+            _recarregar_se_mudou(_cache_frequencias, ARQUIVO_FREQUENCIAS)
         
-        # Fallback para arquivo local se existir
-        elif os.path.exists(arquivo_local):
-            with open(arquivo_local, 'r', encoding='utf-8') as f:
-                dados = json.load(f)
-                dados.setdefault("orgaos_judiciais", [])
-                dados.setdefault("assuntos_beneficios", [])
-                dados.setdefault("assuntos_rpv", [])
-                dados.setdefault("orgaos_rpv", [])
-                dados.setdefault("varas_rpv", [])
-                return dados
+        versao = (_cache_autocomplete["hash"], _cache_frequencias["hash"])
+        if _cache_autocomplete["opcoes_versao"] == versao:
+            return
         
-        # Se não existir nenhum arquivo, criar estrutura vazia
-        dados_vazios = {
-            "orgaos_judiciais": [],
-            "assuntos_beneficios": [],
-            "assuntos_rpv": [],
-            "orgaos_rpv": [],
-            "varas_rpv": []
-        }
+        dados = _cache_autocomplete["dados"]
+        for categoria in CATEGORIAS_AUTOCOMPLETE:
+            dados.setdefault(categoria, [])
+        contagens = _contagens_frequencias()
         
-        # Salvar arquivo do repositório para próximas sessões
-        with open(arquivo_repo, 'w', encoding='utf-8') as f:
-            json.dump(dados_vazios, f, indent=2, ensure_ascii=False)
+        # Padrão + salvos + colhidos das bases; mais usados primeiro
+        opcoes = {}
+        for categoria in CATEGORIAS_AUTOCOMPLETE:
+            uso = contagens.get(categoria, {})
+            valores = set(OPCOES_BASE_AUTOCOMPLETE.get(categoria, []) + dados[categoria])
+            valores.update(valor for valor, qtd in uso.items() if qtd > 0)
+            opcoes[categoria] = sorted(valores, key=lambda v: (-uso.get(v, 0), v))
+        
+        _cache_autocomplete["opcoes"] = opcoes
+        _cache_autocomplete["indices"] = {}
+        _cache_autocomplete["opcoes_versao"] = versao
+
+def _escrever_arquivo_autocomplete(dados):
+    """Grava o arquivo de autocomplete (chamar com o lock adquirido)"""
+    _escrever_json_atomico(_cache_autocomplete, ARQUIVO_AUTOCOMPLETE, dados)
+
+def obter_opcoes_autocomplete(categoria):
+    """Lista completa (padrão + salvos + usados nas bases) da categoria, mais usados primeiro"""
+    try:
+        _garantir_cache_autocomplete()
+        return list(_cache_autocomplete["opcoes"].get(categoria, []))
+    except Exception:
+        return sorted(set(OPCOES_BASE_AUTOCOMPLETE.get(categoria, [])))
+
+def obter_indice_autocomplete(categoria):
+    """Índice de busca da categoria, construído uma vez por versão dos arquivos"""
+    _garantir_cache_autocomplete()
+    indices = _cache_autocomplete["indices"]
+    if categoria not in indices:
+        uso = _contagens_frequencias().get(categoria, {})
+        opcoes = _cache_autocomplete["opcoes"].get(categoria, [])
+        indices[categoria] = IndiceBusca(opcoes, pesos=[uso.get(v, 0) for v in opcoes])
+    return indices[categoria]
+
+def buscar_opcoes_autocomplete(categoria, termo, limite=10):
+    """Busca sem acentos, por prefixo e aproximada, nas opções da categoria"""
+    try:
+        return obter_indice_autocomplete(categoria).buscar(termo, limite=limite)
+    except Exception:
+        termo_normalizado = normalizar_texto(termo)
+        return [o for o in obter_opcoes_autocomplete(categoria) if termo_normalizado in normalizar_texto(o)][:limite]
+
+# =====================================
+# FREQUÊNCIA DE USO COLHIDA DAS BASES
+# =====================================
+
+# Arquivo local com a contagem de uso de cada valor, por categoria
+ARQUIVO_FREQUENCIAS = "autocomplete_frequencias.json"
+
+# Base -> {coluna: categoria do autocomplete}
+COLUNAS_AUTOCOMPLETE_POR_BASE = {
+    "lista_rpv.csv": {
+        "Orgao Judicial": "orgaos_rpv",
+        "Assunto": "assuntos_rpv",
+        "Vara": "varas_rpv",
+    },
+    "lista_alvaras.csv": {
+        "Órgão Judicial": "orgaos_judiciais",
+    },
+    "lista_beneficios.csv": {
+        "ASSUNTO": "assuntos_beneficios",
+    },
+}
+
+_cache_frequencias = {
+    "arquivo": None,
+    "assinatura": None,
+    "hash": None,
+    "dados": None
+}
+
+def _contagens_frequencias():
+    """Contagens por categoria (chamar depois de _garantir_cache_autocomplete)"""
+    return (_cache_frequencias["dados"] or {}).get("contagens", {})
+
+def _contar_valores(serie):
+    """value_counts dos valores preenchidos (ignora vazios e 'nan')"""
+    valores = serie.dropna().astype(str).str.strip()
+    valores = valores[(valores != "") & (~valores.str.lower().isin(["nan", "none", "não informado"]))]
+    return valores.value_counts()
+
+def _linhas_alteradas(df_antigo, df_novo, coluna):
+    """
+    Compara as duas versões pelo ID e devolve só o que mudou na coluna:
+    (valores que saíram, valores que entraram)
+    """
+    if "ID" not in df_antigo.columns or "ID" not in df_novo.columns:
+        return (df_antigo[coluna] if coluna in df_antigo.columns else pd.Series(dtype=object),
+                df_novo[coluna] if coluna in df_novo.columns else pd.Series(dtype=object))
+    
+    def por_id(df):
+        if coluna not in df.columns:
+            return pd.Series(dtype=object)
+        serie = df[coluna].copy()
+        serie.index = df["ID"].astype(str)
+        return serie[~serie.index.duplicated(keep='last')]
+    
+    antigo, novo = por_id(df_antigo), por_id(df_novo)
+    comuns = antigo.index.intersection(novo.index)
+    alterados = comuns[antigo.loc[comuns].astype(str).values != novo.loc[comuns].astype(str).values]
+    
+    saiu = antigo.loc[alterados.union(antigo.index.difference(novo.index))]
+    entrou = novo.loc[alterados.union(novo.index.difference(antigo.index))]
+    return saiu, entrou
+
+def registrar_uso_autocomplete(filename, df_antigo, df_novo):
+    """
+    Atualiza as contagens de uso com o que mudou entre a versão anterior e a salva.
+    Na primeira vez que a base aparece, conta a base inteira uma única vez.
+    """
+    colunas = COLUNAS_AUTOCOMPLETE_POR_BASE.get(filename)
+    if not colunas:
+        return False
+    
+    try:
+        with _lock_autocomplete:
+            if os.path.exists(ARQUIVO_FREQUENCIAS):
+                _recarregar_se_mudou(_cache_frequencias, ARQUIVO_FREQUENCIAS)
             
-        return dados_vazios
+            dados = json.loads(json.dumps(_cache_frequencias["dados"] or {}))
+            dados.setdefault("bases", [])
+            contagens = dados.setdefault("contagens", {})
+            
+            base_conhecida = filename in dados["bases"]
+            
+            for coluna, categoria in colunas.items():
+                uso = contagens.setdefault(categoria, {})
+                
+                if base_conhecida:
+                    saiu, entrou = _linhas_alteradas(df_antigo, df_novo, coluna)
+                else:
+                    saiu = pd.Series(dtype=object)
+                    entrou = df_novo[coluna] if coluna in df_novo.columns else pd.Series(dtype=object)
+                
+                for valor, qtd in _contar_valores(saiu).items():
+                    uso[valor] = uso.get(valor, 0) - int(qtd)
+                for valor, qtd in _contar_valores(entrou).items():
+                    uso[valor] = uso.get(valor, 0) + int(qtd)
+                
+                contagens[categoria] = {valor: qtd for valor, qtd in uso.items() if qtd > 0}
+            
+            if not base_conhecida:
+                dados["bases"].append(filename)
+            
+            _escrever_json_atomico(_cache_frequencias, ARQUIVO_FREQUENCIAS, dados)
+        return True
+    
+    except Exception:
+        return False  # Não crítico: o autocomplete segue com as listas salvas
+
+def obter_frequencia_uso(categoria):
+    """Contagem de uso de cada valor da categoria nas bases"""
+    _garantir_cache_autocomplete()
+    return dict(_contagens_frequencias().get(categoria, {}))
+
+def carregar_dados_autocomplete():
+    """Carrega dados de autocomplete (do cache em memória; relê o JSON só se o arquivo mudou)"""
+    try:
+        _garantir_cache_autocomplete()
+        # Cópia: quem chama pode alterar as listas antes de salvar
+        return {categoria: list(valores) for categoria, valores in _cache_autocomplete["dados"].items()}
             
     except Exception as e:
         # Em caso de erro, retornar estrutura vazia
-        return {
-            "orgaos_judiciais": [],
-            "assuntos_beneficios": [],
-            "assuntos_rpv": [],
-            "orgaos_rpv": []
-        }
+        return _estrutura_vazia_autocomplete()
 
 def salvar_dados_autocomplete(dados):
     """Salva dados de autocomplete no arquivo JSON do repositório"""
     try:
-        import os
-        arquivo_repo = "autocomplete_data.json"
-        
         # Salvar no arquivo do repositório (será commitado)
-        with open(arquivo_repo, 'w', encoding='utf-8') as f:
-            json.dump(dados, f, indent=2, ensure_ascii=False)
+        with _lock_autocomplete:
+            _escrever_arquivo_autocomplete(dados)
         
         return True
             
@@ -84,9 +365,7 @@ def adicionar_orgao_judicial(novo_orgao):
         return False
         
     # Normaliza o órgão
-    import unicodedata
-    orgao_normalizado = unicodedata.normalize('NFD', novo_orgao.upper().strip())
-    orgao_normalizado = ''.join(c for c in orgao_normalizado if unicodedata.category(c) != 'Mn')
+    orgao_normalizado = normalizar_texto(novo_orgao)
     
     # Carrega dados atuais
     dados = carregar_dados_autocomplete()
@@ -113,9 +392,7 @@ def adicionar_assunto_beneficio(novo_assunto):
         return False
         
     # Normaliza o assunto
-    import unicodedata
-    assunto_normalizado = unicodedata.normalize('NFD', novo_assunto.upper().strip())
-    assunto_normalizado = ''.join(c for c in assunto_normalizado if unicodedata.category(c) != 'Mn')
+    assunto_normalizado = normalizar_texto(novo_assunto)
     
     # Carrega dados atuais
     dados = carregar_dados_autocomplete()
@@ -142,9 +419,7 @@ def adicionar_assunto_rpv(novo_assunto):
         return False
         
     # Normaliza o assunto
-    import unicodedata
-    assunto_normalizado = unicodedata.normalize('NFD', novo_assunto.upper().strip())
-    assunto_normalizado = ''.join(c for c in assunto_normalizado if unicodedata.category(c) != 'Mn')
+    assunto_normalizado = normalizar_texto(novo_assunto)
     
     # Carrega dados atuais
     dados = carregar_dados_autocomplete()
@@ -167,9 +442,7 @@ def adicionar_orgao_rpv(novo_orgao):
         return False
         
     # Normaliza o órgão
-    import unicodedata
-    orgao_normalizado = unicodedata.normalize('NFD', novo_orgao.upper().strip())
-    orgao_normalizado = ''.join(c for c in orgao_normalizado if unicodedata.category(c) != 'Mn')
+    orgao_normalizado = normalizar_texto(novo_orgao)
     
     # Carrega dados atuais
     dados = carregar_dados_autocomplete()
@@ -191,9 +464,7 @@ def remover_orgao_judicial(orgao_para_remover):
         return False
         
     # Normaliza o órgão
-    import unicodedata
-    orgao_normalizado = unicodedata.normalize('NFD', orgao_para_remover.upper().strip())
-    orgao_normalizado = ''.join(c for c in orgao_normalizado if unicodedata.category(c) != 'Mn')
+    orgao_normalizado = normalizar_texto(orgao_para_remover)
     
     # Carrega dados atuais
     dados = carregar_dados_autocomplete()
@@ -214,9 +485,7 @@ def remover_assunto_beneficio(assunto_para_remover):
         return False
         
     # Normaliza o assunto
-    import unicodedata
-    assunto_normalizado = unicodedata.normalize('NFD', assunto_para_remover.upper().strip())
-    assunto_normalizado = ''.join(c for c in assunto_normalizado if unicodedata.category(c) != 'Mn')
+    assunto_normalizado = normalizar_texto(assunto_para_remover)
     
     # Carrega dados atuais
     dados = carregar_dados_autocomplete()
@@ -237,9 +506,7 @@ def remover_assunto_rpv(assunto_para_remover):
         return False
         
     # Normaliza o assunto
-    import unicodedata
-    assunto_normalizado = unicodedata.normalize('NFD', assunto_para_remover.upper().strip())
-    assunto_normalizado = ''.join(c for c in assunto_normalizado if unicodedata.category(c) != 'Mn')
+    assunto_normalizado = normalizar_texto(assunto_para_remover)
     
     # Carrega dados atuais
     dados = carregar_dados_autocomplete()
@@ -260,9 +527,7 @@ def remover_orgao_rpv(orgao_para_remover):
         return False
         
     # Normaliza o órgão
-    import unicodedata
-    orgao_normalizado = unicodedata.normalize('NFD', orgao_para_remover.upper().strip())
-    orgao_normalizado = ''.join(c for c in orgao_normalizado if unicodedata.category(c) != 'Mn')
+    orgao_normalizado = normalizar_texto(orgao_para_remover)
     
     # Carrega dados atuais
     dados = carregar_dados_autocomplete()
@@ -283,9 +548,7 @@ def adicionar_vara_rpv(nova_vara):
         return False
         
     # Normaliza a vara
-    import unicodedata
-    vara_normalizada = unicodedata.normalize('NFD', nova_vara.upper().strip())
-    vara_normalizada = ''.join(c for c in vara_normalizada if unicodedata.category(c) != 'Mn')
+    vara_normalizada = normalizar_texto(nova_vara)
     
     # Carrega dados atuais
     dados = carregar_dados_autocomplete()
@@ -307,9 +570,7 @@ def remover_vara_rpv(vara_para_remover):
         return False
         
     # Normaliza a vara
-    import unicodedata
-    vara_normalizada = unicodedata.normalize('NFD', vara_para_remover.upper().strip())
-    vara_normalizada = ''.join(c for c in vara_normalizada if unicodedata.category(c) != 'Mn')
+    vara_normalizada = normalizar_texto(vara_para_remover)
     
     # Carrega dados atuais
     dados = carregar_dados_autocomplete()
@@ -360,110 +621,23 @@ def inicializar_autocomplete_session():
 
 def obter_orgaos_judiciais_completo():
     """Obtém lista completa de órgãos judiciais (padrão + salvos)"""
-    # Dados padrão
-    ORGAOS_JUDICIAIS_BASE = [
-        "TRIBUNAL REGIONAL FEDERAL DA 5.ª REGIÃO (TRF5)",
-    ]
-    
-    # Dados salvos
-    dados_salvos = carregar_dados_autocomplete()
-    orgaos_salvos = dados_salvos.get("orgaos_judiciais", [])
-    
-    # Combinar e ordenar
-    return sorted(list(set(ORGAOS_JUDICIAIS_BASE + orgaos_salvos)))
+    return obter_opcoes_autocomplete("orgaos_judiciais")
 
 def obter_assuntos_beneficios_completo():
     """Obtém lista completa de assuntos de benefícios (padrão + salvos)"""
-    # Dados padrão (incluindo tipos de processo)
-    ASSUNTOS_BENEFICIOS_BASE = [
-        # Tipos de processo principais
-        "LOAS",
-        "LOAS DEFICIENTE",
-        "LOAS IDOSO",
-        "APOSENTADORIA POR INVALIDEZ",
-        "APOSENTADORIA POR IDADE",
-        "AUXÍLIO DOENÇA",
-        "AUXÍLIO ACIDENTE",
-        "PENSÃO POR MORTE",
-        "SALÁRIO MATERNIDADE",
-        "OUTROS",
-        # Assuntos específicos adicionais
-        "AUXÍLIO-DOENÇA",
-        "APOSENTADORIA ESPECIAL",
-        "BENEFÍCIO DE PRESTAÇÃO CONTINUADA (BPC)",
-        "REVISÃO DE BENEFÍCIO",
-        "DIFERENÇAS DE APOSENTADORIA",
-        "ABONO ANUAL (13º SALÁRIO)",
-        "AUXÍLIO-ALIMENTAÇÃO",
-        "LICENÇA-PRÊMIO"
-    ]
-    
-    # Dados salvos
-    dados_salvos = carregar_dados_autocomplete()
-    assuntos_salvos = dados_salvos.get("assuntos_beneficios", [])
-    
-    # Combinar e ordenar
-    return sorted(list(set(ASSUNTOS_BENEFICIOS_BASE + assuntos_salvos)))
+    return obter_opcoes_autocomplete("assuntos_beneficios")
 
 def obter_assuntos_rpv_completo():
     """Obtém lista completa de assuntos de RPV (padrão + salvos)"""
-    # Dados padrão
-    ASSUNTOS_RPV_BASE = [
-        "APOSENTADORIA POR INVALIDEZ",
-        "APOSENTADORIA POR IDADE",
-        "APOSENTADORIA ESPECIAL",
-        "AUXILIO-DOENCA",
-        "AUXILIO-ACIDENTE",
-        "BENEFICIO DE PRESTACAO CONTINUADA (BPC)",
-        "PENSAO POR MORTE",
-        "SALARIO-MATERNIDADE",
-        "REVISAO DE BENEFICIO",
-        "DIFERENCAS DE APOSENTADORIA",
-        "ABONO ANUAL (13º SALARIO)",
-        "AUXILIO-ALIMENTACAO",
-        "ADICIONAL DE INSALUBRIDADE",
-        "ADICIONAL NOTURNO",
-        "HORAS EXTRAS",
-        "INDENIZACAO POR DANOS MORAIS",
-        "REINTEGRAÇÃO DE SERVIDOR",
-        "DIFERENÇAS SALARIAIS",
-        "LICENÇA-PRÊMIO"
-    ]
-    
-    # Dados salvos
-    dados_salvos = carregar_dados_autocomplete()
-    assuntos_salvos = dados_salvos.get("assuntos_rpv", [])
-    
-    # Combinar e ordenar
-    return sorted(list(set(ASSUNTOS_RPV_BASE + assuntos_salvos)))
+    return obter_opcoes_autocomplete("assuntos_rpv")
 
 def obter_orgaos_rpv_completo():
     """Obtém lista completa de órgãos de RPV (padrão + salvos)"""
-    # Dados padrão
-    ORGAOS_RPV_BASE = [
-        "TRIBUNAL REGIONAL FEDERAL 5ª REGIÃO (TRF5)",
-    ]
-    
-    # Dados salvos
-    dados_salvos = carregar_dados_autocomplete()
-    orgaos_salvos = dados_salvos.get("orgaos_rpv", [])
-    
-    # Combinar e ordenar
-    return sorted(list(set(ORGAOS_RPV_BASE + orgaos_salvos)))
+    return obter_opcoes_autocomplete("orgaos_rpv")
 
 def obter_varas_rpv_completo():
     """Obtém lista completa de varas de RPV (padrão + salvos)"""
-    # Dados padrão
-    VARAS_RPV_BASE = [
-        "1ª VARA CÍVEL",
-    ]
-    
-    # Dados salvos
-    dados_salvos = carregar_dados_autocomplete()
-    varas_salvas = dados_salvos.get("varas_rpv", [])
-    
-    # Combinar e ordenar
-    return sorted(list(set(VARAS_RPV_BASE + varas_salvas)))
+    return obter_opcoes_autocomplete("varas_rpv")
 
 def obter_assuntos_rpv():
     """Alias para manter compatibilidade - obtém lista de assuntos RPV"""
@@ -479,33 +653,40 @@ def obter_varas_rpv():
 
 def normalizar_assunto_rpv(assunto):
     """Normaliza assunto de RPV"""
-    if not assunto:
-        return ""
-    import unicodedata
-    normalizado = unicodedata.normalize('NFD', assunto.upper().strip())
-    return ''.join(c for c in normalizado if unicodedata.category(c) != 'Mn')
+    return normalizar_texto(assunto)
 
 def normalizar_orgao_rpv(orgao):
     """Normaliza órgão de RPV"""
-    if not orgao:
-        return ""
-    import unicodedata
-    normalizado = unicodedata.normalize('NFD', orgao.upper().strip())
-    return ''.join(c for c in normalizado if unicodedata.category(c) != 'Mn')
+    return normalizar_texto(orgao)
 
 def normalizar_vara_rpv(vara):
     """Normaliza vara de RPV"""
-    if not vara:
-        return ""
-    import unicodedata
-    normalizado = unicodedata.normalize('NFD', vara.upper().strip())
-    return ''.join(c for c in normalizado if unicodedata.category(c) != 'Mn')
+    return normalizar_texto(vara)
+
+# Acima deste número de opções os campos ganham uma caixa de busca
+LIMITE_OPCOES_SEM_BUSCA = 50
+LIMITE_RESULTADOS_BUSCA = 50
+
+def _opcoes_campo_com_busca(categoria, key_prefix):
+    """Opções do selectbox; em listas grandes, filtradas pela busca do índice"""
+    opcoes = obter_opcoes_autocomplete(categoria)
+    
+    if len(opcoes) > LIMITE_OPCOES_SEM_BUSCA:
+        termo = st.text_input(
+            "🔎 Buscar:",
+            key=f"busca_{key_prefix}",
+            placeholder="Digite parte do nome (acentos e pequenos erros são ignorados)"
+        )
+        if termo and termo.strip():
+            opcoes = buscar_opcoes_autocomplete(categoria, termo, limite=LIMITE_RESULTADOS_BUSCA)
+    
+    return opcoes
 
 def campo_orgao_judicial(label="🏛️ Órgão Judicial:", key_prefix="orgao"):
     """Campo selectbox + campo de texto para órgão judicial - Aparece imediatamente"""
     
-    # Obter lista completa (padrão + salvos)
-    orgaos_existentes = obter_orgaos_judiciais_completo()
+    # Obter lista completa (padrão + salvos), filtrada pela busca em listas grandes
+    orgaos_existentes = _opcoes_campo_com_busca("orgaos_judiciais", key_prefix)
     
     # Adicionar opção especial
     opcoes = orgaos_existentes + ["➕ Adicionar novo órgão"]
@@ -541,8 +722,8 @@ def campo_orgao_judicial(label="🏛️ Órgão Judicial:", key_prefix="orgao"):
 def campo_assunto_beneficio(label="📄 Assunto:", key_prefix="assunto_ben"):
     """Campo selectbox + campo de texto para assunto de benefício - Aparece imediatamente"""
     
-    # Obter lista completa (padrão + salvos)
-    assuntos_existentes = obter_assuntos_beneficios_completo()
+    # Obter lista completa (padrão + salvos), filtrada pela busca em listas grandes
+    assuntos_existentes = _opcoes_campo_com_busca("assuntos_beneficios", key_prefix)
     
     # Adicionar opção especial
     opcoes = assuntos_existentes + ["➕ Adicionar novo assunto"]
@@ -578,8 +759,8 @@ def campo_assunto_beneficio(label="📄 Assunto:", key_prefix="assunto_ben"):
 def campo_assunto_rpv(label="📄 Assunto:", key_prefix="assunto_rpv"):
     """Campo selectbox + campo de texto para assunto de RPV - Aparece imediatamente"""
     
-    # Obter lista completa (padrão + salvos)
-    assuntos_existentes = obter_assuntos_rpv_completo()
+    # Obter lista completa (padrão + salvos), filtrada pela busca em listas grandes
+    assuntos_existentes = _opcoes_campo_com_busca("assuntos_rpv", key_prefix)
     
     # Adicionar opção especial
     opcoes = assuntos_existentes + ["➕ Adicionar novo assunto"]
@@ -615,8 +796,8 @@ def campo_assunto_rpv(label="📄 Assunto:", key_prefix="assunto_rpv"):
 def campo_orgao_rpv(label="🏛️ Órgão Judicial:", key_prefix="orgao_rpv"):
     """Campo selectbox + campo de texto para órgão de RPV - Aparece imediatamente"""
     
-    # Obter lista completa (padrão + salvos)
-    orgaos_existentes = obter_orgaos_rpv_completo()
+    # Obter lista completa (padrão + salvos), filtrada pela busca em listas grandes
+    orgaos_existentes = _opcoes_campo_com_busca("orgaos_rpv", key_prefix)
     
     # Adicionar opção especial
     opcoes = orgaos_existentes + ["➕ Adicionar novo órgão"]
@@ -652,8 +833,8 @@ def campo_orgao_rpv(label="🏛️ Órgão Judicial:", key_prefix="orgao_rpv"):
 def campo_vara_rpv(label="⚖️ Vara:", key_prefix="vara_rpv"):
     """Campo selectbox + campo de texto para vara de RPV - Aparece imediatamente"""
     
-    # Obter lista completa (padrão + salvos)
-    varas_existentes = obter_varas_rpv_completo()
+    # Obter lista completa (padrão + salvos), filtrada pela busca em listas grandes
+    varas_existentes = _opcoes_campo_com_busca("varas_rpv", key_prefix)
     
     # Adicionar opção especial
     opcoes = varas_existentes + ["➕ Adicionar nova vara"]
@@ -0,0 +1,394 @@
+"""
+Módulo de busca textual compartilhado
+Normalização sem acentos e índice de busca por prefixo e aproximada (trigramas)
+para órgãos, assuntos e varas, e índice invertido das linhas das listas de processos
+"""
+
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+from functools import lru_cache
+import numpy as np
+
+# =====================================
+# NORMALIZAÇÃO
+# =====================================
+
+def normalizar_texto(texto):
+    """Normaliza texto removendo acentos e convertendo para maiúsculo"""
+    if not texto:
+        return ""
+    normalizado = unicodedata.normalize('NFD', str(texto).upper().strip())
+    return ''.join(c for c in normalizado if unicodedata.category(c) != 'Mn')
+
+def chave_busca(texto):
+    """Chave de comparação: sem acentos, sem pontuação e com espaços simples"""
+    sem_pontuacao = re.sub(r"[^0-9A-Z]+", " ", normalizar_texto(texto))
+    return " ".join(sem_pontuacao.split())
+
+def trigramas(chave):
+    """Conjunto de trigramas das palavras da chave (com bordas marcadas)"""
+    resultado = set()
+    for palavra in chave.split():
+        palavra = f"  {palavra} "
+        for i in range(len(palavra) - 2):
+            resultado.add(palavra[i:i + 3])
+    return resultado
+
+@lru_cache(maxsize=65536)
+def chave_fonetica(palavra):
+    """
+    Chave fonética simplificada para nomes em português:
+    SOUZA/SOUSA, LUIZ/LUIS, THIAGO/TIAGO, CONCEIÇÃO/CONCEICAO, PHILIPE/FILIPE...
+    """
+    palavra = chave_busca(palavra).replace(" ", "")
+    if not palavra.isalpha():
+        return palavra
+
+    regras = [
+        (r"PH", "F"), (r"TH", "T"), (r"LH", "LI"), (r"NH", "NI"),
+        (r"SCH|SH|CH", "X"),
+        (r"G(?=[EIY])", "J"),
+        (r"QU(?=[EI])|GU(?=[EI])", lambda m: "K" if m.group(0) == "QU" else "G"),
+        (r"(SC|XC|SS|C)(?=[EIY])", "S"),
+        (r"Q|C", "K"),
+        (r"Z", "S"), (r"Y", "I"), (r"W", "V"),
+        (r"H", ""),
+        (r"SS", "S"),
+        (r"M$", "N"),
+    ]
+    for padrao, troca in regras:
+        palavra = re.sub(padrao, troca, palavra)
+
+    # Letras repetidas valem uma só (ANNA/ANA, MATTOS/MATOS)
+    return re.sub(r"(.)\1+", r"\1", palavra)
+
+@lru_cache(maxsize=65536)
+def _chave_busca_celula(texto):
+    # Memorizada: ao reconstruir o índice após um salvamento só valores novos são normalizados
+    return chave_busca(texto)
+
+# =====================================
+# ÍNDICE DE BUSCA
+# =====================================
+
+class IndiceBusca:
+    """
+    Índice sobre uma lista de valores com as chaves normalizadas uma única vez.
+    Responde buscas por prefixo, por trecho e aproximadas (tolerantes a erro de digitação).
+    Os pesos opcionais (ex.: frequência de uso) desempatam resultados da mesma classe.
+    """
+
+    def __init__(self, valores, pesos=None):
+        self.valores = list(valores)
+        self.chaves = [chave_busca(v) for v in self.valores]
+        self.pesos = list(pesos) if pesos is not None else [0] * len(self.valores)
+
+        # Chaves ordenadas para busca de prefixo com bisect
+        self._ordenadas = sorted((chave, i) for i, chave in enumerate(self.chaves))
+        self._chaves_ordenadas = [chave for chave, _ in self._ordenadas]
+
+        # Lista invertida trigrama -> posições
+        self._qtd_trigramas = []
+        self._postings = defaultdict(list)
+        for i, chave in enumerate(self.chaves):
+            grams = trigramas(chave)
+            self._qtd_trigramas.append(len(grams))
+            for gram in grams:
+                self._postings[gram].append(i)
+
+    def __len__(self):
+        return len(self.valores)
+
+    def _posicoes_prefixo(self, termo):
+        inicio = bisect_left(self._chaves_ordenadas, termo)
+        for chave, i in self._ordenadas[inicio:]:
+            if not chave.startswith(termo):
+                break
+            yield i
+
+    def buscar(self, termo, limite=10, similaridade_minima=0.3):
+        """
+        Retorna os valores que casam com o termo, do melhor para o pior:
+        igual > começa com > palavra começa com > contém > parecido (trigramas)
+        """
+        termo = chave_busca(termo)
+        if not termo:
+            return self.valores[:limite]
+
+        ranking = {}
+
+        for i in self._posicoes_prefixo(termo):
+            ranking[i] = (0 if self.chaves[i] == termo else 1, 0.0)
+
+        if len(termo) < 3:
+            # Termos curtos não formam trigramas úteis: varredura só por trecho
+            for i, chave in enumerate(self.chaves):
+                if i not in ranking and termo in chave:
+                    ranking[i] = (2 if f" {termo}" in f" {chave}" else 3, 0.0)
+        else:
+            grams_termo = trigramas(termo)
+            comuns = defaultdict(int)
+            for gram in grams_termo:
+                for i in self._postings.get(gram, ()):
+                    comuns[i] += 1
+
+            for i, qtd in comuns.items():
+                if i in ranking:
+                    continue
+                chave = self.chaves[i]
+                similaridade = qtd / (len(grams_termo) + self._qtd_trigramas[i] - qtd)
+                if termo in chave:
+                    ranking[i] = (2 if f" {termo}" in f" {chave}" else 3, -similaridade)
+                elif similaridade >= similaridade_minima:
+                    ranking[i] = (4, -similaridade)
+
+        ordem = sorted(ranking, key=lambda i: (ranking[i], -self.pesos[i], self.chaves[i]))
+        return [self.valores[i] for i in ordem[:limite]]
+
+@lru_cache(maxsize=32)
+def _indice_para_tupla(valores):
+    return IndiceBusca(valores)
+
+def obter_indice_busca(valores):
+    """Índice para a lista de valores, reaproveitado enquanto a lista não mudar"""
+    return _indice_para_tupla(tuple(valores))
+
+# =====================================
+# ÍNDICE DE REGISTROS (LISTAS)
+# =====================================
+
+def _trigramas_trecho(palavra):
+    """Trigramas internos da palavra (sem bordas), usados para buscar por trecho"""
+    return {palavra[i:i + 3] for i in range(len(palavra) - 2)}
+
+# Similaridade mínima (trigramas) para uma palavra contar como parecida
+SIMILARIDADE_NOMES = 0.4
+
+# Nota de cada tipo de casamento de palavra na busca aproximada
+NOTA_TRECHO = 1.0
+NOTA_FONETICA = 0.9
+PESO_SIMILARIDADE = 0.8
+
+class _VocabularioLinhas:
+    """
+    Palavras distintas -> linhas onde aparecem, com trigramas sobre as palavras.
+    Mantido linha a linha: uma linha alterada sai das palavras antigas e entra nas novas.
+    """
+
+    def __init__(self, chaves_linhas, aproximado=False):
+        self.palavras = []
+        self.linhas = []
+        self._posicoes = {}
+        self._aproximado = aproximado
+        self._postings = defaultdict(list)
+
+        # Chaves fonéticas e trigramas com bordas, só para o vocabulário de nomes
+        self._foneticas = defaultdict(list)
+        self._postings_similares = defaultdict(list)
+        self._qtd_trigramas = []
+
+        for linha, chave in enumerate(chaves_linhas):
+            self.adicionar_linha(linha, chave)
+
+    def _posicao_palavra(self, palavra):
+        """Posição da palavra no vocabulário, incluindo-a (com seus trigramas) se for nova"""
+        i = self._posicoes.get(palavra)
+        if i is not None:
+            return i
+
+        i = len(self.palavras)
+        self._posicoes[palavra] = i
+        self.palavras.append(palavra)
+        self.linhas.append(set())
+        for gram in _trigramas_trecho(palavra):
+            self._postings[gram].append(i)
+        if self._aproximado:
+            if palavra.isalpha():
+                self._foneticas[chave_fonetica(palavra)].append(i)
+            grams = trigramas(palavra)
+            self._qtd_trigramas.append(len(grams))
+            for gram in grams:
+                self._postings_similares[gram].append(i)
+        return i
+
+    def adicionar_linha(self, linha, chave):
+        for palavra in chave.split():
+            self.linhas[self._posicao_palavra(palavra)].add(linha)
+
+    def remover_linha(self, linha, chave):
+        # A palavra fica no vocabulário mesmo sem linhas (não casa com nada)
+        for palavra in chave.split():
+            i = self._posicoes.get(palavra)
+            if i is not None:
+                self.linhas[i].discard(linha)
+
+    def notas_palavras(self, palavra, similaridade_minima=SIMILARIDADE_NOMES):
+        """Palavras do vocabulário que casam com a palavra buscada -> nota (maior é melhor)"""
+        notas = {i: NOTA_TRECHO for i in self.palavras_com_trecho(palavra)}
+        if len(palavra) < 3 or not self._qtd_trigramas:
+            return notas
+
+        if palavra.isalpha():
+            for i in self._foneticas.get(chave_fonetica(palavra), ()):
+                notas.setdefault(i, NOTA_FONETICA)
+
+        grams = trigramas(palavra)
+        comuns = defaultdict(int)
+        for gram in grams:
+            for i in self._postings_similares.get(gram, ()):
+                comuns[i] += 1
+        for i, qtd in comuns.items():
+            if i in notas:
+                continue
+            similaridade = qtd / (len(grams) + self._qtd_trigramas[i] - qtd)
+            if similaridade >= similaridade_minima:
+                notas[i] = PESO_SIMILARIDADE * similaridade
+        return notas
+
+    def palavras_com_trecho(self, trecho):
+        """Posições das palavras do vocabulário que contêm o trecho"""
+        grams = _trigramas_trecho(trecho)
+        if not grams:
+            # Trecho de 1-2 caracteres: varre o vocabulário (bem menor que a base)
+            return [i for i, palavra in enumerate(self.palavras) if trecho in palavra]
+
+        listas = sorted((self._postings.get(gram, []) for gram in grams), key=len)
+        if not listas[0]:
+            return []
+        candidatas = set(listas[0])
+        for lista in listas[1:]:
+            candidatas.intersection_update(lista)
+            if not candidatas:
+                return []
+        return [i for i in candidatas if trecho in self.palavras[i]]
+
+    def linhas_com_trecho(self, trecho):
+        linhas = set()
+        for i in self.palavras_com_trecho(trecho):
+            linhas |= self.linhas[i]
+        return linhas
+
+class IndiceRegistros:
+    """
+    Índice invertido sobre as linhas de uma base.
+    Cada linha tem uma chave de texto (palavras normalizadas, sem acentos) e uma
+    chave só com os dígitos de CPF/processo; as buscas devolvem as posições das linhas.
+    """
+
+    def __init__(self, textos, digitos):
+        # Valores recebidos, para atualizar() saber quais linhas mudaram
+        self.origem = list(zip(textos, digitos))
+        self.textos = [_chave_busca_celula(t) for t in textos]
+        self.digitos = [self._chave_digitos(d) for d in digitos]
+        self._vocab_texto = _VocabularioLinhas(self.textos, aproximado=True)
+        self._vocab_digitos = _VocabularioLinhas(self.digitos)
+
+    def __len__(self):
+        return len(self.textos)
+
+    @staticmethod
+    def _chave_digitos(valor):
+        return " ".join(re.sub(r"\D", "", parte) for parte in str(valor).split())
+
+    def atualizar(self, textos, digitos):
+        """
+        Atualiza o índice para a nova versão da base: só as linhas alteradas são
+        reindexadas e as novas (no fim) acrescentadas.
+
+        Returns:
+            bool: False (índice intacto) quando a base encolheu ou mudou demais
+            (ex: exclusão no meio desloca as posições); nesse caso reconstruir é melhor
+        """
+        if len(textos) < len(self):
+            return False
+        alteradas = [i for i, valores in enumerate(self.origem) if valores != (textos[i], digitos[i])]
+        alteradas.extend(range(len(self), len(textos)))
+        if len(alteradas) > len(textos) // 2:
+            return False
+
+        for linha in alteradas:
+            texto = _chave_busca_celula(textos[linha])
+            chave_digitos = self._chave_digitos(digitos[linha])
+            if linha < len(self):
+                self._vocab_texto.remover_linha(linha, self.textos[linha])
+                self._vocab_digitos.remover_linha(linha, self.digitos[linha])
+                self.origem[linha] = (textos[linha], digitos[linha])
+                self.textos[linha] = texto
+                self.digitos[linha] = chave_digitos
+            else:
+                self.origem.append((textos[linha], digitos[linha]))
+                self.textos.append(texto)
+                self.digitos.append(chave_digitos)
+            self._vocab_texto.adicionar_linha(linha, texto)
+            self._vocab_digitos.adicionar_linha(linha, chave_digitos)
+        return True
+
+    @staticmethod
+    def modo_busca(termo):
+        """'digitos' para termos só com números (e pontuação), 'texto' nos demais"""
+        return "texto" if re.search(r"[A-Z]", chave_busca(termo)) else "digitos"
+
+    def buscar(self, termo, candidatos=None):
+        """
+        Posições (ordenadas) das linhas que casam com o termo.
+        Termo só com números (e pontuação) casa por trecho com os dígitos de CPF/processo;
+        caso contrário cada palavra do termo precisa aparecer em alguma palavra da linha.
+        Com candidatos (resultado de uma busca anterior mais curta), só eles são conferidos.
+        """
+        chave = chave_busca(termo)
+        if not chave:
+            if candidatos is not None:
+                return np.fromiter(sorted(candidatos), dtype=np.int64, count=len(candidatos))
+            return np.arange(len(self), dtype=np.int64)
+
+        if self.modo_busca(chave) == "digitos":
+            digitos = re.sub(r"\D", "", chave)
+            if candidatos is not None:
+                linhas = {i for i in candidatos if digitos in self.digitos[i]}
+            else:
+                linhas = self._vocab_digitos.linhas_com_trecho(digitos)
+        else:
+            palavras = chave.split()
+            if candidatos is not None:
+                # Palavras não contêm espaço: estar no texto da linha é estar em uma de suas palavras
+                linhas = {i for i in candidatos if all(p in self.textos[i] for p in palavras)}
+            else:
+                linhas = None
+                for palavra in palavras:
+                    encontradas = self._vocab_texto.linhas_com_trecho(palavra)
+                    linhas = encontradas if linhas is None else linhas & encontradas
+                    if not linhas:
+                        break
+
+        return np.fromiter(sorted(linhas), dtype=np.int64, count=len(linhas))
+
+    def buscar_aproximado(self, termo, similaridade_minima=SIMILARIDADE_NOMES):
+        """
+        Busca tolerante para nomes: cada palavra do termo precisa casar com alguma
+        palavra da linha por trecho, pelo som (chave fonética) ou por trigramas.
+        Compara o termo com o vocabulário da base, não com cada linha.
+
+        Returns:
+            dict: posição da linha -> pontuação (soma das notas das palavras)
+        """
+        chave = chave_busca(termo)
+        if not chave or self.modo_busca(chave) == "digitos":
+            return {}
+
+        pontuacao = None
+        for palavra in chave.split():
+            por_linha = {}
+            for i, nota in self._vocab_texto.notas_palavras(palavra, similaridade_minima).items():
+                for linha in self._vocab_texto.linhas[i]:
+                    if nota > por_linha.get(linha, 0):
+                        por_linha[linha] = nota
+
+            if pontuacao is None:
+                pontuacao = por_linha
+            else:
+                pontuacao = {linha: pontuacao[linha] + nota for linha, nota in por_linha.items() if linha in pontuacao}
+            if not pontuacao:
+                return {}
+        return pontuacao
@@ -0,0 +1,357 @@
+"""
+Módulo de canonização de valores digitados livremente
+Agrupa variantes de órgãos, assuntos e varas ("TRF 5A REGIAO" x
+"TRIBUNAL REGIONAL FEDERAL DA 5.ª REGIÃO (TRF5)"), propõe um valor canônico
+para aprovação e mantém a tabela de mapeamento usada ao salvar
+"""
+
+import json
+import os
+import re
+from collections import defaultdict
+import streamlit as st
+import pandas as pd
+from components.busca_textual import chave_busca, trigramas
+
+# Arquivo com os mapeamentos aprovados: {familia: {chave_compacta_variante: canonico}}
+ARQUIVO_CANONIZACAO = "canonizacao_autocomplete.json"
+
+# Família -> colunas (base, coluna) onde os valores aparecem
+FAMILIAS_CANONIZACAO = {
+    "orgaos": [("lista_rpv.csv", "Orgao Judicial"), ("lista_alvaras.csv", "Órgão Judicial")],
+    "assuntos": [("lista_rpv.csv", "Assunto")],
+    "varas": [("lista_rpv.csv", "Vara")],
+}
+
+NOMES_FAMILIAS = {
+    "orgaos": "Órgãos Judiciais",
+    "assuntos": "Assuntos",
+    "varas": "Varas",
+}
+
+# Base -> (chave do DataFrame na sessão, chave do SHA)
+CHAVES_SESSAO_BASES = {
+    "lista_rpv.csv": ("df_editado_rpv", "file_sha_rpv"),
+    "lista_alvaras.csv": ("df_editado_alvaras", "file_sha_alvaras"),
+}
+
+PALAVRAS_IGNORADAS = {"DA", "DE", "DO", "DAS", "DOS", "E"}
+
+# Palavras que podem acompanhar uma sigla sem mudar a entidade ("TRF 5A REGIAO" = "TRF5")
+PALAVRAS_GENERICAS_SIGLA = {"REGIAO", "SECAO", "JUDICIARIA"}
+
+SIMILARIDADE_AGRUPAMENTO = 0.8
+
+# =====================================
+# CHAVES DE AGRUPAMENTO
+# =====================================
+
+def chave_compacta(valor):
+    """Chave sem acentos, pontuação, preposições e marcas de ordinal (5ª, 5.ª, 5A -> 5)"""
+    tokens = []
+    for token in chave_busca(valor).split():
+        if token in PALAVRAS_IGNORADAS:
+            continue
+        # "5A"/"5O" -> "5"; "A"/"O" logo depois de um número também é ordinal
+        token = re.sub(r"^(\d+)[AO]$", r"\1", token)
+        if token in ("A", "O") and tokens and tokens[-1].isdigit():
+            continue
+        tokens.append(token)
+    return " ".join(tokens)
+
+def siglas(valor):
+    """Siglas que identificam o valor: entre parênteses "(TRF5)" ou no início "TRF 5A ..." """
+    resultado = set()
+
+    for trecho in re.findall(r"\(([^)]+)\)", str(valor)):
+        sigla = chave_compacta(trecho).replace(" ", "")
+        if len(sigla) >= 3:
+            resultado.add(sigla)
+
+    tokens = chave_compacta(valor).split()
+    if len(tokens) >= 2 and tokens[0].isalpha() and len(tokens[0]) <= 5 and tokens[1].isdigit():
+        resultado.add(tokens[0] + tokens[1])
+    elif len(tokens) == 1 and re.fullmatch(r"[A-Z]{2,5}\d+", tokens[0]):
+        # O valor já é uma sigla ("TRF2")
+        resultado.add(tokens[0])
+
+    return resultado
+
+def _sigla_identifica(sigla, restante):
+    """
+    A sigla identifica o valor inteiro? Sim se o resto do valor é genérico ("REGIAO")
+    ou é o nome por extenso da sigla (TRIBUNAL REGIONAL FEDERAL 5 -> TRF5)
+    """
+    palavras = [t for t in restante if t not in PALAVRAS_GENERICAS_SIGLA]
+    if not palavras:
+        return True
+    iniciais = "".join(t[0] for t in palavras if t.isalpha())
+    return (iniciais == re.sub(r"\d+", "", sigla)
+            and [t for t in palavras if t.isdigit()] == re.findall(r"\d+", sigla))
+
+def siglas_identificadoras(valor):
+    """
+    Siglas que bastam para juntar valores: só quando a sigla é o valor inteiro.
+    "AUXILIO DOENCA (INSS)" não vira "INSS", nem "VARA 2 CRIMINAL" vira "VARA2".
+    """
+    fora_parenteses = chave_compacta(re.sub(r"\([^)]*\)", " ", str(valor))).split()
+    resultado = set()
+
+    for trecho in re.findall(r"\(([^)]+)\)", str(valor)):
+        sigla = chave_compacta(trecho).replace(" ", "")
+        if len(sigla) >= 3 and _sigla_identifica(sigla, fora_parenteses):
+            resultado.add(sigla)
+
+    tokens = fora_parenteses
+    if len(tokens) >= 2 and tokens[0].isalpha() and len(tokens[0]) <= 5 and tokens[1].isdigit():
+        if _sigla_identifica(tokens[0] + tokens[1], tokens[2:]):
+            resultado.add(tokens[0] + tokens[1])
+    elif len(tokens) == 1 and re.fullmatch(r"[A-Z]{2,5}\d+", tokens[0]):
+        resultado.add(tokens[0])
+
+    return resultado
+
+def numeros(valor):
+    """Números e ordinais do valor (5ª, 5.ª, 5A -> 5), que distinguem entidades: TRF1 x TRF5, 1ª x 2ª Vara"""
+    return tuple(sorted(re.findall(r"\d+", chave_compacta(valor))))
+
+def abreviacoes(valor):
+    """
+    Abreviações do valor: as siglas e, em textos com minúsculas, as palavras em
+    maiúsculas ("Vara do JEF" -> JEF), sem os números
+    """
+    resultado = {re.sub(r"\d+", "", sigla) for sigla in siglas(valor)}
+    # Sigla colada ao número no meio do texto ("TRF5 REGIAO")
+    for token in chave_compacta(valor).split():
+        if re.fullmatch(r"[A-Z]{2,5}\d+", token):
+            resultado.add(re.sub(r"\d+", "", token))
+    texto = str(valor)
+    if any(c.islower() for c in texto):
+        for palavra in re.findall(r"\b[A-Z]{2,6}\b", texto):
+            if palavra not in PALAVRAS_IGNORADAS:
+                resultado.add(palavra)
+    return frozenset(resultado)
+
+# =====================================
+# AGRUPAMENTO E PROPOSTAS
+# =====================================
+
+def contar_valores_familia(bases, familia):
+    """Contagem de cada valor da família somando todas as colunas/bases"""
+    contagem = defaultdict(int)
+    for filename, coluna in FAMILIAS_CANONIZACAO[familia]:
+        df = bases.get(filename)
+        if df is None or coluna not in df.columns:
+            continue
+        valores = df[coluna].dropna().astype(str).str.strip()
+        for valor, qtd in valores[valores != ""].value_counts().items():
+            if valor.lower() != "nan":
+                contagem[valor] += int(qtd)
+    return dict(contagem)
+
+def agrupar_variantes(valores):
+    """
+    Agrupa valores que são variantes do mesmo nome.
+    Mesma chave compacta ou mesma sigla (quando ela é o valor inteiro, ver
+    siglas_identificadoras) -> mesmo grupo; depois junta grupos
+    com trigramas parecidos (comparando só quem divide trigramas e tem os mesmos
+    números e abreviações).
+    """
+    valores = list(valores)
+    pai = list(range(len(valores)))
+
+    def raiz(i):
+        while pai[i] != i:
+            pai[i] = pai[pai[i]]
+            i = pai[i]
+        return i
+
+    def unir(i, j):
+        ri, rj = raiz(i), raiz(j)
+        if ri != rj:
+            pai[rj] = ri
+
+    compactas = [chave_compacta(v) for v in valores]
+
+    dono_chave = {}
+    for i, valor in enumerate(valores):
+        for chave in {f"c:{compactas[i]}"} | {f"s:{s}" for s in siglas_identificadoras(valor)}:
+            if chave in dono_chave:
+                unir(dono_chave[chave], i)
+            else:
+                dono_chave[chave] = i
+
+    # Similaridade por trigramas, só entre quem compartilha algum trigrama e tem os mesmos
+    # números/ordinais e abreviações (trigramas não distinguem "TRF1" de "TRF5")
+    grams = [trigramas(c) for c in compactas]
+    assinaturas = [(numeros(v), abreviacoes(v)) for v in valores]
+    postings = defaultdict(list)
+    for i, g in enumerate(grams):
+        for gram in g:
+            postings[gram].append(i)
+
+    for i, g in enumerate(grams):
+        comuns = defaultdict(int)
+        for gram in g:
+            for j in postings[gram]:
+                if j > i:
+                    comuns[j] += 1
+        for j, qtd in comuns.items():
+            if assinaturas[i] != assinaturas[j]:
+                continue
+            if qtd / (len(g) + len(grams[j]) - qtd) >= SIMILARIDADE_AGRUPAMENTO:
+                unir(i, j)
+
+    grupos = defaultdict(list)
+    for i, valor in enumerate(valores):
+        grupos[raiz(i)].append(valor)
+    return [grupo for grupo in grupos.values() if len(grupo) > 1]
+
+def gerar_propostas_canonizacao(bases):
+    """
+    Lista de propostas {familia, canonico, variantes: [(valor, qtd)]}.
+    O canônico proposto é a variante mais usada (empate: a mais longa).
+    """
+    propostas = []
+    for familia in FAMILIAS_CANONIZACAO:
+        contagem = contar_valores_familia(bases, familia)
+        for grupo in agrupar_variantes(contagem.keys()):
+            variantes = sorted(((v, contagem[v]) for v in grupo), key=lambda item: (-item[1], -len(item[0]), item[0]))
+            propostas.append({
+                "familia": familia,
+                "canonico": variantes[0][0],
+                "variantes": variantes
+            })
+    return propostas
+
+# =====================================
+# TABELA DE MAPEAMENTO
+# =====================================
+
+_cache_canonizacao = {"assinatura": None, "dados": {}}
+
+def carregar_mapeamentos_canonizacao():
+    """Mapeamentos aprovados, relidos só quando o arquivo muda"""
+    if not os.path.exists(ARQUIVO_CANONIZACAO):
+        return {}
+    try:
+        stat = os.stat(ARQUIVO_CANONIZACAO)
+        assinatura = (stat.st_mtime_ns, stat.st_size)
+        if _cache_canonizacao["assinatura"] != assinatura:
+            with open(ARQUIVO_CANONIZACAO, 'r', encoding='utf-8') as f:
+                _cache_canonizacao["dados"] = json.load(f)
+            _cache_canonizacao["assinatura"] = assinatura
+        return _cache_canonizacao["dados"]
+    except Exception:
+        return {}
+
+def salvar_mapeamentos_canonizacao(mapeamentos):
+    """Grava a tabela de mapeamento de forma atômica"""
+    try:
+        arquivo_temp = f"{ARQUIVO_CANONIZACAO}.tmp"
+        with open(arquivo_temp, 'w', encoding='utf-8') as f:
+            json.dump(mapeamentos, f, indent=2, ensure_ascii=False)
+        os.replace(arquivo_temp, ARQUIVO_CANONIZACAO)
+        return True
+    except Exception:
+        return False
+
+def canonizar_valor(valor, familia):
+    """Valor canônico aprovado para o valor (ou o próprio valor)"""
+    if valor is None or (isinstance(valor, float) and pd.isna(valor)):
+        return valor
+    mapa = carregar_mapeamentos_canonizacao().get(familia, {})
+    return mapa.get(chave_compacta(valor), valor)
+
+def canonizar_dataframe(df, filename, mapeamentos=None):
+    """
+    Aplica os mapeamentos aprovados às colunas da base (no próprio DataFrame).
+    Trabalha sobre os valores distintos, não linha a linha.
+
+    Args:
+        mapeamentos: tabela a aplicar; None para a gravada em ARQUIVO_CANONIZACAO
+
+    Returns:
+        int: quantidade de células alteradas
+    """
+    if mapeamentos is None:
+        mapeamentos = carregar_mapeamentos_canonizacao()
+    if not mapeamentos:
+        return 0
+
+    alteradas = 0
+    for familia, colunas in FAMILIAS_CANONIZACAO.items():
+        mapa = mapeamentos.get(familia)
+        if not mapa:
+            continue
+        for base, coluna in colunas:
+            if base != filename or coluna not in df.columns:
+                continue
+
+            trocas = {}
+            for valor in df[coluna].dropna().unique():
+                canonico = mapa.get(chave_compacta(valor))
+                if canonico and canonico != valor:
+                    trocas[valor] = canonico
+
+            if trocas:
+                mask = df[coluna].isin(list(trocas.keys()))
+                alteradas += int(mask.sum())
+                df.loc[mask, coluna] = df.loc[mask, coluna].map(trocas)
+    return alteradas
+
+def aplicar_canonizacao(propostas_aprovadas):
+    """
+    Reescreve todas as bases afetadas em um único commit e, só depois que o commit
+    foi aceito, grava os mapeamentos aprovados.
+
+    Returns:
+        int: quantidade de células alteradas (None em caso de falha no salvamento)
+    """
+    from components.functions_controle import load_data_from_github, save_multiple_to_github_seguro
+
+    mapeamentos = {familia: dict(mapa) for familia, mapa in carregar_mapeamentos_canonizacao().items()}
+    for proposta in propostas_aprovadas:
+        mapa = mapeamentos.setdefault(proposta["familia"], {})
+        for valor, _ in proposta["variantes"]:
+            mapa[chave_compacta(valor)] = proposta["canonico"]
+
+    familias = {p["familia"] for p in propostas_aprovadas}
+    arquivos = {base for familia in familias for base, _ in FAMILIAS_CANONIZACAO[familia]}
+
+    # Sempre partir da versão atual das bases
+    bases_alteradas = {}
+    total_alteradas = 0
+    for filename in sorted(arquivos):
+        df, sha = load_data_from_github(filename)
+        if not sha:
+            st.error(f"❌ Não foi possível carregar {filename}. Nada foi alterado nas bases.")
+            return None
+        alteradas = canonizar_dataframe(df, filename, mapeamentos)
+        if alteradas:
+            bases_alteradas[filename] = df
+            total_alteradas += alteradas
+
+    if bases_alteradas:
+        novos_shas = save_multiple_to_github_seguro(
+            bases_alteradas,
+            f"Canonização de órgãos/assuntos/varas ({total_alteradas} valores)",
+            mapeamentos=mapeamentos
+        )
+        if not novos_shas:
+            return None
+    else:
+        novos_shas = {}
+
+    if not salvar_mapeamentos_canonizacao(mapeamentos):
+        st.error("❌ As bases foram atualizadas, mas houve erro ao salvar a tabela de mapeamento. "
+                 "Aplique a proposta novamente para registrá-la.")
+        return None
+
+    for filename, novo_sha in novos_shas.items():
+        chave_df, chave_sha = CHAVES_SESSAO_BASES[filename]
+        st.session_state[chave_sha] = novo_sha
+        # Força a recarga da base na próxima visita à página do módulo
+        st.session_state.pop(chave_df, None)
+
+    return total_alteradas
@@ -0,0 +1,137 @@
+"""
+Cards das listas de processos (RPV, Alvarás e Benefícios)
+Camada de exibição: a base inteira vira texto pronto para a tela uma vez por versão
+(vazios tratados, valores em reais formatados, selo de status em HTML), e os resumos da
+página são montados de uma vez, em um único bloco HTML por card, com uma folha de estilos
+só para as três listas
+"""
+
+import html
+import pandas as pd
+import streamlit as st
+from components.functions_controle import obter_cor_status
+from components.indice_listas import obter_por_versao, texto_serie
+from components.moeda import COLUNAS_MOEDA, formatar_coluna_reais
+
+# Só as classes usadas pelos resumos (os antigos *-card / tab-button não eram aplicados)
+CSS_CARDS_LISTAS = """<style>
+.rpv-info-grid, .alvara-info-grid, .beneficio-info-grid {
+    display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 8px; margin-top: 8px;
+}
+.info-item { background: rgba(255,255,255,0.7); padding: 6px 8px; border-radius: 4px; border-left: 3px solid #0066cc; }
+.info-label { font-size: 0.8em; color: #666; font-weight: bold; }
+.info-value { font-size: 0.9em; color: #333; }
+.card-titulo { margin: 4px 0; }
+.card-descricao { margin: 0 0 4px 0; }
+</style>"""
+
+VALORES_VAZIOS = ["", "nan", "none", "nat", "null"]
+
+# =====================================
+# DADOS DE EXIBIÇÃO
+# =====================================
+
+def _texto_exibicao(serie):
+    """Série como texto limpo: '' nos vazios (NaN, 'nan', 'None'...), sem o '.0' de números inteiros"""
+    texto = texto_serie(serie).str.strip()
+    return texto.where(~texto.str.lower().isin(VALORES_VAZIOS), "")
+
+def montar_frame_exibicao(base, modulo):
+    """
+    Base como texto pronto para a tela: vazios viram "", colunas em reais formatadas e a
+    coluna "Status_html" com o selo colorido (um obter_cor_status por status distinto)
+    """
+    moedas = set(COLUNAS_MOEDA.get(modulo, []))
+    colunas = []
+    for i, coluna in enumerate(base.columns):
+        texto = _texto_exibicao(base.iloc[:, i])
+        if coluna in moedas:
+            # Valores em reais formatados; textos que não são valor (ex: 'A definir') ficam como estão
+            texto = formatar_coluna_reais(base.iloc[:, i])
+        colunas.append(texto)
+
+    exibicao = pd.concat(colunas, axis=1) if colunas else pd.DataFrame(index=base.index)
+    exibicao.columns = list(base.columns)
+
+    status = exibicao["Status"] if "Status" in base.columns else pd.Series("", index=base.index)
+    if isinstance(status, pd.DataFrame):
+        status = status.iloc[:, 0]
+    status = status.where(status != "", "Não informado")
+    selos = {s: obter_cor_status(s, modulo)["html"] for s in status.unique()}
+    exibicao["Status_html"] = status.map(selos)
+    return exibicao
+
+def obter_frame_exibicao(df, modulo):
+    """Frame de exibição da base, construído uma vez por versão"""
+    return obter_por_versao(df, modulo, "exibicao", lambda base: montar_frame_exibicao(base, modulo))
+
+def linha_exibicao(linha, modulo):
+    """Uma linha avulsa (ex: a aberta num diálogo) no formato de exibição, como dict"""
+    return montar_frame_exibicao(linha.to_frame().T.infer_objects(), modulo).iloc[0].to_dict()
+
+def valor_exibicao(linha, coluna, padrao="Não informado"):
+    """Valor de uma linha de exibição, com o padrão quando vazio"""
+    return linha.get(coluna) or padrao
+
+def aplicar_css_cards():
+    """
+    Folha de estilos dos cards. Chamada uma vez por execução da lista (e não por card):
+    o Streamlit remove os elementos que não são redesenhados, então não dá para enviar só
+    na primeira execução da sessão; nos reruns de fragmento dos cards ela não é reenviada.
+    """
+    st.markdown(CSS_CARDS_LISTAS, unsafe_allow_html=True)
+
+# =====================================
+# RESUMOS DOS CARDS
+# =====================================
+
+def resumos_cards_html(pagina, classe_grade, campos, titulo=None, descricao=None):
+    """
+    HTML do resumo de cada card da página, montado numa só passada por coluna.
+
+    Args:
+        pagina: linhas da página no frame de exibição (obter_frame_exibicao(...).iloc[posições])
+        classe_grade: classe CSS da grade (ex: "rpv-info-grid")
+        campos: lista de (rótulo, coluna, padrão, formatar|None); "Status" usa o selo colorido
+        titulo: (rótulo, coluna) exibido acima da grade, ex: ("Processo", "Processo")
+        descricao: coluna exibida abaixo do título quando preenchida
+
+    Returns:
+        list[str]: um bloco HTML por linha, na ordem da página
+    """
+    def coluna_escapada(coluna, padrao, formatar=None):
+        if coluna not in pagina.columns:
+            valores = [padrao] * len(pagina)
+        else:
+            valores = [v or padrao for v in pagina[coluna].tolist()]
+        if formatar:
+            valores = [formatar(v) for v in valores]
+        return [html.escape(v) for v in valores]
+
+    colunas = []
+    for rotulo, coluna, padrao, formatar in campos:
+        if coluna == "Status":
+            valores = pagina["Status_html"].tolist()
+        else:
+            valores = coluna_escapada(coluna, padrao, formatar)
+        colunas.append((html.escape(rotulo), valores))
+
+    titulos = coluna_escapada(titulo[1], "Não informado") if titulo else None
+    descricoes = coluna_escapada(descricao, "") if descricao else None
+
+    resumos = []
+    for i in range(len(pagina)):
+        partes = []
+        if titulos:
+            partes.append(f'<div class="card-titulo">📄 <b>{html.escape(titulo[0])}:</b> {titulos[i]}</div>')
+        if descricoes and descricoes[i]:
+            partes.append(f'<div class="card-descricao">📝 <b>Descrição:</b> {descricoes[i]}</div>')
+        partes.append(f'<div class="{classe_grade}">')
+        for rotulo, valores in colunas:
+            partes.append(
+                f'<div class="info-item"><div class="info-label">{rotulo}</div>'
+                f'<div class="info-value">{valores[i]}</div></div>'
+            )
+        partes.append("</div>")
+        resumos.append("".join(partes))
+    return resumos
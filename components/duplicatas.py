@@ -0,0 +1,207 @@
+"""
+Detecção de possíveis duplicatas nas bases (RPV, Alvarás, Benefícios e Acordos)
+Os registros são agrupados por chaves de bloco (primeiros nomes normalizados, dígitos do
+CPF, número do processo) e a similaridade só é calculada dentro de cada bloco, em vez de
+comparar todos os pares da base. O resultado fica em cache por versão da base e é
+revisado numa fila, onde cada par pode ser descartado ("não é duplicata")
+"""
+
+from difflib import SequenceMatcher
+from itertools import combinations
+import pandas as pd
+import streamlit as st
+from components.busca_textual import chave_busca, chave_fonetica
+from components.indice_listas import obter_por_versao, texto_coluna
+
+# Colunas usadas na comparação de cada base
+CAMPOS_DUPLICATAS = {
+    "rpv": {"nome": "Beneficiário", "cpf": "CPF", "processo": "Processo"},
+    "alvaras": {"nome": "Parte", "cpf": "CPF", "processo": "Processo"},
+    "beneficios": {"nome": "PARTE", "cpf": "CPF", "processo": "Nº DO PROCESSO"},
+    "acordos": {"nome": "Nome_Cliente", "cpf": "CPF_Cliente", "processo": "Processo"},
+}
+
+NOMES_MODULOS = {"rpv": "RPV", "alvaras": "Alvarás", "beneficios": "Benefícios", "acordos": "Acordos"}
+
+# Preposições que não identificam o nome ("MARIA DA SILVA" -> MARIA, SILVA)
+PALAVRAS_IGNORADAS = {"DE", "DA", "DO", "DAS", "DOS", "E"}
+
+# Similaridade mínima entre os nomes para o par entrar na fila sem CPF igual
+LIMIAR_SIMILARIDADE_NOME = 0.9
+
+# Blocos maiores que isso (ex: nome muito comum) comparam cada registro só com os
+# vizinhos na ordem alfabética, para não voltar ao custo quadrático
+TAMANHO_MAXIMO_BLOCO = 50
+JANELA_BLOCO_GRANDE = 10
+
+ITENS_POR_PAGINA_FILA = 20
+
+# =====================================
+# CHAVES DE BLOCO
+# =====================================
+
+def _digitos(serie):
+    return serie.str.replace(r"\D", "", regex=True)
+
+def _palavras_nome(nome):
+    return [p for p in nome.split() if p not in PALAVRAS_IGNORADAS and len(p) > 1]
+
+def chaves_bloco(nome, cpf, processo):
+    """
+    Chaves de bloco de um registro: primeiro+segundo nome e primeiro+último nome (pela chave
+    fonética, para SOUZA/SOUSA, LUIZ/LUIS caírem no mesmo bloco), CPF e processo
+    """
+    chaves = []
+    palavras = [chave_fonetica(p) for p in _palavras_nome(nome)]
+    if len(palavras) >= 2:
+        chaves.append(f"nome:{palavras[0]} {palavras[1]}")
+        chaves.append(f"nome:{palavras[0]} {palavras[-1]}")
+    elif palavras and len(palavras[0]) > 5:
+        chaves.append(f"nome:{palavras[0]}")
+    if cpf:
+        chaves.append(f"cpf:{cpf}")
+    if len(processo) >= 7:
+        chaves.append(f"processo:{processo}")
+    # Sem repetição (com dois nomes, primeiro+segundo e primeiro+último são a mesma chave)
+    return list(dict.fromkeys(chaves))
+
+def _cpf_valido(cpf):
+    """Dígitos do CPF se tiver 11 dígitos e não for repetido (000.000.000-00 é preenchimento padrão); senão ''"""
+    return cpf if len(cpf) == 11 and len(set(cpf)) > 1 else ""
+
+# =====================================
+# DETECÇÃO
+# =====================================
+
+def _pares_bloco(membros, nomes):
+    """Pares a comparar dentro de um bloco (todos, ou vizinhos na ordem alfabética se o bloco for grande)"""
+    if len(membros) <= TAMANHO_MAXIMO_BLOCO:
+        return combinations(membros, 2)
+    ordenados = sorted(membros, key=lambda i: nomes[i])
+    return (
+        (ordenados[a], ordenados[b])
+        for a in range(len(ordenados))
+        for b in range(a + 1, min(a + 1 + JANELA_BLOCO_GRANDE, len(ordenados)))
+    )
+
+def _similaridade_nomes(nome_a, nome_b, mesmo_cpf):
+    """Similaridade (0 a 1) entre dois nomes; 0 quando os limites rápidos já descartam o par"""
+    if not nome_a or not nome_b:
+        return 0.0
+    if nome_a == nome_b:
+        return 1.0
+    comparador = SequenceMatcher(None, nome_a, nome_b)
+    if not mesmo_cpf and comparador.real_quick_ratio() < LIMIAR_SIMILARIDADE_NOME:
+        return 0.0
+    return comparador.ratio()
+
+def detectar_duplicatas(base, modulo):
+    """
+    Pares de registros que podem ser o mesmo cadastro.
+
+    Returns:
+        pd.DataFrame: posicao_a, posicao_b, id_a, id_b, nome_a, nome_b, semelhanca (0 a 1) e motivos,
+        do par mais parecido para o menos parecido
+    """
+    campos = CAMPOS_DUPLICATAS[modulo]
+    nomes = [chave_busca(n) for n in texto_coluna(base, campos["nome"])]
+    cpfs = [_cpf_valido(c) for c in _digitos(texto_coluna(base, campos["cpf"]))]
+    processos = _digitos(texto_coluna(base, campos["processo"])).tolist()
+    ids = texto_coluna(base, "ID").tolist()
+    nomes_originais = texto_coluna(base, campos["nome"]).tolist()
+
+    blocos = {}
+    for i in range(len(base)):
+        for chave in chaves_bloco(nomes[i], cpfs[i], processos[i]):
+            blocos.setdefault(chave, []).append(i)
+
+    comparados = set()
+    pares = []
+    for membros in blocos.values():
+        if len(membros) < 2:
+            continue
+        for a, b in _pares_bloco(membros, nomes):
+            if (a, b) in comparados:
+                continue
+            comparados.add((a, b))
+
+            mesmo_cpf = cpfs[a] != "" and cpfs[a] == cpfs[b]
+            mesmo_processo = processos[a] != "" and processos[a] == processos[b]
+            similaridade = _similaridade_nomes(nomes[a], nomes[b], mesmo_cpf)
+            if not mesmo_cpf and similaridade < LIMIAR_SIMILARIDADE_NOME:
+                continue
+
+            motivos = []
+            if similaridade == 1:
+                motivos.append("mesmo nome")
+            elif similaridade >= LIMIAR_SIMILARIDADE_NOME:
+                motivos.append(f"nomes parecidos ({similaridade:.0%})")
+            if mesmo_cpf:
+                motivos.append("mesmo CPF")
+            if mesmo_processo:
+                motivos.append("mesmo processo")
+
+            pares.append({
+                "posicao_a": a, "posicao_b": b, "id_a": ids[a], "id_b": ids[b],
+                "nome_a": nomes_originais[a], "nome_b": nomes_originais[b],
+                "semelhanca": round(0.5 * similaridade + 0.3 * mesmo_cpf + 0.2 * mesmo_processo, 3),
+                "motivos": ", ".join(motivos),
+            })
+
+    colunas = ["posicao_a", "posicao_b", "id_a", "id_b", "nome_a", "nome_b", "semelhanca", "motivos"]
+    resultado = pd.DataFrame(pares, columns=colunas)
+    return resultado.sort_values("semelhanca", ascending=False, kind="stable").reset_index(drop=True)
+
+def obter_duplicatas(df, modulo):
+    """Pares suspeitos da base, calculados uma vez por versão"""
+    return obter_por_versao(df, modulo, "duplicatas", lambda base: detectar_duplicatas(base, modulo))
+
+# =====================================
+# FILA DE REVISÃO
+# =====================================
+
+def _chave_par(modulo, id_a, id_b):
+    return (modulo,) + tuple(sorted((str(id_a), str(id_b))))
+
+def descartar_par(modulo, id_a, id_b):
+    """Callback do "Não é duplicata": tira o par da fila nesta sessão"""
+    st.session_state.setdefault("duplicatas_descartadas", set()).add(_chave_par(modulo, id_a, id_b))
+
+def fila_duplicatas(df, modulo):
+    """Pares suspeitos ainda não descartados"""
+    pares = obter_duplicatas(df, modulo)
+    descartados = st.session_state.get("duplicatas_descartadas", set())
+    if pares.empty or not descartados:
+        return pares
+    manter = [_chave_par(modulo, a, b) not in descartados for a, b in zip(pares["id_a"], pares["id_b"])]
+    return pares[manter]
+
+def interface_fila_duplicatas(df, modulo):
+    """Fila de revisão das possíveis duplicatas da base"""
+    campos = CAMPOS_DUPLICATAS[modulo]
+    fila = fila_duplicatas(df, modulo)
+
+    if fila.empty:
+        st.success(f"✅ Nenhuma possível duplicata em {NOMES_MODULOS[modulo]}")
+        return
+
+    st.warning(f"⚠️ {len(fila)} par(es) de possíveis duplicatas em {NOMES_MODULOS[modulo]}")
+
+    total_paginas = (len(fila) - 1) // ITENS_POR_PAGINA_FILA + 1
+    pagina = 1
+    if total_paginas > 1:
+        pagina = st.selectbox("Página:", range(1, total_paginas + 1), key=f"pagina_fila_duplicatas_{modulo}")
+    inicio = (pagina - 1) * ITENS_POR_PAGINA_FILA
+
+    colunas_exibir = [c for c in ["ID", campos["nome"], campos["cpf"], campos["processo"], "Status"] if c in df.columns]
+    for _, par in fila.iloc[inicio:inicio + ITENS_POR_PAGINA_FILA].iterrows():
+        with st.container():
+            col_info, col_acao = st.columns([8, 2])
+            with col_info:
+                st.markdown(f"**{par['nome_a']}** × **{par['nome_b']}** — {par['motivos']} "
+                            f"(semelhança {par['semelhanca']:.0%})")
+                st.dataframe(df.iloc[[par["posicao_a"], par["posicao_b"]]][colunas_exibir],
+                             hide_index=True, use_container_width=True)
+            with col_acao:
+                st.button("✅ Não é duplicata", key=f"descartar_{modulo}_{par['id_a']}_{par['id_b']}",
+                          on_click=descartar_par, args=(modulo, par["id_a"], par["id_b"]))
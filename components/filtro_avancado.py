@@ -0,0 +1,174 @@
+"""
+Componentes de filtro das listas de processos: construtor de filtro avançado
+Condições combinadas com E/OU (status múltiplos, faixas de valor, períodos de
+datas, campos vazios) compiladas em máscaras numpy pelo módulo indice_listas,
+e seletores com a contagem de cada opção
+"""
+
+import streamlit as st
+from components.indice_listas import contar_facetas_lista, obter_codigos_coluna, tipo_coluna_filtro
+from components.moeda import formatar_reais, valor_reais
+
+OPERADORES_POR_TIPO = {
+    "texto": [("em", "é um de"), ("contem", "contém"), ("vazio", "está vazio"), ("preenchido", "está preenchido")],
+    "numero": [("entre", "entre (valor)"), ("vazio", "está vazio"), ("preenchido", "está preenchido")],
+    "data": [("entre", "entre (datas)"), ("vazio", "está vazio"), ("preenchido", "está preenchido")],
+}
+
+COMBINADORES = {"E": "E (todas as condições)", "OU": "OU (qualquer condição)"}
+
+# Colunas de controle que não fazem sentido no filtro
+COLUNAS_IGNORADAS = {"ID", "linhas"}
+
+def _valor_digitado(texto):
+    """Valor monetário digitado ('1.000,00', '1000.50'); None se vazio ou inválido"""
+    if not texto or not texto.strip():
+        return None
+    return valor_reais(texto, padrao=None)
+
+def descrever_condicao(condicao):
+    """Texto legível da condição para a lista de condições ativas"""
+    coluna, operador, valor = condicao
+    if operador == "em":
+        return f"**{coluna}** é um de: {', '.join(str(v) for v in valor)}"
+    if operador == "contem":
+        return f"**{coluna}** contém \"{valor}\""
+    if operador == "vazio":
+        return f"**{coluna}** está vazio"
+    if operador == "preenchido":
+        return f"**{coluna}** está preenchido"
+    if operador == "entre":
+        minimo, maximo = valor
+        if tipo_coluna_filtro(coluna) == "data":
+            inicio = minimo.strftime("%d/%m/%Y") if minimo else "—"
+            fim = maximo.strftime("%d/%m/%Y") if maximo else "—"
+        else:
+            inicio = formatar_reais(minimo) if minimo is not None else "—"
+            fim = formatar_reais(maximo) if maximo is not None else "—"
+        return f"**{coluna}** entre {inicio} e {fim}"
+    return f"**{coluna}** {operador} {valor}"
+
+def _ler_valor_condicao(df, modulo, coluna, operador, chave):
+    """Campos do valor conforme o operador; retorna o valor da condição ou None se incompleto"""
+    if operador in ("vazio", "preenchido"):
+        return ()
+
+    if operador == "em":
+        codigos = obter_codigos_coluna(df, modulo, coluna)
+        opcoes = sorted(codigos[1].keys(), key=str) if codigos else []
+        selecionados = st.multiselect("Valores:", options=opcoes, key=f"{chave}_valores")
+        return tuple(selecionados) or None
+
+    if operador == "contem":
+        termo = st.text_input("Trecho:", key=f"{chave}_trecho")
+        return termo.strip() or None
+
+    col_min, col_max = st.columns(2)
+    if tipo_coluna_filtro(coluna) == "data":
+        with col_min:
+            inicio = st.date_input("De:", value=None, key=f"{chave}_data_inicio", format="DD/MM/YYYY")
+        with col_max:
+            fim = st.date_input("Até:", value=None, key=f"{chave}_data_fim", format="DD/MM/YYYY")
+        return (inicio, fim) if (inicio or fim) else None
+
+    with col_min:
+        minimo = _valor_digitado(st.text_input("Mínimo (R$):", key=f"{chave}_minimo", placeholder="ex: 1.000,00"))
+    with col_max:
+        maximo = _valor_digitado(st.text_input("Máximo (R$):", key=f"{chave}_maximo", placeholder="ex: 5.000,00"))
+    return (minimo, maximo) if (minimo is not None or maximo is not None) else None
+
+def obter_filtro_avancado(chave):
+    """Filtro avançado atual da lista (estado da sessão), sem renderizar o construtor"""
+    chave_estado = f"filtro_avancado_{chave}"
+    condicoes = st.session_state.get(chave_estado) or []
+    if not condicoes:
+        return None
+    return (st.session_state.get(f"{chave_estado}_combinador", "E"), tuple(condicoes))
+
+def interface_filtro_avancado(df, modulo, chave):
+    """
+    Expander com o construtor de filtro avançado da lista.
+    As condições ficam na sessão (st.session_state[f"filtro_avancado_{chave}"]).
+
+    Returns:
+        tuple: ("E"/"OU", (condição, ...)) pronto para filtrar_posicoes_lista, ou None
+    """
+    chave_estado = f"filtro_avancado_{chave}"
+    if chave_estado not in st.session_state:
+        st.session_state[chave_estado] = []
+    condicoes = st.session_state[chave_estado]
+
+    titulo = "🧰 Filtro avançado"
+    if condicoes:
+        titulo += f" ({len(condicoes)} condição(ões) ativa(s))"
+
+    with st.expander(titulo, expanded=False):
+        combinador = st.radio(
+            "Combinar condições com:",
+            options=list(COMBINADORES.keys()),
+            format_func=lambda c: COMBINADORES[c],
+            horizontal=True,
+            key=f"{chave_estado}_combinador"
+        )
+
+        # Condições ativas
+        for i, condicao in enumerate(condicoes):
+            col_desc, col_rem = st.columns([9, 1])
+            with col_desc:
+                st.markdown(f"{i + 1}. {descrever_condicao(condicao)}")
+            with col_rem:
+                if st.button("🗑️", key=f"{chave_estado}_remover_{i}", help="Remover condição"):
+                    condicoes.pop(i)
+                    st.rerun()
+
+        if condicoes:
+            st.markdown("---")
+
+        # Nova condição
+        colunas = [c for c in df.columns if c not in COLUNAS_IGNORADAS]
+        col_coluna, col_operador = st.columns(2)
+        with col_coluna:
+            coluna = st.selectbox("Coluna:", options=colunas, key=f"{chave_estado}_coluna")
+        operadores = OPERADORES_POR_TIPO[tipo_coluna_filtro(coluna)]
+        with col_operador:
+            operador = st.selectbox(
+                "Condição:",
+                options=[op for op, _ in operadores],
+                format_func=lambda op: dict(operadores)[op],
+                key=f"{chave_estado}_operador"
+            )
+
+        valor = _ler_valor_condicao(df, modulo, coluna, operador, f"{chave_estado}_novo")
+
+        col_add, col_limpar, _ = st.columns([2, 2, 6])
+        with col_add:
+            if st.button("➕ Adicionar condição", key=f"{chave_estado}_adicionar", disabled=valor is None):
+                condicoes.append((coluna, operador, valor))
+                st.rerun()
+        with col_limpar:
+            if condicoes and st.button("🧹 Limpar condições", key=f"{chave_estado}_limpar"):
+                st.session_state[chave_estado] = []
+                st.rerun()
+
+    return (combinador, tuple(condicoes)) if condicoes else None
+
+# =====================================
+# SELETORES COM CONTAGEM (FACETAS)
+# =====================================
+
+def selectbox_faceta(rotulo, df, modulo, coluna, filtros, key, busca="", avancado=None):
+    """
+    Selectbox de filtro com a quantidade de cada opção ("Status (n)"), contando só as
+    linhas que passam pelos demais filtros ativos. O valor retornado é o valor puro.
+    """
+    if coluna not in df.columns:
+        return st.selectbox(rotulo, options=["Todos"], key=key)
+
+    contagens, total = contar_facetas_lista(df, modulo, coluna, filtros, busca=busca, avancado=avancado)
+
+    def formatar(opcao):
+        if opcao == "Todos":
+            return f"Todos ({total})"
+        return f"{opcao} ({contagens.get(opcao, 0)})"
+
+    return st.selectbox(rotulo, options=["Todos"] + list(contagens.keys()), format_func=formatar, key=key)
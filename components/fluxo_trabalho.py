@@ -0,0 +1,499 @@
+"""
+Fluxo de trabalho das bases (RPV, Alvarás e Benefícios)
+Máquina de estados declarada por módulo (status, transições, perfis que podem executá-las
+e campos carimbados em cada uma), compilada uma vez em tabelas de consulta: "este perfil
+pode editar este status?" e "o que este usuário pode fazer nestas N linhas?" viram
+consultas a dicionário e indexação de arrays, em vez de ramificações por linha. Transições que não
+dependem de dados da linha podem ser aplicadas em massa, num único salvamento
+"""
+
+from datetime import datetime
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+import streamlit as st
+from components.duplicatas import CAMPOS_DUPLICATAS
+from components.indice_listas import ARQUIVOS_LISTAS, CHAVES_SHA_LISTAS, obter_codigos_coluna, texto_coluna
+from components.moeda import converter_centavos
+
+# Marcadores dos campos carimbados na transição
+DATA_ATUAL = "{data}"
+USUARIO_ATUAL = "{usuario}"
+
+# Perfil com acesso a todas as transições
+PERFIL_TOTAL = "Desenvolvedor"
+
+VALORES_VAZIOS = ["", "nan", "none", "nat", "null"]
+
+# =====================================
+# DECLARAÇÃO DOS FLUXOS
+# =====================================
+
+FLUXOS = {
+    "rpv": {
+        "estados": [
+            "Cadastro",
+            "SAC - aguardando documentação",
+            "Administrativo - aguardando documentação",
+            "SAC - documentação pronta",
+            "Administrativo - documentação pronta",
+            "Enviado para Rodrigo",
+            "aguardando pagamento",
+            "finalizado",
+        ],
+        # Status que correm ao mesmo tempo (principal em "Status", secundário em "Status Secundario")
+        "simultaneos": [
+            ["SAC - aguardando documentação", "Administrativo - aguardando documentação"],
+            ["SAC - documentação pronta", "Administrativo - documentação pronta"],
+        ],
+        # Status que cada perfil pode editar
+        "edicao": {
+            "Cadastrador": ["Cadastro"],
+            "Financeiro": ["Enviado para Rodrigo", "aguardando pagamento"],
+            "Administrativo": ["SAC - aguardando documentação", "Administrativo - aguardando documentação",
+                               "SAC - documentação pronta", "Administrativo - documentação pronta"],
+            "SAC": ["SAC - aguardando documentação", "Administrativo - aguardando documentação",
+                    "SAC - documentação pronta", "Administrativo - documentação pronta"],
+        },
+        "transicoes": {
+            "finalizar_cadastro": {
+                "rotulo": "✅ Finalizar Cadastro e Enviar",
+                "de": ["Cadastro"], "para": "SAC - aguardando documentação",
+                "perfis": ["Cadastrador"],
+                "em_massa": True,
+                "campos": {"Status Secundario": "Administrativo - aguardando documentação",
+                           "Data Envio": DATA_ATUAL, "Enviado Por": USUARIO_ATUAL},
+            },
+            "documentacao_sac": {
+                "rotulo": "🔄 Marcar SAC como Pronto",
+                "de": ["SAC - aguardando documentação"], "para": "SAC - documentação pronta",
+                "perfis": ["SAC"],
+                "em_massa": True,
+                "campos": {"SAC Documentacao Pronta": "Sim", "Data SAC Documentacao": DATA_ATUAL,
+                           "SAC Responsavel": USUARIO_ATUAL},
+            },
+            "documentacao_admin": {
+                "rotulo": "🔄 Marcar Administrativo como Pronto",
+                "coluna": "Status Secundario",
+                "de": ["Administrativo - aguardando documentação"], "para": "Administrativo - documentação pronta",
+                "perfis": ["Administrativo"],
+                "em_massa": True,
+                "campos": {"Admin Documentacao Pronta": "Sim", "Data Admin Documentacao": DATA_ATUAL,
+                           "Admin Responsavel": USUARIO_ATUAL},
+            },
+            # Executada pelo sistema quando SAC e Administrativo concluem a documentação
+            "enviar_rodrigo": {
+                "rotulo": "📤 Enviar para Rodrigo",
+                "de": ["SAC - documentação pronta"], "para": "Enviado para Rodrigo",
+                "perfis": ["SAC", "Administrativo"],
+                "automatica": True,
+                "condicao": {"SAC Documentacao Pronta": "Sim", "Admin Documentacao Pronta": "Sim"},
+                "campos": {"Status Secundario": "", "Validado Financeiro": "Sim", "Data Validacao": DATA_ATUAL,
+                           "Validado Por": "Sistema - Automatico SAC+Admin"},
+            },
+            "registrar_recebimento": {
+                "rotulo": "➡️ Prosseguir para Aguardando Pagamento",
+                "de": ["Enviado para Rodrigo"], "para": "aguardando pagamento",
+                "perfis": ["Financeiro"],
+                "campos": {"Data Recebimento": DATA_ATUAL, "Recebido Por": USUARIO_ATUAL},
+            },
+            "finalizar": {
+                "rotulo": "💳 Finalizar RPV",
+                "de": ["aguardando pagamento"], "para": "finalizado",
+                "perfis": ["Financeiro"],
+                "campos": {"Data Pagamento": DATA_ATUAL, "Pago Por": USUARIO_ATUAL, "Data Finalizacao": DATA_ATUAL},
+            },
+        },
+    },
+    "alvaras": {
+        "estados": ["Cadastrado", "Enviado para o Financeiro", "Financeiro - Enviado para Rodrigo", "Finalizado"],
+        "edicao": {
+            "Cadastrador": ["Cadastrado", "Enviado para o Financeiro"],
+            "Financeiro": ["Enviado para o Financeiro", "Financeiro - Enviado para Rodrigo", "Finalizado"],
+            # Administrativo e SAC podem visualizar tudo
+            "Administrativo": ["Cadastrado", "Enviado para o Financeiro", "Financeiro - Enviado para Rodrigo", "Finalizado"],
+            "SAC": ["Cadastrado", "Enviado para o Financeiro", "Financeiro - Enviado para Rodrigo", "Finalizado"],
+        },
+        "transicoes": {
+            "enviar_financeiro": {
+                "rotulo": "📤 Enviar para Financeiro",
+                "de": ["Cadastrado"], "para": "Enviado para o Financeiro",
+                "perfis": ["Cadastrador"],
+                "campos": {"Data Envio Financeiro": DATA_ATUAL, "Enviado Financeiro Por": USUARIO_ATUAL},
+            },
+            "enviar_rodrigo": {
+                "rotulo": "📤 Enviar para Rodrigo",
+                "de": ["Enviado para o Financeiro"], "para": "Financeiro - Enviado para Rodrigo",
+                "perfis": ["Financeiro"],
+                "campos": {"Data Envio Rodrigo": DATA_ATUAL, "Enviado Rodrigo Por": USUARIO_ATUAL},
+            },
+            "finalizar": {
+                "rotulo": "🎯 Finalizar",
+                "de": ["Financeiro - Enviado para Rodrigo"], "para": "Finalizado",
+                "perfis": ["Financeiro"],
+                # Em massa só os que já têm comprovante e valor sacado salvos no card
+                "em_massa": True,
+                "exige_preenchidos": ["Comprovante Recebimento"],
+                "exige_positivos": ["Valor Sacado"],
+                "campos": {"Data Finalizacao": DATA_ATUAL, "Finalizado Por": USUARIO_ATUAL},
+            },
+        },
+    },
+    "beneficios": {
+        "estados": ["Enviado para administrativo", "Implantado", "Enviado para o SAC",
+                    "Enviado para o financeiro", "Finalizado"],
+        "edicao": {
+            "Cadastrador": ["Implantado"],
+            "Administrativo": ["Enviado para administrativo"],
+            "SAC": ["Enviado para o SAC"],
+            "Financeiro": ["Enviado para o financeiro"],
+        },
+        "transicoes": {
+            "implantar": {
+                "rotulo": "💾 Salvar e Devolver para Cadastrador",
+                "de": ["Enviado para administrativo"], "para": "Implantado",
+                "perfis": ["Administrativo"],
+                "em_massa": True,
+                "confirmacao": "Carta de Concessão e Histórico de Crédito inseridos no Korbil",
+                "campos": {"Data Implantação": DATA_ATUAL, "Implantado Por": USUARIO_ATUAL},
+            },
+            "enviar_sac": {
+                "rotulo": "📞 Enviar para SAC",
+                "de": ["Implantado"], "para": "Enviado para o SAC",
+                "perfis": ["Cadastrador"],
+                "em_massa": True,
+                "campos": {"Data Envio SAC": DATA_ATUAL, "Enviado SAC Por": USUARIO_ATUAL},
+            },
+            "enviar_financeiro": {
+                "rotulo": "📤 Enviar para Financeiro",
+                "de": ["Enviado para o SAC"], "para": "Enviado para o financeiro",
+                "perfis": ["SAC"],
+                "campos": {"Data Envio Financeiro": DATA_ATUAL, "Enviado Financeiro Por": USUARIO_ATUAL},
+            },
+            "finalizar": {
+                "rotulo": "✅ Finalizar Benefício",
+                "de": ["Enviado para o financeiro"], "para": "Finalizado",
+                "perfis": ["Financeiro"],
+                "campos": {"Data Finalização": DATA_ATUAL, "Finalizado Por": USUARIO_ATUAL},
+            },
+        },
+    },
+}
+
+# =====================================
+# COMPILAÇÃO EM TABELAS
+# =====================================
+
+@lru_cache(maxsize=None)
+def compilar_fluxo(modulo):
+    """
+    Tabelas do fluxo do módulo, montadas uma vez por processo:
+    - codigos: status -> código (posição em "estados")
+    - edicao: perfil -> array bool por código (com uma posição extra, False, para status desconhecido)
+    - transicoes: nome -> transição com "origens" (array bool por código) e "perfis" (set)
+    - disponiveis: (perfil, status) -> nomes das transições manuais que o perfil pode executar
+    """
+    fluxo = FLUXOS[modulo]
+    estados = fluxo["estados"]
+    codigos = {estado: i for i, estado in enumerate(estados)}
+    perfis = set(fluxo["edicao"]) | {PERFIL_TOTAL}
+    for transicao in fluxo["transicoes"].values():
+        perfis |= set(transicao["perfis"])
+
+    edicao = {}
+    for perfil in perfis:
+        permitidos = estados if perfil == PERFIL_TOTAL else fluxo["edicao"].get(perfil, [])
+        tabela = np.zeros(len(estados) + 1, dtype=bool)
+        tabela[[codigos[e] for e in permitidos]] = True
+        edicao[perfil] = tabela
+
+    transicoes = {}
+    disponiveis = {}
+    for nome, declarada in fluxo["transicoes"].items():
+        origens = np.zeros(len(estados) + 1, dtype=bool)
+        origens[[codigos[e] for e in declarada["de"]]] = True
+        transicao = dict(declarada, nome=nome, coluna=declarada.get("coluna", "Status"),
+                         origens=origens, perfis=frozenset(declarada["perfis"]) | {PERFIL_TOTAL})
+        transicoes[nome] = transicao
+        if not transicao.get("automatica"):
+            for perfil in transicao["perfis"]:
+                for estado in declarada["de"]:
+                    disponiveis.setdefault((perfil, estado), []).append(nome)
+
+    return {"estados": estados, "codigos": codigos, "edicao": edicao,
+            "transicoes": transicoes, "disponiveis": disponiveis}
+
+def status_etapas(modulo):
+    """Status do fluxo numerados a partir de 1 (formato dos antigos STATUS_ETAPAS_*)"""
+    return {i: estado for i, estado in enumerate(FLUXOS[modulo]["estados"], 1)}
+
+def perfis_edicao(modulo):
+    """Perfil -> status que pode editar (formato dos antigos PERFIS_*)"""
+    fluxo = FLUXOS[modulo]
+    return {**fluxo["edicao"], PERFIL_TOTAL: list(fluxo["estados"])}
+
+# =====================================
+# CONSULTAS
+# =====================================
+
+def pode_editar_status(modulo, status, perfil):
+    """O perfil pode editar registros neste status?"""
+    fluxo = compilar_fluxo(modulo)
+    tabela = fluxo["edicao"].get(perfil)
+    return tabela is not None and bool(tabela[fluxo["codigos"].get(status, -1)])
+
+def pode_executar(modulo, nome_transicao, perfil):
+    """O perfil pode executar a transição (sem olhar o status da linha)?"""
+    return perfil in compilar_fluxo(modulo)["transicoes"][nome_transicao]["perfis"]
+
+def transicoes_disponiveis(modulo, status, perfil):
+    """Transições manuais que o perfil pode executar a partir do status"""
+    fluxo = compilar_fluxo(modulo)
+    if perfil == PERFIL_TOTAL:
+        return [nome for nome, t in fluxo["transicoes"].items()
+                if not t.get("automatica") and t["origens"][fluxo["codigos"].get(status, -1)]]
+    return list(fluxo["disponiveis"].get((perfil, status), []))
+
+def transicao_para(modulo, novo_status):
+    """Nome da transição que leva ao status (None se nenhuma)"""
+    for nome, transicao in compilar_fluxo(modulo)["transicoes"].items():
+        if transicao["para"] == novo_status:
+            return nome
+    return None
+
+def codigos_status(serie, modulo):
+    """Código do status de cada linha (-1 quando fora do fluxo)"""
+    codigos = compilar_fluxo(modulo)["codigos"]
+    return serie.map(codigos).fillna(-1).astype(int).to_numpy()
+
+def codigos_status_base(df, modulo, coluna="Status"):
+    """Código do status de cada linha da base, a partir da coluna fatorada por versão"""
+    fatorada = obter_codigos_coluna(df, modulo, coluna)
+    if fatorada is None:
+        return np.full(len(df), -1)
+    codigos_linhas, valores = fatorada
+    codigos = compilar_fluxo(modulo)["codigos"]
+    # Tabela valor fatorado -> código do fluxo; a última posição atende as linhas vazias (-1)
+    traducao = np.full(len(valores) + 1, -1)
+    for valor, i in valores.items():
+        traducao[i] = codigos.get(valor, -1)
+    return traducao[codigos_linhas]
+
+def mascara_editaveis(df, modulo, perfil, colunas=("Status",)):
+    """Linhas da base que o perfil pode editar (em qualquer uma das colunas de status)"""
+    tabela = compilar_fluxo(modulo)["edicao"].get(perfil)
+    if tabela is None:
+        return np.zeros(len(df), dtype=bool)
+    mascara = np.zeros(len(df), dtype=bool)
+    for coluna in colunas:
+        if coluna in df.columns:
+            mascara |= tabela[codigos_status_base(df, modulo, coluna)]
+    return mascara
+
+def mascara_transicao(df, modulo, nome_transicao, perfil, linhas=None):
+    """
+    Quais linhas aceitam a transição pelo perfil: status de origem, perfil autorizado,
+    condição e campos exigidos pela transição, de uma vez para todas as linhas.
+
+    Args:
+        linhas: índices (labels) a verificar; None para a base inteira
+
+    Returns:
+        np.ndarray: bool, uma posição por linha verificada
+    """
+    transicao = compilar_fluxo(modulo)["transicoes"][nome_transicao]
+    recorte = df if linhas is None else df.loc[linhas]
+    if perfil not in transicao["perfis"] or transicao["coluna"] not in recorte.columns:
+        return np.zeros(len(recorte), dtype=bool)
+
+    if linhas is None:
+        mascara = transicao["origens"][codigos_status_base(df, modulo, transicao["coluna"])]
+    else:
+        # Valores atuais (a seleção pode ter sido alterada nesta execução)
+        mascara = transicao["origens"][codigos_status(recorte[transicao["coluna"]], modulo)]
+
+    for coluna, valor in transicao.get("condicao", {}).items():
+        if coluna not in recorte.columns:
+            return np.zeros(len(recorte), dtype=bool)
+        mascara = mascara & (recorte[coluna].astype(str).str.strip() == valor).to_numpy()
+
+    for coluna in transicao.get("exige_preenchidos", []) + transicao.get("exige_positivos", []):
+        if coluna not in recorte.columns:
+            return np.zeros(len(recorte), dtype=bool)
+    for coluna in transicao.get("exige_preenchidos", []):
+        texto = recorte[coluna].fillna("").astype(str).str.strip().str.lower()
+        mascara = mascara & ~texto.isin(VALORES_VAZIOS).to_numpy()
+    for coluna in transicao.get("exige_positivos", []):
+        mascara = mascara & (converter_centavos(recorte[coluna]).fillna(0) > 0).to_numpy()
+    return mascara
+
+# =====================================
+# APLICAÇÃO
+# =====================================
+
+def aplicar_transicao(df, modulo, linhas, nome_transicao, valores=None, carimbar=True):
+    """
+    Aplica a transição às linhas de uma vez: novo status e campos carimbados
+    (data/usuário atuais) numa atribuição por coluna. Não salva nem verifica permissão
+    (ver mascara_transicao).
+
+    Args:
+        linhas: índice (label) ou lista de índices das linhas
+        valores: campos extras da ação (ex: comprovante anexado)
+        carimbar: False para só mudar o status (ex: campos já preenchidos antes)
+
+    Returns:
+        pd.DataFrame: o próprio df alterado
+    """
+    transicao = compilar_fluxo(modulo)["transicoes"][nome_transicao]
+    substituicoes = {
+        DATA_ATUAL: datetime.now().strftime("%d/%m/%Y %H:%M"),
+        USUARIO_ATUAL: str(st.session_state.get("usuario", "Sistema")),
+    }
+
+    campos = {transicao["coluna"]: transicao["para"]}
+    if carimbar:
+        campos.update({coluna: substituicoes.get(valor, valor) for coluna, valor in transicao["campos"].items()})
+    campos.update(valores or {})
+
+    for coluna, valor in campos.items():
+        if coluna not in df.columns:
+            df[coluna] = ""
+        elif df[coluna].dtype != object:
+            df[coluna] = df[coluna].astype(object)
+        df.loc[linhas, coluna] = valor
+    return df
+
+def aplicar_automaticas(df, modulo, linhas):
+    """Executa as transições automáticas cujas condições as linhas já cumprem; devolve as que avançaram"""
+    avancadas = {}
+    for nome, transicao in compilar_fluxo(modulo)["transicoes"].items():
+        if not transicao.get("automatica"):
+            continue
+        indices = pd.Index(linhas if isinstance(linhas, (list, pd.Index)) else [linhas])
+        prontas = indices[mascara_transicao(df, modulo, nome, PERFIL_TOTAL, indices)]
+        if len(prontas):
+            aplicar_transicao(df, modulo, prontas, nome)
+            avancadas[nome] = list(prontas)
+    return avancadas
+
+# =====================================
+# TRANSIÇÕES EM MASSA
+# =====================================
+
+def transicoes_em_massa(modulo, perfil):
+    """Transições que o perfil pode aplicar a várias linhas de uma vez"""
+    return [nome for nome, t in compilar_fluxo(modulo)["transicoes"].items()
+            if t.get("em_massa") and perfil in t["perfis"]]
+
+def aplicar_em_massa(modulo, linhas, nome_transicao, perfil):
+    """
+    Valida a seleção inteira, aplica a transição (e as automáticas que ela liberar) às
+    linhas válidas de uma cópia da base em edição e salva tudo num único commit; a cópia
+    só substitui a base da sessão depois que o salvamento devolve o SHA.
+
+    Returns:
+        tuple: (índices aplicados, índices ignorados, transições automáticas) ou None se não salvou
+    """
+    from components.functions_controle import save_data_to_github_seguro
+
+    base = st.session_state[f"df_editado_{modulo}"]
+    selecionadas = pd.Index(linhas)
+    linhas = selecionadas[selecionadas.isin(base.index)]
+    # Status atuais da base (outra ação pode ter mudado ou excluído alguma linha desde a seleção)
+    validas = linhas[mascara_transicao(base, modulo, nome_transicao, perfil, linhas)]
+    ignoradas = selecionadas.difference(validas)
+    if not len(validas):
+        return validas, ignoradas, {}
+
+    alterada = base.copy()
+    aplicar_transicao(alterada, modulo, validas, nome_transicao)
+    avancadas = aplicar_automaticas(alterada, modulo, validas)
+
+    novo_sha = save_data_to_github_seguro(alterada, ARQUIVOS_LISTAS[modulo], CHAVES_SHA_LISTAS[modulo])
+    if not novo_sha:
+        return None
+    st.session_state[f"df_editado_{modulo}"] = alterada
+    return validas, ignoradas, avancadas
+
+def interface_transicoes_em_massa(df, modulo, perfil_usuario, posicoes=None):
+    """
+    Seleção de várias linhas para uma transição do fluxo, salva de uma vez.
+
+    Args:
+        df: base exibida na lista (mesmo índice da base em edição)
+        posicoes: posições das linhas filtradas na lista; None para a base inteira
+    """
+    # Resultado da última aplicação (exibido depois do rerun)
+    for tipo, mensagem in st.session_state.pop(f"resultado_transicao_massa_{modulo}", []):
+        getattr(st, tipo)(mensagem)
+
+    opcoes = transicoes_em_massa(modulo, perfil_usuario)
+    if not opcoes:
+        st.info("ℹ️ Nenhuma transição em massa disponível para o seu perfil.")
+        return
+
+    transicoes = compilar_fluxo(modulo)["transicoes"]
+    nome = st.selectbox(
+        "Transição:",
+        options=opcoes,
+        format_func=lambda n: f"{transicoes[n]['rotulo']} ({', '.join(transicoes[n]['de'])} → {transicoes[n]['para']})",
+        key=f"transicao_massa_{modulo}"
+    )
+    transicao = transicoes[nome]
+
+    mascara = mascara_transicao(df, modulo, nome, perfil_usuario)
+    if posicoes is not None:
+        filtradas = np.zeros(len(df), dtype=bool)
+        filtradas[np.asarray(posicoes, dtype=int)] = True
+        mascara = mascara & filtradas
+    candidatas = df.index[mascara]
+
+    if not len(candidatas):
+        st.info("ℹ️ Nenhum registro da lista filtrada pode receber esta transição.")
+        return
+
+    campos = CAMPOS_DUPLICATAS[modulo]
+    recorte = df.loc[candidatas]
+    descricoes = dict(zip(candidatas, (
+        texto_coluna(recorte, "ID") + " — " + texto_coluna(recorte, campos["processo"])
+        + " — " + texto_coluna(recorte, campos["nome"])
+    )))
+
+    todas = st.checkbox(f"Selecionar todos ({len(candidatas)})", key=f"transicao_massa_todos_{modulo}_{nome}")
+    if todas:
+        selecionadas = list(candidatas)
+    else:
+        selecionadas = st.multiselect(
+            "Registros:",
+            options=list(candidatas),
+            format_func=lambda i: descricoes.get(i, str(i)),
+            key=f"transicao_massa_linhas_{modulo}_{nome}"
+        )
+
+    confirmado = True
+    if transicao.get("confirmacao"):
+        confirmado = st.checkbox(transicao["confirmacao"], key=f"transicao_massa_confirmacao_{modulo}_{nome}")
+
+    if st.button(f"{transicao['rotulo']} ({len(selecionadas)})", type="primary",
+                 disabled=not selecionadas or not confirmado, key=f"aplicar_transicao_massa_{modulo}"):
+        with st.spinner("Aplicando e salvando..."):
+            resultado = aplicar_em_massa(modulo, selecionadas, nome, perfil_usuario)
+
+        if resultado is None:
+            st.error("❌ Erro ao salvar. Tente novamente.")
+            return
+        aplicadas, ignoradas, avancadas = resultado
+        if not len(aplicadas):
+            st.error("❌ Nenhum dos registros selecionados pode mais receber esta transição.")
+            return
+
+        mensagens = [("success", f"✅ {len(aplicadas)} registro(s) movido(s) para '{transicao['para']}' num único salvamento!")]
+        for automatica, linhas in avancadas.items():
+            mensagens.append(("info", f"🔄 {len(linhas)} registro(s) seguiram automaticamente para "
+                                      f"'{transicoes[automatica]['para']}'"))
+        if len(ignoradas):
+            mensagens.append(("warning", f"⚠️ {len(ignoradas)} registro(s) ignorado(s): o status mudou "
+                                         "ou o perfil não tem permissão."))
+        st.session_state[f"resultado_transicao_massa_{modulo}"] = mensagens
+        st.rerun()
@@ -0,0 +1,93 @@
+"""
+Reexecução parcial (fragmentos) dos cards das listas de processos
+Abrir/fechar um card reexecuta só o fragmento do card, sem recarregar o app inteiro
+(sidebar, leitura das bases e a lista toda). Ações que salvam dados continuam usando
+st.rerun(), que recarrega a página completa. O "Abrir Todos" é limitado e os cards abertos
+por ele só executam as seções quando carregados
+"""
+
+import streamlit as st
+
+# st.fragment (1.37+) ou st.experimental_fragment (1.33+); nas versões anteriores a
+# função roda normalmente, com o rerun completo de sempre
+_decorador_fragmento = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+
+def fragmento(funcao):
+    """Decorador: executa a função como fragmento quando a versão do Streamlit suporta"""
+    if _decorador_fragmento is None:
+        return funcao
+    return _decorador_fragmento(funcao)
+
+def alternar_card_expandido(chave_conjunto, card_id):
+    """Callback dos botões Abrir/Fechar: alterna o card no conjunto de expandidos da sessão"""
+    expandidos = st.session_state.setdefault(chave_conjunto, set())
+    if card_id in expandidos:
+        expandidos.discard(card_id)
+        st.session_state.setdefault(f"{chave_conjunto}_adiados", set()).discard(card_id)
+    else:
+        expandidos.add(card_id)
+
+# =====================================
+# ABRIR/FECHAR TODOS (LIMITADO E SOB DEMANDA)
+# =====================================
+
+# Máximo de cards abertos de uma vez pelo "Abrir Todos" (os da página visível)
+LIMITE_CARDS_ABERTOS = 20
+
+def registrar_cards_pagina(chave_conjunto, ids_pagina):
+    """Guarda os IDs dos cards exibidos na página, usados pelo próximo "Abrir Todos" """
+    st.session_state[f"{chave_conjunto}_pagina"] = list(ids_pagina)
+
+def abrir_todos_cards(chave_conjunto):
+    """
+    Callback do "Abrir Todos": abre os cards da página visível, até LIMITE_CARDS_ABERTOS.
+    Os cards abertos assim ficam adiados: mostram só um aviso até o usuário carregá-los
+    """
+    expandidos = st.session_state.setdefault(chave_conjunto, set())
+    adiados = st.session_state.setdefault(f"{chave_conjunto}_adiados", set())
+    for card_id in st.session_state.get(f"{chave_conjunto}_pagina", [])[:LIMITE_CARDS_ABERTOS]:
+        if card_id not in expandidos:
+            expandidos.add(card_id)
+            adiados.add(card_id)
+
+def fechar_todos_cards(chave_conjunto):
+    """Callback do "Fechar Todos" """
+    st.session_state[chave_conjunto] = set()
+    st.session_state[f"{chave_conjunto}_adiados"] = set()
+
+def carregar_card(chave_conjunto, card_id):
+    """Callback do botão do card adiado: passa a renderizar as seções do card"""
+    st.session_state.setdefault(f"{chave_conjunto}_adiados", set()).discard(card_id)
+
+def botoes_abrir_fechar_todos(chave_conjunto, chave):
+    """Botões "Abrir Todos"/"Fechar Todos" com o contador de cards abertos"""
+    col_abrir, col_fechar, col_contador = st.columns([2, 2, 6])
+    with col_abrir:
+        st.button("🔽 Abrir Todos", key=f"abrir_todos_{chave}", on_click=abrir_todos_cards,
+                  args=(chave_conjunto,), help=f"Abre até {LIMITE_CARDS_ABERTOS} cards da página atual")
+    with col_fechar:
+        st.button("🔼 Fechar Todos", key=f"fechar_todos_{chave}", on_click=fechar_todos_cards,
+                  args=(chave_conjunto,))
+    with col_contador:
+        abertos = len(st.session_state.get(chave_conjunto, ()))
+        st.caption(f"📂 {abertos} card(s) aberto(s) · Abrir Todos: até {LIMITE_CARDS_ABERTOS} por vez")
+
+def secao_card_expandido(chave_conjunto, card_id, chave):
+    """
+    Seção ativa de um card aberto. Só a seção escolhida é executada (st.tabs executaria
+    Informações, Ações e Histórico de todos os cards abertos); cards abertos pelo
+    "Abrir Todos" mostram só um botão até serem carregados.
+
+    Returns:
+        str | None: "info", "acoes" ou "historico"; None enquanto o card está adiado
+    """
+    if card_id in st.session_state.get(f"{chave_conjunto}_adiados", ()):
+        st.button("📂 Carregar detalhes", key=f"carregar_{chave}", on_click=carregar_card,
+                  args=(chave_conjunto, card_id))
+        return None
+
+    secoes = {"info": "📋 Informações", "acoes": "⚙️ Ações", "historico": "📜 Histórico"}
+    if st.session_state.get(chave) not in secoes:
+        st.session_state[chave] = "info"
+    return st.radio("Seção do card:", options=list(secoes.keys()), format_func=lambda s: secoes[s],
+                    horizontal=True, label_visibility="collapsed", key=chave)
@@ -25,6 +25,9 @@ from components.functions_controle import (
     # Função de cores de status
     obter_cor_status
 )
+from components.indice_listas import converter_data, filtrar_posicoes_lista
+from components.moeda import valor_reais
+from components.filtro_avancado import interface_filtro_avancado, obter_filtro_avancado, selectbox_faceta
 
 def safe_get_value_acordo(data, key, default='Não cadastrado'):
     """Obtém valor de forma segura, tratando NaN e valores None"""
@@ -39,16 +42,7 @@ def safe_get_value_acordo(data, key, default='Não cadastrado'):
 
 def safe_get_float_value_acordo(data, key, default=0.0):
     """Obtém valor float de forma segura para Acordos"""
-    value = data.get(key, default)
-    if pd.isna(value) or value == "nan" or value == "" or value is None:
-        return default
-    try:
-        # Remove formatação brasileira se presente
-        if isinstance(value, str):
-            value = value.replace("R$", "").replace(".", "").replace(",", ".").strip()
-        return float(value)
-    except (ValueError, TypeError):
-        return default
+    return valor_reais(data.get(key), padrao=default)
 
 def limpar_estados_dialogo_acordo():
     """Limpa todos os estados relacionados aos diálogos de acordos"""
@@ -67,7 +61,7 @@ def proximo_dia_util(data):
 def calcular_datas_parcelas(data_primeiro_pagamento, num_parcelas):
     """Calcula as datas de pagamento das parcelas (30 dias úteis entre elas)"""
     datas = []
-    data_atual = datetime.strptime(data_primeiro_pagamento, "%Y-%m-%d")
+    data_atual = converter_data(data_primeiro_pagamento)
     
     for i in range(num_parcelas):
         if i == 0:
@@ -246,10 +240,13 @@ def interface_lista_acordos(df, perfil_usuario):
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        filtro_status = st.selectbox(
-            "📊 Filtrar por Status",
-            ["Todos"] + list(df["Status"].unique()) if "Status" in df.columns else ["Todos"],
-            key="filtro_status_acordos"
+        # Cada status mostra quantos acordos teria com a busca e o filtro avançado atuais
+        filtro_status = selectbox_faceta(
+            "📊 Filtrar por Status", df, "acordos", "Status",
+            {"Status": st.session_state.get("filtro_status_acordos", "Todos")},
+            key="filtro_status_acordos",
+            busca=st.session_state.get("filtro_busca_acordos", ""),
+            avancado=obter_filtro_avancado("lista_acordos")
         )
     
     with col2:
@@ -263,21 +260,19 @@ def interface_lista_acordos(df, perfil_usuario):
     with col3:
         st.metric("📈 Total de Acordos", len(df))
     
-    # Aplicar filtros
-    df_filtrado = df.copy()
-    
-    if filtro_status != "Todos":
-        df_filtrado = df_filtrado[df_filtrado["Status"] == filtro_status]
-    
-    if filtro_busca:
-        mask = (
-            df_filtrado["Nome_Cliente"].str.contains(filtro_busca, case=False, na=False) |
-            df_filtrado["Nome_Reu"].str.contains(filtro_busca, case=False, na=False) |
-            df_filtrado["CPF_Cliente"].str.contains(filtro_busca, case=False, na=False) |
-            df_filtrado["CPF_Reu"].str.contains(filtro_busca, case=False, na=False) |
-            df_filtrado["Processo"].str.contains(filtro_busca, case=False, na=False)
-        )
-        df_filtrado = df_filtrado[mask]
+    # Filtro avançado (condições E/OU sobre quaisquer colunas)
+    filtro_avancado = interface_filtro_avancado(df, "acordos", "lista_acordos")
+
+    # Aplicar filtros (posições em cache por versão da base e estado dos filtros;
+    # busca resolvida pelo índice, já ranqueada)
+    posicoes_filtradas = filtrar_posicoes_lista(
+        df, "acordos",
+        filtros={"Status": filtro_status},
+        busca=filtro_busca,
+        chave_sessao_busca="filtro_busca_acordos",
+        avancado=filtro_avancado
+    )
+    df_filtrado = df.iloc[posicoes_filtradas]
     
     if df_filtrado.empty:
         st.info("🔍 Nenhum acordo encontrado com os filtros aplicados.")
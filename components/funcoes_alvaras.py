@@ -5,7 +5,6 @@ import requests
 import base64
 from datetime import datetime
 import math
-import unicodedata
 from streamlit_js_eval import streamlit_js_eval
 from st_aggrid import AgGrid, GridOptionsBuilder, DataReturnMode, GridUpdateMode, JsCode
 from components.autocomplete_manager import (
@@ -14,6 +13,21 @@ from components.autocomplete_manager import (
     campo_orgao_judicial
 )
 from components.functions_controle import salvar_arquivo, save_data_to_github_seguro, obter_cor_status
+from components.fluxo_trabalho import (
+    aplicar_transicao, interface_transicoes_em_massa, perfis_edicao, pode_editar_status, pode_executar, status_etapas,
+    transicoes_em_massa
+)
+from components.busca_textual import normalizar_texto, obter_indice_busca
+from components.indice_listas import contar_no_periodo, filtrar_posicoes_lista, ordenar_posicoes_por_data
+from components.filtro_avancado import interface_filtro_avancado, obter_filtro_avancado, selectbox_faceta
+from components.navegacao_listas import controles_ordenacao_lista, controles_paginacao_lista, pagina_lista
+from components.fragmentos import (
+    alternar_card_expandido, botoes_abrir_fechar_todos, fragmento, registrar_cards_pagina, secao_card_expandido
+)
+from components.moeda import formatar_coluna_reais, formatar_reais, valor_reais
+from components.cards_listas import (
+    aplicar_css_cards, linha_exibicao, obter_frame_exibicao, resumos_cards_html, valor_exibicao
+)
 
 # =====================================
 # FUNÇÕES AUXILIARES
@@ -58,37 +72,18 @@ def safe_format_currency_alvara(valor, default="Não informado"):
     """
     Formatar valores monetários de forma segura, tratando NaN
     """
-    try:
-        if valor is None or valor == "" or str(valor).lower() in ['nan', 'nat', 'none']:
-            return default
-        
-        # Tentar converter para float
-        valor_float = float(valor)
-        if math.isnan(valor_float):
-            return default
-        
-        return f"R$ {valor_float:.2f}"
-    except (ValueError, TypeError):
+    valor_float = valor_reais(valor, padrao=None)
+    if valor_float is None:
         return default
+    return formatar_reais(valor_float)
 
 # =====================================
 # CONFIGURAÇÕES DE PERFIS - ALVARÁS
 # =====================================
 
-PERFIS_ALVARAS = {
-    "Cadastrador": ["Cadastrado", "Enviado para o Financeiro"],
-    "Financeiro": ["Enviado para o Financeiro", "Financeiro - Enviado para Rodrigo", "Finalizado"],
-    "Administrativo": ["Cadastrado", "Enviado para o Financeiro", "Financeiro - Enviado para Rodrigo", "Finalizado"],  # Pode visualizar tudo
-    "SAC": ["Cadastrado", "Enviado para o Financeiro", "Financeiro - Enviado para Rodrigo", "Finalizado"],  # Pode visualizar tudo
-    "Desenvolvedor": ["Cadastrado", "Enviado para o Financeiro", "Financeiro - Enviado para Rodrigo", "Finalizado"]  # Desenvolvedor tem acesso total
-}
-
-STATUS_ETAPAS_ALVARAS = {
-    1: "Cadastrado",
-    2: "Enviado para o Financeiro",
-    3: "Financeiro - Enviado para Rodrigo",
-    4: "Finalizado"
-}
+# Status e permissões por perfil - declarados em components/fluxo_trabalho.py
+PERFIS_ALVARAS = perfis_edicao("alvaras")
+STATUS_ETAPAS_ALVARAS = status_etapas("alvaras")
 
 # Órgãos Judiciais para autocomplete
 ORGAOS_JUDICIAIS_DEFAULT = [
@@ -103,12 +98,7 @@ ORGAOS_JUDICIAIS_DEFAULT = [
 
 def normalizar_orgao_judicial(texto):
     """Normaliza nome do órgão judicial removendo acentos e convertendo para maiúsculo"""
-    if not texto:
-        return ""
-    # Remove acentos
-    texto_normalizado = unicodedata.normalize('NFD', texto)
-    texto_sem_acento = ''.join(c for c in texto_normalizado if unicodedata.category(c) != 'Mn')
-    return texto_sem_acento.upper().strip()
+    return normalizar_texto(texto)
 
 def obter_orgaos_judiciais():
     """Retorna lista de órgãos judiciais salvos + padrões"""
@@ -301,21 +291,13 @@ def exibir_informacoes_basicas_alvara(linha_alvara, estilo="compacto"):
 
 def search_orgaos_judiciais(searchterm):
     """Função de busca para o autocomplete de órgãos judiciais"""
-    orgaos_disponiveis = obter_orgaos_judiciais()
+    orgaos_disponiveis = sorted(obter_orgaos_judiciais())
     
     if not searchterm:
         return orgaos_disponiveis[:10]  # Mostrar primeiros 10 se não há busca
     
-    # Normalizar termo de busca
-    termo_normalizado = searchterm.upper().strip()
-    
-    # Buscar órgãos que contenham o termo
-    resultados = []
-    for orgao in orgaos_disponiveis:
-        if termo_normalizado in orgao.upper():
-            resultados.append(orgao)
-    
-    return resultados[:10]  # Limitar a 10 resultados
+    # Índice com chaves já normalizadas (reaproveitado enquanto a lista não mudar)
+    return obter_indice_busca(orgaos_disponiveis).buscar(searchterm, limite=10)
 
 # =====================================
 # FUNÇÕES DE PERFIL E CONTROLE - ALVARÁS
@@ -347,7 +329,7 @@ def verificar_perfil_usuario_alvaras():
     return perfil
 def pode_editar_status_alvaras(status_atual, perfil_usuario):
     """Verifica se o usuário pode editar determinado status"""
-    return status_atual in PERFIS_ALVARAS.get(perfil_usuario, [])
+    return pode_editar_status("alvaras", status_atual, perfil_usuario)
 
 # Funções auxiliares para o cadastro de alvarás
 def obter_colunas_controle():
@@ -437,36 +419,38 @@ def render_tab_anexos_alvara(processo, alvara_id, numero_processo):
 # FUNÇÕES DE RENDERIZAÇÃO DE TABS
 # =====================================
 
-def render_tab_info_alvara(processo, alvara_id):
-    """Renderiza a tab de informações do alvará"""
+def render_tab_info_alvara(processo, alvara_id, exibicao=None):
+    """Renderiza a tab de informações do alvará (textos da linha de exibição, valores da linha original)"""
+    if exibicao is None:
+        exibicao = linha_exibicao(processo, "alvaras")
         
     col_det1, col_det2 = st.columns(2)
     
     with col_det1:
         st.markdown("**📋 Dados Básicos:**")
-        st.write(f"**CPF:** {processo.get('CPF', 'Não informado')}")
-        st.write(f"**Agência:** {processo.get('Agência', 'Não informado')}")
-        st.write(f"**Conta:** {processo.get('Conta', 'Não informado')}")
-        st.write(f"**Banco:** {processo.get('Banco', 'Não informado')}")
+        st.write(f"**CPF:** {valor_exibicao(exibicao, 'CPF')}")
+        st.write(f"**Agência:** {valor_exibicao(exibicao, 'Agência')}")
+        st.write(f"**Conta:** {valor_exibicao(exibicao, 'Conta')}")
+        st.write(f"**Banco:** {valor_exibicao(exibicao, 'Banco')}")
     
     with col_det2:
         st.markdown("**💰 Valores:**")
-        st.write(f"**Valor Sacado:** {safe_format_currency_alvara(processo.get('Valor Sacado'))}")
+        st.write(f"**Valor Sacado:** {valor_exibicao(exibicao, 'Valor Sacado')}")
         
         # Calcular e exibir valor do cliente automaticamente
         valor_cliente_calculado = calcular_valor_cliente_alvara(processo)
         st.write(f"**Valor Cliente (calculado):** R$ {valor_cliente_calculado:.2f}")
         
-        st.write(f"**Honorários Sucumbenciais:** {safe_format_currency_alvara(processo.get('Honorarios Sucumbenciais Valor'))}")
-        st.write(f"**Prospector/Parceiro:** {safe_format_currency_alvara(processo.get('Prospector Parceiro'))}")
+        st.write(f"**Honorários Sucumbenciais:** {valor_exibicao(exibicao, 'Honorarios Sucumbenciais Valor')}")
+        st.write(f"**Prospector/Parceiro:** {valor_exibicao(exibicao, 'Prospector Parceiro')}")
     
     # Mostrar detalhes dos honorários contratuais
     mostrar_detalhes_hc_alvara(processo, f"info_{alvara_id}")
     
     # Observações
-    if processo.get('Observacoes Financeiras'):
+    if exibicao.get('Observacoes Financeiras'):
         st.markdown("### 📝 Observações Financeiras")
-        st.info(processo.get('Observacoes Financeiras'))
+        st.info(exibicao['Observacoes Financeiras'])
 
 def render_tab_acoes_alvara(df, processo, alvara_id, status_atual, perfil_usuario):
     """Renderiza a tab de ações do alvará - inclui edição completa para Cadastradores e Desenvolvedores"""
@@ -594,7 +578,7 @@ def render_tab_acoes_alvara(df, processo, alvara_id, status_atual, perfil_usuari
         st.markdown("---")
     
     # Renderizar ações baseadas no status - usando a lógica original
-    if status_atual == "Cadastrado" and perfil_usuario in ["Cadastrador", "Desenvolvedor"]:
+    if status_atual == "Cadastrado" and pode_executar("alvaras", "enviar_financeiro", perfil_usuario):
         # Usar função auxiliar para anexos
         comprovante_conta, pdf_alvara, anexar_multiplos = render_tab_anexos_alvara(processo, alvara_id, numero_processo)
         
@@ -658,11 +642,8 @@ def render_tab_acoes_alvara(df, processo, alvara_id, status_atual, perfil_usuari
                 if sucesso_salvamento and comprovante_url and pdf_url:
                     # Atualizar DataFrame
                     idx = df[df["ID"] == alvara_id].index[0]
-                    st.session_state.df_editado_alvaras.loc[idx, "Status"] = "Enviado para o Financeiro"
-                    st.session_state.df_editado_alvaras.loc[idx, "Comprovante Conta"] = comprovante_url
-                    st.session_state.df_editado_alvaras.loc[idx, "PDF Alvará"] = pdf_url
-                    st.session_state.df_editado_alvaras.loc[idx, "Data Envio Financeiro"] = datetime.now().strftime("%d/%m/%Y %H:%M")
-                    st.session_state.df_editado_alvaras.loc[idx, "Enviado Financeiro Por"] = st.session_state.get("usuario", "Sistema")
+                    aplicar_transicao(st.session_state.df_editado_alvaras, "alvaras", idx, "enviar_financeiro",
+                                      valores={"Comprovante Conta": comprovante_url, "PDF Alvará": pdf_url})
                     
                     # Salvar no GitHub
                     novo_sha = save_data_to_github_seguro(
@@ -686,12 +667,12 @@ def render_tab_acoes_alvara(df, processo, alvara_id, status_atual, perfil_usuari
     
     elif status_atual == "Enviado para o Financeiro":
         # Apenas Financeiro e Desenvolvedor podem preencher valores financeiros
-        if perfil_usuario in ["Financeiro", "Desenvolvedor"]:
+        if pode_executar("alvaras", "enviar_rodrigo", perfil_usuario):
             render_tab_acoes_financeiro_alvara(df, linha_processo, alvara_id)
         else:
             st.warning("⚠️ Apenas usuários Financeiro e Desenvolvedor podem gerenciar valores financeiros.")
     
-    elif status_atual == "Financeiro - Enviado para Rodrigo" and perfil_usuario in ["Financeiro", "Desenvolvedor"]:
+    elif status_atual == "Financeiro - Enviado para Rodrigo" and pode_executar("alvaras", "finalizar", perfil_usuario):
         render_tab_acoes_rodrigo_alvara(df, linha_processo, alvara_id)
     
     elif status_atual == "Finalizado":
@@ -995,9 +976,7 @@ def render_tab_acoes_financeiro_alvara(df, linha_processo, alvara_id):
                     # Nota: Valor do Cliente não é mais salvo manualmente - é calculado automaticamente
                 
                 # Atualizar status para próxima etapa
-                st.session_state.df_editado_alvaras.loc[idx, "Status"] = "Financeiro - Enviado para Rodrigo"
-                st.session_state.df_editado_alvaras.loc[idx, "Data Envio Rodrigo"] = datetime.now().strftime("%d/%m/%Y %H:%M")
-                st.session_state.df_editado_alvaras.loc[idx, "Enviado Rodrigo Por"] = st.session_state.get("usuario", "Sistema")
+                aplicar_transicao(st.session_state.df_editado_alvaras, "alvaras", idx, "enviar_rodrigo")
                 
                 # Manter status de pendência para que Rodrigo saiba que precisa preencher do zero
                 if pendente_cadastro:
@@ -1268,9 +1247,7 @@ def render_tab_acoes_rodrigo_alvara(df, linha_processo, alvara_id):
                     st.session_state.df_editado_alvaras.loc[idx, "HC2"] = hc2_valor
                 
                 # Atualizar status para finalizado
-                st.session_state.df_editado_alvaras.loc[idx, "Status"] = "Finalizado"
-                st.session_state.df_editado_alvaras.loc[idx, "Data Finalizacao"] = datetime.now().strftime("%d/%m/%Y %H:%M")
-                st.session_state.df_editado_alvaras.loc[idx, "Finalizado Por"] = st.session_state.get("usuario", "Sistema")
+                aplicar_transicao(st.session_state.df_editado_alvaras, "alvaras", idx, "finalizar")
                 
                 # Salvar no GitHub com tratamento de erro
                 try:
@@ -1659,11 +1636,8 @@ def interface_visualizar_dados(df):
         st.metric("Pendentes", pendentes)
     with col_stat4:
         if "Data Cadastro" in df.columns:
-            hoje = datetime.now().strftime("%d/%m/%Y")
-            df_temp = df.copy()
-            df_temp["Data Cadastro"] = df_temp["Data Cadastro"].astype(str)
-            hoje_count = len(df_temp[df_temp["Data Cadastro"].str.contains(hoje, na=False)])
-            st.metric("Cadastrados Hoje", hoje_count)
+            hoje = datetime.now().date()
+            st.metric("Cadastrados Hoje", contar_no_periodo(df, "alvaras", "Data Cadastro", hoje, hoje))
         else:
             st.metric("Cadastrados Hoje", "N/A")
 
@@ -1902,19 +1876,15 @@ def interface_visualizar_dados_alvara(df):
         st.metric("⏳ Em Andamento", f"{pendentes} ({taxa_pendentes:.1f}%)")
     
     with col4:
-        if "Data Cadastro" in df.columns:
-            hoje = datetime.now().strftime("%d/%m/%Y")
-            df_temp = df.copy()
-            df_temp["Data Cadastro"] = df_temp["Data Cadastro"].astype(str)
-            hoje_count = len(df_temp[df_temp["Data Cadastro"].str.contains(hoje, na=False)])
-        else:
-            hoje_count = 0
+        # Contagem pelo índice de datas da versão (busca binária), sem varrer a coluna como texto
+        hoje = datetime.now().date()
+        hoje_count = contar_no_periodo(df, "alvaras", "Data Cadastro", hoje, hoje)
         st.metric("📅 Cadastrados Hoje", hoje_count)
 
     st.markdown("---")
 
     col_filtro1, col_filtro2, col_filtro3, col_filtro4 = st.columns(4)
-    
+
     with col_filtro1:
         status_unicos = ["Todos"] + list(df["Status"].dropna().unique()) if "Status" in df.columns else ["Todos"]
         status_filtro = st.selectbox("Status:", options=status_unicos, key="viz_alvara_status")
@@ -1930,33 +1900,15 @@ def interface_visualizar_dados_alvara(df):
     with col_filtro4:
         pesquisa = st.text_input("🔎 Pesquisar por Parte ou Processo:", key="viz_alvara_search")
 
-    # Aplicar filtros
-    df_filtrado = df.copy()
-    
-    if status_filtro != "Todos" and "Status" in df.columns:
-        df_filtrado = df_filtrado[df_filtrado["Status"] == status_filtro]
-    
-    if usuario_filtro != "Todos" and "Cadastrado Por" in df.columns:
-        df_filtrado = df_filtrado[df_filtrado["Cadastrado Por"] == usuario_filtro]
-        
-    if orgao_filtro != "Todos" and "Órgão Judicial" in df.columns:
-        df_filtrado = df_filtrado[df_filtrado["Órgão Judicial"] == orgao_filtro]
-    
-    if pesquisa:
-        mask = pd.Series([False] * len(df_filtrado))
-        if "Parte" in df_filtrado.columns:
-            mask |= df_filtrado["Parte"].astype(str).str.contains(pesquisa, case=False, na=False)
-        if "Processo" in df_filtrado.columns:
-            mask |= df_filtrado["Processo"].astype(str).str.contains(pesquisa, case=False, na=False)
-        if "CPF" in df_filtrado.columns:
-            mask |= df_filtrado["CPF"].astype(str).str.contains(pesquisa, case=False, na=False)
-        df_filtrado = df_filtrado[mask]
+    # Aplicar filtros (posições em cache por versão da base e estado dos filtros)
+    posicoes_filtradas = filtrar_posicoes_lista(
+        df, "alvaras",
+        filtros={"Status": status_filtro, "Cadastrado Por": usuario_filtro, "Órgão Judicial": orgao_filtro},
+        busca=pesquisa
+    )
 
     # Ordenar por data de cadastro mais recente
-    if "Data Cadastro" in df_filtrado.columns:
-        df_filtrado["_temp_data"] = pd.to_datetime(df_filtrado["Data Cadastro"], format="%d/%m/%Y %H:%M", errors="coerce")
-        df_filtrado = df_filtrado.sort_values("_temp_data", ascending=False, na_position="last")
-        df_filtrado = df_filtrado.drop("_temp_data", axis=1)
+    df_filtrado = df.iloc[ordenar_posicoes_por_data(df, "alvaras", posicoes_filtradas)]
 
     # Botões de download
     if not df_filtrado.empty:
@@ -2011,9 +1963,7 @@ def interface_visualizar_dados_alvara(df):
         
         # Formatar valor monetário
         if 'Valor do Alvará (R$)' in df_display.columns:
-            df_display['Valor do Alvará (R$)'] = df_display['Valor do Alvará (R$)'].apply(
-                lambda x: f"R$ {float(x):,.2f}" if pd.notna(x) and str(x).replace('.', '').replace(',', '').replace('-', '').isdigit() else str(x)
-            )
+            df_display['Valor do Alvará (R$)'] = formatar_coluna_reais(df_display['Valor do Alvará (R$)'])
         
         # Formatar datas
         if 'Data Cadastro' in df_display.columns:
@@ -2205,20 +2155,29 @@ def interface_lista_alvaras(df, perfil_usuario):
     pendentes = total_alvaras - finalizados
     
     col1, col2, col3, col4 = st.columns(4)
-    # Filtros
+    # Filtros (cada opção mostra quantos alvarás ela teria com os demais filtros ativos)
     col_filtro1, col_filtro2, col_filtro3, col_filtro4 = st.columns(4)
-    
+    filtros_atuais = {
+        "Status": st.session_state.get("lista_alvara_status", "Todos"),
+        "Cadastrado Por": st.session_state.get("lista_alvara_user", "Todos"),
+        "Órgão Judicial": st.session_state.get("lista_alvara_orgao", "Todos"),
+    }
+    contexto_facetas = {
+        "busca": st.session_state.get("lista_alvara_search", ""),
+        "avancado": obter_filtro_avancado("lista_alvaras"),
+    }
+
     with col_filtro1:
-        status_unicos = ["Todos"] + list(df["Status"].dropna().unique()) if "Status" in df.columns else ["Todos"]
-        status_filtro = st.selectbox("Status:", options=status_unicos, key="lista_alvara_status")
-        
+        status_filtro = selectbox_faceta("Status:", df, "alvaras", "Status", filtros_atuais,
+                                         key="lista_alvara_status", **contexto_facetas)
+
     with col_filtro2:
-        usuarios_unicos = ["Todos"] + list(df["Cadastrado Por"].dropna().unique()) if "Cadastrado Por" in df.columns else ["Todos"]
-        usuario_filtro = st.selectbox("Cadastrado Por:", options=usuarios_unicos, key="lista_alvara_user")
-    
+        usuario_filtro = selectbox_faceta("Cadastrado Por:", df, "alvaras", "Cadastrado Por", filtros_atuais,
+                                          key="lista_alvara_user", **contexto_facetas)
+
     with col_filtro3:
-        orgaos_unicos = ["Todos"] + list(df["Órgão Judicial"].dropna().unique()) if "Órgão Judicial" in df.columns else ["Todos"]
-        orgao_filtro = st.selectbox("Órgão Judicial:", options=orgaos_unicos, key="lista_alvara_orgao")
+        orgao_filtro = selectbox_faceta("Órgão Judicial:", df, "alvaras", "Órgão Judicial", filtros_atuais,
+                                        key="lista_alvara_orgao", **contexto_facetas)
     
     with col_filtro4:
         # Campo de busca otimizado
@@ -2235,27 +2194,25 @@ def interface_lista_alvaras(df, perfil_usuario):
         if pesquisa:
             st.caption(f"🔍 Buscando por: '{pesquisa}' ({len(pesquisa)} caracteres)")
 
-    # Aplicar filtros automaticamente
-    df_filtrado = df.copy()
-    
-    if status_filtro != "Todos":
-        df_filtrado = df_filtrado[df_filtrado["Status"] == status_filtro]
-    
-    if usuario_filtro != "Todos":
-        df_filtrado = df_filtrado[df_filtrado["Cadastrado Por"] == usuario_filtro]
-        
-    if orgao_filtro != "Todos":
-        df_filtrado = df_filtrado[df_filtrado["Órgão Judicial"] == orgao_filtro]
-    
-    if pesquisa:
-        mask = pd.Series([False] * len(df_filtrado))
-        for col in ["Parte", "Processo", "CPF"]:
-            if col in df_filtrado.columns:
-                mask |= df_filtrado[col].astype(str).str.contains(pesquisa, case=False, na=False)
-        df_filtrado = df_filtrado[mask]
+    # Filtro avançado (condições E/OU sobre quaisquer colunas)
+    filtro_avancado = interface_filtro_avancado(df, "alvaras", "lista_alvaras")
+
+    # Ordenação e tamanho da página
+    criterio_ordem, items_per_page = controles_ordenacao_lista("lista_alvaras")
+
+    # Aplicar filtros automaticamente: posições das linhas em cache por versão da base e estado
+    # dos filtros (busca resolvida pelo índice, já ranqueada); só a página exibida vira DataFrame
+    filtros_lista = {"Status": status_filtro, "Cadastrado Por": usuario_filtro, "Órgão Judicial": orgao_filtro}
+    posicoes_filtradas = filtrar_posicoes_lista(
+        df, "alvaras",
+        filtros=filtros_lista,
+        busca=pesquisa,
+        chave_sessao_busca="lista_alvara_search",
+        avancado=filtro_avancado
+    )
 
     # Calcular total de registros filtrados
-    total_registros_filtrados = len(df_filtrado)
+    total_registros_filtrados = len(posicoes_filtradas)
     
     # Mostrar resultado da busca
     if pesquisa:
@@ -2294,127 +2251,56 @@ def interface_lista_alvaras(df, perfil_usuario):
                            key="confirmar_exclusao_alvaras", type="primary"):
                     confirmar_exclusao_massa_alvaras(df, st.session_state.processos_selecionados_alvaras)
 
+    # Transições de status em massa (validadas de uma vez e salvas num único commit)
+    if transicoes_em_massa("alvaras", perfil_usuario):
+        with st.expander("🔁 Transição em Massa", expanded=False):
+            interface_transicoes_em_massa(df, "alvaras", perfil_usuario, posicoes_filtradas)
+
     # Botões de Expandir/Recolher Todos
     if total_registros_filtrados > 0:
         st.markdown("---")
-        col_exp1, col_exp2, col_exp_space = st.columns([2, 2, 6])
-        
-        with col_exp1:
-            if st.button("🔽 Abrir Todos", key="abrir_todos_alvaras"):
-                # Adicionar todos os IDs dos alvarás filtrados ao set de expandidos
-                for _, processo in df_filtrado.iterrows():
-                    alvara_id = processo.get("ID", "N/A")
-                    st.session_state.alvara_expanded_cards.add(alvara_id)
-                st.rerun()
-        
-        with col_exp2:
-            if st.button("🔼 Fechar Todos", key="fechar_todos_alvaras"):
-                # Limpar o set de cards expandidos
-                st.session_state.alvara_expanded_cards.clear()
-                st.rerun()
+        # Abre no máximo LIMITE_CARDS_ABERTOS cards da página, adiados até serem carregados
+        botoes_abrir_fechar_todos("alvara_expanded_cards", "alvaras")
 
-    # Paginação
-    if "current_page_alvaras" not in st.session_state:
-        st.session_state.current_page_alvaras = 1
-    
-    items_per_page = 10
-    total_registros = len(df_filtrado)
-    total_pages = math.ceil(total_registros / items_per_page) if items_per_page > 0 else 1
-    
-    start_idx = (st.session_state.current_page_alvaras - 1) * items_per_page
+    # Paginação por cursor: a página continua no mesmo alvará mesmo com cadastros de outros usuários
+    assinatura_lista = (tuple(filtros_lista.items()), pesquisa, filtro_avancado, criterio_ordem, items_per_page)
+    posicoes_ordenadas, start_idx = pagina_lista(
+        df, "alvaras", posicoes_filtradas, criterio_ordem, items_per_page, "lista_alvaras", assinatura_lista
+    )
+    total_registros = total_registros_filtrados
     end_idx = start_idx + items_per_page
-    df_paginado = df_filtrado.iloc[start_idx:end_idx]
-
-    # CSS para cards dropdown (exatamente igual ao benefícios)
-    st.markdown("""
-    <style>
-    .alvara-card {
-        border: 1px solid #e0e6ed;
-        border-radius: 8px;
-        padding: 12px;
-        margin-bottom: 8px;
-        background-color: transparent;
-        transition: all 0.3s ease;
-    }
-    .alvara-card:hover {
-        border-color: #0066cc;
-        box-shadow: 0 2px 8px rgba(0,102,204,0.15);
-    }
-    .alvara-card.expanded {
-        background-color: transparent;
-        border-color: #0066cc;
-        border-width: 2px;
-        box-shadow: 0 4px 12px rgba(0,102,204,0.2);
-    }
-    .alvara-card-header {
-        display: flex;
-        justify-content: space-between;
-        align-items: center;
-        cursor: pointer;
-    }
-    .alvara-info-grid {
-        display: grid;
-        grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-        gap: 8px;
-        margin-top: 8px;
-    }
-    .info-item {
-        background: rgba(255,255,255,0.7);
-        padding: 6px 8px;
-        border-radius: 4px;
-        border-left: 3px solid #0066cc;
-    }
-    .expanded .info-item {
-        background: rgba(255,255,255,0.9);
-        border-left: 3px solid #0055aa;
-    }
-    .info-label {
-        font-size: 0.8em;
-        color: #666;
-        font-weight: bold;
-    }
-    .info-value {
-        font-size: 0.9em;
-        color: #333;
-    }
-    .tab-button {
-        background: #f8f9fa;
-        border: 1px solid #dee2e6;
-        border-radius: 4px;
-        padding: 8px 16px;
-        margin-right: 8px;
-        cursor: pointer;
-        transition: all 0.2s;
-    }
-    .tab-button:hover {
-        background: #e9ecef;
-    }
-    .tab-button.active {
-        background: #0066cc;
-        color: white;
-        border-color: #0066cc;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    posicoes_pagina = posicoes_ordenadas[start_idx:end_idx]
+    df_paginado = df.iloc[posicoes_pagina]
+    # Mesma página no frame de exibição (textos tratados uma vez por versão da base)
+    exibicao_pagina = obter_frame_exibicao(df, "alvaras").iloc[posicoes_pagina]
+    registros_exibicao = exibicao_pagina.to_dict("records")
+
+    # CSS dos cards (folha única das listas) e resumos da página montados de uma vez
+    aplicar_css_cards()
+    resumos_pagina = resumos_cards_html(
+        exibicao_pagina, "alvara-info-grid",
+        campos=[
+            ("Processo", "Processo", "Não informado", None),
+            ("Parte", "Parte", "Não informado", None),
+            ("CPF", "CPF", "Não informado", None),
+            ("Status", "Status", "Não informado", None),
+            ("Valor", "Pagamento", "Não informado", None),
+            ("Órgão", "Órgão Judicial", "Não informado", None),
+        ]
+    )
 
     # Lista de Alvarás
     if not df_paginado.empty:
         
-        # Renderizar cards
-        for _, processo in df_paginado.iterrows():
+        # Renderizar cards (cada card é um fragmento: abrir/fechar não recarrega a página inteira)
+        for idx, (_, processo) in enumerate(df_paginado.iterrows()):
             alvara_id = processo.get("ID", "N/A")
-            status_atual = processo.get('Status', 'Não informado')
             st.markdown("---")
-
-            # Verificar se o card está expandido
-            is_expanded = alvara_id in st.session_state.alvara_expanded_cards
-            
-            card_class = "alvara-card expanded" if is_expanded else "alvara-card"
             
             with st.container():
-                # Layout com checkbox e botão expandir (igual aos Benefícios)
+                # Checkbox fora do fragmento: a seleção precisa atualizar o botão "Excluir (n)"
                 if st.session_state.modo_exclusao_alvaras:
-                    col_check, col_expand, col_info = st.columns([0.3, 0.7, 9])
+                    col_check, col_card = st.columns([0.3, 9.7])
                     
                     with col_check:
                         checkbox_key = f"alvara_select_{alvara_id}"
@@ -2423,90 +2309,57 @@ def interface_lista_alvaras(df, perfil_usuario):
                                 st.session_state.processos_selecionados_alvaras.append(alvara_id)
                         elif alvara_id in st.session_state.processos_selecionados_alvaras:
                             st.session_state.processos_selecionados_alvaras.remove(alvara_id)
-                else:
-                    col_expand, col_info = st.columns([1, 9])
-                
-                with col_expand if not st.session_state.modo_exclusao_alvaras else col_expand:
-                    expand_text = "▼ Fechar" if is_expanded else "▶ Abrir"
-                    if st.button(expand_text, key=f"expand_alvara_{alvara_id}"):
-                        if is_expanded:
-                            st.session_state.alvara_expanded_cards.discard(alvara_id)
-                        else:
-                            st.session_state.alvara_expanded_cards.add(alvara_id)
-                        st.rerun()
-                
-                with col_info:
-                    # Informações resumidas (sempre visíveis) com status colorido
-                    status_info = obter_cor_status(status_atual, "alvaras")
-                    
-                    st.markdown(f"""
-                    <div class="alvara-info-grid">
-                        <div class="info-item">
-                            <div class="info-label">Processo</div>
-                            <div class="info-value">{processo.get('Processo', 'Não informado')}</div>
-                        </div>
-                        <div class="info-item">
-                            <div class="info-label">Parte</div>
-                            <div class="info-value">{processo.get('Parte', 'Não informado')}</div>
-                        </div>
-                        <div class="info-item">
-                            <div class="info-label">CPF</div>
-                            <div class="info-value">{processo.get('CPF', 'Não informado')}</div>
-                        </div>
-                        <div class="info-item">
-                            <div class="info-label">Status</div>
-                            <div class="info-value">{status_info['html']}</div>
-                        </div>
-                        <div class="info-item">
-                            <div class="info-label">Valor</div>
-                            <div class="info-value">{processo.get('Pagamento', 'Não informado')}</div>
-                        </div>
-                        <div class="info-item">
-                            <div class="info-label">Órgão</div>
-                            <div class="info-value">{processo.get('Órgão Judicial', 'Não informado')}</div>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                # Conteúdo expandido (tabs)
-                if is_expanded:                    
-                    # Tabs
-                    tab_info, tab_acoes, tab_historico = st.tabs(["📋 Informações", "⚙️ Ações", "📜 Histórico"])
                     
-                    with tab_info:
-                        render_tab_info_alvara(processo, alvara_id)
-                    
-                    with tab_acoes:
-                        render_tab_acoes_alvara(df, processo, alvara_id, status_atual, perfil_usuario)
-                    
-                    with tab_historico:
-                        render_tab_historico_alvara(processo, alvara_id)
+                    with col_card:
+                        render_card_lista_alvara(
+                            df, processo, alvara_id, resumos_pagina[idx], registros_exibicao[idx], perfil_usuario
+                        )
+                else:
+                    render_card_lista_alvara(
+                        df, processo, alvara_id, resumos_pagina[idx], registros_exibicao[idx], perfil_usuario
+                    )
+
+        # Cards que o próximo "Abrir Todos" vai abrir
+        registrar_cards_pagina("alvara_expanded_cards", [processo.get("ID", "N/A") for _, processo in df_paginado.iterrows()])
                     
     else:
         st.info("Nenhum alvará encontrado com os filtros aplicados.")
         
     # Controles de paginação
-    if total_registros > 0:
-        st.markdown("---")
-        col_nav1, col_nav2, col_nav3 = st.columns([3, 2, 3])
+    controles_paginacao_lista(
+        df, "alvaras", posicoes_ordenadas, start_idx, items_per_page, criterio_ordem, "lista_alvaras", assinatura_lista
+    )
 
-        with col_nav1:
-            if st.session_state.current_page_alvaras > 1:
-                if st.button("<< Primeira", key="btn_primeira_alvaras"):
-                    st.session_state.current_page_alvaras = 1
-                    st.rerun()
-                if st.button("< Anterior", key="btn_anterior_alvaras"):
-                    st.session_state.current_page_alvaras -= 1
-                    st.rerun()
+@fragmento
+def render_card_lista_alvara(df, processo, alvara_id, resumo_html, exibicao, perfil_usuario):
+    """Card de um alvará na lista (resumo e, se expandido, as abas), reexecutado isoladamente"""
+    status_atual = processo.get('Status', 'Não informado')
 
-        with col_nav2:
-            st.write(f"Página {st.session_state.current_page_alvaras} de {total_pages}")
+    # Verificar se o card está expandido
+    is_expanded = alvara_id in st.session_state.alvara_expanded_cards
+    
+    col_expand, col_info = st.columns([0.7, 9] if st.session_state.modo_exclusao_alvaras else [1, 9])
+    
+    with col_expand:
+        expand_text = "▼ Fechar" if is_expanded else "▶ Abrir"
+        # O callback alterna o card antes do rerun, que fica restrito a este fragmento
+        st.button(expand_text, key=f"expand_alvara_{alvara_id}", on_click=alternar_card_expandido,
+                  args=("alvara_expanded_cards", alvara_id))
+    
+    with col_info:
+        # Resumo (sempre visível) já montado para a página inteira
+        st.markdown(resumo_html, unsafe_allow_html=True)
 
-        with col_nav3:
-            if st.session_state.current_page_alvaras < total_pages:
-                if st.button("Próxima >", key="btn_proxima_alvaras"):
-                    st.session_state.current_page_alvaras += 1
-                    st.rerun()
-                if st.button("Última >>", key="btn_ultima_alvaras"):
-                    st.session_state.current_page_alvaras = total_pages
-                    st.rerun()
\ No newline at end of file
+    # Conteúdo expandido (tabs)
+    if is_expanded:                    
+        # Seções: só a escolhida é executada (e nenhuma enquanto o card estiver adiado)
+        secao = secao_card_expandido("alvara_expanded_cards", alvara_id, f"secao_card_alvara_{alvara_id}")
+
+        if secao == "info":
+            render_tab_info_alvara(processo, alvara_id, exibicao)
+
+        elif secao == "acoes":
+            render_tab_acoes_alvara(df, processo, alvara_id, status_atual, perfil_usuario)
+
+        elif secao == "historico":
+            render_tab_historico_alvara(processo, alvara_id)
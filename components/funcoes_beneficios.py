@@ -25,6 +25,22 @@ from components.functions_controle import (
     # Função de cores de status
     obter_cor_status
 )
+from components.indice_listas import (
+    contar_no_periodo, converter_data, filtrar_posicoes_lista, ordenar_posicoes_por_data
+)
+from components.fluxo_trabalho import (
+    aplicar_transicao, interface_transicoes_em_massa, perfis_edicao, pode_editar_status, pode_executar, status_etapas,
+    transicao_para, transicoes_em_massa
+)
+from components.filtro_avancado import interface_filtro_avancado, obter_filtro_avancado, selectbox_faceta
+from components.navegacao_listas import controles_ordenacao_lista, controles_paginacao_lista, pagina_lista
+from components.fragmentos import (
+    alternar_card_expandido, botoes_abrir_fechar_todos, fragmento, registrar_cards_pagina, secao_card_expandido
+)
+from components.moeda import formatar_coluna_reais, formatar_reais, valor_reais
+from components.cards_listas import (
+    aplicar_css_cards, linha_exibicao, obter_frame_exibicao, resumos_cards_html, valor_exibicao
+)
 
 def safe_get_hc_value_beneficio(data, key, default=0.0):
     """Obtém valor de honorário contratual de forma segura, tratando NaN e valores None"""
@@ -144,13 +160,7 @@ def gerar_parcelas_beneficio(beneficio_id, valor_total, num_parcelas, data_inici
         Dict com dados das parcelas formatados para salvar no DataFrame
     """
     # Garantir que valor_total seja numérico
-    if isinstance(valor_total, str):
-        try:
-            valor_total = float(valor_total.replace("R$", "").replace(".", "").replace(",", ".").strip())
-        except:
-            valor_total = 0
-    elif not valor_total:
-        valor_total = 0
+    valor_total = valor_reais(valor_total)
     
     valor_parcela = valor_total / num_parcelas if num_parcelas > 0 else 0
     parcelas_data = {}
@@ -270,14 +280,8 @@ def exibir_informacoes_basicas_beneficio(linha_beneficio, estilo="compacto"):
 # CONFIGURAÇÕES DE PERFIS - BENEFÍCIOS
 # =====================================
 
-# PERFIS E PERMISSÕES
-PERFIS_BENEFICIOS = {
-    "Cadastrador": ["Implantado"],
-    "Administrativo": ["Enviado para administrativo"],
-    "SAC": ["Enviado para o SAC"],
-    "Financeiro": ["Enviado para o financeiro"],
-    "Desenvolvedor": ["Enviado para administrativo", "Implantado", "Enviado para o SAC", "Enviado para o financeiro", "Finalizado"]
-}
+# PERFIS E PERMISSÕES - declarados em components/fluxo_trabalho.py
+PERFIS_BENEFICIOS = perfis_edicao("beneficios")
 
 # CONFIGURAÇÕES DE PAGAMENTO PARCELADO
 OPCOES_PAGAMENTO = {
@@ -391,16 +395,11 @@ def obter_assuntos_beneficios():
     assuntos_customizados = st.session_state.get("assuntos_beneficios_customizados", [])
     return sorted(list(set(ASSUNTOS_BENEFICIOS_DEFAULT + assuntos_customizados)))
 
-STATUS_ETAPAS_BENEFICIOS = {
-    1: "Enviado para administrativo",  # Começa aqui automaticamente
-    2: "Implantado",
-    3: "Enviado para o financeiro",
-    4: "Finalizado"
-}
+STATUS_ETAPAS_BENEFICIOS = status_etapas("beneficios")  # Começa em "Enviado para administrativo"
 
 def pode_editar_status_beneficios(status_atual, perfil_usuario):
     """Verifica se o usuário pode editar determinado status de benefício"""
-    return status_atual in PERFIS_BENEFICIOS.get(perfil_usuario, [])
+    return pode_editar_status("beneficios", status_atual, perfil_usuario)
 
 # =====================================
 # FUNÇÕES DE INTERFACE E AÇÕES - BENEFÍCIOS
@@ -433,87 +432,8 @@ def toggle_beneficio_selection(beneficio_id):
 def interface_lista_beneficios(df, perfil_usuario):
     """Lista de benefícios com cards expansíveis estilo dropdown."""
     
-    # CSS para cards dropdown (igual ao alvarás)
-    st.markdown("""
-    <style>
-    .beneficio-card {
-        border: 1px solid #e0e6ed;
-        border-radius: 8px;
-        padding: 12px;
-        margin-bottom: 8px;
-        background-color: transparent;
-        transition: all 0.3s ease;
-    }
-    .beneficio-card:hover {
-        border-color: #0066cc;
-        box-shadow: 0 2px 8px rgba(0,102,204,0.15);
-    }
-    .beneficio-card.expanded {
-        background-color: transparent;
-        border-color: #0066cc;
-        border-width: 2px;
-        box-shadow: 0 4px 12px rgba(0,102,204,0.2);
-    }
-    .beneficio-card-header {
-        display: flex;
-        justify-content: space-between;
-        align-items: center;
-        cursor: pointer;
-    }
-    .beneficio-info-grid {
-        display: grid;
-        grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-        gap: 8px;
-        margin-top: 8px;
-    }
-    .info-item {
-        background: rgba(255,255,255,0.7);
-        padding: 6px 8px;
-        border-radius: 4px;
-        border-left: 3px solid #0066cc;
-    }
-    .expanded .info-item {
-        background: rgba(255,255,255,0.9);
-        border-left: 3px solid #0055aa;
-    }
-    .info-label {
-        font-size: 0.8em;
-        color: #666;
-        font-weight: bold;
-    }
-    .info-value {
-        font-size: 0.9em;
-        color: #333;
-    }
-    .tab-button {
-        background: #f8f9fa;
-        border: 1px solid #dee2e6;
-        border-radius: 4px;
-        padding: 8px 16px;
-        margin-right: 8px;
-        cursor: pointer;
-        transition: all 0.2s;
-    }
-    .tab-button:hover {
-        background: #e9ecef;
-    }
-    .tab-button.active {
-        background: #0066cc;
-        color: white;
-        border-color: #0066cc;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-
-    # ORDENAR por data de cadastro mais recente
-    df_ordenado = df.copy()
-    if "Data Cadastro" in df_ordenado.columns:
-        df_ordenado["_data_cadastro_dt"] = pd.to_datetime(
-            df_ordenado["Data Cadastro"], format='%d/%m/%Y %H:%M', errors='coerce'
-        )
-        df_ordenado = df_ordenado.sort_values(
-            by="_data_cadastro_dt", ascending=False, na_position='last'
-        ).drop(columns=["_data_cadastro_dt"])
+    # CSS dos cards (folha única das listas)
+    aplicar_css_cards()
 
     # Inicializar estado dos cards expansíveis
     if "beneficios_expanded_cards" not in st.session_state:
@@ -558,63 +478,37 @@ def interface_lista_beneficios(df, perfil_usuario):
                            key="confirmar_exclusao_beneficios", type="primary"):
                     confirmar_exclusao_massa_beneficios(df, st.session_state.processos_selecionados_beneficios)
 
-    # Calcular total de registros (aplicar filtros primeiro para obter contagem correta)
-    df_temp_filtrado = df_ordenado.copy()
-    
     # Botões de Abrir/Fechar Todos
-    if len(df_temp_filtrado) > 0:
+    if len(df) > 0:
         st.markdown("---")
-        col_exp1, col_exp2, col_exp_space = st.columns([2, 2, 6])
-        
-        with col_exp1:
-            if st.button("🔽 Abrir Todos", key="abrir_todos_beneficios"):
-                # Adicionar todos os IDs dos benefícios ao set de expandidos
-                for _, processo in df_temp_filtrado.iterrows():
-                    beneficio_id = processo.get("ID", "N/A")
-                    st.session_state.beneficios_expanded_cards.add(beneficio_id)
-                st.rerun()
-        
-        with col_exp2:
-            if st.button("🔼 Fechar Todos", key="fechar_todos_beneficios"):
-                # Limpar o set de cards expandidos
-                st.session_state.beneficios_expanded_cards.clear()
-                st.rerun()
+        # Abre no máximo LIMITE_CARDS_ABERTOS cards da página, adiados até serem carregados
+        botoes_abrir_fechar_todos("beneficios_expanded_cards", "beneficios")
 
-    # FILTROS
+    # FILTROS (cada opção mostra quantos benefícios ela teria com os demais filtros ativos)
     col1, col2, col3, col4 = st.columns(4)
-    
+    filtros_atuais = {
+        "Status": st.session_state.get("beneficio_status_filter", "Todos"),
+        "TIPO DE PROCESSO": st.session_state.get("beneficio_tipo_filter", "Todos"),
+        "ASSUNTO": st.session_state.get("beneficio_assunto_filter", "Todos"),
+    }
+    contexto_facetas = {
+        "busca": st.session_state.get("beneficio_search", ""),
+        "avancado": obter_filtro_avancado("lista_beneficios"),
+    }
+
     with col1:
-        # Verificar se a coluna 'Status' existe, senão criar uma lista vazia
-        if "Status" in df.columns:
-            status_unicos = ["Todos"] + list(df["Status"].dropna().unique())
-        else:
-            status_unicos = ["Todos"]
-        filtro_status = st.selectbox(
-            "Status:",
-            options=status_unicos,
-            key="beneficio_status_filter"
-        )
-    
+        # Sem a coluna 'Status' o seletor fica só com "Todos"
+        filtro_status = selectbox_faceta("Status:", df, "beneficios", "Status", filtros_atuais,
+                                         key="beneficio_status_filter", **contexto_facetas)
+
     with col2:
-        # Verificar se a coluna 'TIPO DE PROCESSO' existe, senão criar uma lista vazia
-        if "TIPO DE PROCESSO" in df.columns:
-            tipos_unicos = ["Todos"] + list(df["TIPO DE PROCESSO"].dropna().unique())
-        else:
-            tipos_unicos = ["Todos"]
-        filtro_tipo = st.selectbox(
-            "Tipo de Processo:",
-            options=tipos_unicos,
-            key="beneficio_tipo_filter"
-        )
-    
+        filtro_tipo = selectbox_faceta("Tipo de Processo:", df, "beneficios", "TIPO DE PROCESSO", filtros_atuais,
+                                       key="beneficio_tipo_filter", **contexto_facetas)
+
     with col3:
         if "ASSUNTO" in df.columns:
-            assuntos_unicos = ["Todos"] + list(df["ASSUNTO"].dropna().unique())
-            filtro_assunto = st.selectbox(
-                "Assunto:",
-                options=assuntos_unicos,
-                key="beneficio_assunto_filter"
-            )
+            filtro_assunto = selectbox_faceta("Assunto:", df, "beneficios", "ASSUNTO", filtros_atuais,
+                                              key="beneficio_assunto_filter", **contexto_facetas)
         else:
             filtro_assunto = "Todos"
 
@@ -638,44 +532,73 @@ def interface_lista_beneficios(df, perfil_usuario):
         if filtro_busca:
             st.caption(f"🔍 Buscando por: '{filtro_busca}' ({len(filtro_busca)} caracteres)")
 
-    # Aplicar filtros
-    df_filtrado = df_ordenado.copy()
-    if filtro_status != "Todos" and "Status" in df_filtrado.columns:
-        df_filtrado = df_filtrado[df_filtrado["Status"] == filtro_status]
-    if filtro_tipo != "Todos" and "TIPO DE PROCESSO" in df_filtrado.columns:
-        df_filtrado = df_filtrado[df_filtrado["TIPO DE PROCESSO"] == filtro_tipo]
-    if filtro_assunto != "Todos" and "ASSUNTO" in df_filtrado.columns:
-        df_filtrado = df_filtrado[df_filtrado["ASSUNTO"] == filtro_assunto]
-    if filtro_busca:
-        df_filtrado = df_filtrado[
-            df_filtrado["PARTE"].str.contains(filtro_busca, case=False, na=False) |
-            df_filtrado["CPF"].str.contains(filtro_busca, case=False, na=False) |
-            df_filtrado["Nº DO PROCESSO"].str.contains(filtro_busca, case=False, na=False)
-        ]
+    # Filtro avançado (condições E/OU sobre quaisquer colunas)
+    filtro_avancado = interface_filtro_avancado(df, "beneficios", "lista_beneficios")
+
+    # Ordenação e tamanho da página
+    criterio_ordem, itens_por_pagina = controles_ordenacao_lista("lista_beneficios", tamanho_padrao=20)
+
+    # Aplicar filtros (posições em cache por versão da base e estado dos filtros).
+    # Na ordem padrão: com busca, o ranking da busca; sem busca, a data de cadastro mais recente
+    filtros_lista = {"Status": filtro_status, "TIPO DE PROCESSO": filtro_tipo, "ASSUNTO": filtro_assunto}
+    posicoes_filtradas = filtrar_posicoes_lista(
+        df, "beneficios",
+        filtros=filtros_lista,
+        busca=filtro_busca,
+        chave_sessao_busca="beneficio_search",
+        avancado=filtro_avancado
+    )
+    if not filtro_busca and criterio_ordem == "padrao":
+        posicoes_filtradas = ordenar_posicoes_por_data(df, "beneficios", posicoes_filtradas)
+    total_filtrados = len(posicoes_filtradas)
 
-    if df_filtrado.empty:
+    if total_filtrados == 0:
         st.info("Nenhum benefício encontrado com os filtros aplicados.")
         return
 
     # Mostrar resultado da busca  
     if filtro_busca:
-        st.success(f"🔍 {len(df_filtrado)} resultado(s) encontrado(s) para '{filtro_busca}'")
-    elif len(df_filtrado) < len(df_ordenado):
-        st.info(f"📊 {len(df_filtrado)} de {len(df_ordenado)} registros (filtros aplicados)")
+        st.success(f"🔍 {total_filtrados} resultado(s) encontrado(s) para '{filtro_busca}'")
+    elif total_filtrados < len(df):
+        st.info(f"📊 {total_filtrados} de {len(df)} registros (filtros aplicados)")
     else:
-        st.markdown(f"**{len(df_filtrado)} benefício(s) encontrado(s)**")
+        st.markdown(f"**{total_filtrados} benefício(s) encontrado(s)**")
+
+    # Transições de status em massa (validadas de uma vez e salvas num único commit)
+    if transicoes_em_massa("beneficios", perfil_usuario):
+        with st.expander("🔁 Transição em Massa", expanded=False):
+            interface_transicoes_em_massa(df, "beneficios", perfil_usuario, posicoes_filtradas)
 
-    # Renderizar cards
-    for _, beneficio in df_filtrado.iterrows():
+    # Paginação por cursor: a página continua no mesmo benefício mesmo com cadastros de outros usuários
+    assinatura_lista = (tuple(filtros_lista.items()), filtro_busca, filtro_avancado, criterio_ordem, itens_por_pagina)
+    posicoes_ordenadas, inicio_pagina = pagina_lista(
+        df, "beneficios", posicoes_filtradas, criterio_ordem, itens_por_pagina, "lista_beneficios", assinatura_lista
+    )
+    posicoes_pagina = posicoes_ordenadas[inicio_pagina:inicio_pagina + itens_por_pagina]
+    df_paginado = df.iloc[posicoes_pagina]
+    # Mesma página no frame de exibição (textos tratados uma vez por versão da base)
+    exibicao_pagina = obter_frame_exibicao(df, "beneficios").iloc[posicoes_pagina]
+    registros_exibicao = exibicao_pagina.to_dict("records")
+
+    # Resumos da página montados de uma vez
+    resumos_pagina = resumos_cards_html(
+        exibicao_pagina, "beneficio-info-grid",
+        campos=[
+            ("Tipo de Processo", "TIPO DE PROCESSO", "Não informado", None),
+            ("Status", "Status", "Não informado", None),
+            ("Data Cadastro", "Data Cadastro", "Não informado", lambda v: v[:16]),
+            ("CPF", "CPF", "Não informado", lambda v: f"{v[:11]}..."),
+        ]
+    )
+
+    # Renderizar cards (cada card é um fragmento: abrir/fechar não recarrega a página inteira)
+    for idx, (_, beneficio) in enumerate(df_paginado.iterrows()):
         beneficio_id = beneficio.get("ID")
-        is_expanded = beneficio_id in st.session_state.beneficios_expanded_cards
-        
-        card_class = "beneficio-card expanded" if is_expanded else "beneficio-card"
         
         with st.container():
-            # Layout com checkbox e botão expandir
+            # Checkbox fora do fragmento: a seleção precisa atualizar o botão "Excluir (n)"
             if st.session_state.modo_exclusao_beneficios:
-                col_check, col_expand, col_info = st.columns([0.3, 0.7, 9])
+                col_check, col_card = st.columns([0.3, 9.7])
                 
                 with col_check:
                     checkbox_key = f"beneficio_select_{beneficio_id}"
@@ -684,94 +607,94 @@ def interface_lista_beneficios(df, perfil_usuario):
                             st.session_state.processos_selecionados_beneficios.append(beneficio_id)
                     elif beneficio_id in st.session_state.processos_selecionados_beneficios:
                         st.session_state.processos_selecionados_beneficios.remove(beneficio_id)
-            else:
-                col_expand, col_info = st.columns([1, 9])
-            
-            with col_expand if not st.session_state.modo_exclusao_beneficios else col_expand:
-                expand_text = "▼ Fechar" if is_expanded else "▶ Abrir"
-                if st.button(expand_text, key=f"expand_beneficio_{beneficio_id}"):
-                    if is_expanded:
-                        st.session_state.beneficios_expanded_cards.discard(beneficio_id)
-                    else:
-                        st.session_state.beneficios_expanded_cards.add(beneficio_id)
-                    st.rerun()
-            
-            with col_info:
-                # Informações resumidas
-                status_atual = safe_get_value_beneficio(beneficio, 'Status', 'Não informado')
-                status_info = obter_cor_status(status_atual, "beneficios")
-                
-                st.markdown(f"""
-                <div class="beneficio-info-grid">
-                    <div class="info-item">
-                        <div class="info-label">Tipo de Processo</div>
-                        <div class="info-value">{safe_get_value_beneficio(beneficio, 'TIPO DE PROCESSO', 'Não informado')}</div>
-                    </div>
-                    <div class="info-item">
-                        <div class="info-label">Status</div>
-                        <div class="info-value">{status_info['html']}</div>
-                    </div>
-                    <div class="info-item">
-                        <div class="info-label">Data Cadastro</div>
-                        <div class="info-value">{safe_get_value_beneficio(beneficio, 'Data Cadastro', 'Não informado')[:16]}</div>
-                    </div>
-                    <div class="info-item">
-                        <div class="info-label">CPF</div>
-                        <div class="info-value">{safe_get_value_beneficio(beneficio, 'CPF', 'Não informado')[:11]}...</div>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            # Conteúdo expandido (tabs)
-            if is_expanded:
-                st.markdown("---")
-                st.markdown(f"### 📄 {safe_get_value_beneficio(beneficio, 'Nº DO PROCESSO', 'Não informado')}")
-                
-                # Tabs
-                tab_info, tab_acoes, tab_historico = st.tabs(["📋 Informações", "⚙️ Ações", "📜 Histórico"])
-                
-                with tab_info:
-                    render_tab_info_beneficio(beneficio, beneficio_id)
                 
-                with tab_acoes:
-                    render_tab_acoes_beneficio(df, beneficio, beneficio_id, 
-                                             safe_get_value_beneficio(beneficio, 'Status'), perfil_usuario)
-                
-                with tab_historico:
-                    render_tab_historico_beneficio(beneficio, beneficio_id)
+                with col_card:
+                    render_card_lista_beneficio(
+                        df, beneficio, beneficio_id, resumos_pagina[idx], registros_exibicao[idx], perfil_usuario
+                    )
+            else:
+                render_card_lista_beneficio(
+                    df, beneficio, beneficio_id, resumos_pagina[idx], registros_exibicao[idx], perfil_usuario
+                )
+
+    # Cards que o próximo "Abrir Todos" vai abrir
+    registrar_cards_pagina("beneficios_expanded_cards", [beneficio.get("ID") for _, beneficio in df_paginado.iterrows()])
+
+    # Controles de paginação
+    controles_paginacao_lista(
+        df, "beneficios", posicoes_ordenadas, inicio_pagina, itens_por_pagina, criterio_ordem,
+        "lista_beneficios", assinatura_lista
+    )
 
-def render_tab_info_beneficio(processo, beneficio_id):
-    """Renderiza a tab de informações do Benefício"""
+@fragmento
+def render_card_lista_beneficio(df, beneficio, beneficio_id, resumo_html, exibicao, perfil_usuario):
+    """Card de um benefício na lista (resumo e, se expandido, as abas), reexecutado isoladamente"""
+    is_expanded = beneficio_id in st.session_state.beneficios_expanded_cards
+    
+    col_expand, col_info = st.columns([0.7, 9] if st.session_state.modo_exclusao_beneficios else [1, 9])
+    
+    with col_expand:
+        expand_text = "▼ Fechar" if is_expanded else "▶ Abrir"
+        # O callback alterna o card antes do rerun, que fica restrito a este fragmento
+        st.button(expand_text, key=f"expand_beneficio_{beneficio_id}", on_click=alternar_card_expandido,
+                  args=("beneficios_expanded_cards", beneficio_id))
+    
+    with col_info:
+        # Resumo (sempre visível) já montado para a página inteira
+        st.markdown(resumo_html, unsafe_allow_html=True)
+
+    # Conteúdo expandido (tabs)
+    if is_expanded:
+        st.markdown("---")
+        st.markdown(f"### 📄 {valor_exibicao(exibicao, 'Nº DO PROCESSO')}")
+
+        # Seções: só a escolhida é executada (e nenhuma enquanto o card estiver adiado)
+        secao = secao_card_expandido("beneficios_expanded_cards", beneficio_id, f"secao_card_beneficio_{beneficio_id}")
+
+        if secao == "info":
+            render_tab_info_beneficio(beneficio, beneficio_id, exibicao)
+
+        elif secao == "acoes":
+            render_tab_acoes_beneficio(df, beneficio, beneficio_id, 
+                                     safe_get_value_beneficio(beneficio, 'Status'), perfil_usuario)
+
+        elif secao == "historico":
+            render_tab_historico_beneficio(beneficio, beneficio_id)
+
+def render_tab_info_beneficio(processo, beneficio_id, exibicao=None):
+    """Renderiza a tab de informações do Benefício (textos da linha de exibição, valores da linha original)"""
+    if exibicao is None:
+        exibicao = linha_exibicao(processo, "beneficios")
         
     col_det1, col_det2 = st.columns(2)
     
     with col_det1:
         st.markdown("**📋 Dados Básicos:**")
-        st.write(f"**CPF:** {safe_get_value_beneficio(processo, 'CPF')}")
-        st.write(f"**Parte:** {safe_get_value_beneficio(processo, 'PARTE')}")
-        st.write(f"**Tipo de Processo:** {safe_get_value_beneficio(processo, 'TIPO DE PROCESSO')}")
+        st.write(f"**CPF:** {valor_exibicao(exibicao, 'CPF', 'Não cadastrado')}")
+        st.write(f"**Parte:** {valor_exibicao(exibicao, 'PARTE', 'Não cadastrado')}")
+        st.write(f"**Tipo de Processo:** {valor_exibicao(exibicao, 'TIPO DE PROCESSO', 'Não cadastrado')}")
         if "ASSUNTO" in processo:
-            st.write(f"**Assunto:** {safe_get_value_beneficio(processo, 'ASSUNTO')}")
+            st.write(f"**Assunto:** {valor_exibicao(exibicao, 'ASSUNTO', 'Não cadastrado')}")
     
     with col_det2:
         st.markdown("**💰 Valores e Documentos:**")
         if "VALOR" in processo:
-            st.write(f"**Valor:** {safe_get_value_beneficio(processo, 'VALOR')}")
+            st.write(f"**Valor:** {valor_exibicao(exibicao, 'VALOR', 'Não cadastrado')}")
         if "BENEFÍCIO" in processo:
-            st.write(f"**Benefício:** {safe_get_value_beneficio(processo, 'BENEFÍCIO')}")
+            st.write(f"**Benefício:** {valor_exibicao(exibicao, 'BENEFÍCIO', 'Não cadastrado')}")
         if "ESPÉCIE" in processo:
-            st.write(f"**Espécie:** {safe_get_value_beneficio(processo, 'ESPÉCIE')}")
+            st.write(f"**Espécie:** {valor_exibicao(exibicao, 'ESPÉCIE', 'Não cadastrado')}")
         if "STATUS BENEFÍCIO" in processo:
-            st.write(f"**Status Benefício:** {safe_get_value_beneficio(processo, 'STATUS BENEFÍCIO')}")
+            st.write(f"**Status Benefício:** {valor_exibicao(exibicao, 'STATUS BENEFÍCIO', 'Não cadastrado')}")
     
     # Mostrar detalhes dos honorários contratuais
     mostrar_detalhes_hc_beneficio(processo, f"info_{beneficio_id}")
     
     # Sistema de Parcelas - Informações
-    tipo_pagamento = safe_get_value_beneficio(processo, 'Tipo Pagamento', 'À vista')
+    tipo_pagamento = valor_exibicao(exibicao, 'Tipo Pagamento', 'À vista')
     if tipo_pagamento != 'À vista':
         num_parcelas = safe_get_int_value_beneficio(processo, 'Numero Parcelas', 1)
-        valor_total = safe_get_value_beneficio(processo, 'Valor Total Honorarios', 'N/A')
+        valor_total = valor_exibicao(exibicao, 'Valor Total Honorarios', 'N/A')
         
         st.markdown("---")
         st.markdown("### 💳 Sistema de Parcelas")
@@ -801,9 +724,9 @@ def render_tab_info_beneficio(processo, beneficio_id):
                 data_pagamento = safe_get_value_beneficio(processo, f'Parcela_{i}_Data_Pagamento', '')
     
     # Observações
-    if safe_get_value_beneficio(processo, 'OBSERVAÇÕES', '') != 'Não cadastrado':
+    if exibicao.get('OBSERVAÇÕES'):
         st.markdown("### 📝 Observações")
-        st.info(safe_get_value_beneficio(processo, 'OBSERVAÇÕES'))
+        st.info(exibicao['OBSERVAÇÕES'])
 
 def render_tab_acoes_beneficio(df, processo, beneficio_id, status_atual, perfil_usuario):
     """Renderiza a tab de ações do Benefício - inclui edição completa para Cadastradores e Desenvolvedores"""
@@ -914,7 +837,7 @@ def render_tab_acoes_beneficio(df, processo, beneficio_id, status_atual, perfil_
                         st.error(f"❌ Erro ao salvar edições: {str(e)}")
         
     # Chamar a interface de edição que contém as ações específicas por status
-    if status_atual == "Enviado para administrativo" and perfil_usuario in ["Administrativo", "Desenvolvedor"]:
+    if status_atual == "Enviado para administrativo" and pode_executar("beneficios", "implantar", perfil_usuario):
         st.markdown("#### 🔧 Análise Administrativa")
         st.info("Após inserir os documentos no Korbil, marque a caixa abaixo e salve.")
         
@@ -923,7 +846,7 @@ def render_tab_acoes_beneficio(df, processo, beneficio_id, status_atual, perfil_
         if st.button("💾 Salvar e Devolver para Cadastrador", type="primary", disabled=not korbil_ok, key=f"salvar_admin_{beneficio_id}"):
             atualizar_status_beneficio(beneficio_id, "Implantado", df)
 
-    elif status_atual == "Implantado" and perfil_usuario in ["Cadastrador", "Desenvolvedor"]:
+    elif status_atual == "Implantado" and pode_executar("beneficios", "enviar_sac", perfil_usuario):
         st.info("🔍 Processo implantado e pronto para contato com cliente via SAC.")
 
         if st.button("📞 Enviar para SAC", type="primary", use_container_width=True, key=f"enviar_sac_{beneficio_id}"):
@@ -931,7 +854,7 @@ def render_tab_acoes_beneficio(df, processo, beneficio_id, status_atual, perfil_
                 beneficio_id, "Enviado para o SAC", df
             )
 
-    elif status_atual == "Enviado para o SAC" and perfil_usuario in ["SAC", "Desenvolvedor"]:
+    elif status_atual == "Enviado para o SAC" and pode_executar("beneficios", "enviar_financeiro", perfil_usuario):
         st.markdown("#### 📞 Contato com Cliente - SAC")
         st.info("📋 Entre em contato com o cliente e marque quando concluído.")
         
@@ -944,7 +867,7 @@ def render_tab_acoes_beneficio(df, processo, beneficio_id, status_atual, perfil_
                                                       "Data Contato SAC": datetime.now().strftime("%d/%m/%Y %H:%M"),
                                                       "Contatado Por": perfil_usuario})
 
-    elif status_atual == "Enviado para o financeiro" and perfil_usuario in ["Financeiro", "Desenvolvedor"]:
+    elif status_atual == "Enviado para o financeiro" and pode_executar("beneficios", "finalizar", perfil_usuario):
         
         # Obter dados da linha atual
         linha_beneficio = df[df["ID"] == beneficio_id].iloc[0]
@@ -986,9 +909,9 @@ def render_tab_acoes_beneficio(df, processo, beneficio_id, status_atual, perfil_
         st.info(f"**Status Atual:** {status_atual}")
         
         # Para outros status, mostrar ações apropriadas - sem chamadas duplicadas
-        if ((status_atual == "Enviado para administrativo" and perfil_usuario in ["Administrativo", "Desenvolvedor"]) or
-            (status_atual == "Implantado" and perfil_usuario in ["Cadastrador", "Desenvolvedor"]) or
-            (status_atual == "Enviado para o SAC" and perfil_usuario in ["SAC", "Desenvolvedor"])):
+        if ((status_atual == "Enviado para administrativo" and pode_executar("beneficios", "implantar", perfil_usuario)) or
+            (status_atual == "Implantado" and pode_executar("beneficios", "enviar_sac", perfil_usuario)) or
+            (status_atual == "Enviado para o SAC" and pode_executar("beneficios", "enviar_financeiro", perfil_usuario))):
             with st.expander("💳 Sistema de Pagamento e Parcelas", expanded=False):
                 interface_edicao_beneficio(df, beneficio_id, perfil_usuario)
 
@@ -1340,7 +1263,7 @@ def render_parcela_individual(linha_beneficio, i, valor_parcela_individual, bene
         # Parcela pendente - interface para pagamento
         if data_vencimento:
             try:
-                venc_date = datetime.strptime(data_vencimento, "%d/%m/%Y")
+                venc_date = converter_data(data_vencimento)
                 hoje = datetime.now()
                 dias_venc = (venc_date - hoje).days
                 
@@ -1454,7 +1377,7 @@ def interface_edicao_beneficio(df, beneficio_id, perfil_usuario):
     # Exibir informações básicas do benefício com layout compacto
     exibir_informacoes_basicas_beneficio(linha_beneficio, "compacto")
 
-    if status_atual == "Enviado para administrativo" and perfil_usuario in ["Administrativo", "Desenvolvedor"]:
+    if status_atual == "Enviado para administrativo" and pode_executar("beneficios", "implantar", perfil_usuario):
         st.markdown("#### 🔧 Análise Administrativa")
         st.info("Após inserir os documentos no Korbil, marque a caixa abaixo e salve.")
         
@@ -1463,7 +1386,7 @@ def interface_edicao_beneficio(df, beneficio_id, perfil_usuario):
         if st.button("💾 Salvar e Devolver para Cadastrador", type="primary", disabled=not korbil_ok):
             atualizar_status_beneficio(beneficio_id, "Implantado", df)
 
-    elif status_atual == "Implantado" and perfil_usuario in ["Cadastrador", "Desenvolvedor"]:
+    elif status_atual == "Implantado" and pode_executar("beneficios", "enviar_sac", perfil_usuario):
         st.markdown("#### 📞 Enviar para SAC")
         st.info("🔍 Processo implantado e pronto para contato com cliente via SAC.")
 
@@ -1472,7 +1395,7 @@ def interface_edicao_beneficio(df, beneficio_id, perfil_usuario):
                 beneficio_id, "Enviado para o SAC", df
             )
 
-    elif status_atual == "Enviado para o SAC" and perfil_usuario in ["SAC", "Desenvolvedor"]:
+    elif status_atual == "Enviado para o SAC" and pode_executar("beneficios", "enviar_financeiro", perfil_usuario):
         st.markdown("#### 📞 Contato com Cliente - SAC")
         st.info("📋 Entre em contato com o cliente e marque quando concluído.")
         
@@ -1485,7 +1408,7 @@ def interface_edicao_beneficio(df, beneficio_id, perfil_usuario):
                                                       "Data Contato SAC": datetime.now().strftime("%d/%m/%Y %H:%M"),
                                                       "Contatado Por": perfil_usuario})
 
-    elif status_atual == "Enviado para o financeiro" and perfil_usuario in ["Financeiro", "Desenvolvedor"]:
+    elif status_atual == "Enviado para o financeiro" and pode_executar("beneficios", "finalizar", perfil_usuario):
         
         # Verificar tipo de pagamento
         tipo_pagamento = linha_beneficio.get("Tipo Pagamento", "À vista")
@@ -1571,12 +1494,7 @@ def interface_edicao_beneficio(df, beneficio_id, perfil_usuario):
                     )
                 
                 with col_alt2:
-                    valor_atual = 0
-                    if valor_total and "R$" in str(valor_total):
-                        try:
-                            valor_atual = float(str(valor_total).replace("R$", "").replace(".", "").replace(",", ".").strip())
-                        except:
-                            valor_atual = 0
+                    valor_atual = valor_reais(valor_total)
                     
                     valor_alterado = st.number_input(
                         "Novo Valor Total (R$):",
@@ -1733,18 +1651,8 @@ def interface_edicao_beneficio(df, beneficio_id, perfil_usuario):
             
             try:
                 # Converter valor_total para uso na geração de parcelas
-                valor_total_para_parcelas = 0
-                if valor_total and valor_total != "A definir":
-                    try:
-                        if "R$" in str(valor_total):
-                            valor_limpo = str(valor_total).replace("R$", "").strip()
-                            if "," in valor_limpo:
-                                valor_limpo = valor_limpo.replace(".", "").replace(",", ".")
-                            valor_total_para_parcelas = float(valor_limpo)
-                        else:
-                            valor_total_para_parcelas = float(valor_total)
-                    except:
-                        valor_total_para_parcelas = 0
+                # "A definir" e valores inválidos contam como 0
+                valor_total_para_parcelas = valor_reais(valor_total)
                 
                 # Gerar dados das parcelas automaticamente
                 data_envio = datetime.now()
@@ -1779,18 +1687,8 @@ def interface_edicao_beneficio(df, beneficio_id, perfil_usuario):
         
         
         # Converter valor_total para número se necessário
-        valor_total_numerico = 0
-        if valor_total and valor_total != "A definir":
-            try:
-                if "R$" in str(valor_total):
-                    valor_limpo = str(valor_total).replace("R$", "").strip()
-                    if "," in valor_limpo:
-                        valor_limpo = valor_limpo.replace(".", "").replace(",", ".")
-                    valor_total_numerico = float(valor_limpo)
-                else:
-                    valor_total_numerico = float(valor_total)
-            except:
-                valor_total_numerico = 0
+        # "A definir" e valores inválidos contam como 0
+        valor_total_numerico = valor_reais(valor_total)
         
         # Calcular estatísticas
         parcelas_pagas, todas_pagas = calcular_status_parcelas(linha_beneficio, num_parcelas)
@@ -1843,11 +1741,7 @@ def interface_edicao_beneficio(df, beneficio_id, perfil_usuario):
                     st.session_state.df_editado_beneficios = df.copy()
                 
                 try:
-                    valor_total_str = safe_get_value_beneficio(linha_beneficio, "Valor Total Honorarios", "0")
-                    if valor_total_str.startswith("R$"):
-                        valor_total = float(valor_total_str.replace("R$", "").replace(".", "").replace(",", ".").strip())
-                    else:
-                        valor_total = 0
+                    valor_total = valor_reais(linha_beneficio.get("Valor Total Honorarios"))
                     
                     # Gerar dados da parcela única
                     data_envio = datetime.now()
@@ -1883,14 +1777,7 @@ def interface_edicao_beneficio(df, beneficio_id, perfil_usuario):
                 comprovante_url = linha_beneficio.get("Parcela_1_Comprovante", "")
                 
                 # Calcular valor da parcela
-                valor_total_str = safe_get_value_beneficio(linha_beneficio, "Valor Total Honorarios", "0")
-                if valor_total_str and valor_total_str.startswith("R$"):
-                    try:
-                        valor_parcela = float(valor_total_str.replace("R$", "").replace(".", "").replace(",", ".").strip())
-                    except:
-                        valor_parcela = 0
-                else:
-                    valor_parcela = 0
+                valor_parcela = valor_reais(linha_beneficio.get("Valor Total Honorarios"))
                 
                 if status_parcela == "Paga":
                     # Já foi pago - mostrar informações
@@ -2011,20 +1898,8 @@ def interface_edicao_beneficio(df, beneficio_id, perfil_usuario):
                 
                 try:
                     # Converter valor_total para uso na geração de parcelas
-                    valor_total_para_parcelas = 0
-                    if valor_total and valor_total != "A definir":
-                        try:
-                            if "R$" in str(valor_total):
-                                # Para valores como "R$ 8.000,00" -> remover R$, trocar . por vazio e , por .
-                                valor_limpo = str(valor_total).replace("R$", "").strip()
-                                if "," in valor_limpo:
-                                    # Formato brasileiro: R$ 8.000,00
-                                    valor_limpo = valor_limpo.replace(".", "").replace(",", ".")
-                                valor_total_para_parcelas = float(valor_limpo)
-                            else:
-                                valor_total_para_parcelas = float(valor_total)
-                        except:
-                            valor_total_para_parcelas = 0
+                    # "A definir" e valores inválidos contam como 0
+                    valor_total_para_parcelas = valor_reais(valor_total)
                     
                     # Gerar dados das parcelas automaticamente
                     data_envio = datetime.now()  # Usar data atual como base
@@ -2059,20 +1934,8 @@ def interface_edicao_beneficio(df, beneficio_id, perfil_usuario):
             
             
             # Converter valor_total para número se necessário
-            valor_total_numerico = 0
-            if valor_total and valor_total != "A definir":
-                try:
-                    if "R$" in str(valor_total):
-                        # Para valores como "R$ 8.000,00" -> remover R$, trocar . por vazio e , por .
-                        valor_limpo = str(valor_total).replace("R$", "").strip()
-                        if "," in valor_limpo:
-                            # Formato brasileiro: R$ 8.000,00
-                            valor_limpo = valor_limpo.replace(".", "").replace(",", ".")
-                        valor_total_numerico = float(valor_limpo)
-                    else:
-                        valor_total_numerico = float(valor_total)
-                except:
-                    valor_total_numerico = 0
+            # "A definir" e valores inválidos contam como 0
+            valor_total_numerico = valor_reais(valor_total)
             
             # Aviso se valor não está definido
             if valor_total_numerico == 0:
@@ -2094,7 +1957,7 @@ def interface_edicao_beneficio(df, beneficio_id, perfil_usuario):
                         data_vencimento = linha_beneficio.get(f"Parcela_{i}_Data_Vencimento", "")
                         if data_vencimento:
                             try:
-                                venc_date = datetime.strptime(data_vencimento, "%d/%m/%Y")
+                                venc_date = converter_data(data_vencimento)
                                 hoje = datetime.now()
                                 dias_venc = (venc_date - hoje).days
                                 
@@ -2144,11 +2007,8 @@ def interface_edicao_beneficio(df, beneficio_id, perfil_usuario):
             st.write(f"- Tipo: {linha_beneficio.get('Tipo Pagamento', 'N/A')}")
             
             # FORMATAR VALOR CORRETAMENTE
-            valor_pago = linha_beneficio.get('Valor Pago', 0)
-            if valor_pago and str(valor_pago).replace('.', '').isdigit():
-                valor_formatado = f"R$ {float(valor_pago):,.2f}"
-            else:
-                valor_formatado = "N/A"
+            valor_pago = valor_reais(linha_beneficio.get('Valor Pago'), padrao=None)
+            valor_formatado = formatar_reais(valor_pago) if valor_pago else "N/A"
             
             st.write(f"- Valor: {valor_formatado}")
             st.write(f"- Data: {linha_beneficio.get('Data Finalização', 'N/A')}")
@@ -2202,32 +2062,18 @@ def atualizar_status_beneficio(beneficio_id, novo_status, df, **kwargs):
     if idx.empty:
         st.error("Erro: ID do benefício não encontrado para atualização."); return
 
-    usuario_atual = st.session_state.get("usuario", "Sistema")
-    data_atual = datetime.now().strftime("%d/%m/%Y %H:%M")
-
-    st.session_state.df_editado_beneficios.loc[idx, "Status"] = novo_status
+    # Novo status e campos carimbados (data/responsável) declarados no fluxo
+    valores = dict(kwargs.get('dados_adicionais', {}))
+    if 'valor_beneficio' in kwargs:
+        valores["Valor do Benefício"] = kwargs['valor_beneficio']
+    if 'percentual_cobranca' in kwargs:
+        valores["Percentual Cobrança"] = kwargs['percentual_cobranca']
 
-    if novo_status == "Implantado":
-        st.session_state.df_editado_beneficios.loc[idx, "Data Implantação"] = data_atual
-        st.session_state.df_editado_beneficios.loc[idx, "Implantado Por"] = usuario_atual
-    
-    elif novo_status == "Enviado para o SAC":
-        st.session_state.df_editado_beneficios.loc[idx, "Data Envio SAC"] = data_atual
-        st.session_state.df_editado_beneficios.loc[idx, "Enviado SAC Por"] = usuario_atual
-    
-    elif novo_status == "Enviado para o financeiro":
-        st.session_state.df_editado_beneficios.loc[idx, "Data Envio Financeiro"] = data_atual
-        st.session_state.df_editado_beneficios.loc[idx, "Enviado Financeiro Por"] = usuario_atual
-        # Salva os novos campos de valor e percentual
-        if 'valor_beneficio' in kwargs:
-            st.session_state.df_editado_beneficios.loc[idx, "Valor do Benefício"] = kwargs['valor_beneficio']
-        if 'percentual_cobranca' in kwargs:
-            st.session_state.df_editado_beneficios.loc[idx, "Percentual Cobrança"] = kwargs['percentual_cobranca']
-        
-        # Adicionar dados adicionais se fornecidos
-        if 'dados_adicionais' in kwargs:
-            for campo, valor in kwargs['dados_adicionais'].items():
-                st.session_state.df_editado_beneficios.loc[idx, campo] = valor
+    nome_transicao = transicao_para("beneficios", novo_status)
+    if nome_transicao:
+        aplicar_transicao(st.session_state.df_editado_beneficios, "beneficios", idx, nome_transicao, valores)
+    else:
+        st.session_state.df_editado_beneficios.loc[idx, "Status"] = novo_status
 
     # Salvar e fechar
     novo_sha = save_data_to_github_seguro(
@@ -2628,13 +2474,9 @@ def interface_visualizar_dados_beneficio(df):
         st.metric("⏳ Em Andamento", f"{pendentes} ({taxa_pendentes:.1f}%)")
     
     with col4:
-        if "Data Cadastro" in df.columns:
-            hoje = datetime.now().strftime("%d/%m/%Y")
-            df_temp = df.copy()
-            df_temp["Data Cadastro"] = df_temp["Data Cadastro"].astype(str)
-            hoje_count = len(df_temp[df_temp["Data Cadastro"].str.contains(hoje, na=False)])
-        else:
-            hoje_count = 0
+        # Contagem pelo índice de datas da versão (busca binária), sem varrer a coluna como texto
+        hoje = datetime.now().date()
+        hoje_count = contar_no_periodo(df, "beneficios", "Data Cadastro", hoje, hoje)
         st.metric("📅 Cadastrados Hoje", hoje_count)
 
     st.markdown("---")
@@ -2656,31 +2498,15 @@ def interface_visualizar_dados_beneficio(df):
     with col_filtro4:
         pesquisa = st.text_input("🔎 Pesquisar por Parte ou Processo:", key="viz_beneficio_search")
 
-    # Aplicar filtros
-    df_filtrado = df.copy()
-    
-    if status_filtro != "Todos" and "Status" in df.columns:
-        df_filtrado = df_filtrado[df_filtrado["Status"] == status_filtro]
-    
-    if usuario_filtro != "Todos" and "Cadastrado Por" in df.columns:
-        df_filtrado = df_filtrado[df_filtrado["Cadastrado Por"] == usuario_filtro]
-        
-    if tipo_filtro != "Todos" and "TIPO DE PROCESSO" in df.columns:
-        df_filtrado = df_filtrado[df_filtrado["TIPO DE PROCESSO"] == tipo_filtro]
-    
-    if pesquisa:
-        mask = pd.Series([False] * len(df_filtrado))
-        if "PARTE" in df_filtrado.columns:
-            mask |= df_filtrado["PARTE"].astype(str).str.contains(pesquisa, case=False, na=False)
-        if "Nº DO PROCESSO" in df_filtrado.columns:
-            mask |= df_filtrado["Nº DO PROCESSO"].astype(str).str.contains(pesquisa, case=False, na=False)
-        df_filtrado = df_filtrado[mask]
+    # Aplicar filtros (posições em cache por versão da base e estado dos filtros)
+    posicoes_filtradas = filtrar_posicoes_lista(
+        df, "beneficios",
+        filtros={"Status": status_filtro, "Cadastrado Por": usuario_filtro, "TIPO DE PROCESSO": tipo_filtro},
+        busca=pesquisa
+    )
 
     # Ordenar por data de cadastro mais recente
-    if "Data Cadastro" in df_filtrado.columns:
-        df_filtrado["_temp_data"] = pd.to_datetime(df_filtrado["Data Cadastro"], format="%d/%m/%Y %H:%M", errors="coerce")
-        df_filtrado = df_filtrado.sort_values("_temp_data", ascending=False, na_position="last")
-        df_filtrado = df_filtrado.drop("_temp_data", axis=1)
+    df_filtrado = df.iloc[ordenar_posicoes_por_data(df, "beneficios", posicoes_filtradas)]
 
     # Botões de download
     if not df_filtrado.empty:
@@ -2735,9 +2561,7 @@ def interface_visualizar_dados_beneficio(df):
         
         # Formatar valor monetário
         if 'Valor Pago (R$)' in df_display.columns:
-            df_display['Valor Pago (R$)'] = df_display['Valor Pago (R$)'].apply(
-                lambda x: f"R$ {float(x):,.2f}" if pd.notna(x) and str(x) not in ['nan', 'N/A', ''] and str(x).replace('.', '').replace(',', '').replace('-', '').isdigit() else str(x)
-            )
+            df_display['Valor Pago (R$)'] = formatar_coluna_reais(df_display['Valor Pago (R$)'])
         
         # Formatar datas
         if 'Data Cadastro' in df_display.columns:
@@ -2861,12 +2685,7 @@ def dialog_beneficio_detalhes(df_beneficios):
     st.markdown("### 💳 Sistema de Parcelas")
     
     # Verificar se já existem parcelas (em implementação futura)
-    valor_total = linha_beneficio.get('Valor Pago (R$)', 0)
-    if isinstance(valor_total, str):
-        try:
-            valor_total = float(valor_total.replace('R$', '').replace('.', '').replace(',', '.').strip())
-        except:
-            valor_total = 0
+    valor_total = valor_reais(linha_beneficio.get('Valor Pago (R$)'))
     
     col1, col2 = st.columns(2)
     
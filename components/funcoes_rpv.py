@@ -15,6 +15,8 @@ from components.autocomplete_manager import (
     campo_assunto_rpv,
     campo_vara_rpv,
     carregar_dados_autocomplete,
+    normalizar_assunto_rpv,
+    normalizar_orgao_rpv,
     normalizar_vara_rpv,
     obter_varas_rpv,
     obter_orgaos_rpv
@@ -37,6 +39,21 @@ from components.functions_controle import (
     # Função de cores de status
     obter_cor_status
 )
+from components.indice_listas import contar_no_periodo, filtrar_posicoes_lista
+from components.filtro_avancado import interface_filtro_avancado, obter_filtro_avancado, selectbox_faceta
+from components.navegacao_listas import controles_ordenacao_lista, controles_paginacao_lista, pagina_lista
+from components.fragmentos import (
+    alternar_card_expandido, botoes_abrir_fechar_todos, fechar_todos_cards, fragmento, registrar_cards_pagina,
+    secao_card_expandido
+)
+from components.moeda import formatar_coluna_reais
+from components.fluxo_trabalho import (
+    FLUXOS, aplicar_automaticas, aplicar_transicao, interface_transicoes_em_massa, perfis_edicao, pode_editar_status,
+    pode_executar, status_etapas, transicao_para, transicoes_em_massa
+)
+from components.cards_listas import (
+    aplicar_css_cards, linha_exibicao, obter_frame_exibicao, resumos_cards_html, valor_exibicao
+)
 
 def safe_get_value(data, key, default='Não informado'):
     """
@@ -134,79 +151,6 @@ def limpar_estados_cadastro_rpv():
     for key in keys_to_remove:
         del st.session_state[key]
 
-def aplicar_css_cards_rpv():
-    """Aplica CSS padrão para cards RPV"""
-    st.markdown("""
-    <style>
-    .rpv-card {
-        border: 1px solid #e0e6ed;
-        border-radius: 8px;
-        padding: 12px;
-        margin-bottom: 8px;
-        background-color: transparent;
-        transition: all 0.3s ease;
-    }
-    .rpv-card:hover {
-        border-color: #0066cc;
-        box-shadow: 0 2px 8px rgba(0,102,204,0.15);
-    }
-    .rpv-card.expanded {
-        background-color: transparent;
-        border-color: #0066cc;
-        border-width: 2px;
-        box-shadow: 0 4px 12px rgba(0,102,204,0.2);
-    }
-    .rpv-card-header {
-        display: flex;
-        justify-content: space-between;
-        align-items: center;
-        cursor: pointer;
-    }
-    .rpv-info-grid {
-        display: grid;
-        grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-        gap: 8px;
-        margin-top: 8px;
-    }
-    .info-item {
-        background: rgba(255,255,255,0.7);
-        padding: 6px 8px;
-        border-radius: 4px;
-        border-left: 3px solid #0066cc;
-    }
-    .expanded .info-item {
-        background: rgba(255,255,255,0.9);
-        border-left: 3px solid #0055aa;
-    }
-    .info-label {
-        font-size: 0.8em;
-        color: #666;
-        font-weight: bold;
-    }
-    .info-value {
-        font-size: 0.9em;
-        color: #333;
-    }
-    .tab-button {
-        background: #f8f9fa;
-        border: 1px solid #dee2e6;
-        border-radius: 4px;
-        padding: 8px 16px;
-        margin-right: 8px;
-        cursor: pointer;
-        transition: all 0.2s;
-    }
-    .tab-button:hover {
-        background: #e9ecef;
-    }
-    .tab-button.active {
-        background: #0066cc;
-        color: white;
-        border-color: #0066cc;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-
 def validar_campos_obrigatorios_rpv(campos):
     """
     Valida campos obrigatórios para RPV
@@ -261,163 +205,14 @@ def verificar_processos_duplicados_rpv(df, processo_principal, rpvs_data):
     
     return duplicados
 
-def testar_integridade_rpvs_multiplos(df):
-    """
-    FUNÇÃO RENOMEADA: testa_integridade_rpvs (não mais específica para múltiplos)
-    Testa a integridade geral dos RPVs. 
-    Retorna um relatório detalhado com estatísticas e possíveis problemas.
-    """
-    relatorio = {
-        'total_rpvs': 0,
-        'beneficiarios_unicos': 0,
-        'processos_base': {},
-        'erros_encontrados': [],
-        'avisos': []
-    }
-    
-    if df.empty:
-        relatorio['avisos'].append("DataFrame está vazio")
-        return relatorio
-    
-    relatorio['total_rpvs'] = len(df)
-    
-    # Verificar se as colunas necessárias existem
-    colunas_necessarias = ['Beneficiário']
-    colunas_existentes = [col for col in colunas_necessarias if col in df.columns]
-    
-    if len(colunas_existentes) < len(colunas_necessarias):
-        colunas_faltando = [col for col in colunas_necessarias if col not in df.columns]
-        relatorio['erros_encontrados'].append(f"Colunas faltando: {', '.join(colunas_faltando)}")
-        return relatorio
-    
-    try:
-        # Contar beneficiários únicos
-        if 'Beneficiário' in df.columns:
-            # Remover valores vazios ou NaN
-            df_limpo = df[df['Beneficiário'].notna() & (df['Beneficiário'] != '')]
-            
-            # Contar beneficiários únicos
-            beneficiarios_unicos = df_limpo['Beneficiário'].nunique()
-            relatorio['beneficiarios_unicos'] = beneficiarios_unicos
-            
-            # Verificações de integridade
-            # 1. Verificar se há beneficiários com nomes muito similares (possíveis duplicatas)
-            beneficiarios_list = df_limpo['Beneficiário'].str.upper().str.strip().unique()
-            for i, ben1 in enumerate(beneficiarios_list):
-                for ben2 in beneficiarios_list[i+1:]:
-                    if len(ben1) > 5 and len(ben2) > 5:  # Só comparar nomes com mais de 5 caracteres
-                        # Verificação simples de similaridade (primeiras 3 palavras)
-                        palavras1 = ben1.split()[:3]
-                        palavras2 = ben2.split()[:3]
-                        if len(set(palavras1) & set(palavras2)) >= 2:  # Pelo menos 2 palavras em comum
-                            relatorio['avisos'].append(f"Possível duplicata: '{ben1}' e '{ben2}'")
-            
-    except Exception as e:
-        relatorio['erros_encontrados'].append(f"Erro durante análise: {str(e)}")
-    
-    return relatorio
-
-
-def diagnosticar_sistema_rpv():
-    """
-    Função de diagnóstico para verificar a integridade do sistema de RPVs
-    Pode ser chamada para debug ou verificação preventiva
-    """
-    if "df_editado_rpv" not in st.session_state:
-        st.warning("⚠️ DataFrame de RPVs não encontrado no session_state")
-        return
-    
-    df = st.session_state.df_editado_rpv
-    
-    with st.expander("🔍 Diagnóstico do Sistema de RPVs", expanded=False):
-        st.markdown("### 📊 Relatório de Integridade")
-        
-        relatorio = testar_integridade_rpvs_multiplos(df)
-        
-        col_diag1, col_diag2, col_diag3 = st.columns(3)
-        
-        with col_diag1:
-            st.metric("Total de RPVs", relatorio['total_rpvs'])
-            st.metric("Beneficiários únicos", relatorio.get('beneficiarios_unicos', 0))
-        
-        with col_diag2:
-            st.metric("Erros Encontrados", len(relatorio['erros_encontrados']))
-            st.metric("Avisos", len(relatorio['avisos']))
-        
-        with col_diag3:
-            # Estatísticas de finalizados
-            if not df.empty and "Status" in df.columns:
-                finalizados = len(df[df["Status"] == "finalizado"]) 
-                st.metric("Finalizados", finalizados)
-            
-        # Mostrar erros se houver
-        if relatorio['erros_encontrados']:
-            st.markdown("### ❌ Erros Encontrados")
-            for erro in relatorio['erros_encontrados']:
-                st.error(erro)
-        
-        # Mostrar avisos se houver
-        if relatorio['avisos']:
-            st.markdown("### ⚠️ Avisos")
-            for aviso in relatorio['avisos']:
-                st.warning(aviso)
-        
-        # Estado dos cards expandidos
-        st.markdown("### 🎴 Estado dos Cards")
-        if hasattr(st.session_state, 'rpv_expanded_cards'):
-            cards_expandidos = len(st.session_state.rpv_expanded_cards)
-            st.info(f"Cards expandidos: {cards_expandidos}")
-            if cards_expandidos > 0 and cards_expandidos <= 10:  # Mostrar apenas se não for muitos
-                st.write("IDs expandidos:", list(st.session_state.rpv_expanded_cards))
-        else:
-            st.warning("Estado de cards expandidos não inicializado")
-        
-        # Verificar consistência de IDs
-        if not df.empty and "ID" in df.columns:
-            ids_unicos = df["ID"].nunique()
-            total_linhas = len(df)
-            
-            st.markdown("### 🆔 Consistência de IDs")
-            if ids_unicos == total_linhas:
-                st.success(f"✅ Todos os {total_linhas} RPVs têm IDs únicos")
-            else:
-                st.error(f"❌ Problema de IDs: {total_linhas} linhas mas apenas {ids_unicos} IDs únicos")
-                
-                # Mostrar IDs duplicados se houver
-                ids_duplicados = df[df["ID"].duplicated()]["ID"].unique()
-                if len(ids_duplicados) > 0:
-                    st.write("IDs duplicados:", list(ids_duplicados))
-
 # =====================================
 # CONFIGURAÇÕES DE PERFIS - RPV
 # =====================================
 
-# a) Novos Status - NOVO FLUXO DE TRABALHO
-STATUS_ETAPAS_RPV = {
-    1: "Cadastro",
-    2: "SAC - aguardando documentação",
-    3: "Administrativo - aguardando documentação",
-    4: "SAC - documentação pronta",
-    5: "Administrativo - documentação pronta",
-    6: "Enviado para Rodrigo",
-    7: "aguardando pagamento",
-    8: "finalizado"
-}
-
-# Status que podem coexistir simultaneamente
-STATUS_SIMULTANEOS_RPV = [
-    ["SAC - aguardando documentação", "Administrativo - aguardando documentação"],
-    ["SAC - documentação pronta", "Administrativo - documentação pronta"]
-]
-
-# b) Novas Permissões de Edição por Perfil - NOVO FLUXO
-PERFIS_RPV = {
-    "Cadastrador": ["Cadastro"], # Cadastrador apenas cria e pode editar cadastros
-    "Financeiro": ["Enviado para Rodrigo", "aguardando pagamento"], # Financeiro atua nos estágios finais
-    "Administrativo": ["SAC - aguardando documentação", "Administrativo - aguardando documentação", "SAC - documentação pronta", "Administrativo - documentação pronta"], # Perfil administrativo
-    "SAC": ["SAC - aguardando documentação", "Administrativo - aguardando documentação", "SAC - documentação pronta", "Administrativo - documentação pronta"], # Perfil SAC
-    "Desenvolvedor": list(STATUS_ETAPAS_RPV.values())  # Desenvolvedor tem acesso total
-}
+# a) Status, status simultâneos e permissões por perfil - declarados em components/fluxo_trabalho.py
+STATUS_ETAPAS_RPV = status_etapas("rpv")
+STATUS_SIMULTANEOS_RPV = FLUXOS["rpv"]["simultaneos"]
+PERFIS_RPV = perfis_edicao("rpv")
 
 # c) Lista de Assuntos Comuns para RPV
 ASSUNTOS_RPV = [
@@ -458,25 +253,6 @@ def salvar_arquivo_anexo(uploaded_file, rpv_id, tipo_comprovante):
         st.error(f"Erro ao salvar arquivo: {str(e)}")
         return None
 
-def normalizar_assunto_rpv(texto):
-    """Normaliza nome do assunto removendo acentos e convertendo para maiúsculo"""
-    if not texto:
-        return ""
-    import unicodedata
-    # Remove acentos
-    texto_normalizado = unicodedata.normalize('NFD', texto)
-    texto_sem_acento = ''.join(c for c in texto_normalizado if unicodedata.category(c) != 'Mn')
-    return texto_sem_acento.upper().strip()
-
-def normalizar_orgao_rpv(texto):
-    """Normaliza nome do órgão removendo acentos e convertendo para maiúsculo"""
-    if not texto:
-        return ""
-    import unicodedata
-    # Remove acentos
-    texto_normalizado = unicodedata.normalize('NFD', texto)
-    texto_sem_acento = ''.join(c for c in texto_normalizado if unicodedata.category(c) != 'Mn')
-    return texto_sem_acento.upper().strip()
 
 def obter_assuntos_rpv():
     """Retorna lista de assuntos RPV salvos + padrões"""
@@ -566,7 +342,7 @@ def verificar_perfil_usuario_rpv():
 
 def pode_editar_status_rpv(status_atual, perfil_usuario):
     """Verifica se o usuário pode editar determinado status RPV - NOVO FLUXO"""
-    return status_atual in PERFIS_RPV.get(perfil_usuario, [])
+    return pode_editar_status("rpv", status_atual, perfil_usuario)
 
 def garantir_colunas_novo_fluxo(df):
     """Garante que as colunas do novo fluxo existem no DataFrame"""
@@ -634,24 +410,6 @@ def obter_status_simultaneo_ativo(linha_rpv):
     
     return status_ativos
 
-def iniciar_status_simultaneo(df, rpv_id, status_principal, status_secundario):
-    """Inicia status simultâneo para um RPV"""
-    # Usar sempre o DataFrame em memória
-    df_trabalho = st.session_state.df_editado_rpv
-    idx = obter_index_rpv_seguro(df_trabalho, rpv_id)
-    if idx is None:
-        st.error(f"❌ Erro: RPV com ID {rpv_id} não encontrado.")
-        return df
-    
-    # CORREÇÃO: Verificar se o índice ainda é válido após possíveis modificações
-    if idx >= len(st.session_state.df_editado_rpv):
-        st.error(f"❌ Erro: Índice {idx} fora do range do DataFrame.")
-        return df
-    
-    st.session_state.df_editado_rpv.loc[idx, "Status"] = status_principal
-    st.session_state.df_editado_rpv.loc[idx, "Status Secundario"] = status_secundario
-    return st.session_state.df_editado_rpv
-
 def finalizar_status_simultaneo(df, rpv_id, novo_status):
     """Finaliza status simultâneo e define status único"""
     # Usar sempre o DataFrame em memória
@@ -666,17 +424,30 @@ def finalizar_status_simultaneo(df, rpv_id, novo_status):
         st.error(f"❌ Erro: Índice {idx} fora do range do DataFrame.")
         return df
     
+    nome_transicao = transicao_para("rpv", novo_status)
+    if nome_transicao:
+        # Campos carimbados declarados no fluxo (ex: validação automática ao ir para Rodrigo)
+        aplicar_transicao(st.session_state.df_editado_rpv, "rpv", idx, nome_transicao)
     st.session_state.df_editado_rpv.loc[idx, "Status"] = novo_status
     st.session_state.df_editado_rpv.loc[idx, "Status Secundario"] = ""  # Limpa status secundário
     
-    # Se o novo status for "Enviado para Rodrigo", marcar como validado automaticamente
-    if novo_status == "Enviado para Rodrigo":
-        st.session_state.df_editado_rpv.loc[idx, "Validado Financeiro"] = "Sim"
-        st.session_state.df_editado_rpv.loc[idx, "Data Validacao"] = str(datetime.now().strftime("%d/%m/%Y %H:%M"))
-        st.session_state.df_editado_rpv.loc[idx, "Validado Por"] = "Sistema - Automatico SAC+Admin"
-    
     return st.session_state.df_editado_rpv
 
+def executar_transicao_rpv(rpv_id, nome_transicao, valores=None, carimbar=True):
+    """
+    Aplica uma transição do fluxo ao RPV em memória, seguida das transições automáticas
+    que ela liberar (ex: SAC e Administrativo prontos -> Enviado para Rodrigo).
+
+    Returns:
+        dict | None: transições automáticas executadas; None se o RPV não foi encontrado
+    """
+    idx = obter_index_rpv_seguro(st.session_state.df_editado_rpv, rpv_id)
+    if idx is None:
+        st.error(f"❌ Erro: RPV com ID {rpv_id} não encontrado.")
+        return None
+    aplicar_transicao(st.session_state.df_editado_rpv, "rpv", idx, nome_transicao, valores, carimbar)
+    return aplicar_automaticas(st.session_state.df_editado_rpv, "rpv", [idx])
+
 def pode_editar_qualquer_status_simultaneo(linha_rpv, perfil_usuario):
     """Verifica se o usuário pode editar pelo menos um dos status simultâneos"""
     status_ativos = obter_status_simultaneo_ativo(linha_rpv)
@@ -837,21 +608,30 @@ def interface_lista_rpv(df, perfil_usuario):
         st.info("ℹ️ Não há RPVs cadastrados ainda. Use a aba 'Cadastrar RPV' para adicionar o primeiro registro.")
         return
 
-    # Filtros
+    # Filtros (cada opção mostra quantos RPVs ela teria com os demais filtros ativos)
     col_filtro1, col_filtro2, col_filtro3, col_filtro4 = st.columns(4)
-    
+    filtros_atuais = {
+        "Status": st.session_state.get("lista_rpv_status", "Todos"),
+        "Cadastrado Por": st.session_state.get("lista_rpv_user", "Todos"),
+        "Orgao Judicial": st.session_state.get("lista_rpv_orgao", "Todos"),
+    }
+    contexto_facetas = {
+        "busca": st.session_state.get("lista_rpv_search", ""),
+        "avancado": obter_filtro_avancado("lista_rpv"),
+    }
+
     with col_filtro1:
-        status_unicos = ["Todos"] + list(df["Status"].dropna().unique()) if "Status" in df.columns else ["Todos"]
-        status_filtro = st.selectbox("Status:", options=status_unicos, key="lista_rpv_status")
-        
+        status_filtro = selectbox_faceta("Status:", df, "rpv", "Status", filtros_atuais,
+                                         key="lista_rpv_status", **contexto_facetas)
+
     with col_filtro2:
-        usuarios_unicos = ["Todos"] + list(df["Cadastrado Por"].dropna().unique()) if "Cadastrado Por" in df.columns else ["Todos"]
-        usuario_filtro = st.selectbox("Cadastrado Por:", options=usuarios_unicos, key="lista_rpv_user")
-    
+        usuario_filtro = selectbox_faceta("Cadastrado Por:", df, "rpv", "Cadastrado Por", filtros_atuais,
+                                          key="lista_rpv_user", **contexto_facetas)
+
     with col_filtro3:
         if "Orgao Judicial" in df.columns:
-            orgaos_unicos = ["Todos"] + list(df["Orgao Judicial"].dropna().unique())
-            orgao_filtro = st.selectbox("Órgão Judicial:", options=orgaos_unicos, key="lista_rpv_orgao")
+            orgao_filtro = selectbox_faceta("Órgão Judicial:", df, "rpv", "Orgao Judicial", filtros_atuais,
+                                            key="lista_rpv_orgao", **contexto_facetas)
         else:
             orgao_filtro = "Todos"
     
@@ -875,27 +655,25 @@ def interface_lista_rpv(df, perfil_usuario):
         if pesquisa:
             st.caption(f"🔍 Buscando por: '{pesquisa}' ({len(pesquisa)} caracteres)")
 
-    # Aplicar filtros
-    df_filtrado = df.copy()
-    
-    if status_filtro != "Todos":
-        df_filtrado = df_filtrado[df_filtrado["Status"] == status_filtro]
-    
-    if usuario_filtro != "Todos":
-        df_filtrado = df_filtrado[df_filtrado["Cadastrado Por"] == usuario_filtro]
-        
-    if orgao_filtro != "Todos" and "Orgao Judicial" in df.columns:
-        df_filtrado = df_filtrado[df_filtrado["Orgao Judicial"] == orgao_filtro]
-    
-    if pesquisa:
-        mask = pd.Series([False] * len(df_filtrado))
-        for col in ["Beneficiário", "Processo", "CPF"]:
-            if col in df_filtrado.columns:
-                mask |= df_filtrado[col].astype(str).str.contains(pesquisa, case=False, na=False)
-        df_filtrado = df_filtrado[mask]
+    # Filtro avançado (condições E/OU sobre quaisquer colunas)
+    filtro_avancado = interface_filtro_avancado(df, "rpv", "lista_rpv")
+
+    # Ordenação e tamanho da página
+    criterio_ordem, items_per_page = controles_ordenacao_lista("lista_rpv")
+
+    # Aplicar filtros: posições das linhas em cache por versão da base e estado dos filtros
+    # (busca resolvida pelo índice, já ranqueada); só a página exibida vira DataFrame
+    filtros_lista = {"Status": status_filtro, "Cadastrado Por": usuario_filtro, "Orgao Judicial": orgao_filtro}
+    posicoes_filtradas = filtrar_posicoes_lista(
+        df, "rpv",
+        filtros=filtros_lista,
+        busca=pesquisa,
+        chave_sessao_busca="lista_rpv_search",
+        avancado=filtro_avancado
+    )
 
     # Calcular total de registros filtrados
-    total_registros_filtrados = len(df_filtrado)
+    total_registros_filtrados = len(posicoes_filtradas)
     
     # Mostrar resultado da busca
     if pesquisa:
@@ -934,32 +712,23 @@ def interface_lista_rpv(df, perfil_usuario):
                            key="confirmar_exclusao_rpv", type="primary"):
                     confirmar_exclusao_massa_rpv(df, st.session_state.processos_selecionados_rpv)
 
-    # Botões de Abrir/Fechar Todos
+    # Transições de status em massa (validadas de uma vez e salvas num único commit)
+    if transicoes_em_massa("rpv", perfil_usuario):
+        with st.expander("🔁 Transição em Massa", expanded=False):
+            interface_transicoes_em_massa(df, "rpv", perfil_usuario, posicoes_filtradas)
+
+    # Botões de Abrir/Fechar Todos (abre no máximo LIMITE_CARDS_ABERTOS cards da página, adiados)
     if total_registros_filtrados > 0:
         st.markdown("---")
-        col_exp1, col_exp2, col_exp3, col_exp_space = st.columns([2, 2, 2, 4])
-        
-        with col_exp1:
-            if st.button("🔽 Abrir Todos", key="abrir_todos_rpv"):
-                # CORREÇÃO: Usar conversão padronizada de ID
-                for _, processo in df_filtrado.iterrows():
-                    rpv_id = processo.get("ID", "N/A")
-                    if rpv_id != "N/A" and rpv_id is not None and rpv_id != "":
-                        # Converter para string para consistência (igual à lógica individual)
-                        rpv_id_str = str(rpv_id)
-                        st.session_state.rpv_expanded_cards.add(rpv_id_str)
-                st.rerun()
+        col_exp, col_cache = st.columns([8, 2])
         
-        with col_exp2:
-            if st.button("🔼 Fechar Todos", key="fechar_todos_rpv"):
-                # Limpar o set de cards expandidos
-                st.session_state.rpv_expanded_cards.clear()
-                st.rerun()
+        with col_exp:
+            botoes_abrir_fechar_todos("rpv_expanded_cards", "rpv")
         
-        with col_exp3:
+        with col_cache:
             if st.button("🔄 Limpar Cache", key="limpar_cache_rpv", help="Limpa o estado de expansão para corrigir problemas"):
                 # Limpar completamente o estado de expansão e forçar recarregamento
-                st.session_state.rpv_expanded_cards = set()
+                fechar_todos_cards("rpv_expanded_cards")
                 if "rpv_aberto_id" in st.session_state:
                     del st.session_state["rpv_aberto_id"]
                 if "show_rpv_dialog" in st.session_state:
@@ -967,26 +736,40 @@ def interface_lista_rpv(df, perfil_usuario):
                 st.success("✅ Cache limpo! Cada RPV agora abre individualmente.")
                 st.rerun()
 
-    # Paginação
-    if "current_page_rpvs" not in st.session_state:
-        st.session_state.current_page_rpvs = 1
-    
-    items_per_page = 10
-    total_registros = len(df_filtrado)
-    total_pages = math.ceil(total_registros / items_per_page) if items_per_page > 0 else 1
-    
-    start_idx = (st.session_state.current_page_rpvs - 1) * items_per_page
+    # Paginação por cursor: a página continua no mesmo RPV mesmo com cadastros de outros usuários
+    assinatura_lista = (tuple(filtros_lista.items()), pesquisa, filtro_avancado, criterio_ordem, items_per_page)
+    posicoes_ordenadas, start_idx = pagina_lista(
+        df, "rpv", posicoes_filtradas, criterio_ordem, items_per_page, "lista_rpv", assinatura_lista
+    )
+    total_registros = total_registros_filtrados
     end_idx = start_idx + items_per_page
-    df_paginado = df_filtrado.iloc[start_idx:end_idx]
-
-    # CSS para cards dropdown (aplicado via função reutilizável)
-    aplicar_css_cards_rpv()
+    st.session_state.current_page_rpvs = start_idx // items_per_page + 1
+    df_paginado = df.iloc[posicoes_ordenadas[start_idx:end_idx]]
+
+    # CSS dos cards (folha única das listas) e resumos da página montados de uma vez
+    aplicar_css_cards()
+    exibicao_pagina = obter_frame_exibicao(df, "rpv").iloc[posicoes_ordenadas[start_idx:end_idx]]
+    registros_exibicao = exibicao_pagina.to_dict("records")
+    resumos_pagina = resumos_cards_html(
+        exibicao_pagina, "rpv-info-grid",
+        campos=[
+            ("Processo", "Processo", "Não informado", None),
+            ("Beneficiário", "Beneficiário", "Não informado", None),
+            ("CPF", "CPF", "Não informado", None),
+            ("Valor Cliente", "Valor Cliente", "R$ 0,00", None),
+            ("Status", "Status", "Não informado", None),
+            ("Mês Competência", "Mês Competência", "Não informado", None),
+        ],
+        titulo=("Processo", "Processo"),
+        descricao="Descricao RPV"
+    )
 
     # Lista de RPVs
     if not df_paginado.empty:
         st.markdown(f"### 📋 Lista de RPVs ({total_registros} encontrados)")
         
-        # Renderizar cards
+        # Renderizar cards (cada card é um fragmento: abrir/fechar não recarrega a página inteira)
+        ids_pagina = []
         for idx, rpv in enumerate(df_paginado.iterrows()):
             _, rpv = rpv  # Desempacotar o tuple
             rpv_id = rpv.get("ID", "N/A")
@@ -997,21 +780,17 @@ def interface_lista_rpv(df, perfil_usuario):
             
             # Converter ID para string para garantir consistência
             rpv_id = str(rpv_id)
+            ids_pagina.append(rpv_id)
             
             # CORREÇÃO SIMPLIFICADA: Usar apenas rpv_id para expanded cards (funciona bem)
             # Única correção necessária é para chaves dos botões/elementos Streamlit
             pagina_atual = st.session_state.get("current_page_rpvs", 1)
             unique_suffix = f"{pagina_atual}_{idx}"
             
-            # Para expanded cards, usar apenas o ID do RPV (mantém consistência entre páginas)
-            is_expanded = rpv_id in st.session_state.rpv_expanded_cards
-            
-            card_class = "rpv-card expanded" if is_expanded else "rpv-card"
-            
             with st.container():
-                # Layout com checkbox e botão expandir (igual aos Benefícios)
+                # Checkbox fora do fragmento: a seleção precisa atualizar o botão "Excluir (n)"
                 if st.session_state.modo_exclusao_rpv:
-                    col_check, col_expand, col_info = st.columns([0.3, 0.7, 9])
+                    col_check, col_card = st.columns([0.3, 9.7])
                     
                     with col_check:
                         # CORREÇÃO: Usar chave única para checkbox
@@ -1021,188 +800,128 @@ def interface_lista_rpv(df, perfil_usuario):
                                 st.session_state.processos_selecionados_rpv.append(rpv_id)
                         elif rpv_id in st.session_state.processos_selecionados_rpv:
                             st.session_state.processos_selecionados_rpv.remove(rpv_id)
-                else:
-                    col_expand, col_info = st.columns([1, 9])
-                
-                with col_expand if not st.session_state.modo_exclusao_rpv else col_expand:
-                    expand_text = "▼ Fechar" if is_expanded else "▶ Abrir"
-                    # CORREÇÃO: Usar chave única para botão expandir
-                    button_key = f"expand_rpv_{rpv_id}_{unique_suffix}"
-                    
-                    if st.button(expand_text, key=button_key):
-                        if is_expanded:
-                            # Remover apenas este card específico (usar apenas rpv_id)
-                            st.session_state.rpv_expanded_cards.discard(rpv_id)
-                        else:
-                            # Adicionar apenas este card específico (usar apenas rpv_id)
-                            st.session_state.rpv_expanded_cards.add(rpv_id)
-                        st.rerun()
-                
-                with col_info:
-                    # Informações resumidas (sempre visíveis) com status colorido
-                    status_atual = safe_get_value(rpv, 'Status', 'Não informado')
-                    status_info = obter_cor_status(status_atual, "rpv")
-                    
-                    # Título com processo e beneficiário
-                    processo_titulo = safe_get_value(rpv, 'Processo', 'Não informado')
-                    descricao_rpv = safe_get_value(rpv, 'Descricao RPV', '')
                     
-                    # Verificar se é um RPV com descrição (antes era múltiplo)
-                    if descricao_rpv and descricao_rpv != 'Não informado':
-                        st.markdown("---")
-                        st.markdown(f"📄 **Processo:** {processo_titulo}")
-                        st.markdown(f"**📝 Descrição:** {descricao_rpv}")
-                    else:
-                        st.markdown(f"📄 **Processo:** {processo_titulo}")
+                    with col_card:
+                        render_card_lista_rpv(rpv, rpv_id, resumos_pagina[idx], registros_exibicao[idx],
+                                              unique_suffix, perfil_usuario)
+                else:
+                    render_card_lista_rpv(rpv, rpv_id, resumos_pagina[idx], registros_exibicao[idx],
+                                              unique_suffix, perfil_usuario)
 
-                    st.markdown(f"""
-                    <div class="rpv-info-grid">
-                        <div class="info-item">
-                            <div class="info-label">Processo</div>
-                            <div class="info-value">{safe_get_value(rpv, 'Processo', 'Não informado')}</div>
-                        </div>
-                        <div class="info-item">
-                            <div class="info-label">Beneficiário</div>
-                            <div class="info-value">{safe_get_value(rpv, 'Beneficiário', 'Não informado')}</div>
-                        </div>
-                        <div class="info-item">
-                            <div class="info-label">CPF</div>
-                            <div class="info-value">{safe_get_value(rpv, 'CPF', 'Não informado')}</div>
-                        </div>
-                        <div class="info-item">
-                            <div class="info-label">Valor Cliente</div>
-                            <div class="info-value">R$ {safe_get_value(rpv, 'Valor Cliente', '0.00')}</div>
-                        </div>
-                        <div class="info-item">
-                            <div class="info-label">Status</div>
-                            <div class="info-value">{status_info['html']}</div>
-                        </div>
-                        <div class="info-item">
-                            <div class="info-label">Mês Competência</div>
-                            <div class="info-value">{safe_get_value(rpv, 'Mês Competência', 'Não informado')}</div>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                # Conteúdo expandido (tabs)
-                if is_expanded:
-                    st.markdown("---")
-                    # Incluir descrição do RPV no título se existir
-                    descricao_rpv = safe_get_value(rpv, 'Descricao RPV', '')
-                    titulo_processo = safe_get_value(rpv, 'Processo', 'Não informado')
-                    
-                    # Mostrar processo com descrição se houver
-                    if descricao_rpv and descricao_rpv != 'Não informado':
-                        st.markdown(f"📄 {titulo_processo}")
-                        st.markdown(f"**📝 Descrição:** {descricao_rpv}")
-                    else:
-                        st.markdown(f"📄 {titulo_processo}")
-                    
-                    # Tabs
-                    tab_info, tab_acoes, tab_historico = st.tabs(["📋 Informações", "⚙️ Ações", "📜 Histórico"])
-                    
-                    # Definir status atual
-                    status_atual = safe_get_value(rpv, 'Status', 'Não informado')
-                    
-                    with tab_info:
-                        render_tab_info_rpv(rpv, rpv_id)
-                    
-                    with tab_acoes:
-                        # Usar o DataFrame editado em memória que contém os RPVs recém-criados
-                        render_tab_acoes_rpv(st.session_state.df_editado_rpv, rpv, rpv_id, status_atual, perfil_usuario)
-                    
-                    with tab_historico:
-                        render_tab_historico_rpv(rpv, rpv_id)
+        # Cards que o próximo "Abrir Todos" vai abrir
+        registrar_cards_pagina("rpv_expanded_cards", ids_pagina)
                     
     else:
         st.info("Nenhum RPV encontrado com os filtros aplicados.")
 
     # Controles de paginação
-    if total_pages > 1:
+    controles_paginacao_lista(
+        df, "rpv", posicoes_ordenadas, start_idx, items_per_page, criterio_ordem, "lista_rpv", assinatura_lista
+    )
+
+@fragmento
+def render_card_lista_rpv(rpv, rpv_id, resumo_html, exibicao, unique_suffix, perfil_usuario):
+    """Card de um RPV na lista (resumo e, se expandido, as abas), reexecutado isoladamente"""
+    # Para expanded cards, usar apenas o ID do RPV (mantém consistência entre páginas)
+    is_expanded = rpv_id in st.session_state.rpv_expanded_cards
+    
+    col_expand, col_info = st.columns([0.7, 9] if st.session_state.modo_exclusao_rpv else [1, 9])
+    
+    with col_expand:
+        expand_text = "▼ Fechar" if is_expanded else "▶ Abrir"
+        # CORREÇÃO: Usar chave única para botão expandir
+        button_key = f"expand_rpv_{rpv_id}_{unique_suffix}"
+        # O callback alterna o card antes do rerun, que fica restrito a este fragmento
+        st.button(expand_text, key=button_key, on_click=alternar_card_expandido,
+                  args=("rpv_expanded_cards", rpv_id))
+    
+    with col_info:
+        # Resumo (sempre visível) já montado para a página inteira
+        st.markdown(resumo_html, unsafe_allow_html=True)
+
+    # Conteúdo expandido (tabs)
+    if is_expanded:
         st.markdown("---")
-        col_nav1, col_nav2, col_nav3 = st.columns([3, 2, 3])
-        
-        with col_nav1:
-            if st.session_state.current_page_rpvs > 1:
-                if st.button("<< Primeira", key="rpv_lista_primeira"):
-                    st.session_state.current_page_rpvs = 1
-                    st.rerun()
-                if st.button("< Anterior", key="rpv_lista_anterior"):
-                    st.session_state.current_page_rpvs -= 1
-                    st.rerun()
-        
-        with col_nav2:
-            st.write(f"Página {st.session_state.current_page_rpvs} de {total_pages}")
-        
-        with col_nav3:
-            if st.session_state.current_page_rpvs < total_pages:
-                if st.button("Próxima >", key="rpv_lista_proxima"):
-                    st.session_state.current_page_rpvs += 1
-                    st.rerun()
-                if st.button("Última >>", key="rpv_lista_ultima"):
-                    st.session_state.current_page_rpvs = total_pages
-                    st.rerun()
+        # Incluir descrição do RPV no título se existir
+        descricao_rpv = valor_exibicao(exibicao, 'Descricao RPV', '')
+        titulo_processo = valor_exibicao(exibicao, 'Processo')
+
+        # Mostrar processo com descrição se houver
+        if descricao_rpv:
+            st.markdown(f"📄 {titulo_processo}")
+            st.markdown(f"**📝 Descrição:** {descricao_rpv}")
+        else:
+            st.markdown(f"📄 {titulo_processo}")
+
+        # Seções: só a escolhida é executada (e nenhuma enquanto o card estiver adiado)
+        secao = secao_card_expandido("rpv_expanded_cards", rpv_id, f"secao_card_rpv_{rpv_id}_{unique_suffix}")
 
-def render_tab_info_rpv(processo, rpv_id):
-    """Renderiza a tab de informações do RPV"""
+        # Definir status atual
+        status_atual = safe_get_value(rpv, 'Status', 'Não informado')
+
+        if secao == "info":
+            render_tab_info_rpv(rpv, rpv_id, exibicao)
+
+        elif secao == "acoes":
+            # Usar o DataFrame editado em memória que contém os RPVs recém-criados
+            render_tab_acoes_rpv(st.session_state.df_editado_rpv, rpv, rpv_id, status_atual, perfil_usuario)
+
+        elif secao == "historico":
+            render_tab_historico_rpv(rpv, rpv_id)
+
+def render_tab_info_rpv(processo, rpv_id, exibicao=None):
+    """Renderiza a tab de informações do RPV (textos lidos da linha de exibição já tratada)"""
+    if exibicao is None:
+        exibicao = linha_exibicao(processo, "rpv")
         
     col_det1, col_det2 = st.columns(2)
     
     with col_det1:
         st.markdown("**📋 Dados Básicos:**")
         # Exibir descrição do RPV se existir
-        descricao_rpv = safe_get_value(processo, 'Descricao RPV', '')
-        if descricao_rpv and descricao_rpv != 'Não informado':
+        descricao_rpv = valor_exibicao(exibicao, 'Descricao RPV', '')
+        if descricao_rpv:
             st.write(f"**Descrição do RPV:** {descricao_rpv}")
         
-        st.write(f"**CPF:** {safe_get_value(processo, 'CPF')}")
-        st.write(f"**Agência:** {safe_get_value(processo, 'Agência')}")
-        st.write(f"**Conta:** {safe_get_value(processo, 'Conta')}")
-        st.write(f"**Banco:** {safe_get_value(processo, 'Banco')}")
+        st.write(f"**CPF:** {valor_exibicao(exibicao, 'CPF')}")
+        st.write(f"**Agência:** {valor_exibicao(exibicao, 'Agência')}")
+        st.write(f"**Conta:** {valor_exibicao(exibicao, 'Conta')}")
+        st.write(f"**Banco:** {valor_exibicao(exibicao, 'Banco')}")
     
     with col_det2:
         st.markdown("**💰 Valores:**")
         
-        # Exibir novos campos de valores
-        houve_destaque = safe_get_value(processo, 'Houve Destaque Honorarios', 'Não')
+        # Exibir novos campos de valores (já formatados em reais)
+        houve_destaque = valor_exibicao(exibicao, 'Houve Destaque Honorarios', 'Não')
         st.write(f"**Houve destaque de honorários:** {houve_destaque}")
-        
-        valor_cliente = safe_get_value(processo, 'Valor Cliente', '0.00')
-        st.write(f"**Valor Cliente:** R$ {valor_cliente}")
-        
-        honorarios_contratuais = safe_get_value(processo, 'Honorarios Contratuais', '0.00')
-        st.write(f"**Honorários Contratuais:** R$ {honorarios_contratuais}")
-        
-        valor_parceiro = safe_get_value(processo, 'Valor Parceiro Prospector', '0.00')
-        st.write(f"**Valor Parceiro/Prospector:** R$ {valor_parceiro}")
-        
-        valor_sucumbencial = safe_get_value(processo, 'Valor Honorario Sucumbencial', '0.00')
-        st.write(f"**Honorário Sucumbencial:** R$ {valor_sucumbencial}")
-        
-        outros_valores = safe_get_value(processo, 'Outros Valores', '0.00')
-        st.write(f"**Outros Valores:** R$ {outros_valores}")
+        st.write(f"**Valor Cliente:** {valor_exibicao(exibicao, 'Valor Cliente', 'R$ 0,00')}")
+        st.write(f"**Honorários Contratuais:** {valor_exibicao(exibicao, 'Honorarios Contratuais', 'R$ 0,00')}")
+        st.write(f"**Valor Parceiro/Prospector:** {valor_exibicao(exibicao, 'Valor Parceiro Prospector', 'R$ 0,00')}")
+        st.write(f"**Honorário Sucumbencial:** {valor_exibicao(exibicao, 'Valor Honorario Sucumbencial', 'R$ 0,00')}")
+        st.write(f"**Outros Valores:** {valor_exibicao(exibicao, 'Outros Valores', 'R$ 0,00')}")
         
         # Observações sobre valores
-        obs_valores = safe_get_value(processo, 'Observacoes Valores', '')
-        if obs_valores and obs_valores != 'Não informado':
+        obs_valores = valor_exibicao(exibicao, 'Observacoes Valores', '')
+        if obs_valores:
             st.write(f"**Observações sobre valores:** {obs_valores}")
-        st.write(f"**Mês Competência:** {safe_get_value(processo, 'Mês Competência')}")
-        st.write(f"**Assunto:** {safe_get_value(processo, 'Assunto')}")
-        st.write(f"**Órgão Judicial:** {safe_get_value(processo, 'Orgao Judicial')}")
+        st.write(f"**Mês Competência:** {valor_exibicao(exibicao, 'Mês Competência')}")
+        st.write(f"**Assunto:** {valor_exibicao(exibicao, 'Assunto')}")
+        st.write(f"**Órgão Judicial:** {valor_exibicao(exibicao, 'Orgao Judicial')}")
     
     # Mostrar detalhes dos honorários contratuais
     mostrar_detalhes_hc_rpv(processo, f"info_{rpv_id}")
     
     # Observações sobre honorários contratuais
-    obs_hc = safe_get_value(processo, 'Observacoes Honorarios Contratuais', '')
-    if obs_hc and obs_hc != 'Não informado':
+    obs_hc = valor_exibicao(exibicao, 'Observacoes Honorarios Contratuais', '')
+    if obs_hc:
         st.markdown("##### 💼 Observações dos Honorários Contratuais")
         st.info(obs_hc)
     
     # Observações gerais
-    if safe_get_value(processo, 'Observações'):
+    observacoes = valor_exibicao(exibicao, 'Observações', '')
+    if observacoes:
         st.markdown("##### 📝 Observações Gerais")
-        st.info(safe_get_value(processo, 'Observações'))
+        st.info(observacoes)
 
 def render_tab_acoes_rpv(df, processo, rpv_id, status_atual, perfil_usuario):
     """Renderiza a tab de ações do RPV - inclui edição completa para Cadastradores e Desenvolvedores"""
@@ -1369,29 +1088,14 @@ def render_tab_acoes_rpv(df, processo, rpv_id, status_atual, perfil_usuario):
         st.markdown("---")
     
     # Renderizar ações baseadas no status - usando a lógica original da interface_edicao_rpv
-    if status_atual == "Cadastro" and perfil_usuario in ["Cadastrador", "Desenvolvedor"]:
+    if status_atual == "Cadastro" and pode_executar("rpv", "finalizar_cadastro", perfil_usuario):
         st.info("Após finalizar o cadastro, este RPV será enviado simultaneamente para **SAC** e **Administrativo**.")        
         unique_key = f"finalizar_cadastro_tab_{rpv_id}"
         if st.button("✅ Finalizar Cadastro e Enviar", type="primary", key=unique_key):
-            # Verificar se o RPV ainda existe no DataFrame de trabalho
-            idx = obter_index_rpv_seguro(df_trabalho, rpv_id)
-            if idx is None:
-                st.error(f"❌ Erro: RPV com ID {rpv_id} não encontrado no DataFrame.")
+            # Status simultâneo SAC + Administrativo e data/responsável do envio (fluxo declarado)
+            if executar_transicao_rpv(rpv_id, "finalizar_cadastro") is None:
                 return
             
-            # Iniciar status simultâneo
-            st.session_state.df_editado_rpv = iniciar_status_simultaneo(
-                st.session_state.df_editado_rpv,
-                rpv_id,
-                "SAC - aguardando documentação",
-                "Administrativo - aguardando documentação"
-            )
-            
-            # Adicionar data de envio
-            now = str(datetime.now().strftime("%d/%m/%Y %H:%M"))
-            st.session_state.df_editado_rpv.loc[idx, "Data Envio"] = now
-            st.session_state.df_editado_rpv.loc[idx, "Enviado Por"] = str(st.session_state.get("usuario", "Sistema"))
-            
             # Salvamento automático
             novo_sha = save_data_to_github_seguro(
                 st.session_state.df_editado_rpv,
@@ -1406,7 +1110,7 @@ def render_tab_acoes_rpv(df, processo, rpv_id, status_atual, perfil_usuario):
             else:
                 st.error("❌ Erro ao salvar. Tente novamente.")
     
-    elif (perfil_usuario in ["SAC", "Desenvolvedor"]) and ("SAC - aguardando documentação" in obter_status_simultaneo_ativo(linha_processo)):
+    elif pode_executar("rpv", "documentacao_sac", perfil_usuario) and ("SAC - aguardando documentação" in obter_status_simultaneo_ativo(linha_processo)):
         st.info("📋 **Sua parte do processo:** Marque quando a documentação SAC estiver pronta.")
         st.warning("Este RPV também está sendo processado pelo perfil Administrativo simultaneamente.")
         
@@ -1427,27 +1131,12 @@ def render_tab_acoes_rpv(df, processo, rpv_id, status_atual, perfil_usuario):
             
             if sac_checkbox_tab:
                 if st.button("🔄 Marcar SAC como Pronto", type="primary", key=f"marcar_sac_tab_{rpv_id}"):
-                    idx = obter_index_rpv_seguro(st.session_state.df_editado_rpv, rpv_id)
-                    if idx is None:
-                        st.error(f"❌ Erro: RPV com ID {rpv_id} não encontrado.")
+                    # SAC pronto (status principal); com o Administrativo já pronto, o fluxo envia para Rodrigo
+                    avancadas = executar_transicao_rpv(rpv_id, "documentacao_sac")
+                    if avancadas is None:
                         return
                     
-                    # Atualizar status SAC (sempre no status principal)
-                    st.session_state.df_editado_rpv.loc[idx, "Status"] = "SAC - documentação pronta"
-                    st.session_state.df_editado_rpv.loc[idx, "SAC Documentacao Pronta"] = "Sim"
-                    st.session_state.df_editado_rpv.loc[idx, "Data SAC Documentacao"] = str(datetime.now().strftime("%d/%m/%Y %H:%M"))
-                    st.session_state.df_editado_rpv.loc[idx, "SAC Responsavel"] = str(st.session_state.get("usuario", "Sistema"))
-                    
-                    # Verificar se Administrativo também finalizou
-                    admin_finalizado = st.session_state.df_editado_rpv.loc[idx, "Admin Documentacao Pronta"] == "Sim"
-                    
-                    if admin_finalizado:
-                        # Ambos finalizaram - avançar automaticamente para "Enviado para Rodrigo"
-                        st.session_state.df_editado_rpv = finalizar_status_simultaneo(
-                            st.session_state.df_editado_rpv,
-                            rpv_id,
-                            "Enviado para Rodrigo"
-                        )
+                    if avancadas:
                         st.success("✅ SAC finalizado! Como Administrativo já havia finalizado, o RPV foi automaticamente enviado para Rodrigo.")
                     else:
                         st.success("✅ SAC finalizado! Aguardando finalização do Administrativo.")
@@ -1463,7 +1152,7 @@ def render_tab_acoes_rpv(df, processo, rpv_id, status_atual, perfil_usuario):
             st.success(f"✅ SAC já marcou documentação como pronta em {linha_processo.get('Data SAC Documentacao', 'N/A')}")
             st.info("ℹ️ Esta etapa já foi concluída. Aguardando conclusão da documentação Administrativa para prosseguir.")
     
-    elif (perfil_usuario in ["Administrativo", "Desenvolvedor"]) and ("Administrativo - aguardando documentação" in obter_status_simultaneo_ativo(linha_processo)):       
+    elif pode_executar("rpv", "documentacao_admin", perfil_usuario) and ("Administrativo - aguardando documentação" in obter_status_simultaneo_ativo(linha_processo)):       
         st.info("🏢 **Sua parte do processo:** Marque quando a documentação Administrativa estiver pronta.")
         st.warning("Este RPV também está sendo processado pelo perfil SAC simultaneamente.")
         
@@ -1484,27 +1173,12 @@ def render_tab_acoes_rpv(df, processo, rpv_id, status_atual, perfil_usuario):
             
             if admin_checkbox_tab:
                 if st.button("🔄 Marcar Administrativo como Pronto", type="primary", key=f"marcar_admin_tab_{rpv_id}"):
-                    idx = obter_index_rpv_seguro(st.session_state.df_editado_rpv, rpv_id)
-                    if idx is None:
-                        st.error(f"❌ Erro: RPV com ID {rpv_id} não encontrado.")
+                    # Administrativo pronto (status secundário); com o SAC já pronto, o fluxo envia para Rodrigo
+                    avancadas = executar_transicao_rpv(rpv_id, "documentacao_admin")
+                    if avancadas is None:
                         return
                     
-                    # Atualizar status Administrativo (sempre no status secundário)
-                    st.session_state.df_editado_rpv.loc[idx, "Status Secundario"] = "Administrativo - documentação pronta"
-                    st.session_state.df_editado_rpv.loc[idx, "Admin Documentacao Pronta"] = "Sim"
-                    st.session_state.df_editado_rpv.loc[idx, "Data Admin Documentacao"] = str(datetime.now().strftime("%d/%m/%Y %H:%M"))
-                    st.session_state.df_editado_rpv.loc[idx, "Admin Responsavel"] = str(st.session_state.get("usuario", "Sistema"))
-                    
-                    # Verificar se SAC também finalizou
-                    sac_finalizado = st.session_state.df_editado_rpv.loc[idx, "SAC Documentacao Pronta"] == "Sim"
-                    
-                    if sac_finalizado:
-                        # Ambos finalizaram - avançar automaticamente para "Enviado para Rodrigo"
-                        st.session_state.df_editado_rpv = finalizar_status_simultaneo(
-                            st.session_state.df_editado_rpv,
-                            rpv_id,
-                            "Enviado para Rodrigo"
-                        )
+                    if avancadas:
                         st.success("✅ Administrativo finalizado! Como SAC já havia finalizado, o RPV foi automaticamente enviado para Rodrigo.")
                     else:
                         st.success("✅ Administrativo finalizado! Aguardando finalização do SAC.")
@@ -1732,7 +1406,7 @@ def render_tab_acoes_rpv(df, processo, rpv_id, status_atual, perfil_usuario):
                 st.warning(f"⚠️ Seu perfil ({perfil_usuario}) não pode editar este status.")
     
     # TRATAMENTO ESPECÍFICO PARA STATUS "ENVIADO PARA RODRIGO"
-    elif status_atual == "Enviado para Rodrigo" and perfil_usuario in ["Financeiro", "Desenvolvedor"]:
+    elif status_atual == "Enviado para Rodrigo" and pode_executar("rpv", "registrar_recebimento", perfil_usuario):
         st.info("📋 **RPV Enviado para Rodrigo** - Anexe o comprovante de recebimento para prosseguir para o pagamento.")
         
         # Mostrar informações da validação
@@ -1766,11 +1440,9 @@ def render_tab_acoes_rpv(df, processo, rpv_id, status_atual, perfil_usuario):
                         arquivo_nome = salvar_arquivo_anexo(uploaded_file, rpv_id, "recebimento")
                         
                         if arquivo_nome:
-                            # Atualizar status para aguardando pagamento
-                            st.session_state.df_editado_rpv.loc[idx, "Status"] = "aguardando pagamento"
-                            st.session_state.df_editado_rpv.loc[idx, "Comprovante Recebimento"] = str(arquivo_nome)
-                            st.session_state.df_editado_rpv.loc[idx, "Data Recebimento"] = str(datetime.now().strftime("%d/%m/%Y %H:%M"))
-                            st.session_state.df_editado_rpv.loc[idx, "Recebido Por"] = str(st.session_state.get("usuario", "Sistema"))
+                            # Atualizar status para aguardando pagamento (data/responsável do fluxo)
+                            aplicar_transicao(st.session_state.df_editado_rpv, "rpv", idx, "registrar_recebimento",
+                                              valores={"Comprovante Recebimento": str(arquivo_nome)})
                             
                             save_data_to_github_seguro(st.session_state.df_editado_rpv, "lista_rpv.csv", "file_sha_rpv")
                             st.success("✅ Comprovante salvo! RPV agora está aguardando pagamento.")
@@ -1790,7 +1462,8 @@ def render_tab_acoes_rpv(df, processo, rpv_id, status_atual, perfil_usuario):
                 if idx is None:
                     st.error(f"❌ Erro: RPV com ID {rpv_id} não encontrado.")
                     return
-                st.session_state.df_editado_rpv.loc[idx, "Status"] = "aguardando pagamento"
+                # Recebimento já registrado junto com o comprovante: só o status muda
+                aplicar_transicao(st.session_state.df_editado_rpv, "rpv", idx, "registrar_recebimento", carimbar=False)
                 save_data_to_github_seguro(st.session_state.df_editado_rpv, "lista_rpv.csv", "file_sha_rpv")
                 st.success("✅ RPV avançado para aguardando pagamento!")
                 # Fechar o card expandido
@@ -1798,7 +1471,7 @@ def render_tab_acoes_rpv(df, processo, rpv_id, status_atual, perfil_usuario):
                 st.rerun()
     
     # TRATAMENTO ESPECÍFICO PARA STATUS "AGUARDANDO PAGAMENTO"
-    elif status_atual == "aguardando pagamento" and perfil_usuario in ["Financeiro", "Desenvolvedor"]:
+    elif status_atual == "aguardando pagamento" and pode_executar("rpv", "finalizar", perfil_usuario):
         st.info("💳 **Aguardando Pagamento** - Anexe o comprovante de pagamento para finalizar o RPV.")
         
         # Mostrar info do recebimento
@@ -1830,12 +1503,9 @@ def render_tab_acoes_rpv(df, processo, rpv_id, status_atual, perfil_usuario):
                         arquivo_nome = salvar_arquivo_anexo(uploaded_file, rpv_id, "pagamento")
                         
                         if arquivo_nome:
-                            # Finalizar RPV
-                            st.session_state.df_editado_rpv.loc[idx, "Status"] = "finalizado"
-                            st.session_state.df_editado_rpv.loc[idx, "Comprovante Pagamento"] = str(arquivo_nome)
-                            st.session_state.df_editado_rpv.loc[idx, "Data Pagamento"] = str(datetime.now().strftime("%d/%m/%Y %H:%M"))
-                            st.session_state.df_editado_rpv.loc[idx, "Pago Por"] = str(st.session_state.get("usuario", "Sistema"))
-                            st.session_state.df_editado_rpv.loc[idx, "Data Finalizacao"] = str(datetime.now().strftime("%d/%m/%Y %H:%M"))
+                            # Finalizar RPV (datas de pagamento/finalização e responsável do fluxo)
+                            aplicar_transicao(st.session_state.df_editado_rpv, "rpv", idx, "finalizar",
+                                              valores={"Comprovante Pagamento": str(arquivo_nome)})
                             
                             save_data_to_github_seguro(st.session_state.df_editado_rpv, "lista_rpv.csv", "file_sha_rpv")
                             st.success("🎉 RPV finalizado com sucesso!")
@@ -2136,14 +1806,17 @@ def exibir_informacoes_basicas_rpv(linha_rpv, estilo="padrao"):
         estilo: "padrao", "compacto", ou "horizontal"
     """
     
+    # Textos tratados uma vez para a linha (vazios, valores em reais), lidos direto pelos estilos
+    exibicao = linha_exibicao(linha_rpv, "rpv")
+    
     if estilo == "padrao":
-        exibir_info_estilo_padrao(linha_rpv)
+        exibir_info_estilo_padrao(linha_rpv, exibicao)
     elif estilo == "compacto":
-        exibir_info_estilo_compacto(linha_rpv)
+        exibir_info_estilo_compacto(linha_rpv, exibicao)
     elif estilo == "horizontal":
-        exibir_info_estilo_horizontal(linha_rpv)
+        exibir_info_estilo_horizontal(linha_rpv, exibicao)
 
-def exibir_info_estilo_padrao(linha_rpv):
+def exibir_info_estilo_padrao(linha_rpv, exibicao):
     """Estilo padrão - 3 colunas com cards verticais"""
     # Estilo CSS para os cards
     st.markdown("""
@@ -2191,18 +1864,18 @@ def exibir_info_estilo_padrao(linha_rpv):
         st.markdown(f"""
         <div class="info-card">
             <div class="info-title">📄 Número do Processo</div>
-            <div class="info-value">{safe_get_value(linha_rpv, 'Processo')}</div>
+            <div class="info-value">{valor_exibicao(exibicao, 'Processo')}</div>
             
             <div class="info-title">👤 Beneficiário</div>
-            <div class="info-value">{safe_get_value(linha_rpv, 'Beneficiário')}</div>
+            <div class="info-value">{valor_exibicao(exibicao, 'Beneficiário')}</div>
             
             <div class="info-title">🆔 CPF</div>
-            <div class="info-value">{safe_get_value(linha_rpv, 'CPF')}</div>
+            <div class="info-value">{valor_exibicao(exibicao, 'CPF')}</div>
         </div>
         """, unsafe_allow_html=True)
     
     with col2:
-        status_atual = safe_get_value(linha_rpv, 'Status')
+        status_atual = valor_exibicao(exibicao, 'Status')
         status_class = {
             "Enviado ao Financeiro": "status-enviado",
             "Aguardando Certidão": "status-aguardando",
@@ -2219,26 +1892,26 @@ def exibir_info_estilo_padrao(linha_rpv):
             </div>
             
             <div class="info-title">🏛️ Órgão Judicial</div>
-            <div class="info-value">{safe_get_value(linha_rpv, 'Orgao Judicial')}</div>
+            <div class="info-value">{valor_exibicao(exibicao, 'Orgao Judicial')}</div>
             
             <div class="info-title">⚖️ Vara</div>
-            <div class="info-value">{safe_get_value(linha_rpv, 'Vara', 'Não informada')}</div>
+            <div class="info-value">{valor_exibicao(exibicao, 'Vara', 'Não informada')}</div>
             
             <div class="info-title">📂 Assunto</div>
-            <div class="info-value">{safe_get_value(linha_rpv, 'Assunto')}</div>
+            <div class="info-value">{valor_exibicao(exibicao, 'Assunto')}</div>
         </div>
         """, unsafe_allow_html=True)
     
     with col3:
-        valor_cliente = safe_get_value(linha_rpv, 'Valor Cliente', '0.00')
-        mes_competencia = safe_get_value(linha_rpv, 'Mês Competência')
-        data_cadastro = safe_get_value(linha_rpv, 'Data Cadastro')
-        cadastrado_por = safe_get_value(linha_rpv, 'Cadastrado Por')
+        valor_cliente = valor_exibicao(exibicao, 'Valor Cliente', 'R$ 0,00')
+        mes_competencia = valor_exibicao(exibicao, 'Mês Competência')
+        data_cadastro = valor_exibicao(exibicao, 'Data Cadastro')
+        cadastrado_por = valor_exibicao(exibicao, 'Cadastrado Por')
         
         st.markdown(f"""
         <div class="info-card">
             <div class="info-title">💰 Valor Cliente</div>
-            <div class="info-value">R$ {valor_cliente}</div>
+            <div class="info-value">{valor_cliente}</div>
             
             <div class="info-title">📅 Mês Competência</div>
             <div class="info-value">{mes_competencia}</div>
@@ -2252,7 +1925,7 @@ def exibir_info_estilo_padrao(linha_rpv):
         """, unsafe_allow_html=True)
     
     # Informações adicionais se houver
-    observacoes = safe_get_value(linha_rpv, 'Observações', '')
+    observacoes = valor_exibicao(exibicao, 'Observações', '')
     # Verificar se observacoes é uma string válida e não vazia
     if observacoes and observacoes != 'N/A' and observacoes.strip():
         st.markdown(f"""
@@ -2264,7 +1937,7 @@ def exibir_info_estilo_padrao(linha_rpv):
     
     st.markdown("---")
 
-def exibir_info_estilo_compacto(linha_rpv):
+def exibir_info_estilo_compacto(linha_rpv, exibicao):
     """Estilo compacto - informações em grid menor"""
     st.markdown("""
     <style>
@@ -2305,7 +1978,7 @@ def exibir_info_estilo_compacto(linha_rpv):
     </style>
     """, unsafe_allow_html=True)
     
-    status_atual = safe_get_value(linha_rpv, 'Status')
+    status_atual = valor_exibicao(exibicao, 'Status')
     status_class = {
         "Enviado ao Financeiro": "background-color: #fff3cd; color: #856404;",
         "Aguardando Certidão": "background-color: #d1ecf1; color: #0c5460;",
@@ -2322,15 +1995,15 @@ def exibir_info_estilo_compacto(linha_rpv):
     <div class="compact-grid">
         <div class="compact-item">
             <div class="compact-label">📄 PROCESSO</div>
-            <div class="compact-value">{safe_get_value(linha_rpv, 'Processo')}</div>
+            <div class="compact-value">{valor_exibicao(exibicao, 'Processo')}</div>
         </div>
         <div class="compact-item">
             <div class="compact-label">👤 BENEFICIÁRIO</div>
-            <div class="compact-value">{safe_get_value(linha_rpv, 'Beneficiário')}</div>
+            <div class="compact-value">{valor_exibicao(exibicao, 'Beneficiário')}</div>
         </div>
         <div class="compact-item">
             <div class="compact-label">🆔 CPF</div>
-            <div class="compact-value">{safe_get_value(linha_rpv, 'CPF')}</div>
+            <div class="compact-value">{valor_exibicao(exibicao, 'CPF')}</div>
         </div>
         <div class="compact-item">
             <div class="compact-label">📊 STATUS</div>
@@ -2340,7 +2013,7 @@ def exibir_info_estilo_compacto(linha_rpv):
         </div>
         <div class="compact-item">
             <div class="compact-label">💰 VALOR CLIENTE</div>
-            <div class="compact-value">R$ {safe_get_value(linha_rpv, 'Valor Cliente', '0.00')}</div>
+            <div class="compact-value">{valor_exibicao(exibicao, 'Valor Cliente', 'R$ 0,00')}</div>
         </div>
         <div class="compact-item">
             <div class="compact-label">💼 TOTAL HC</div>
@@ -2348,11 +2021,11 @@ def exibir_info_estilo_compacto(linha_rpv):
         </div>
         <div class="compact-item">
             <div class="compact-label">🏛️ ÓRGÃO</div>
-            <div class="compact-value">{safe_get_value(linha_rpv, 'Orgao Judicial')[:20]}...</div>
+            <div class="compact-value">{valor_exibicao(exibicao, 'Orgao Judicial')[:20]}...</div>
         </div>
         <div class="compact-item">
             <div class="compact-label">⚖️ VARA</div>
-            <div class="compact-value">{safe_get_value(linha_rpv, 'Vara', 'N/A')[:15]}...</div>
+            <div class="compact-value">{valor_exibicao(exibicao, 'Vara', 'N/A')[:15]}...</div>
         </div>
     </div>
     """, unsafe_allow_html=True)
@@ -2361,7 +2034,7 @@ def exibir_info_estilo_compacto(linha_rpv):
     # Mostrar detalhes dos honorários contratuais
     mostrar_detalhes_hc_rpv(linha_rpv, "compacto")
 
-def exibir_info_estilo_horizontal(linha_rpv):
+def exibir_info_estilo_horizontal(linha_rpv, exibicao):
     """Estilo horizontal - cards em linha"""
     st.markdown("""
     <style>
@@ -2404,19 +2077,19 @@ def exibir_info_estilo_horizontal(linha_rpv):
     
     st.markdown("### 📋 Visão Geral do Processo")
     
-    status_atual = safe_get_value(linha_rpv, 'Status')
+    status_atual = valor_exibicao(exibicao, 'Status')
     card_class = "primary"
     if status_atual == "Finalizado":
         card_class = "success"
     elif "Atrasado" in status_atual:
         card_class = "warning"
     
-    processo_val = safe_get_value(linha_rpv, 'Processo')
-    beneficiario_val = safe_get_value(linha_rpv, 'Beneficiário')
-    valor_val = safe_get_value(linha_rpv, 'Valor Cliente', '0.00')
-    competencia_val = safe_get_value(linha_rpv, 'Mês Competência')
-    orgao_val = safe_get_value(linha_rpv, 'Orgao Judicial')
-    assunto_val = safe_get_value(linha_rpv, 'Assunto')
+    processo_val = valor_exibicao(exibicao, 'Processo')
+    beneficiario_val = valor_exibicao(exibicao, 'Beneficiário')
+    valor_val = valor_exibicao(exibicao, 'Valor Cliente', 'R$ 0,00')
+    competencia_val = valor_exibicao(exibicao, 'Mês Competência')
+    orgao_val = valor_exibicao(exibicao, 'Orgao Judicial')
+    assunto_val = valor_exibicao(exibicao, 'Assunto')
     
     # Truncar textos longos de forma segura
     orgao_truncado = orgao_val[:15] + '...' if len(orgao_val) > 15 and orgao_val != 'N/A' else orgao_val
@@ -2475,32 +2148,17 @@ def interface_edicao_rpv(df, rpv_id, status_atual, perfil_usuario):
     tem_simultaneo = tem_status_simultaneo(linha_rpv)
     status_secundario = linha_rpv.get("Status Secundario", "")
     status_ativos = obter_status_simultaneo_ativo(linha_rpv)
-    if status_atual == "Cadastro" and perfil_usuario in ["Cadastrador", "Desenvolvedor"]:
+    if status_atual == "Cadastro" and pode_executar("rpv", "finalizar_cadastro", perfil_usuario):
         st.info("Após finalizar o cadastro, este RPV será enviado simultaneamente para **SAC** e **Administrativo**.")
         
         # Gerar chave única para o botão
         unique_key = f"finalizar_cadastro_{rpv_id}"
         
         if st.button("✅ Finalizar Cadastro e Enviar", type="primary", key=unique_key):
-            # Verificar se o RPV ainda existe no DataFrame de trabalho
-            idx = obter_index_rpv_seguro(df_trabalho, rpv_id)
-            if idx is None:
-                st.error(f"❌ Erro: RPV com ID {rpv_id} não encontrado no DataFrame.")
+            # Status simultâneo SAC + Administrativo e data/responsável do envio (fluxo declarado)
+            if executar_transicao_rpv(rpv_id, "finalizar_cadastro") is None:
                 return
             
-            # Iniciar status simultâneo
-            st.session_state.df_editado_rpv = iniciar_status_simultaneo(
-                st.session_state.df_editado_rpv,
-                rpv_id,
-                "SAC - aguardando documentação",
-                "Administrativo - aguardando documentação"
-            )
-            
-            # Adicionar data de envio
-            now = str(datetime.now().strftime("%d/%m/%Y %H:%M"))
-            st.session_state.df_editado_rpv.loc[idx, "Data Envio"] = now
-            st.session_state.df_editado_rpv.loc[idx, "Enviado Por"] = str(st.session_state.get("usuario", "Sistema"))
-            
             # Salvamento automático
             novo_sha = save_data_to_github_seguro(
                 st.session_state.df_editado_rpv,
@@ -2515,7 +2173,7 @@ def interface_edicao_rpv(df, rpv_id, status_atual, perfil_usuario):
             else:
                 st.error("❌ Erro ao salvar. Tente novamente.")
     
-    elif (perfil_usuario in ["SAC", "Desenvolvedor"]) and ("SAC - aguardando documentação" in status_ativos):
+    elif pode_executar("rpv", "documentacao_sac", perfil_usuario) and ("SAC - aguardando documentação" in status_ativos):
         st.info("📋 **Sua parte do processo:** Marque quando a documentação SAC estiver pronta.")
         st.warning("Este RPV também está sendo processado pelo perfil Administrativo simultaneamente.")
         
@@ -2537,27 +2195,12 @@ def interface_edicao_rpv(df, rpv_id, status_atual, perfil_usuario):
             if sac_doc_checkbox:
                 unique_key_btn_sac = f"btn_sac_pronto_{rpv_id}"
                 if st.button("🔄 Marcar SAC como Pronto", type="primary", key=unique_key_btn_sac):
-                    idx = obter_index_rpv_seguro(st.session_state.df_editado_rpv, rpv_id)
-                    if idx is None:
-                        st.error(f"❌ Erro: RPV com ID {rpv_id} não encontrado.")
+                    # SAC pronto (status principal); com o Administrativo já pronto, o fluxo envia para Rodrigo
+                    avancadas = executar_transicao_rpv(rpv_id, "documentacao_sac")
+                    if avancadas is None:
                         return
                     
-                    # Atualizar status SAC (sempre no status principal)
-                    st.session_state.df_editado_rpv.loc[idx, "Status"] = "SAC - documentação pronta"
-                    st.session_state.df_editado_rpv.loc[idx, "SAC Documentacao Pronta"] = "Sim"
-                    st.session_state.df_editado_rpv.loc[idx, "Data SAC Documentacao"] = str(datetime.now().strftime("%d/%m/%Y %H:%M"))
-                    st.session_state.df_editado_rpv.loc[idx, "SAC Responsavel"] = str(st.session_state.get("usuario", "Sistema"))
-                    
-                    # Verificar se Administrativo também finalizou
-                    admin_finalizado = st.session_state.df_editado_rpv.loc[idx, "Admin Documentacao Pronta"] == "Sim"
-                    
-                    if admin_finalizado:
-                        # Ambos finalizaram - avançar automaticamente para "Enviado para Rodrigo"
-                        st.session_state.df_editado_rpv = finalizar_status_simultaneo(
-                            st.session_state.df_editado_rpv,
-                            rpv_id,
-                            "Enviado para Rodrigo"
-                        )
+                    if avancadas:
                         st.success("✅ SAC finalizado! Como Administrativo já havia finalizado, o RPV foi automaticamente enviado para Rodrigo.")
                     else:
                         st.success("✅ SAC finalizado! Aguardando finalização do Administrativo.")
@@ -2572,7 +2215,7 @@ def interface_edicao_rpv(df, rpv_id, status_atual, perfil_usuario):
         else:
             st.success(f"✅ SAC já marcou documentação como pronta em {linha_rpv.get('Data SAC Documentacao', 'N/A')}")
             st.info("ℹ️ Esta etapa já foi concluída. Aguardando conclusão da documentação Administrativa para prosseguir.")
-    elif (perfil_usuario in ["Administrativo", "Desenvolvedor"]) and ("Administrativo - aguardando documentação" in status_ativos):
+    elif pode_executar("rpv", "documentacao_admin", perfil_usuario) and ("Administrativo - aguardando documentação" in status_ativos):
         st.info("🏢 **Sua parte do processo:** Marque quando a documentação Administrativa estiver pronta.")
         st.warning("Este RPV também está sendo processado pelo perfil SAC simultaneamente.")
         
@@ -2594,27 +2237,12 @@ def interface_edicao_rpv(df, rpv_id, status_atual, perfil_usuario):
             if admin_doc_checkbox:
                 unique_key_btn_admin = f"btn_admin_pronto_{rpv_id}"
                 if st.button("🔄 Marcar Administrativo como Pronto", type="primary", key=unique_key_btn_admin):
-                    idx = obter_index_rpv_seguro(st.session_state.df_editado_rpv, rpv_id)
-                    if idx is None:
-                        st.error(f"❌ Erro: RPV com ID {rpv_id} não encontrado.")
+                    # Administrativo pronto (status secundário); com o SAC já pronto, o fluxo envia para Rodrigo
+                    avancadas = executar_transicao_rpv(rpv_id, "documentacao_admin")
+                    if avancadas is None:
                         return
                     
-                    # Atualizar status Administrativo (sempre no status secundário)
-                    st.session_state.df_editado_rpv.loc[idx, "Status Secundario"] = "Administrativo - documentação pronta"
-                    st.session_state.df_editado_rpv.loc[idx, "Admin Documentacao Pronta"] = "Sim"
-                    st.session_state.df_editado_rpv.loc[idx, "Data Admin Documentacao"] = str(datetime.now().strftime("%d/%m/%Y %H:%M"))
-                    st.session_state.df_editado_rpv.loc[idx, "Admin Responsavel"] = str(st.session_state.get("usuario", "Sistema"))
-                    
-                    # Verificar se SAC também finalizou
-                    sac_finalizado = st.session_state.df_editado_rpv.loc[idx, "SAC Documentacao Pronta"] == "Sim"
-                    
-                    if sac_finalizado:
-                        # Ambos finalizaram - avançar automaticamente para "Enviado para Rodrigo"
-                        st.session_state.df_editado_rpv = finalizar_status_simultaneo(
-                            st.session_state.df_editado_rpv,
-                            rpv_id,
-                            "Enviado para Rodrigo"
-                        )
+                    if avancadas:
                         st.success("✅ Administrativo finalizado! Como SAC já havia finalizado, o RPV foi automaticamente enviado para Rodrigo.")
                     else:
                         st.success("✅ Administrativo finalizado! Aguardando finalização do SAC.")
@@ -2655,26 +2283,12 @@ def interface_edicao_rpv(df, rpv_id, status_atual, perfil_usuario):
                 
                 if admin_sac_checkbox:
                     if st.button("🔄 Marcar SAC como Pronto", key=f"admin_sac_btn_{rpv_id}"):
-                        idx = obter_index_rpv_seguro(st.session_state.df_editado_rpv, rpv_id)
-                        if idx is None:
-                            st.error(f"❌ Erro: RPV com ID {rpv_id} não encontrado.")
+                        # SAC pronto (status principal); com o Administrativo já pronto, o fluxo envia para Rodrigo
+                        avancadas = executar_transicao_rpv(rpv_id, "documentacao_sac")
+                        if avancadas is None:
                             return
                         
-                        st.session_state.df_editado_rpv.loc[idx, "Status"] = "SAC - documentação pronta"
-                        st.session_state.df_editado_rpv.loc[idx, "SAC Documentacao Pronta"] = "Sim"
-                        st.session_state.df_editado_rpv.loc[idx, "Data SAC Documentacao"] = str(datetime.now().strftime("%d/%m/%Y %H:%M"))
-                        st.session_state.df_editado_rpv.loc[idx, "SAC Responsavel"] = str(st.session_state.get("usuario", "Desenvolvedor"))
-                        
-                        # Verificar se Administrativo também finalizou
-                        admin_finalizado = st.session_state.df_editado_rpv.loc[idx, "Admin Documentacao Pronta"] == "Sim"
-                        
-                        if admin_finalizado:
-                            # Ambos finalizaram - avançar automaticamente para "Enviado para Rodrigo"
-                            st.session_state.df_editado_rpv = finalizar_status_simultaneo(
-                                st.session_state.df_editado_rpv,
-                                rpv_id,
-                                "Enviado para Rodrigo"
-                            )
+                        if avancadas:
                             st.success("✅ SAC finalizado! Como Administrativo já havia finalizado, o RPV foi automaticamente enviado para Rodrigo.")
                         else:
                             st.success("✅ SAC finalizado! Aguardando finalização do Administrativo.")
@@ -2709,22 +2323,10 @@ def interface_edicao_rpv(df, rpv_id, status_atual, perfil_usuario):
                 
                 if admin_admin_checkbox:
                     if st.button("🔄 Marcar Administrativo como Pronto", key=f"admin_admin_btn_{rpv_id}"):
-                        idx = obter_index_rpv_seguro(st.session_state.df_editado_rpv, rpv_id)
-                        if idx is None:
-                            st.error(f"❌ Erro: RPV com ID {rpv_id} não encontrado.")
+                        # Administrativo pronto; com o SAC já pronto, o fluxo avança para Rodrigo
+                        if executar_transicao_rpv(rpv_id, "documentacao_admin") is None:
                             return
                         
-                        st.session_state.df_editado_rpv.loc[idx, "Status Secundario"] = "Administrativo - documentação pronta"
-                        st.session_state.df_editado_rpv.loc[idx, "Admin Documentacao Pronta"] = "Sim"
-                        st.session_state.df_editado_rpv.loc[idx, "Data Admin Documentacao"] = str(datetime.now().strftime("%d/%m/%Y %H:%M"))
-                        st.session_state.df_editado_rpv.loc[idx, "Admin Responsavel"] = str(st.session_state.get("usuario", "Desenvolvedor"))
-                        
-                        # Verificar se SAC também finalizou para avançar automaticamente
-                        sac_finalizado = st.session_state.df_editado_rpv.loc[idx, "SAC Documentacao Pronta"] == "Sim"
-                        if sac_finalizado:
-                            # Ambos finalizaram, avançar para próxima fase
-                            finalizar_status_simultaneo(st.session_state.df_editado_rpv, rpv_id, "Enviado para Rodrigo")
-                        
                         # Limpar checkboxes para evitar estados inconsistentes
                         limpar_checkboxes_rpv(rpv_id)
                         
@@ -2802,7 +2404,7 @@ def interface_edicao_rpv(df, rpv_id, status_atual, perfil_usuario):
             
             st.info("💡 **Importante:** Quando **AMBAS** as etapas estiverem completas, você poderá validar e enviar para Rodrigo.")
     
-    elif status_atual == "Enviado para Rodrigo" and perfil_usuario in ["Financeiro", "Desenvolvedor"]:
+    elif status_atual == "Enviado para Rodrigo" and pode_executar("rpv", "registrar_recebimento", perfil_usuario):
         st.info("� **RPV Enviado para Rodrigo** - Anexe o comprovante de recebimento para prosseguir para o pagamento.")
         
         # Mostrar informações da validação
@@ -2836,11 +2438,9 @@ def interface_edicao_rpv(df, rpv_id, status_atual, perfil_usuario):
                         arquivo_nome = salvar_arquivo_anexo(uploaded_file, rpv_id, "recebimento")
                         
                         if arquivo_nome:
-                            # Atualizar status para aguardando pagamento
-                            st.session_state.df_editado_rpv.loc[idx, "Status"] = "aguardando pagamento"
-                            st.session_state.df_editado_rpv.loc[idx, "Comprovante Recebimento"] = str(arquivo_nome)
-                            st.session_state.df_editado_rpv.loc[idx, "Data Recebimento"] = str(datetime.now().strftime("%d/%m/%Y %H:%M"))
-                            st.session_state.df_editado_rpv.loc[idx, "Recebido Por"] = str(st.session_state.get("usuario", "Sistema"))
+                            # Atualizar status para aguardando pagamento (data/responsável do fluxo)
+                            aplicar_transicao(st.session_state.df_editado_rpv, "rpv", idx, "registrar_recebimento",
+                                              valores={"Comprovante Recebimento": str(arquivo_nome)})
                             
                             save_data_to_github_seguro(st.session_state.df_editado_rpv, "lista_rpv.csv", "file_sha_rpv")
                             st.session_state.show_rpv_dialog = False
@@ -2859,13 +2459,14 @@ def interface_edicao_rpv(df, rpv_id, status_atual, perfil_usuario):
                 if idx is None:
                     st.error(f"❌ Erro: RPV com ID {rpv_id} não encontrado.")
                     return
-                st.session_state.df_editado_rpv.loc[idx, "Status"] = "aguardando pagamento"
+                # Recebimento já registrado junto com o comprovante: só o status muda
+                aplicar_transicao(st.session_state.df_editado_rpv, "rpv", idx, "registrar_recebimento", carimbar=False)
                 save_data_to_github_seguro(st.session_state.df_editado_rpv, "lista_rpv.csv", "file_sha_rpv")
                 st.session_state.show_rpv_dialog = False
                 st.success("✅ RPV avançado para aguardando pagamento!")
                 st.rerun()
     
-    elif status_atual == "aguardando pagamento" and perfil_usuario in ["Financeiro", "Desenvolvedor"]:
+    elif status_atual == "aguardando pagamento" and pode_executar("rpv", "finalizar", perfil_usuario):
         st.info("💳 **Aguardando Pagamento** - Anexe o comprovante de pagamento para finalizar o RPV.")
         
         # Mostrar info do recebimento
@@ -2897,12 +2498,9 @@ def interface_edicao_rpv(df, rpv_id, status_atual, perfil_usuario):
                         arquivo_nome = salvar_arquivo_anexo(uploaded_file, rpv_id, "pagamento")
                         
                         if arquivo_nome:
-                            # Finalizar RPV
-                            st.session_state.df_editado_rpv.loc[idx, "Status"] = "finalizado"
-                            st.session_state.df_editado_rpv.loc[idx, "Comprovante Pagamento"] = str(arquivo_nome)
-                            st.session_state.df_editado_rpv.loc[idx, "Data Pagamento"] = str(datetime.now().strftime("%d/%m/%Y %H:%M"))
-                            st.session_state.df_editado_rpv.loc[idx, "Pago Por"] = str(st.session_state.get("usuario", "Sistema"))
-                            st.session_state.df_editado_rpv.loc[idx, "Data Finalizacao"] = str(datetime.now().strftime("%d/%m/%Y %H:%M"))
+                            # Finalizar RPV (datas de pagamento/finalização e responsável do fluxo)
+                            aplicar_transicao(st.session_state.df_editado_rpv, "rpv", idx, "finalizar",
+                                              valores={"Comprovante Pagamento": str(arquivo_nome)})
                             
                             save_data_to_github_seguro(st.session_state.df_editado_rpv, "lista_rpv.csv", "file_sha_rpv")
                             st.session_state.show_rpv_dialog = False
@@ -3138,18 +2736,11 @@ def interface_visualizar_dados_rpv(df):
         st.metric("⏳ Em Andamento", f"{pendentes} ({taxa_pendentes:.1f}%)")
     
     with col4:
-        if "Data Cadastro" in df.columns:
-            hoje = datetime.now().strftime("%d/%m/%Y")
-            df_temp = df.copy()
-            df_temp["Data Cadastro"] = df_temp["Data Cadastro"].astype(str)
-            hoje_count = len(df_temp[df_temp["Data Cadastro"].str.contains(hoje, na=False)])
-        else:
-            hoje_count = 0
+        # Contagem pelo índice de datas da versão (busca binária), sem varrer a coluna como texto
+        hoje = datetime.now().date()
+        hoje_count = contar_no_periodo(df, "rpv", "Data Cadastro", hoje, hoje)
         st.metric("📅 Cadastrados Hoje", hoje_count)
 
-    # Adicionar função de diagnóstico
-    diagnosticar_sistema_rpv()
-
     st.markdown("---")
 
     col_filtro1, col_filtro2, col_filtro3, col_filtro4 = st.columns(4)
@@ -3169,19 +2760,13 @@ def interface_visualizar_dados_rpv(df):
     with col_filtro4:
         pesquisa = st.text_input("🔎 Pesquisar por Beneficiário ou Processo:", key="viz_rpv_search")
 
-    # Aplicar filtros
-    df_visualizado = df.copy()
-    if status_filtro != "Todos" and "Status" in df.columns:
-        df_visualizado = df_visualizado[df_visualizado["Status"] == status_filtro]
-    if usuario_filtro != "Todos" and "Cadastrado Por" in df.columns:
-        df_visualizado = df_visualizado[df_visualizado["Cadastrado Por"] == usuario_filtro]
-    if assunto_filtro != "Todos" and "Assunto" in df.columns:
-        df_visualizado = df_visualizado[df_visualizado["Assunto"] == assunto_filtro]
-    if pesquisa:
-        df_visualizado = df_visualizado[
-            df_visualizado["Beneficiário"].astype(str).str.contains(pesquisa, case=False, na=False) |
-            df_visualizado["Processo"].astype(str).str.contains(pesquisa, case=False, na=False)
-        ]
+    # Aplicar filtros (posições em cache por versão da base e estado dos filtros)
+    posicoes_filtradas = filtrar_posicoes_lista(
+        df, "rpv",
+        filtros={"Status": status_filtro, "Cadastrado Por": usuario_filtro, "Assunto": assunto_filtro},
+        busca=pesquisa
+    )
+    df_visualizado = df.iloc[posicoes_filtradas]
     
     st.markdown("---")
 
@@ -3253,9 +2838,7 @@ def interface_visualizar_dados_rpv(df):
         
         # Formatar valor monetário
         if 'Valor Cliente (R$)' in df_display.columns:
-            df_display['Valor Cliente (R$)'] = df_display['Valor Cliente (R$)'].apply(
-                lambda x: f"R$ {float(x):,.2f}" if pd.notna(x) and str(x).replace('.', '').replace(',', '').isdigit() else str(x)
-            )
+            df_display['Valor Cliente (R$)'] = formatar_coluna_reais(df_display['Valor Cliente (R$)'])
         
         # Configurar o AgGrid
         gb = GridOptionsBuilder.from_dataframe(df_display)
@@ -4061,43 +3644,15 @@ def interface_relatorio_certidao_rpv(df):
             key="relatorio_rpv_pesquisa"
         )
 
-    # Aplicar filtros
-    df_filtrado = df.copy()
-    
-    # Filtro de data de cadastro
-    if data_inicio or data_fim:
-        if "Data Cadastro" in df.columns:
-            # Converter coluna de data para datetime
-            df_filtrado["Data Cadastro Parsed"] = pd.to_datetime(
-                df_filtrado["Data Cadastro"], 
-                format="%d/%m/%Y %H:%M", 
-                errors="coerce"
-            )
-            
-            if data_inicio:
-                data_inicio_dt = pd.to_datetime(data_inicio)
-                df_filtrado = df_filtrado[df_filtrado["Data Cadastro Parsed"] >= data_inicio_dt]
-            
-            if data_fim:
-                data_fim_dt = pd.to_datetime(data_fim) + pd.Timedelta(days=1)
-                df_filtrado = df_filtrado[df_filtrado["Data Cadastro Parsed"] < data_fim_dt]
-    
-    # Filtro de certidão
-    if certidao_options and "Solicitar Certidão" in df.columns:
-        df_filtrado = df_filtrado[df_filtrado["Solicitar Certidão"].isin(certidao_options)]
-    
-    # Filtro de status
-    if status_filtro != "Todos" and "Status" in df.columns:
-        df_filtrado = df_filtrado[df_filtrado["Status"] == status_filtro]
-    
-    # Filtro de pesquisa
-    if pesquisa:
-        mask = pd.Series([False] * len(df_filtrado))
-        colunas_pesquisa = ["Processo", "Beneficiário", "CPF"]
-        for col in colunas_pesquisa:
-            if col in df_filtrado.columns:
-                mask |= df_filtrado[col].astype(str).str.contains(pesquisa, case=False, na=False)
-        df_filtrado = df_filtrado[mask]
+    # Aplicar filtros (data de cadastro, certidão, status e pesquisa) com cache por
+    # versão da base; colunas inexistentes na base são ignoradas pelo filtro
+    posicoes_filtradas = filtrar_posicoes_lista(
+        df, "rpv",
+        filtros={"Solicitar Certidão": certidao_options, "Status": status_filtro},
+        busca=pesquisa,
+        periodo=("Data Cadastro", data_inicio, data_fim)
+    )
+    df_filtrado = df.iloc[posicoes_filtradas]
 
     st.markdown("---")
 
@@ -4331,9 +3886,7 @@ def interface_relatorio_certidao_rpv(df):
         
         # Formatar valores monetários
         if 'Valor Total (R$)' in df_display.columns:
-            df_display['Valor Total (R$)'] = df_display['Valor Total (R$)'].apply(
-                lambda x: f"R$ {float(x):,.2f}" if pd.notna(x) and str(x).replace('.', '').replace(',', '').replace('-', '').isdigit() else str(x)
-            )
+            df_display['Valor Total (R$)'] = formatar_coluna_reais(df_display['Valor Total (R$)'])
         
         # Formatar datas
         if 'Data Cadastro' in df_display.columns:
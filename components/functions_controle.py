@@ -4,6 +4,7 @@ import pandas as pd
 import requests
 import base64
 from datetime import datetime
+from components.fluxo_trabalho import perfis_edicao, pode_editar_status, status_etapas
 
 def tratar_valor_nan(valor, default='Não informado'):
     """
@@ -82,49 +83,15 @@ def obter_cor_status(status, modulo="geral"):
 # CONFIGURAÇÕES DE PERFIS
 # =====================================
 
-PERFIS_ALVARAS = {
-    "Desenvolvedor": ["Cadastrado", "Enviado para o Financeiro", "Financeiro - Enviado para Rodrigo", "Finalizado"],
-    "Cadastrador": ["Cadastrado", "Enviado para o Financeiro"],
-    "Financeiro": ["Enviado para o Financeiro", "Financeiro - Enviado para Rodrigo", "Finalizado"]
-}
+# Status e permissões por perfil - declarados em components/fluxo_trabalho.py
+PERFIS_ALVARAS = perfis_edicao("alvaras")
+STATUS_ETAPAS_ALVARAS = status_etapas("alvaras")
 
+PERFIS_RPV = perfis_edicao("rpv")
+STATUS_ETAPAS_RPV = status_etapas("rpv")
 
-STATUS_ETAPAS_ALVARAS = {
-    1: "Cadastrado",
-    2: "Enviado para o Financeiro",
-    3: "Financeiro - Enviado para Rodrigo",
-    4: "Finalizado"
-}
-
-
-PERFIS_RPV = {
-    "Desenvolvedor": ["Enviado", "Certidão anexa", "Enviado para Rodrigo", "Finalizado"],
-    "Cadastrador": ["Enviado"],
-    "Jurídico": ["Enviado", "Certidão anexa"],
-    "Financeiro": ["Enviado", "Certidão anexa", "Enviado para Rodrigo", "Finalizado"]
-}
-
-STATUS_ETAPAS_RPV = {
-    1: "Enviado",              # ← Era "Cadastrado", agora começa em "Enviado"
-    2: "Certidão anexa",
-    3: "Enviado para Rodrigo",
-    4: "Finalizado"
-}
-
-PERFIS_BENEFICIOS = {
-    "Desenvolvedor": ["Cadastrado", "Enviado para administrativo", "Implantado", "Enviado para o financeiro", "Finalizado"],
-    "Cadastrador": ["Cadastrado", "Enviado para administrativo", "Implantado", "Enviado para o financeiro"],
-    "Administrativo": ["Enviado para administrativo", "Implantado"],
-    "Financeiro": ["Enviado para o financeiro", "Finalizado"],
-    "SAC": ["Enviado para administrativo", "Implantado", "Enviado para o financeiro", "Finalizado"]  # SAC vê tudo
-}
-
-STATUS_ETAPAS_BENEFICIOS = {
-    1: "Enviado para administrativo",  # Começa aqui automaticamente
-    2: "Implantado",
-    3: "Enviado para o financeiro",
-    4: "Finalizado"
-}
+PERFIS_BENEFICIOS = perfis_edicao("beneficios")
+STATUS_ETAPAS_BENEFICIOS = status_etapas("beneficios")
 
 # =====================================
 # FUNÇÕES DE PERFIL E CONTROLE
@@ -149,11 +116,7 @@ def verificar_perfil_usuario_alvaras():
 
 def pode_editar_status_alvaras(status_atual, perfil_usuario):
     """Verifica se o usuário pode editar determinado status"""
-    # Desenvolvedor pode tudo
-    if perfil_usuario == "Desenvolvedor":
-        return True
-    
-    return status_atual in PERFIS_ALVARAS.get(perfil_usuario, [])
+    return pode_editar_status("alvaras", status_atual, perfil_usuario)
 
 def verificar_perfil_usuario_rpv():
     """Verifica o perfil do usuário logado para RPV"""
@@ -170,11 +133,7 @@ def verificar_perfil_usuario_rpv():
 
 def pode_editar_status_rpv(status_atual, perfil_usuario):
     """Verifica se o usuário pode editar determinado status RPV"""
-    # Desenvolvedor pode tudo
-    if perfil_usuario == "Desenvolvedor":
-        return True
-    
-    return status_atual in PERFIS_RPV.get(perfil_usuario, [])
+    return pode_editar_status("rpv", status_atual, perfil_usuario)
 
 def obter_colunas_controle_rpv():
     """Retorna lista das colunas de controle do fluxo RPV"""
@@ -214,11 +173,7 @@ def verificar_perfil_usuario_beneficios():
 
 def pode_editar_status_beneficios(status_atual, perfil_usuario):
     """Verifica se o usuário pode editar determinado status Benefícios"""
-    # Desenvolvedor pode tudo
-    if perfil_usuario == "Desenvolvedor":
-        return True
-    
-    return status_atual in PERFIS_BENEFICIOS.get(perfil_usuario, [])
+    return pode_editar_status("beneficios", status_atual, perfil_usuario)
 
 def obter_colunas_controle_beneficios():
     """Retorna lista das colunas de controle do fluxo Benefícios"""
@@ -417,6 +372,42 @@ def criar_dataframe_vazio_por_tipo(filename):
         return pd.DataFrame(columns=colunas_genericas)
 
 
+def _preparar_base_para_salvar(df, filename, mapeamentos=None):
+    """
+    Aplica a canonização aprovada numa cópia (o DataFrame de quem chamou só muda
+    depois que o salvamento for aceito) e devolve (CSV a enviar, cópia canonizada)
+    """
+    from components.canonizacao import canonizar_dataframe
+    df_canonico = df.copy()
+    canonizar_dataframe(df_canonico, filename, mapeamentos)
+    
+    from io import StringIO
+    csv_buffer = StringIO()
+    df_canonico.to_csv(csv_buffer, index=False, sep=';')
+    return csv_buffer.getvalue(), df_canonico
+
+def _registrar_base_salva(filename, df_anterior, df, df_canonico):
+    """
+    Depois de um salvamento aceito: leva a canonização para o DataFrame de quem chamou,
+    invalida os caches das listas e atualiza o uso do autocomplete.
+    O arquivo já está salvo, então uma falha aqui só gera aviso.
+    """
+    try:
+        for coluna in df.columns:
+            if not df[coluna].equals(df_canonico[coluna]):
+                df[coluna] = df_canonico[coluna]
+        
+        # Invalidar índices/filtros em cache das listas desta base
+        from components.indice_listas import atualizar_indice_busca_salvamento, marcar_base_alterada
+        marcar_base_alterada(filename)
+        atualizar_indice_busca_salvamento(filename, df)
+        
+        # Atualizar a frequência de uso do autocomplete só com o que mudou
+        from components.autocomplete_manager import registrar_uso_autocomplete
+        registrar_uso_autocomplete(filename, df_anterior, df)
+    except Exception as e:
+        st.warning(f"⚠️ {filename} foi salvo, mas houve erro ao atualizar os dados locais: {e}")
+
 def save_data_to_github_seguro(df, filename, session_state_key):
     """Salva DataFrame no GitHub com recarga automática do SHA"""
     try:
@@ -440,10 +431,9 @@ def save_data_to_github_seguro(df, filename, session_state_key):
             "Accept": "application/vnd.github+json"
         }
         
-        from io import StringIO
-        csv_buffer = StringIO()
-        df.to_csv(csv_buffer, index=False, sep=';')
-        content = base64.b64encode(csv_buffer.getvalue().encode("utf-8")).decode("utf-8")
+        # Aplicar os mapeamentos de canonização aprovados (órgãos, assuntos, varas)
+        csv_texto, df_canonico = _preparar_base_para_salvar(df, filename)
+        content = base64.b64encode(csv_texto.encode("utf-8")).decode("utf-8")
         
         data = {
             "message": f"Atualização via Streamlit {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}",
@@ -461,6 +451,8 @@ def save_data_to_github_seguro(df, filename, session_state_key):
             if session_state_key:
                 st.session_state[session_state_key] = novo_sha
             
+            _registrar_base_salva(filename, df_atual, df, df_canonico)
+            
             st.success("✅ Alterações salvas no GitHub com sucesso!")
             return novo_sha
         else:
@@ -471,6 +463,108 @@ def save_data_to_github_seguro(df, filename, session_state_key):
         st.error(f"❌ Erro ao salvar dados: {e}")
         return None
 
+def save_multiple_to_github_seguro(dataframes, mensagem, mapeamentos=None):
+    """
+    Salva várias bases no GitHub em um único commit (API de Git Data), com a mesma
+    preparação e o mesmo registro pós-salvamento de save_data_to_github_seguro
+    
+    Args:
+        dataframes: dict {filename: DataFrame}
+        mensagem: mensagem do commit
+        mapeamentos: canonização a aplicar (ainda não gravada); None para a tabela em uso
+    
+    Returns:
+        dict {filename: novo_sha} ou None em caso de falha
+    """
+    try:
+        if not verificar_token_github():
+            st.error("❌ Token do GitHub inválido. Salvamento cancelado.")
+            return None
+        
+        repo_owner = st.secrets["github"]["repo_owner"]
+        repo_name = st.secrets["github"]["repo_name"]
+        branch = "main"
+        api_repo = f"https://api.github.com/repos/{repo_owner}/{repo_name}/git"
+        headers = {
+            "Authorization": f'token {st.secrets["github"]["token"]}',
+            "Accept": "application/vnd.github+json"
+        }
+        
+        # Commit atual do branch
+        r = requests.get(f"{api_repo}/ref/heads/{branch}", headers=headers)
+        if r.status_code != 200:
+            st.error(f"❌ Erro ao obter branch: {r.status_code} - {r.text}")
+            return None
+        sha_commit_atual = r.json()["object"]["sha"]
+        
+        r = requests.get(f"{api_repo}/commits/{sha_commit_atual}", headers=headers)
+        if r.status_code != 200:
+            st.error(f"❌ Erro ao obter commit: {r.status_code} - {r.text}")
+            return None
+        sha_tree_base = r.json()["tree"]["sha"]
+        
+        # Versões atuais, para atualizar o uso do autocomplete só com o que mudou
+        anteriores = {filename: load_data_from_github(filename)[0] for filename in dataframes}
+        
+        # Um blob por arquivo
+        novos_shas = {}
+        itens_tree = []
+        canonicos = {}
+        for filename, df in dataframes.items():
+            csv_texto, canonicos[filename] = _preparar_base_para_salvar(df, filename, mapeamentos)
+            
+            r = requests.post(
+                f"{api_repo}/blobs",
+                headers=headers,
+                json={"content": csv_texto, "encoding": "utf-8"}
+            )
+            if r.status_code != 201:
+                st.error(f"❌ Erro ao enviar {filename}: {r.status_code} - {r.text}")
+                return None
+            
+            novos_shas[filename] = r.json()["sha"]
+            itens_tree.append({
+                "path": f"bases/{filename}",
+                "mode": "100644",
+                "type": "blob",
+                "sha": novos_shas[filename]
+            })
+        
+        r = requests.post(f"{api_repo}/trees", headers=headers, json={"base_tree": sha_tree_base, "tree": itens_tree})
+        if r.status_code != 201:
+            st.error(f"❌ Erro ao montar commit: {r.status_code} - {r.text}")
+            return None
+        sha_tree = r.json()["sha"]
+        
+        r = requests.post(
+            f"{api_repo}/commits",
+            headers=headers,
+            json={"message": mensagem, "tree": sha_tree, "parents": [sha_commit_atual]}
+        )
+        if r.status_code != 201:
+            st.error(f"❌ Erro ao criar commit: {r.status_code} - {r.text}")
+            return None
+        
+        # Sem force: falha se alguém salvou no meio do caminho
+        r = requests.patch(
+            f"{api_repo}/refs/heads/{branch}",
+            headers=headers,
+            json={"sha": r.json()["sha"], "force": False}
+        )
+        if r.status_code != 200:
+            st.error(f"❌ Erro ao atualizar branch: {r.status_code} - {r.text}")
+            return None
+        
+        for filename, df in dataframes.items():
+            _registrar_base_salva(filename, anteriores[filename], df, canonicos[filename])
+        
+        st.success("✅ Alterações salvas no GitHub com sucesso!")
+        return novos_shas
+    
+    except Exception as e:
+        st.error(f"❌ Erro ao salvar dados: {e}")
+        return None
+
 def save_data_local(df, filename):
     """Salva DataFrame localmente"""
     try:
@@ -29,11 +29,12 @@ def interface_gerenciamento_autocomplete():
     # Carregar dados atuais
     dados_salvos = carregar_dados_autocomplete()
     # Tabs para cada categoria
-    tab1, tab2, tab3, tab4 = st.tabs([
+    tab1, tab2, tab3, tab4, tab5 = st.tabs([
         "🏛️ Órgãos Judiciais",
         "📄 Assuntos Benefícios",
         "📋 Assuntos RPV",
-        "🏢 Órgãos RPV"
+        "🏢 Órgãos RPV",
+        "🧹 Canonização"
     ])
     
     with tab1:
@@ -47,6 +48,9 @@ def interface_gerenciamento_autocomplete():
         
     with tab4:
         gerenciar_orgaos_rpv(dados_salvos)
+    
+    with tab5:
+        gerenciar_canonizacao()
 
 def gerenciar_orgaos_judiciais(dados_salvos):
     """Interface para gerenciar órgãos judiciais"""
@@ -199,3 +203,97 @@ def gerenciar_orgaos_rpv(dados_salvos):
                         st.error(f"❌ Erro ao remover '{orgao}'")
     else:
         st.info("📝 Nenhum órgão de RPV personalizado adicionado ainda.")
+
+def gerenciar_canonizacao():
+    """Interface para revisar e aplicar a canonização de órgãos, assuntos e varas"""
+    from components.functions_controle import load_data_from_github
+    from components.canonizacao import (
+        FAMILIAS_CANONIZACAO,
+        NOMES_FAMILIAS,
+        gerar_propostas_canonizacao,
+        aplicar_canonizacao,
+        carregar_mapeamentos_canonizacao
+    )
+    
+    st.subheader("🧹 Canonização de Valores")
+    st.caption(
+        "Agrupa variantes do mesmo órgão, assunto ou vara (acentos, abreviações, siglas). "
+        "As propostas aprovadas reescrevem as bases em um único commit e passam a valer para novos cadastros. "
+        "Desmarque as variantes que não pertencem ao grupo."
+    )
+    
+    if st.button("🔍 Analisar bases", key="canonizacao_analisar"):
+        arquivos = sorted({base for colunas in FAMILIAS_CANONIZACAO.values() for base, _ in colunas})
+        with st.spinner("Carregando bases..."):
+            bases = {arquivo: load_data_from_github(arquivo)[0] for arquivo in arquivos}
+        st.session_state.propostas_canonizacao = gerar_propostas_canonizacao(bases)
+    
+    propostas = st.session_state.get("propostas_canonizacao")
+    
+    if propostas is not None:
+        if not propostas:
+            st.success("✅ Nenhuma variante encontrada nas bases.")
+        else:
+            st.write(f"**{len(propostas)} grupo(s) de variantes encontrado(s):**")
+            
+            aprovadas = []
+            for i, proposta in enumerate(propostas):
+                st.markdown("---")
+                with st.container():
+                    variantes = [valor for valor, _ in proposta["variantes"]]
+                    
+                    col1, col2 = st.columns([1, 3])
+                    with col1:
+                        aprovar = st.checkbox(
+                            f"Aprovar ({NOMES_FAMILIAS[proposta['familia']]})",
+                            key=f"canonizacao_aprovar_{i}"
+                        )
+                    with col2:
+                        canonico = st.selectbox(
+                            "Valor canônico:",
+                            variantes,
+                            index=variantes.index(proposta["canonico"]),
+                            key=f"canonizacao_canonico_{i}"
+                        )
+                    
+                    # Variantes desmarcadas ficam fora do grupo (o canônico sempre entra)
+                    incluidas = []
+                    for j, (valor, qtd) in enumerate(proposta["variantes"]):
+                        incluir = st.checkbox(
+                            f"{valor} ({qtd})",
+                            value=True,
+                            disabled=valor == canonico,
+                            key=f"canonizacao_incluir_{i}_{j}"
+                        )
+                        if incluir or valor == canonico:
+                            incluidas.append((valor, qtd))
+                    
+                    if aprovar and len(incluidas) > 1:
+                        aprovadas.append({**proposta, "canonico": canonico, "variantes": incluidas})
+            
+            if st.button(
+                f"✅ Aplicar {len(aprovadas)} proposta(s) aprovada(s)",
+                key="canonizacao_aplicar",
+                type="primary",
+                disabled=not aprovadas
+            ):
+                with st.spinner("Reescrevendo bases..."):
+                    alteradas = aplicar_canonizacao(aprovadas)
+                
+                if alteradas is not None:
+                    st.success(f"✅ Canonização aplicada: {alteradas} valor(es) atualizado(s).")
+                    del st.session_state.propostas_canonizacao
+    
+    st.markdown("---")
+    st.write("**Mapeamentos em uso:**")
+    
+    mapeamentos = carregar_mapeamentos_canonizacao()
+    linhas = [
+        {"Categoria": NOMES_FAMILIAS.get(familia, familia), "Variante (chave)": variante, "Canônico": canonico}
+        for familia, mapa in mapeamentos.items()
+        for variante, canonico in mapa.items()
+    ]
+    if linhas:
+        st.dataframe(linhas, use_container_width=True)
+    else:
+        st.info("📝 Nenhum mapeamento aprovado ainda.")
@@ -12,7 +12,7 @@ import streamlit as st
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseUpload
+from googleapiclient.http import MediaIoBaseUpload, MediaIoBaseDownload
 from datetime import datetime
 
 # Permitir HTTP local para desenvolvimento OAuth
@@ -151,6 +151,47 @@ class GoogleDriveIntegration:
             print(f"Erro no upload do arquivo '{file_name}': {str(e)}")
             return None, None
     
+    def list_files(self, folder_id, name_prefix=None):
+        """Listar arquivos de uma pasta (opcionalmente filtrando pelo prefixo do nome)"""
+        try:
+            query = f"'{folder_id}' in parents and trashed=false"
+            if name_prefix:
+                query += f" and name contains '{name_prefix}'"
+            
+            arquivos = []
+            page_token = None
+            while True:
+                results = self.service.files().list(
+                    q=query,
+                    fields="nextPageToken, files(id, name, createdTime, size)",
+                    pageToken=page_token
+                ).execute()
+                arquivos.extend(results.get('files', []))
+                page_token = results.get('nextPageToken')
+                if not page_token:
+                    break
+            
+            if name_prefix:
+                arquivos = [a for a in arquivos if a['name'].startswith(name_prefix)]
+            return arquivos
+        except Exception as e:
+            print(f"Erro ao listar arquivos da pasta '{folder_id}': {str(e)}")
+            return []
+    
+    def download_file(self, file_id):
+        """Baixar conteúdo de um arquivo do Google Drive"""
+        try:
+            request = self.service.files().get_media(fileId=file_id)
+            buffer = io.BytesIO()
+            downloader = MediaIoBaseDownload(buffer, request)
+            done = False
+            while not done:
+                _, done = downloader.next_chunk()
+            return buffer.getvalue()
+        except Exception as e:
+            print(f"Erro ao baixar arquivo '{file_id}': {str(e)}")
+            return None
+    
     def upload_alvara_documents(self, processo, comprovante_file, pdf_file):
         """Upload específico para documentos de alvará"""
         if not self.initialize_service():
@@ -239,6 +280,14 @@ def upload_to_google_drive(processo, comprovante_file, pdf_file):
     return drive.upload_alvara_documents(processo, comprovante_file, pdf_file)
 
 
+def _obter_pasta_logs(drive, criar=True):
+    """Encontra (ou cria) a pasta Logs_Sistema no Drive"""
+    pasta_logs_id = drive.find_folder("Logs_Sistema")
+    if not pasta_logs_id and criar:
+        pasta_logs_id = drive.create_folder("Logs_Sistema")
+    return pasta_logs_id
+
+
 def upload_log_to_drive(arquivo_local, nome_arquivo="log_exclusoes.csv"):
     """
     Função específica para upload de logs CSV para Google Drive
@@ -247,30 +296,38 @@ def upload_log_to_drive(arquivo_local, nome_arquivo="log_exclusoes.csv"):
         arquivo_local: Caminho para o arquivo local
         nome_arquivo: Nome do arquivo no Drive
         
+    Returns:
+        bool: True se sucesso, False se falha
+    """
+    # Verificar se arquivo local existe
+    if not os.path.exists(arquivo_local):
+        return False
+    
+    # Ler arquivo local
+    with open(arquivo_local, 'rb') as file:
+        file_content = file.read()
+    
+    return upload_log_content_to_drive(file_content, nome_arquivo)
+
+
+def upload_log_content_to_drive(file_content, nome_arquivo):
+    """
+    Upload de conteúdo de log (bytes) para a pasta Logs_Sistema
+    
     Returns:
         bool: True se sucesso, False se falha
     """
     try:
         drive = GoogleDriveIntegration()
         
-        # Verificar se arquivo local existe
-        if not os.path.exists(arquivo_local):
-            return False
-        
         # Inicializar serviço
         if not drive.initialize_service():
             return False
         
         # Encontrar ou criar pasta de Logs
-        pasta_logs_id = drive.find_folder("Logs_Sistema")
+        pasta_logs_id = _obter_pasta_logs(drive)
         if not pasta_logs_id:
-            pasta_logs_id = drive.create_folder("Logs_Sistema")
-            if not pasta_logs_id:
-                return False
-        
-        # Ler arquivo local
-        with open(arquivo_local, 'rb') as file:
-            file_content = file.read()
+            return False
         
         # Upload para Drive
         file_id, uploaded_name = drive.upload_file(
@@ -293,6 +350,46 @@ def upload_log_to_drive(arquivo_local, nome_arquivo="log_exclusoes.csv"):
         return False
 
 
+def listar_logs_drive(prefixo):
+    """
+    Lista os arquivos de log da pasta Logs_Sistema que começam com o prefixo
+    
+    Returns:
+        list: dicts com id, name, createdTime e size (vazio em caso de falha)
+    """
+    try:
+        drive = GoogleDriveIntegration()
+        if not drive.initialize_service():
+            return []
+        
+        pasta_logs_id = _obter_pasta_logs(drive, criar=False)
+        if not pasta_logs_id:
+            return []
+        
+        return drive.list_files(pasta_logs_id, name_prefix=prefixo)
+    except Exception as e:
+        st.error(f"Erro ao listar logs no Drive: {str(e)}")
+        return []
+
+
+def baixar_logs_drive(file_ids):
+    """
+    Baixa vários arquivos de log do Drive com uma única conexão
+    
+    Returns:
+        dict: file_id -> bytes (None para os que falharam)
+    """
+    try:
+        drive = GoogleDriveIntegration()
+        if not drive.initialize_service():
+            return {}
+        
+        return {file_id: drive.download_file(file_id) for file_id in file_ids}
+    except Exception as e:
+        st.error(f"Erro ao baixar logs do Drive: {str(e)}")
+        return {}
+
+
 def test_google_drive_connection():
     """Função para testar conexão com Google Drive - Interface Streamlit"""
     drive = GoogleDriveIntegration()
@@ -0,0 +1,688 @@
+"""
+Módulo de índices das listas de processos
+Estruturas calculadas uma única vez por versão da base (RPV, Alvarás, Benefícios
+e Acordos) para que buscas e filtros das listas não varram o DataFrame a cada rerun
+"""
+
+from collections import OrderedDict
+from datetime import datetime
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+import streamlit as st
+from components.busca_textual import IndiceRegistros, chave_busca, normalizar_texto
+from components.moeda import converter_centavos
+
+# Módulo -> chave do SHA da base na sessão (muda a cada salvamento)
+CHAVES_SHA_LISTAS = {
+    "rpv": "file_sha_rpv",
+    "alvaras": "file_sha_alvaras",
+    "beneficios": "file_sha_beneficios",
+    "acordos": "file_sha_acordos",
+}
+
+# Módulo -> arquivo da base no GitHub
+ARQUIVOS_LISTAS = {
+    "rpv": "lista_rpv.csv",
+    "alvaras": "lista_alvaras.csv",
+    "beneficios": "lista_beneficios.csv",
+    "acordos": "lista_acordos.csv",
+}
+
+# Módulo -> colunas pesquisadas na caixa de busca da lista
+COLUNAS_BUSCA_LISTAS = {
+    "rpv": {
+        "texto": ["Beneficiário", "Processo", "CPF"],
+        "digitos": ["CPF", "Processo"],
+    },
+    "alvaras": {
+        "texto": ["Parte", "Processo", "CPF"],
+        "digitos": ["CPF", "Processo"],
+    },
+    "beneficios": {
+        "texto": ["PARTE", "Nº DO PROCESSO", "CPF"],
+        "digitos": ["CPF", "Nº DO PROCESSO"],
+    },
+    "acordos": {
+        "texto": ["Nome_Cliente", "Nome_Reu", "Processo", "CPF_Cliente", "CPF_Reu"],
+        "digitos": ["CPF_Cliente", "CPF_Reu", "Processo"],
+    },
+}
+
+# =====================================
+# VERSÃO DA BASE E CACHE
+# =====================================
+
+def _modulo_arquivo(filename):
+    for modulo, arquivo in ARQUIVOS_LISTAS.items():
+        if arquivo == filename:
+            return modulo
+    return None
+
+def contador_versao_base(modulo):
+    """
+    Contador de versões da base em edição, guardado ao lado de df_editado_<modulo>.
+    Avança a cada salvamento (marcar_base_alterada) e quando o DataFrame da sessão é
+    substituído (cadastro, exclusão, recarga): o objeto novo é criado enquanto o antigo
+    ainda está na sessão, então a identidade registrada nunca coincide por reuso.
+    """
+    chave = f"versao_df_editado_{modulo}"
+    sessao = st.session_state.get(f"df_editado_{modulo}")
+    identidade = id(sessao) if sessao is not None else None
+    registrada, contador = st.session_state.get(chave, (None, 0))
+    if registrada != identidade:
+        contador += 1
+        st.session_state[chave] = (identidade, contador)
+    return contador
+
+def marcar_base_alterada(filename):
+    """Registra um salvamento da base (edições no próprio DataFrame não mudam o objeto nem o tamanho)"""
+    modulo = _modulo_arquivo(filename)
+    if modulo is None:
+        return
+    contador = contador_versao_base(modulo)
+    chave = f"versao_df_editado_{modulo}"
+    st.session_state[chave] = (st.session_state.get(chave, (None, 0))[0], contador + 1)
+
+def versao_base(df, modulo):
+    """
+    Identifica a versão da base exibida: SHA e contador de versões da base em edição,
+    mais tamanho e colunas. Não usa o id do DataFrame recebido: as páginas passam cópias
+    (df.loc[:, colunas]) recriadas a cada rerun, com as mesmas linhas da base da sessão.
+    """
+    return (st.session_state.get(CHAVES_SHA_LISTAS[modulo]), contador_versao_base(modulo), len(df), tuple(df.columns))
+
+def obter_por_versao(df, modulo, nome, construir):
+    """Objeto derivado da base, reconstruído só quando a versão muda"""
+    cache = st.session_state.setdefault("cache_indices_listas", {})
+    versao = versao_base(df, modulo)
+    atual = cache.get((modulo, nome))
+    if atual is None or atual[0] != versao:
+        atual = (versao, construir(df))
+        cache[(modulo, nome)] = atual
+    return atual[1]
+
+# =====================================
+# BUSCA DAS LISTAS
+# =====================================
+
+def texto_coluna(df, coluna):
+    """Coluna como texto, sem 'nan' e sem o '.0' de CPFs/processos lidos como número"""
+    if coluna not in df.columns:
+        return pd.Series([""] * len(df), index=df.index)
+    return texto_serie(df[coluna])
+
+def texto_serie(serie):
+    """Série como texto (mesmas regras de texto_coluna)"""
+    if pd.api.types.is_float_dtype(serie):
+        inteiros = serie.notna() & (serie % 1 == 0)
+        texto = serie.astype(str)
+        texto[inteiros] = serie[inteiros].astype("int64").astype(str)
+        return texto.where(serie.notna(), "")
+    return serie.fillna("").astype(str)
+
+def _juntar_colunas(df, colunas):
+    resultado = pd.Series([""] * len(df), index=df.index)
+    for coluna in colunas:
+        resultado = resultado + " " + texto_coluna(df, coluna)
+    return resultado.tolist()
+
+def atualizar_indice_busca_salvamento(filename, df):
+    """
+    Depois de um salvamento da base em edição: atualiza o índice de busca em cache só
+    nas linhas alteradas ou novas, em vez de reconstruí-lo na próxima busca
+    """
+    modulo = _modulo_arquivo(filename)
+    if modulo is None or df is not st.session_state.get(f"df_editado_{modulo}"):
+        return
+    cache = st.session_state.get("cache_indices_listas", {})
+    atual = cache.get((modulo, "busca"))
+    if atual is None:
+        return
+
+    colunas = COLUNAS_BUSCA_LISTAS[modulo]
+    indice = atual[1]
+    if indice.atualizar(_juntar_colunas(df, colunas["texto"]), _juntar_colunas(df, colunas["digitos"])):
+        # A versão completa (SHA, colunas da página) só é conhecida na próxima leitura da lista
+        cache[(modulo, "busca")] = (("incremental", contador_versao_base(modulo), len(df)), indice)
+
+def obter_indice_busca_lista(df, modulo):
+    """Índice de busca da lista do módulo para a versão atual da base"""
+    colunas = COLUNAS_BUSCA_LISTAS[modulo]
+
+    # Índice já atualizado no salvamento: passa a valer para a versão completa
+    cache = st.session_state.setdefault("cache_indices_listas", {})
+    atual = cache.get((modulo, "busca"))
+    if atual is not None and atual[0][0] == "incremental":
+        versao = versao_base(df, modulo)
+        if atual[0][1:] == versao[1:3]:
+            cache[(modulo, "busca")] = (versao, atual[1])
+
+    def construir(base):
+        return IndiceRegistros(
+            _juntar_colunas(base, colunas["texto"]),
+            _juntar_colunas(base, colunas["digitos"])
+        )
+
+    return obter_por_versao(df, modulo, "busca", construir)
+
+def _buscar_posicoes_exatas(indice, df, modulo, termo, chave_sessao):
+    """
+    Linhas que contêm o termo. Com chave_sessao a busca é incremental: o resultado
+    fica guardado na sessão e, se o novo termo apenas estende o anterior (mesma
+    versão da base), só as linhas já encontradas são conferidas.
+    """
+    if chave_sessao is None:
+        return indice.buscar(termo)
+
+    chave_estado = f"busca_incremental_{chave_sessao}"
+    versao = versao_base(df, modulo)
+    chave = chave_busca(termo)
+    modo = indice.modo_busca(chave)
+
+    anterior = st.session_state.get(chave_estado)
+    candidatos = None
+    if (anterior and anterior["versao"] == versao and anterior["modo"] == modo
+            and anterior["chave"] and chave.startswith(anterior["chave"])):
+        if anterior["chave"] == chave:
+            return anterior["posicoes"]
+        candidatos = anterior["posicoes"].tolist()
+
+    posicoes = indice.buscar(chave, candidatos=candidatos)
+    st.session_state[chave_estado] = {
+        "versao": versao,
+        "modo": modo,
+        "chave": chave,
+        "posicoes": posicoes
+    }
+    return posicoes
+
+def buscar_posicoes_lista(df, modulo, termo, chave_sessao=None):
+    """
+    Posições (iloc) das linhas da base que casam com o termo da caixa de busca, ranqueadas:
+    primeiro as que contêm o termo (na ordem da base), depois os nomes parecidos
+    (grafia, acentuação ou som: Souza/Sousa, Conceicao/Conceição), do mais parecido ao menos.
+    """
+    indice = obter_indice_busca_lista(df, modulo)
+    exatas = _buscar_posicoes_exatas(indice, df, modulo, termo, chave_sessao)
+
+    aproximadas = indice.buscar_aproximado(termo)
+    if not aproximadas:
+        return exatas
+
+    encontradas = set(exatas.tolist())
+    extras = sorted((linha for linha in aproximadas if linha not in encontradas),
+                    key=lambda linha: (-aproximadas[linha], linha))
+    return np.concatenate([exatas, np.asarray(extras, dtype=np.int64)])
+
+# =====================================
+# COLUNAS TIPADAS E FILTROS SIMPLES (CACHE POR VERSÃO)
+# =====================================
+
+# Quantidade de combinações de filtros guardadas por sessão (LRU)
+TAMANHO_CACHE_FILTROS = 32
+
+# Formatos de data encontrados nas bases, na ordem de tentativa
+FORMATOS_DATA = ("%d/%m/%Y %H:%M", "%d/%m/%Y %H:%M:%S", "%d/%m/%Y", "%Y-%m-%d")
+
+def obter_codigos_coluna(df, modulo, coluna):
+    """
+    Coluna fatorada uma vez por versão: (códigos por linha, valor -> código).
+    Linhas vazias ficam com código -1. None se a coluna não existir.
+    """
+    def construir(base):
+        if coluna not in base.columns:
+            return None
+        codigos, categorias = pd.factorize(base[coluna])
+        return codigos, {valor: i for i, valor in enumerate(categorias)}
+
+    return obter_por_versao(df, modulo, f"codigos:{coluna}", construir)
+
+def obter_datas_coluna(df, modulo, coluna):
+    """
+    Coluna de data convertida uma vez por versão (datetime64; NaT quando inválida),
+    aceitando todos os formatos usados nas bases (FORMATOS_DATA) na mesma coluna
+    """
+    def construir(base):
+        if coluna not in base.columns:
+            return None
+        texto = base[coluna].astype(str).str.strip().reset_index(drop=True)
+        datas = pd.Series(pd.NaT, index=texto.index, dtype="datetime64[ns]")
+        for fmt in FORMATOS_DATA:
+            faltando = datas.isna()
+            if not faltando.any():
+                break
+            datas[faltando] = pd.to_datetime(texto[faltando], format=fmt, errors="coerce")
+        return datas.to_numpy()
+
+    return obter_por_versao(df, modulo, f"datas:{coluna}", construir)
+
+def obter_indice_datas(df, modulo, coluna):
+    """
+    Índice ordenado da coluna de data, para consultas por período com busca binária.
+
+    Returns:
+        dict | None: {"valores": datas em ns (int64, crescentes), "posicoes": posição de cada data na base};
+        linhas sem data ficam fora do índice
+    """
+    def construir(base):
+        datas = obter_datas_coluna(base, modulo, coluna)
+        if datas is None:
+            return None
+        posicoes = np.flatnonzero(~np.isnat(datas))
+        valores = datas[posicoes].astype("datetime64[ns]").astype(np.int64)
+        ordem = np.argsort(valores, kind="stable")
+        return {"valores": valores[ordem], "posicoes": posicoes[ordem]}
+
+    return obter_por_versao(df, modulo, f"indice_datas:{coluna}", construir)
+
+def _faixa_periodo(indice, inicio, fim):
+    """Fatia do índice de datas entre inicio e fim (dias inteiros, fim inclusivo)"""
+    valores = indice["valores"]
+    de = 0
+    ate = len(valores)
+    if inicio:
+        de = np.searchsorted(valores, pd.Timestamp(inicio).normalize().value, side="left")
+    if fim:
+        ate = np.searchsorted(valores, (pd.Timestamp(fim).normalize() + pd.Timedelta(days=1)).value, side="left")
+    return de, max(de, ate)
+
+def posicoes_no_periodo(df, modulo, coluna, inicio=None, fim=None):
+    """Posições das linhas com a data da coluna no período (em ordem de data); None se a coluna não existir"""
+    indice = obter_indice_datas(df, modulo, coluna)
+    if indice is None:
+        return None
+    de, ate = _faixa_periodo(indice, inicio, fim)
+    return indice["posicoes"][de:ate]
+
+def contar_no_periodo(df, modulo, coluna, inicio=None, fim=None):
+    """Quantidade de linhas com a data da coluna no período (ex: cadastrados hoje)"""
+    indice = obter_indice_datas(df, modulo, coluna)
+    if indice is None:
+        return 0
+    de, ate = _faixa_periodo(indice, inicio, fim)
+    return int(ate - de)
+
+@lru_cache(maxsize=4096)
+def converter_data(texto):
+    """Uma data avulsa em qualquer formato das bases ('15/03/2025', '2025-03-15'...) -> datetime; None se inválida"""
+    texto = str(texto).strip()
+    for fmt in FORMATOS_DATA:
+        try:
+            return datetime.strptime(texto, fmt)
+        except ValueError:
+            continue
+    return None
+
+def obter_centavos_coluna(df, modulo, coluna):
+    """Coluna em reais convertida para centavos inteiros (Int64) uma vez por versão"""
+    def construir(base):
+        if coluna not in base.columns:
+            return None
+        return converter_centavos(base[coluna].reset_index(drop=True))
+
+    return obter_por_versao(df, modulo, f"centavos:{coluna}", construir)
+
+def obter_numeros_coluna(df, modulo, coluna):
+    """Coluna de valor em reais como float, a partir dos centavos da versão (NaN quando vazia/inválida)"""
+    def construir(base):
+        centavos = obter_centavos_coluna(df, modulo, coluna)
+        if centavos is None:
+            return None
+        return centavos.to_numpy(dtype="float64", na_value=np.nan) / 100
+
+    return obter_por_versao(df, modulo, f"numeros:{coluna}", construir)
+
+def obter_vazios_coluna(df, modulo, coluna):
+    """Máscara das linhas com a coluna vazia (NaN, texto em branco ou 'nan'), uma vez por versão"""
+    def construir(base):
+        if coluna not in base.columns:
+            return np.ones(len(base), dtype=bool)
+        serie = base[coluna]
+        texto = serie.astype(str).str.strip()
+        return (serie.isna() | texto.isin(["", "nan", "None", "NaN"])).to_numpy()
+
+    return obter_por_versao(df, modulo, f"vazios:{coluna}", construir)
+
+def obter_chaves_coluna(df, modulo, coluna):
+    """Coluna normalizada para busca por trecho (sem acentos, maiúscula), uma vez por versão"""
+    def construir(base):
+        return pd.Series([chave_busca(v) for v in texto_coluna(base, coluna)], index=base.index)
+
+    return obter_por_versao(df, modulo, f"chaves:{coluna}", construir)
+
+def _normalizar_filtros(filtros):
+    """Filtros ativos como tupla ordenada (hashable); 'Todos', None e listas vazias são ignorados"""
+    ativos = []
+    for coluna, valor in (filtros or {}).items():
+        if isinstance(valor, (list, tuple, set)):
+            if not valor:
+                continue
+            valor = tuple(sorted(valor, key=str))
+        elif valor is None or valor == "Todos":
+            continue
+        ativos.append((coluna, valor))
+    return tuple(sorted(ativos, key=lambda item: item[0]))
+
+def _filtrar_por_valores(df, modulo, posicoes, coluna, valor):
+    codigos = obter_codigos_coluna(df, modulo, coluna)
+    if codigos is None:
+        # Coluna inexistente nesta base: filtro não se aplica
+        return posicoes
+    codigos, mapa = codigos
+    valores = valor if isinstance(valor, tuple) else (valor,)
+    alvo = [mapa[v] for v in valores if v in mapa]
+    return posicoes[np.isin(codigos[posicoes], alvo)]
+
+def _filtrar_por_periodo(df, modulo, posicoes, periodo):
+    coluna, inicio, fim = periodo
+    if not inicio and not fim:
+        return posicoes
+    no_periodo = posicoes_no_periodo(df, modulo, coluna, inicio, fim)
+    if no_periodo is None:
+        return posicoes
+    mascara = np.zeros(len(df), dtype=bool)
+    mascara[no_periodo] = True
+    return posicoes[mascara[posicoes]]
+
+# =====================================
+# FILTRO AVANÇADO (MÁSCARAS POR CONDIÇÃO)
+# =====================================
+
+def tipo_coluna_filtro(coluna):
+    """'data', 'numero' ou 'texto', pelo nome da coluna (Data Cadastro, Valor Cliente, Valor_Total...)"""
+    palavras = normalizar_texto(coluna).replace("_", " ").split()
+    if "DATA" in palavras:
+        return "data"
+    if "VALOR" in palavras or "TOTAL" in palavras:
+        return "numero"
+    return "texto"
+
+def _mascara_condicao(df, modulo, condicao):
+    """Máscara booleana (np.ndarray) de uma condição (coluna, operador, valor) sobre a base toda"""
+    coluna, operador, valor = condicao
+
+    if operador in ("vazio", "preenchido"):
+        vazios = obter_vazios_coluna(df, modulo, coluna)
+        return vazios if operador == "vazio" else ~vazios
+
+    if coluna not in df.columns:
+        return np.zeros(len(df), dtype=bool)
+
+    if operador == "em":
+        codigos, mapa = obter_codigos_coluna(df, modulo, coluna)
+        return np.isin(codigos, [mapa[v] for v in valor if v in mapa])
+
+    if operador == "contem":
+        return obter_chaves_coluna(df, modulo, coluna).str.contains(chave_busca(valor), regex=False).to_numpy()
+
+    if operador == "entre":
+        minimo, maximo = valor
+        if tipo_coluna_filtro(coluna) == "data":
+            datas = obter_datas_coluna(df, modulo, coluna)
+            mascara = ~np.isnat(datas)
+            if minimo:
+                mascara &= datas >= pd.Timestamp(minimo).to_datetime64()
+            if maximo:
+                mascara &= datas < (pd.Timestamp(maximo) + pd.Timedelta(days=1)).to_datetime64()
+            return mascara
+        numeros = obter_numeros_coluna(df, modulo, coluna)
+        mascara = ~np.isnan(numeros)
+        if minimo is not None:
+            mascara &= numeros >= minimo
+        if maximo is not None:
+            mascara &= numeros <= maximo
+        return mascara
+
+    return np.ones(len(df), dtype=bool)
+
+def compilar_filtro_avancado(df, modulo, filtro):
+    """
+    Máscara booleana do filtro avançado: filtro = ("E" ou "OU", (condição, ...)).
+    Cada condição vira uma máscara numpy calculada uma vez por versão da base.
+    """
+    combinador, condicoes = filtro
+    cache = st.session_state.setdefault("cache_mascaras_filtro", OrderedDict())
+    versao = versao_base(df, modulo)
+
+    mascaras = []
+    for condicao in condicoes:
+        chave = (modulo, versao, condicao)
+        if chave in cache:
+            cache.move_to_end(chave)
+        else:
+            cache[chave] = _mascara_condicao(df, modulo, condicao)
+            while len(cache) > TAMANHO_CACHE_FILTROS:
+                cache.popitem(last=False)
+        mascaras.append(cache[chave])
+
+    if not mascaras:
+        return np.ones(len(df), dtype=bool)
+    if combinador == "OU":
+        return np.logical_or.reduce(mascaras)
+    return np.logical_and.reduce(mascaras)
+
+# =====================================
+# FILTROS DAS LISTAS
+# =====================================
+
+def filtrar_posicoes_lista(df, modulo, filtros=None, busca="", chave_sessao_busca=None, periodo=None, avancado=None):
+    """
+    Posições (iloc) das linhas que passam pelos filtros da tela.
+
+    Args:
+        filtros: {coluna: valor ou lista de valores}; "Todos"/None/lista vazia = sem filtro
+        busca: termo da caixa de busca (resultado na ordem do ranking da busca)
+        chave_sessao_busca: chave do campo de busca, para a busca incremental
+        periodo: (coluna de data, início, fim) com datas inclusivas; None = sem filtro
+        avancado: filtro do construtor avançado ("E"/"OU", condições); None = sem filtro
+
+    O resultado fica em cache (LRU) por versão da base e estado dos filtros, então
+    reruns que só expandem um card ou trocam de página não refazem a filtragem.
+    """
+    if periodo and not (periodo[1] or periodo[2]):
+        periodo = None
+    filtros_ativos = _normalizar_filtros(filtros)
+    if avancado and not avancado[1]:
+        avancado = None
+    chave = (modulo, versao_base(df, modulo), filtros_ativos, chave_busca(busca), periodo, avancado)
+
+    cache = st.session_state.setdefault("cache_filtros_listas", OrderedDict())
+    if chave in cache:
+        cache.move_to_end(chave)
+        return cache[chave]
+
+    if busca and chave_busca(busca):
+        posicoes = buscar_posicoes_lista(df, modulo, busca, chave_sessao_busca)
+    else:
+        posicoes = np.arange(len(df), dtype=np.int64)
+
+    for coluna, valor in filtros_ativos:
+        posicoes = _filtrar_por_valores(df, modulo, posicoes, coluna, valor)
+    if periodo:
+        posicoes = _filtrar_por_periodo(df, modulo, posicoes, periodo)
+    if avancado:
+        posicoes = posicoes[compilar_filtro_avancado(df, modulo, avancado)[posicoes]]
+
+    cache[chave] = posicoes
+    while len(cache) > TAMANHO_CACHE_FILTROS:
+        cache.popitem(last=False)
+    return posicoes
+
+def ordenar_posicoes_por_data(df, modulo, posicoes, coluna="Data Cadastro", decrescente=True):
+    """Reordena as posições pela data da coluna (datas vazias no fim), com a ordem calculada uma vez por versão"""
+    def construir(base):
+        datas = obter_datas_coluna(base, modulo, coluna)
+        if datas is None:
+            return None
+        # Posto de cada linha na ordenação (estável; NaT sempre por último)
+        valores = datas.astype("datetime64[ns]").astype(np.int64)
+        vazias = np.isnat(datas)
+        chave_ordem = -valores if decrescente else valores
+        ordem = np.lexsort((chave_ordem, vazias))
+        postos = np.empty(len(ordem), dtype=np.int64)
+        postos[ordem] = np.arange(len(ordem))
+        return postos
+
+    postos = obter_por_versao(df, modulo, f"postos:{coluna}:{decrescente}", construir)
+    if postos is None:
+        return posicoes
+    return posicoes[np.argsort(postos[posicoes], kind="stable")]
+
+# =====================================
+# CONTAGEM POR OPÇÃO (FACETAS)
+# =====================================
+
+TAMANHO_CACHE_FACETAS = 64
+
+def contar_facetas_lista(df, modulo, coluna, filtros=None, busca="", periodo=None, avancado=None):
+    """
+    Quantidade de linhas de cada valor da coluna, considerando os demais filtros
+    ativos (o filtro da própria coluna é ignorado, para mostrar o tamanho de cada opção).
+    Conta com np.bincount sobre os códigos da coluna; resultado em cache por versão e filtros.
+
+    Returns:
+        tuple: ({valor: quantidade}, total de linhas que passam pelos demais filtros)
+    """
+    outros = {c: v for c, v in (filtros or {}).items() if c != coluna}
+    if avancado and not avancado[1]:
+        avancado = None
+    chave = ("faceta", modulo, versao_base(df, modulo), coluna,
+             _normalizar_filtros(outros), chave_busca(busca), periodo, avancado)
+
+    cache = st.session_state.setdefault("cache_facetas_listas", OrderedDict())
+    if chave in cache:
+        cache.move_to_end(chave)
+        return cache[chave]
+
+    posicoes = filtrar_posicoes_lista(df, modulo, outros, busca=busca, periodo=periodo, avancado=avancado)
+    codigos = obter_codigos_coluna(df, modulo, coluna)
+    if codigos is None:
+        resultado = ({}, len(posicoes))
+    else:
+        codigos, mapa = codigos
+        selecionados = codigos[posicoes]
+        contagem = np.bincount(selecionados[selecionados >= 0], minlength=len(mapa))
+        resultado = ({valor: int(contagem[i]) for valor, i in mapa.items()}, len(posicoes))
+
+    cache[chave] = resultado
+    while len(cache) > TAMANHO_CACHE_FACETAS:
+        cache.popitem(last=False)
+    return resultado
+
+# =====================================
+# ORDENAÇÃO DAS LISTAS (PAGINAÇÃO POR CURSOR)
+# =====================================
+
+ORDENACOES_LISTAS = {
+    "padrao": "🔎 Padrão (relevância da busca / ordem da base)",
+    "recentes": "📅 Cadastro mais recente",
+    "antigos": "📅 Cadastro mais antigo",
+    "maior_valor": "💰 Maior valor",
+    "menor_valor": "💰 Menor valor",
+    "parados": "⏳ Há mais tempo no status atual",
+}
+
+COLUNAS_DATA_CADASTRO_LISTAS = {
+    "rpv": "Data Cadastro",
+    "alvaras": "Data Cadastro",
+    "beneficios": "Data Cadastro",
+    "acordos": "Data_Cadastro",
+}
+
+COLUNAS_VALOR_LISTAS = {
+    "rpv": "Valor Saque",
+    "alvaras": "Pagamento",
+    "beneficios": "Valor Total Honorarios",
+    "acordos": "Valor_Total",
+}
+
+# Datas gravadas a cada etapa do fluxo: a mais recente marca a entrada no status atual
+COLUNAS_DATA_STATUS_LISTAS = {
+    "rpv": ["Data SAC Documentacao", "Data Admin Documentacao", "Data Validacao", "Data Envio",
+            "Data Recebimento", "Data Comprovante Recebimento", "Data Pagamento",
+            "Data Finalizacao", "Data Finalização"],
+    "alvaras": ["Data Envio Financeiro", "Data Envio Rodrigo", "Data Finalização", "Data Finalizacao"],
+    "beneficios": ["Data Envio Administrativo", "Data Implantação", "Data Envio SAC", "Data Contato SAC",
+                   "Data Envio Financeiro", "Data Finalização"],
+    "acordos": ["Data_Ultimo_Update"],
+}
+
+def _datas_em_segundos(datas, quantidade):
+    """datetime64 -> segundos (float), NaN para datas vazias ou coluna inexistente"""
+    if datas is None:
+        return np.full(quantidade, np.nan)
+    segundos = datas.astype("datetime64[s]").astype(np.int64).astype(float)
+    segundos[np.isnat(datas)] = np.nan
+    return segundos
+
+def _chaves_criterio(base, modulo, criterio):
+    """Chave numérica crescente de cada linha para o critério (vazios viram +inf e vão para o fim)"""
+    if criterio in ("maior_valor", "menor_valor"):
+        chaves = obter_numeros_coluna(base, modulo, COLUNAS_VALOR_LISTAS[modulo])
+        chaves = np.full(len(base), np.nan) if chaves is None else chaves.copy()
+    else:
+        cadastro = obter_datas_coluna(base, modulo, COLUNAS_DATA_CADASTRO_LISTAS[modulo])
+        chaves = _datas_em_segundos(cadastro, len(base))
+        if criterio == "parados":
+            for coluna in COLUNAS_DATA_STATUS_LISTAS[modulo]:
+                etapa = obter_datas_coluna(base, modulo, coluna)
+                chaves = np.fmax(chaves, _datas_em_segundos(etapa, len(base)))
+
+    if criterio in ("recentes", "maior_valor"):
+        chaves = -chaves
+    return np.where(np.isnan(chaves), np.inf, chaves)
+
+def obter_ids_lista(df, modulo):
+    """IDs da base como texto, uma vez por versão (âncora do cursor de paginação)"""
+    return obter_por_versao(df, modulo, "ids", lambda base: texto_coluna(base, "ID").to_numpy(dtype=str))
+
+def obter_ordem_lista(df, modulo, criterio):
+    """
+    Ordem total das linhas para o critério, calculada uma vez por versão.
+    Desempate pelo ID, para que a ordem não dependa da posição da linha no arquivo.
+
+    Returns:
+        dict: "chaves" (float por linha) e "postos" (posição de cada linha na ordem)
+    """
+    def construir(base):
+        chaves = _chaves_criterio(base, modulo, criterio)
+        ids = obter_ids_lista(base, modulo)
+        postos_ids = np.empty(len(ids), dtype=np.int64)
+        postos_ids[np.argsort(ids, kind="stable")] = np.arange(len(ids))
+        ordem = np.lexsort((postos_ids, chaves))
+        postos = np.empty(len(ordem), dtype=np.int64)
+        postos[ordem] = np.arange(len(ordem))
+        return {"chaves": chaves, "postos": postos}
+
+    return obter_por_versao(df, modulo, f"ordem:{criterio}", construir)
+
+def ordenar_posicoes_lista(df, modulo, posicoes, criterio):
+    """Reordena as posições filtradas pelo critério; "padrao" mantém a ordem recebida"""
+    if criterio not in ORDENACOES_LISTAS or criterio == "padrao":
+        return posicoes
+    postos = obter_ordem_lista(df, modulo, criterio)["postos"]
+    return posicoes[np.argsort(postos[posicoes], kind="stable")]
+
+def cursor_linha(df, modulo, criterio, posicao):
+    """Cursor (chave do critério, ID) que identifica a linha independentemente da posição no arquivo"""
+    chave = None
+    if criterio in ORDENACOES_LISTAS and criterio != "padrao":
+        chave = float(obter_ordem_lista(df, modulo, criterio)["chaves"][posicao])
+    return (chave, str(obter_ids_lista(df, modulo)[posicao]))
+
+def localizar_cursor(df, modulo, posicoes_ordenadas, criterio, cursor):
+    """
+    Índice, dentro das posições ordenadas, da primeira linha que não vem antes do cursor.
+    Linhas inseridas ou excluídas por outros usuários não deslocam a página: ela continua
+    começando no mesmo registro. No critério "padrao" a âncora é o próprio ID (None se sumiu).
+    """
+    chave, id_cursor = cursor
+    ids = obter_ids_lista(df, modulo)[posicoes_ordenadas]
+    if chave is None:
+        encontrados = np.flatnonzero(ids == id_cursor)
+        return int(encontrados[0]) if len(encontrados) else None
+
+    chaves = obter_ordem_lista(df, modulo, criterio)["chaves"][posicoes_ordenadas]
+    antes = (chaves < chave) | ((chaves == chave) & (ids < id_cursor))
+    return int(np.count_nonzero(antes))
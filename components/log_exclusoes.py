@@ -2,9 +2,217 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime
 import os
-from components.google_drive_integration import upload_log_to_drive
+import ast
+import re
+import json
+import math
+import io
+from components.google_drive_integration import (
+    upload_log_content_to_drive,
+    listar_logs_drive,
+    baixar_logs_drive
+)
 
-def should_create_backup(df_log):
+# =====================================
+# DADOS ESTRUTURADOS E ÍNDICE DO LOG
+# =====================================
+
+COLUNAS_INDICE_LOG = ["Data_Exclusao", "Usuario", "Tipo_Processo", "Numero_Processo"]
+
+# Registros lidos por vez ao buscar as linhas de uma página no arquivo
+TAMANHO_BLOCO_LEITURA_LOG = 5000
+
+def serializar_dados_completos(dados_excluidos):
+    """Serializa a linha excluída como JSON (NaN vira null)"""
+    dados = dados_excluidos.to_dict() if hasattr(dados_excluidos, 'to_dict') else dict(dados_excluidos)
+    
+    dados_limpos = {}
+    for chave, valor in dados.items():
+        if valor is None or (pd.api.types.is_scalar(valor) and pd.isna(valor)):
+            dados_limpos[str(chave)] = None
+        elif hasattr(valor, 'item'):
+            # Tipos numpy (int64, float64...) para tipos nativos
+            dados_limpos[str(chave)] = valor.item()
+        else:
+            dados_limpos[str(chave)] = valor
+    
+    return json.dumps(dados_limpos, ensure_ascii=False, default=str)
+
+def carregar_dados_completos(valor):
+    """
+    Converte a coluna Dados_Completos de volta para dict.
+    Aceita o formato JSON atual e o formato antigo (str(dict) com nan).
+    """
+    if valor is None or (isinstance(valor, float) and math.isnan(valor)):
+        return {}
+    
+    texto = str(valor).strip()
+    if not texto:
+        return {}
+    
+    try:
+        return json.loads(texto)
+    except (ValueError, TypeError):
+        pass
+    
+    # Formato antigo: repr de dict Python, com nan soltos
+    try:
+        texto_legado = re.sub(r"(?<=[:\[,\s])nan(?=[,}\]])", "None", texto)
+        dados = ast.literal_eval(texto_legado)
+        return dados if isinstance(dados, dict) else {}
+    except (ValueError, SyntaxError):
+        return {}
+
+def _assinatura_arquivo_log(caminho_local):
+    """Identifica a versão do arquivo de log (mtime + tamanho)"""
+    stat = os.stat(caminho_local)
+    return (stat.st_mtime_ns, stat.st_size)
+
+def _offsets_registros_log(caminho_local):
+    """
+    Posição em bytes do início de cada registro (sem o cabeçalho).
+    Conta as aspas de cada linha física: uma quebra de linha dentro das aspas
+    (Dados_Completos) não inicia registro; linhas em branco são ignoradas, como no leitor de CSV.
+    """
+    offsets = []
+    posicao = 0
+    dentro_aspas = False
+    cabecalho = True
+    with open(caminho_local, "rb") as arquivo:
+        for linha in arquivo:
+            if not dentro_aspas and linha.strip():
+                if cabecalho:
+                    cabecalho = False
+                else:
+                    offsets.append(posicao)
+            if linha.count(b'"') % 2:
+                dentro_aspas = not dentro_aspas
+            posicao += len(linha)
+    return offsets
+
+def obter_indice_log(caminho_local):
+    """
+    Retorna o índice do log (data, usuário, tipo, processo + posição da linha
+    e do registro em bytes no arquivo).
+    Lê apenas as colunas leves e fica em cache até o arquivo mudar.
+    """
+    assinatura = _assinatura_arquivo_log(caminho_local)
+    cache = st.session_state.get("indice_log_exclusoes")
+    
+    if cache and cache["caminho"] == caminho_local and cache["assinatura"] == assinatura:
+        return cache["indice"]
+    
+    df_indice = pd.read_csv(caminho_local, usecols=COLUNAS_INDICE_LOG, dtype=str)
+    df_indice["Linha"] = range(len(df_indice))
+    df_indice["Data"] = pd.to_datetime(
+        df_indice["Data_Exclusao"], format="%d/%m/%Y %H:%M:%S", errors="coerce"
+    ).dt.date
+    df_indice["Evento"] = agrupar_eventos_exclusao(df_indice)
+    
+    # Sem Offset (contagem divergente do leitor de CSV) a leitura volta a ser em blocos
+    offsets = _offsets_registros_log(caminho_local)
+    if len(offsets) == len(df_indice):
+        df_indice["Offset"] = offsets
+    
+    st.session_state.indice_log_exclusoes = {
+        "caminho": caminho_local,
+        "assinatura": assinatura,
+        "indice": df_indice
+    }
+    return df_indice
+
+def filtrar_indice_log(df_indice, tipo=None, usuario=None, data_inicio=None, data_fim=None, numero_processo=None):
+    """Aplica os filtros sobre o índice e retorna as posições das linhas (mais recentes primeiro)"""
+    mask = pd.Series(True, index=df_indice.index)
+    
+    if tipo and tipo != "Todos":
+        mask &= df_indice["Tipo_Processo"] == tipo
+    if usuario and usuario != "Todos":
+        mask &= df_indice["Usuario"] == usuario
+    if data_inicio:
+        mask &= df_indice["Data"] >= data_inicio
+    if data_fim:
+        mask &= df_indice["Data"] <= data_fim
+    if numero_processo:
+        mask &= df_indice["Numero_Processo"].fillna("").str.contains(numero_processo, case=False, regex=False)
+    
+    return df_indice.loc[mask, "Linha"].tolist()[::-1]
+
+def _blocos_registros_log(caminho_local, **kwargs):
+    """
+    Lê o log em blocos, com o índice = número do registro (posição no índice do log).
+    A contagem é feita pelo leitor de CSV: Dados_Completos pode ter quebras de linha
+    dentro das aspas, então uma linha física não corresponde a um registro.
+    """
+    inicio = 0
+    for bloco in pd.read_csv(caminho_local, chunksize=TAMANHO_BLOCO_LEITURA_LOG, **kwargs):
+        bloco.index = range(inicio, inicio + len(bloco))
+        inicio += len(bloco)
+        yield bloco
+
+def _ler_registros_log(caminho_local, linhas, **kwargs):
+    """
+    Lê os registros pedidos indo direto às posições em bytes guardadas no índice
+    (registros vizinhos saem numa leitura só).
+    
+    Returns:
+        DataFrame com índice = número do registro, ou None se o índice não tem as posições
+    """
+    df_indice = obter_indice_log(caminho_local)
+    if "Offset" not in df_indice.columns:
+        return None
+    
+    offsets = df_indice["Offset"].tolist()
+    fins = offsets[1:] + [st.session_state.indice_log_exclusoes["assinatura"][1]]
+    linhas = [linha for linha in linhas if 0 <= linha < len(offsets)]
+    if not linhas:
+        return pd.DataFrame()
+    
+    trechos = []
+    for linha in linhas:
+        if trechos and trechos[-1][1] == offsets[linha]:
+            trechos[-1][1] = fins[linha]
+        else:
+            trechos.append([offsets[linha], fins[linha]])
+    
+    with open(caminho_local, "rb") as arquivo:
+        partes = [arquivo.read(offsets[0]) if offsets else b""]
+        for inicio, fim in trechos:
+            arquivo.seek(inicio)
+            parte = arquivo.read(fim - inicio)
+            partes.append(parte if parte.endswith(b"\n") else parte + b"\n")
+    
+    df = pd.read_csv(io.BytesIO(b"".join(partes)), **kwargs)
+    df.index = linhas
+    return df
+
+def carregar_linhas_log(caminho_local, linhas):
+    """Carrega do arquivo apenas as linhas pedidas (posições do índice), na ordem pedida"""
+    if not linhas:
+        return pd.DataFrame()
+    
+    df = _ler_registros_log(caminho_local, linhas)
+    if df is not None:
+        return df
+    
+    pedidas = set(linhas)
+    ultima = max(pedidas)
+    partes = []
+    for bloco in _blocos_registros_log(caminho_local):
+        partes.append(bloco[bloco.index.isin(pedidas)])
+        if bloco.index[-1] >= ultima:
+            break
+    
+    df = pd.concat(partes)
+    return df.loc[[linha for linha in linhas if linha in df.index]]
+
+def contar_registros_log(caminho_local):
+    """Quantidade de registros no log, usando o índice em cache"""
+    if not os.path.exists(caminho_local):
+        return 0
+    return len(obter_indice_log(caminho_local))
+
+def should_create_backup(total_registros):
     """
     Determina se deve criar um backup automático baseado em critérios:
     - A cada 5 exclusões
@@ -24,7 +232,7 @@ def should_create_backup(df_log):
                     
                     # Se já fez backup hoje, só criar novo a cada 5 exclusões
                     if ultimo_backup_data == hoje:
-                        current_count = len(df_log)
+                        current_count = total_registros
                         last_count = int(ultimo_backup_count)
                         return (current_count - last_count) >= 5
                     else:
@@ -48,11 +256,7 @@ def save_last_backup_timestamp():
         arquivo_log = "log_exclusoes.csv"
         caminho_local = os.path.join(os.getcwd(), arquivo_log)
         
-        if os.path.exists(caminho_local):
-            df_log = pd.read_csv(caminho_local)
-            count = len(df_log)
-        else:
-            count = 0
+        count = contar_registros_log(caminho_local)
         
         with open(arquivo_backup_info, 'w') as f:
             f.write(f"{hoje},{count}")
@@ -60,6 +264,375 @@ def save_last_backup_timestamp():
     except Exception:
         pass  # Falha silenciosa, não é crítica
 
+# =====================================
+# BACKUP INCREMENTAL (SNAPSHOT + DELTAS)
+# =====================================
+
+ARQUIVO_OFFSET_BACKUP = "last_backup_offset.json"
+PREFIXO_SNAPSHOT_LOG = "log_exclusoes_snapshot_"
+PREFIXO_DELTA_LOG = "log_exclusoes_delta_"
+DIAS_ENTRE_SNAPSHOTS = 7
+
+def carregar_estado_backup():
+    """
+    Lê o estado do backup incremental (guardado junto ao last_backup.txt):
+    - offset: quantidade de registros já confirmados no Drive
+    - snapshot_offset: registros cobertos pelo último snapshot completo
+    - ultimo_snapshot: data (YYYY-MM-DD) do último snapshot
+    """
+    estado = {"offset": 0, "snapshot_offset": 0, "ultimo_snapshot": None}
+    try:
+        if os.path.exists(ARQUIVO_OFFSET_BACKUP):
+            with open(ARQUIVO_OFFSET_BACKUP, 'r', encoding='utf-8') as f:
+                estado.update(json.load(f))
+    except Exception:
+        pass  # Estado corrompido: recomeça com um snapshot completo
+    return estado
+
+def salvar_estado_backup(estado):
+    """Grava o estado do backup incremental"""
+    try:
+        with open(ARQUIVO_OFFSET_BACKUP, 'w', encoding='utf-8') as f:
+            json.dump(estado, f)
+    except Exception:
+        pass  # Falha silenciosa, não é crítica
+
+def snapshot_necessario(estado, total_registros):
+    """Snapshot completo na primeira vez, se o log encolheu ou a cada DIAS_ENTRE_SNAPSHOTS"""
+    if not estado.get("ultimo_snapshot") or estado.get("offset", 0) > total_registros:
+        return True
+    try:
+        ultimo = datetime.strptime(estado["ultimo_snapshot"], "%Y-%m-%d")
+        return (datetime.now() - ultimo).days >= DIAS_ENTRE_SNAPSHOTS
+    except ValueError:
+        return True
+
+def enviar_snapshot_log(caminho_local):
+    """Envia o log completo como snapshot compactado e zera a fila de deltas"""
+    total = contar_registros_log(caminho_local)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    nome_snapshot = f"{PREFIXO_SNAPSHOT_LOG}{total:07d}_{timestamp}.csv"
+    
+    df_log = pd.read_csv(caminho_local, dtype=str)
+    conteudo = df_log.to_csv(index=False).encode('utf-8')
+    
+    if not upload_log_content_to_drive(conteudo, nome_snapshot):
+        return None
+    
+    salvar_estado_backup({
+        "offset": total,
+        "snapshot_offset": total,
+        "ultimo_snapshot": datetime.now().strftime("%Y-%m-%d")
+    })
+    return nome_snapshot
+
+def enviar_delta_log(caminho_local):
+    """
+    Envia apenas os registros adicionados desde o último offset confirmado.
+    O offset só avança depois que o upload foi aceito pelo Drive.
+    
+    Returns:
+        str | None: nome do arquivo enviado, "" se não havia nada pendente, None em falha
+    """
+    estado = carregar_estado_backup()
+    total = contar_registros_log(caminho_local)
+    inicio = estado.get("offset", 0)
+    
+    if inicio >= total:
+        return ""
+    
+    # Só os registros novos, a partir da posição em bytes guardada no índice
+    df_delta = _ler_registros_log(caminho_local, range(inicio, total), dtype=str)
+    if df_delta is None:
+        df_delta = pd.concat(
+            bloco[bloco.index >= inicio] for bloco in _blocos_registros_log(caminho_local, dtype=str)
+        )
+    conteudo = df_delta.to_csv(index=False).encode('utf-8')
+    nome_delta = f"{PREFIXO_DELTA_LOG}{inicio:07d}_{total:07d}.csv"
+    
+    if not upload_log_content_to_drive(conteudo, nome_delta):
+        return None
+    
+    estado["offset"] = total
+    salvar_estado_backup(estado)
+    return nome_delta
+
+def executar_backup_incremental(caminho_local):
+    """Decide entre snapshot completo e delta e executa o envio"""
+    estado = carregar_estado_backup()
+    total = contar_registros_log(caminho_local)
+    
+    if snapshot_necessario(estado, total):
+        return enviar_snapshot_log(caminho_local)
+    return enviar_delta_log(caminho_local)
+
+def _faixa_arquivo_log(nome, prefixo):
+    """Extrai (inicio, fim) do nome de um snapshot ou delta"""
+    partes = nome[len(prefixo):].replace(".csv", "").split("_")
+    try:
+        if prefixo == PREFIXO_SNAPSHOT_LOG:
+            return 0, int(partes[0])
+        return int(partes[0]), int(partes[1])
+    except (IndexError, ValueError):
+        return None
+
+def _momento_snapshot(arquivo):
+    """Data/hora do snapshot pelo nome (..._AAAAMMDD_HHMMSS.csv), ou a de criação no Drive"""
+    partes = arquivo['name'].replace(".csv", "").split("_")
+    if len(partes) >= 2 and (partes[-2] + partes[-1]).isdigit() and len(partes[-2]) == 8:
+        return datetime.strptime(partes[-2] + partes[-1], "%Y%m%d%H%M%S").isoformat()
+    return arquivo.get('createdTime') or ""
+
+def planejar_restauracao_log():
+    """
+    Monta a sequência snapshot + deltas a partir dos arquivos no Drive.
+    
+    Returns:
+        tuple: (snapshot, deltas, total_registros, avisos)
+    """
+    avisos = []
+    
+    snapshots = []
+    for arquivo in listar_logs_drive(PREFIXO_SNAPSHOT_LOG):
+        faixa = _faixa_arquivo_log(arquivo['name'], PREFIXO_SNAPSHOT_LOG)
+        if faixa:
+            snapshots.append((_momento_snapshot(arquivo), faixa[1], arquivo))
+    
+    if not snapshots:
+        return None, [], 0, ["Nenhum snapshot encontrado no Drive."]
+    
+    # Snapshot mais recente, mesmo que menor (ex: depois de uma limpeza do log)
+    _, cobertura, snapshot = max(snapshots, key=lambda s: (s[0], s[1]))
+    criado_snapshot = snapshot.get('createdTime') or ""
+    
+    deltas_por_inicio = {}
+    for arquivo in listar_logs_drive(PREFIXO_DELTA_LOG):
+        faixa = _faixa_arquivo_log(arquivo['name'], PREFIXO_DELTA_LOG)
+        # Só os deltas enviados depois do snapshot (os anteriores numeram outro log)
+        if (arquivo.get('createdTime') or "") < criado_snapshot:
+            continue
+        if faixa and faixa[1] > cobertura:
+            # Em caso de reenvio da mesma faixa, fica o que cobre mais registros
+            atual = deltas_por_inicio.get(faixa[0])
+            if not atual or faixa[1] > atual[0][1]:
+                deltas_por_inicio[faixa[0]] = (faixa, arquivo)
+    
+    deltas = []
+    while cobertura in deltas_por_inicio:
+        faixa, arquivo = deltas_por_inicio.pop(cobertura)
+        deltas.append(arquivo)
+        cobertura = faixa[1]
+    
+    if deltas_por_inicio:
+        avisos.append(
+            f"{len(deltas_por_inicio)} delta(s) ignorado(s) por lacuna na sequência "
+            f"(restauração vai até o registro {cobertura})."
+        )
+    
+    return snapshot, deltas, cobertura, avisos
+
+def restaurar_log_do_drive():
+    """
+    Reconstrói o log a partir do último snapshot + deltas seguintes.
+    
+    Returns:
+        tuple: (DataFrame ou None, avisos)
+    """
+    snapshot, deltas, total, avisos = planejar_restauracao_log()
+    if snapshot is None:
+        return None, avisos
+    
+    arquivos = [snapshot] + deltas
+    conteudos = baixar_logs_drive([a['id'] for a in arquivos])
+    
+    partes = []
+    for arquivo in arquivos:
+        conteudo = conteudos.get(arquivo['id'])
+        if conteudo is None:
+            avisos.append(f"Falha ao baixar {arquivo['name']}; restauração interrompida neste ponto.")
+            break
+        partes.append(pd.read_csv(io.BytesIO(conteudo), dtype=str))
+    
+    if not partes:
+        avisos.append("Nenhum arquivo de backup pôde ser baixado; nada foi restaurado.")
+        return None, avisos
+    
+    df_restaurado = pd.concat(partes, ignore_index=True)
+    if len(df_restaurado) != total and len(partes) == len(arquivos):
+        avisos.append(f"Esperados {total} registros, reconstruídos {len(df_restaurado)}.")
+    
+    return df_restaurado, avisos
+
+def interface_restaurar_log_drive(caminho_local):
+    """Ferramenta de restauração do log a partir do Drive"""
+    st.caption("Reconstrói o log a partir do último snapshot completo e dos deltas enviados depois dele.")
+    
+    if st.button("🔍 Reconstruir log a partir do Drive", key="log_reconstruir_drive"):
+        with st.spinner("☁️ Baixando snapshot e deltas..."):
+            df_restaurado, avisos = restaurar_log_do_drive()
+        
+        for aviso in avisos:
+            st.warning(f"⚠️ {aviso}")
+        
+        if df_restaurado is not None:
+            st.session_state.log_restaurado_drive = df_restaurado
+    
+    df_restaurado = st.session_state.get("log_restaurado_drive")
+    if df_restaurado is None:
+        return
+    
+    total_local = contar_registros_log(caminho_local) if os.path.exists(caminho_local) else 0
+    st.info(f"📊 Log reconstruído: {len(df_restaurado)} registros (local: {total_local})")
+    
+    col_baixar, col_aplicar = st.columns(2)
+    with col_baixar:
+        st.download_button(
+            label="📥 Baixar log reconstruído",
+            data=df_restaurado.to_csv(index=False),
+            file_name=f"log_exclusoes_restaurado_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+            mime="text/csv"
+        )
+    with col_aplicar:
+        if st.button("♻️ Substituir log local", key="log_aplicar_restauracao", type="primary"):
+            df_restaurado.to_csv(caminho_local, index=False)
+            salvar_estado_backup({
+                "offset": len(df_restaurado),
+                "snapshot_offset": 0,
+                "ultimo_snapshot": None
+            })
+            del st.session_state.log_restaurado_drive
+            st.success("✅ Log local restaurado. O próximo backup será um snapshot completo.")
+            st.rerun()
+
+# =====================================
+# RESTAURAÇÃO DE PROCESSOS EXCLUÍDOS
+# =====================================
+
+# Tipo_Processo do log -> (arquivo da base, chave do DataFrame, chave do SHA)
+BASES_RESTAURACAO = {
+    "Alvará": ("lista_alvaras.csv", "df_editado_alvaras", "file_sha_alvaras"),
+    "RPV": ("lista_rpv.csv", "df_editado_rpv", "file_sha_rpv"),
+    "Benefício": ("lista_beneficios.csv", "df_editado_beneficios", "file_sha_beneficios"),
+}
+
+def reconstruir_linhas_excluidas(df_entradas, df_base):
+    """
+    Reconstrói as linhas excluídas no formato da base (mesmas colunas e tipos).
+    Mantém o ID original e ignora as que já existem na base.
+    
+    Returns:
+        tuple: (DataFrame com as linhas a reinserir, IDs ignorados)
+    """
+    ids_existentes = set(df_base["ID"].astype(str)) if "ID" in df_base.columns else set()
+    
+    linhas, ignorados = [], []
+    for _, entrada in df_entradas.iterrows():
+        dados = carregar_dados_completos(entrada.get("Dados_Completos"))
+        if not dados:
+            continue
+        
+        id_original = str(dados.get("ID", ""))
+        if id_original and id_original in ids_existentes:
+            ignorados.append(id_original)
+            continue
+        
+        ids_existentes.add(id_original)
+        linhas.append(dados)
+    
+    if not linhas:
+        return pd.DataFrame(columns=df_base.columns), ignorados
+    
+    df_linhas = pd.DataFrame(linhas)
+    if len(df_base.columns) > 0:
+        df_linhas = df_linhas.reindex(columns=df_base.columns)
+    
+    # Mesmos tipos das colunas da base
+    for coluna in df_linhas.columns:
+        if coluna in df_base.columns and pd.api.types.is_numeric_dtype(df_base[coluna]):
+            df_linhas[coluna] = pd.to_numeric(df_linhas[coluna], errors='coerce')
+    
+    return df_linhas, ignorados
+
+def restaurar_processos_excluidos(df_entradas):
+    """
+    Reinsere na base correta os processos das entradas do log, em um único commit por base.
+    
+    Returns:
+        int: quantidade de processos restaurados
+    """
+    from components.functions_controle import load_data_from_github, save_data_to_github_seguro
+    
+    total_restaurado = 0
+    
+    for tipo, df_tipo in df_entradas.groupby("Tipo_Processo"):
+        if tipo not in BASES_RESTAURACAO:
+            st.warning(f"⚠️ Tipo '{tipo}' não pode ser restaurado automaticamente.")
+            continue
+        
+        arquivo, chave_df, chave_sha = BASES_RESTAURACAO[tipo]
+        
+        # Sempre partir da versão atual da base
+        df_base, _ = load_data_from_github(arquivo)
+        df_linhas, ignorados = reconstruir_linhas_excluidas(df_tipo, df_base)
+        
+        if ignorados:
+            st.info(f"ℹ️ {len(ignorados)} {tipo}(s) já existem na base e foram ignorados: {', '.join(ignorados)}")
+        
+        if df_linhas.empty:
+            continue
+        
+        df_novo = pd.concat([df_base, df_linhas], ignore_index=True)
+        
+        with st.spinner(f"Restaurando {len(df_linhas)} {tipo}(s)..."):
+            novo_sha = save_data_to_github_seguro(df_novo, arquivo, chave_sha)
+        
+        if novo_sha:
+            # Força a recarga da base na próxima visita à página do módulo
+            st.session_state.pop(chave_df, None)
+            total_restaurado += len(df_linhas)
+        else:
+            st.error(f"❌ Falha ao restaurar {tipo}(s). Nenhuma alteração foi feita nessa base.")
+    
+    return total_restaurado
+
+def agrupar_eventos_exclusao(df_indice, intervalo_segundos=60):
+    """
+    Numera os eventos de exclusão: entradas seguidas do mesmo usuário e tipo,
+    com até `intervalo_segundos` entre elas, formam um mesmo evento (exclusão em massa).
+    """
+    momentos = pd.to_datetime(df_indice["Data_Exclusao"], format="%d/%m/%Y %H:%M:%S", errors="coerce")
+    
+    novo_evento = (
+        (df_indice["Usuario"] != df_indice["Usuario"].shift())
+        | (df_indice["Tipo_Processo"] != df_indice["Tipo_Processo"].shift())
+        | ((momentos - momentos.shift()).dt.total_seconds() > intervalo_segundos)
+        | momentos.isna()
+    )
+    return novo_evento.cumsum()
+
+def interface_restaurar_processos(caminho_local, df_indice, linha):
+    """Botões de restauração do registro escolhido e do evento de exclusão ao qual ele pertence"""
+    evento = df_indice.loc[df_indice["Linha"] == linha, "Evento"].iloc[0]
+    linhas_evento = df_indice.loc[df_indice["Evento"] == evento, "Linha"].tolist()
+    
+    col_um, col_evento = st.columns(2)
+    
+    with col_um:
+        if st.button("♻️ Restaurar este processo", key=f"log_restaurar_{linha}"):
+            restaurados = restaurar_processos_excluidos(carregar_linhas_log(caminho_local, [linha]))
+            if restaurados:
+                st.success(f"✅ {restaurados} processo(s) restaurado(s)!")
+    
+    with col_evento:
+        if len(linhas_evento) > 1:
+            if st.button(
+                f"♻️ Restaurar exclusão em massa ({len(linhas_evento)} registros)",
+                key=f"log_restaurar_evento_{evento}"
+            ):
+                restaurados = restaurar_processos_excluidos(carregar_linhas_log(caminho_local, linhas_evento))
+                if restaurados:
+                    st.success(f"✅ {restaurados} processo(s) restaurado(s)!")
+
 def registrar_exclusao(tipo_processo, processo_numero, dados_excluidos, usuario):
     """
     Registra uma exclusão no log
@@ -81,44 +654,35 @@ def registrar_exclusao(tipo_processo, processo_numero, dados_excluidos, usuario)
             "CPF": dados_excluidos.get("CPF", "N/A"),
             "Status": dados_excluidos.get("Status", "N/A"),
             "Valor": dados_excluidos.get("Valor", "N/A"),
-            "Dados_Completos": str(dados_excluidos.to_dict() if hasattr(dados_excluidos, 'to_dict') else dados_excluidos)
+            "Dados_Completos": serializar_dados_completos(dados_excluidos)
         }
         
         # Nome do arquivo de log
         arquivo_log = "log_exclusoes.csv"
         caminho_local = os.path.join(os.getcwd(), arquivo_log)
         
-        # Verificar if arquivo existe
-        if os.path.exists(caminho_local):
-            # Carregar log existente
-            df_log = pd.read_csv(caminho_local)
-            # Adicionar nova entrada
-            df_log = pd.concat([df_log, pd.DataFrame([log_entry])], ignore_index=True)
-        else:
-            # Criar novo log
-            df_log = pd.DataFrame([log_entry])
-        
-        # Salvar localmente
-        df_log.to_csv(caminho_local, index=False)
+        # Anexar a nova entrada sem reescrever o arquivo inteiro
+        arquivo_existe = os.path.exists(caminho_local)
+        pd.DataFrame([log_entry]).to_csv(
+            caminho_local,
+            mode='a' if arquivo_existe else 'w',
+            header=not arquivo_existe,
+            index=False
+        )
         
         # Log foi salvo localmente com sucesso - isso é o principal
         log_salvo_com_sucesso = True
         
         # Tentar criar backup no Drive apenas a cada 5 exclusões ou uma vez por dia
-        deve_fazer_backup = should_create_backup(df_log)
+        deve_fazer_backup = should_create_backup(contar_registros_log(caminho_local))
         
         if deve_fazer_backup:
             # Tentar enviar para o Google Drive (não crítico)
             try:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M")
-                nome_backup = f"log_exclusoes_auto_{timestamp}.csv"
+                # Envia só os registros novos (ou um snapshot completo periódico)
+                upload_result = executar_backup_incremental(caminho_local)
                 
-                upload_result = upload_log_to_drive(
-                    arquivo_local=caminho_local,
-                    nome_arquivo=nome_backup
-                )
-                
-                if upload_result:
+                if upload_result is not None:
                     st.success(f"📝 Exclusão registrada e backup automático criado: {tipo_processo} - {processo_numero}")
                     # Salvar timestamp do último backup
                     save_last_backup_timestamp()
@@ -138,7 +702,7 @@ def registrar_exclusao(tipo_processo, processo_numero, dados_excluidos, usuario)
 
 def criar_backup_completo_logs():
     """
-    Cria um backup completo dos logs no Google Drive
+    Cria um backup completo (snapshot compactado) dos logs no Google Drive
     Útil para ser executado periodicamente ou manualmente
     """
     try:
@@ -149,14 +713,11 @@ def criar_backup_completo_logs():
             st.warning("📁 Nenhum log local encontrado para backup.")
             return False
         
-        # Nome do arquivo com timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        nome_backup = f"log_exclusoes_backup_{timestamp}.csv"
-        
         with st.spinner("☁️ Criando backup dos logs no Google Drive..."):
-            sucesso = upload_log_to_drive(caminho_local, nome_backup)
+            nome_backup = enviar_snapshot_log(caminho_local)
         
-        if sucesso:
+        if nome_backup:
+            save_last_backup_timestamp()
             st.success(f"✅ Backup criado com sucesso: {nome_backup}")
             return True
         else:
@@ -169,8 +730,8 @@ def criar_backup_completo_logs():
 
 def sincronizar_logs_com_drive():
     """
-    Sincroniza todos os logs locais com o Google Drive
-    Útil para migração inicial ou recuperação
+    Sincroniza os logs locais com o Google Drive
+    Envia os registros pendentes (ou um snapshot, se estiver na hora)
     """
     try:
         arquivo_log = "log_exclusoes.csv"
@@ -182,22 +743,19 @@ def sincronizar_logs_com_drive():
         
         st.info("🔄 Iniciando sincronização completa com Google Drive...")
         
-        # Criar backup principal
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        nome_principal = f"log_exclusoes_sync_{timestamp}.csv"
-        
         with st.spinner("☁️ Enviando logs para Google Drive..."):
-            sucesso_principal = upload_log_to_drive(caminho_local, nome_principal)
+            nome_principal = executar_backup_incremental(caminho_local)
         
-        if sucesso_principal:
+        if nome_principal == "":
+            st.success("✅ Drive já está em dia, nenhum registro pendente.")
+        elif nome_principal:
             st.success(f"✅ Sincronização concluída: {nome_principal}")
             
             # Atualizar informações de backup
             save_last_backup_timestamp()
             
             # Mostrar estatísticas
-            df_log = pd.read_csv(caminho_local)
-            st.info(f"📊 Total de {len(df_log)} registros sincronizados")
+            st.info(f"📊 Total de {contar_registros_log(caminho_local)} registros sincronizados")
             
         else:
             st.error("❌ Falha na sincronização.")
@@ -292,14 +850,14 @@ def visualizar_log_exclusoes():
     
     if os.path.exists(caminho_local):
         try:
-            df_log = pd.read_csv(caminho_local)
+            df_indice = obter_indice_log(caminho_local)
             
-            if not df_log.empty:
+            if not df_indice.empty:
                 # Informações de status dos backups
                 col_info1, col_info2 = st.columns(2)
                 
                 with col_info1:
-                    st.success(f"📊 Total de exclusões registradas: {len(df_log)}")
+                    st.success(f"📊 Total de exclusões registradas: {len(df_indice)}")
                 
                 with col_info2:
                     # Verificar status do último backup
@@ -327,7 +885,8 @@ def visualizar_log_exclusoes():
                         sincronizar_logs_com_drive()
                 
                 with col_download:
-                    csv_completo = df_log.to_csv(index=False)
+                    with open(caminho_local, 'rb') as f:
+                        csv_completo = f.read()
                     st.download_button(
                         label="📥 Download Local",
                         data=csv_completo,
@@ -336,53 +895,123 @@ def visualizar_log_exclusoes():
                         help="Baixa cópia local dos logs"
                     )
                 
+                estado_backup = carregar_estado_backup()
+                pendentes = max(0, len(df_indice) - estado_backup.get("offset", 0))
+                st.caption(
+                    f"☁️ Registros pendentes de envio ao Drive: {pendentes} · "
+                    f"último snapshot: {estado_backup.get('ultimo_snapshot') or 'nunca'}"
+                )
+                
+                with st.expander("♻️ Restaurar log a partir do Drive"):
+                    interface_restaurar_log_drive(caminho_local)
+                
                 st.markdown("---")
                 
-                # Filtros
-                col1, col2, col3 = st.columns(3)
+                # Filtros (aplicados sobre o índice, sem carregar os dados completos)
+                col1, col2, col3, col4 = st.columns(4)
                 
                 with col1:
                     filtro_tipo = st.selectbox(
                         "Filtrar por tipo:",
-                        ["Todos"] + list(df_log["Tipo_Processo"].unique())
+                        ["Todos"] + sorted(df_indice["Tipo_Processo"].dropna().unique()),
+                        key="log_filtro_tipo"
                     )
                 
                 with col2:
                     filtro_usuario = st.selectbox(
                         "Filtrar por usuário:",
-                        ["Todos"] + list(df_log["Usuario"].unique())
+                        ["Todos"] + sorted(df_indice["Usuario"].dropna().unique()),
+                        key="log_filtro_usuario"
                     )
                 
                 with col3:
-                    filtro_data = st.date_input("Filtrar por data:")
+                    filtro_processo = st.text_input(
+                        "Filtrar por processo:",
+                        key="log_filtro_processo",
+                        placeholder="Número do processo"
+                    )
                 
-                # Aplicar filtros
-                df_filtrado = df_log.copy()
+                with col4:
+                    filtrar_periodo = st.checkbox("Filtrar por período", key="log_filtrar_periodo")
+                    periodo = st.date_input(
+                        "Período:",
+                        value=(datetime.now().date(), datetime.now().date()),
+                        key="log_filtro_periodo",
+                        disabled=not filtrar_periodo,
+                        format="DD/MM/YYYY"
+                    )
                 
-                if filtro_tipo != "Todos":
-                    df_filtrado = df_filtrado[df_filtrado["Tipo_Processo"] == filtro_tipo]
-                    
-                if filtro_usuario != "Todos":
-                    df_filtrado = df_filtrado[df_filtrado["Usuario"] == filtro_usuario]
+                data_inicio, data_fim = None, None
+                if filtrar_periodo and periodo:
+                    if isinstance(periodo, (list, tuple)):
+                        data_inicio = periodo[0]
+                        data_fim = periodo[1] if len(periodo) > 1 else periodo[0]
+                    else:
+                        data_inicio = data_fim = periodo
                 
-                if filtro_data:
-                    data_str = filtro_data.strftime("%d/%m/%Y")
-                    df_filtrado = df_filtrado[df_filtrado["Data_Exclusao"].str.contains(data_str)]
+                linhas_filtradas = filtrar_indice_log(
+                    df_indice,
+                    tipo=filtro_tipo,
+                    usuario=filtro_usuario,
+                    data_inicio=data_inicio,
+                    data_fim=data_fim,
+                    numero_processo=filtro_processo.strip()
+                )
+                total_filtrado = len(linhas_filtradas)
+                
+                if total_filtrado == 0:
+                    st.info("📋 Nenhuma exclusão encontrada com os filtros aplicados.")
+                    return
+                
+                # Paginação
+                col_pag1, col_pag2, col_pag3 = st.columns([2, 2, 6])
+                with col_pag1:
+                    itens_por_pagina = st.selectbox(
+                        "Registros por página:", [25, 50, 100], key="log_itens_por_pagina"
+                    )
+                total_paginas = max(1, math.ceil(total_filtrado / itens_por_pagina))
+                # Com menos páginas (filtro novo), a página guardada não pode passar do máximo
+                if st.session_state.get("log_pagina_atual", 1) > total_paginas:
+                    st.session_state.log_pagina_atual = total_paginas
+                with col_pag2:
+                    pagina = st.number_input(
+                        "Página:", min_value=1, max_value=total_paginas, step=1,
+                        key="log_pagina_atual"
+                    )
+                with col_pag3:
+                    st.caption(f"{total_filtrado} registro(s) · página {pagina} de {total_paginas}")
+                
+                inicio = (pagina - 1) * itens_por_pagina
+                linhas_pagina = linhas_filtradas[inicio:inicio + itens_por_pagina]
+                df_pagina = carregar_linhas_log(caminho_local, linhas_pagina)
                 
                 # Mostrar resultados
                 st.dataframe(
-                    df_filtrado[["Data_Exclusao", "Usuario", "Tipo_Processo", "Numero_Processo", "Beneficiario", "Status"]],
+                    df_pagina[["Data_Exclusao", "Usuario", "Tipo_Processo", "Numero_Processo", "Beneficiario", "Status"]],
                     use_container_width=True
                 )
                 
-                # Botão para download
-                csv = df_filtrado.to_csv(index=False)
-                st.download_button(
-                    label="📥 Baixar log filtrado",
-                    data=csv,
-                    file_name=f"log_exclusoes_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                    mime="text/csv"
-                )
+                # Detalhes do registro completo
+                opcoes_detalhe = {
+                    f"{row['Data_Exclusao']} - {row['Tipo_Processo']} - {row['Numero_Processo']}": linha
+                    for linha, row in df_pagina.iterrows()
+                }
+                with st.expander("👁️ Ver dados completos / restaurar um registro"):
+                    escolha = st.selectbox("Registro:", list(opcoes_detalhe.keys()), key="log_detalhe_registro")
+                    if escolha:
+                        linha_escolhida = opcoes_detalhe[escolha]
+                        interface_restaurar_processos(caminho_local, df_indice, linha_escolhida)
+                        st.json(carregar_dados_completos(df_pagina.loc[linha_escolhida, "Dados_Completos"]))
+                
+                # Botão para download (carrega somente as linhas filtradas)
+                if st.button("📦 Preparar download do log filtrado", key="log_preparar_download"):
+                    csv = carregar_linhas_log(caminho_local, linhas_filtradas).to_csv(index=False)
+                    st.download_button(
+                        label="📥 Baixar log filtrado",
+                        data=csv,
+                        file_name=f"log_exclusoes_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                        mime="text/csv"
+                    )
                 
             else:
                 st.info("📋 Nenhuma exclusão registrada ainda.")
@@ -391,6 +1020,9 @@ def visualizar_log_exclusoes():
             st.error(f"❌ Erro ao carregar log: {str(e)}")
     else:
         st.info("📋 Arquivo de log não encontrado. Nenhuma exclusão foi registrada ainda.")
+        
+        with st.expander("♻️ Restaurar log a partir do Drive"):
+            interface_restaurar_log_drive(caminho_local)
 
 def confirmar_exclusao_com_log(tipo_processo, processo_numero, dados_processo, usuario):
     """
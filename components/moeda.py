@@ -0,0 +1,109 @@
+"""
+Módulo de valores em reais compartilhado
+Valores monetários guardados como centavos inteiros: conversão vetorizada dos formatos
+usados nas bases ("R$ 1.234,56", "1234.56", "1.412", "R$ 111") e formatação
+"R$ 1.234,56" para exibição e exportação, sem cadeias de replace valor a valor
+"""
+
+import numpy as np
+import pandas as pd
+
+# Colunas em reais de cada base
+COLUNAS_MOEDA = {
+    "rpv": ["Valor Cliente", "Honorarios Contratuais", "Valor Parceiro Prospector", "Valor Honorario Sucumbencial",
+            "Outros Valores", "Valor Saque", "H Sucumbenciais", "Valor Líquido"],
+    "alvaras": ["Pagamento", "Valor Total Alvara", "Valor Devido Cliente", "Valor Escritorio Contratual",
+                "Valor Escritorio Sucumbencial", "Valor Sacado", "Honorarios Sucumbenciais Valor",
+                "Prospector Parceiro", "Honorarios Contratuais", "Valor do Alvará"],
+    "beneficios": ["VALOR MENSAL", "VALOR RETROATIVO", "TOTAL GERAL", "VALOR DE HONORÁRIOS",
+                   "Valor Total Honorarios", "Valor Parcela", "Honorarios Contratuais"],
+    "acordos": ["Valor_Total", "Honorarios_Contratuais", "Valor_Cliente", "H_Sucumbenciais", "Valor_Parceiro",
+                "Outros_Valores", "Valor_Atualizado", "Novo_Valor_Parcela"],
+}
+
+# =====================================
+# CONVERSÃO
+# =====================================
+
+def _texto_moeda(serie):
+    """Texto do valor com ponto decimal: 'R$ 1.234,56' -> '1234.56', '1.412' -> '1412'"""
+    texto = serie.fillna("").astype(str).str.replace(r"[R$\s]", "", regex=True)
+    # Vírgula decimal (1.234,56) ou só separador de milhar (1.412)
+    brasileiro = texto.str.contains(",", regex=False) | texto.str.fullmatch(r"\d{1,3}(\.\d{3})+")
+    return texto.where(~brasileiro, texto.str.replace(".", "", regex=False).str.replace(",", ".", regex=False))
+
+def converter_centavos(serie):
+    """
+    Converte uma série de valores em reais para centavos inteiros.
+
+    Returns:
+        pd.Series: dtype Int64, <NA> quando vazio ou inválido
+    """
+    serie = pd.Series(serie)
+    texto = _texto_moeda(serie)
+    partes = texto.str.extract(r"^([+-]?)(\d*)(?:\.(\d*))?$")
+    inteiro = partes[1].fillna("")
+    fracao = partes[2].fillna("")
+    casou = partes[0].notna() & ((inteiro != "") | (fracao != ""))
+
+    # Parte inteira e os dois primeiros dígitos da fração, arredondando pelo terceiro
+    fracao = fracao.str.ljust(3, "0")
+    centavos = (
+        pd.to_numeric(inteiro.where(inteiro != "", "0"), errors="coerce") * 100
+        + pd.to_numeric(fracao.str[:2], errors="coerce")
+        + (fracao.str[2] >= "5")
+    )
+    centavos = centavos.where(partes[0] != "-", -centavos).where(casou)
+
+    # Formatos fora do padrão (ex: '1e+16'): conversão numérica direta
+    resto = ~casou & (texto != "")
+    if resto.any():
+        numeros = pd.to_numeric(texto[resto], errors="coerce")
+        centavos[resto] = (numeros.where(np.isfinite(numeros)) * 100).round()
+
+    return centavos.round().astype("Int64")
+
+def converter_numeros(serie):
+    """Converte valores como 'R$ 1.234,56', '1234.56' ou 'R$ 111' para float em reais (NaN quando inválido)"""
+    return converter_centavos(serie).to_numpy(dtype="float64", na_value=np.nan) / 100
+
+def valor_reais(valor, padrao=0.0):
+    """Um valor avulso em reais como float ('R$ 1.234,56' -> 1234.56); o padrão quando vazio ou inválido"""
+    if isinstance(valor, (int, float, np.integer, np.floating)) and not isinstance(valor, bool):
+        return padrao if pd.isna(valor) else float(valor)
+    numero = converter_numeros(pd.Series([valor]))[0]
+    return padrao if np.isnan(numero) else float(numero)
+
+# =====================================
+# FORMATAÇÃO
+# =====================================
+
+def formatar_reais(valor):
+    """1234.5 -> 'R$ 1.234,50'"""
+    return "R$ " + f"{valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+
+def formatar_centavos(centavos, vazio=""):
+    """
+    Formata uma série de centavos (Int64) como 'R$ 1.234,56', de uma vez para a série toda.
+
+    Returns:
+        pd.Series: texto formatado; o valor de `vazio` onde não há valor
+    """
+    centavos = pd.Series(centavos).astype("Int64")
+    valido = centavos.notna()
+    absoluto = centavos.abs().fillna(0).astype("int64")
+    inteiro = (absoluto // 100).astype(str).str.replace(r"\B(?=(\d{3})+(?!\d))", ".", regex=True)
+    fracao = (absoluto % 100).astype(str).str.zfill(2)
+    sinal = pd.Series(np.where(centavos.fillna(0) < 0, "-", ""), index=centavos.index)
+    return ("R$ " + sinal + inteiro + "," + fracao).where(valido, vazio)
+
+def formatar_coluna_reais(serie, vazio=""):
+    """
+    Coluna em reais formatada para exibição/exportação; textos que não são valor
+    (ex: 'A definir') ficam como estão
+    """
+    serie = pd.Series(serie)
+    formatados = formatar_centavos(converter_centavos(serie), vazio=None)
+    texto = serie.fillna("").astype(str).str.strip()
+    texto = texto.where(~texto.str.lower().isin(["", "nan", "none", "nat", "null"]), vazio)
+    return formatados.where(formatados.notna(), texto)
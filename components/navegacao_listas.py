@@ -0,0 +1,101 @@
+"""
+Ordenação e paginação das listas de processos
+A ordem de cada critério vem pronta do módulo indice_listas (uma vez por versão da base);
+a página atual é guardada como cursor (chave + ID do primeiro registro), e não como número,
+para não "pular" registros quando outros usuários cadastram ou excluem processos
+"""
+
+import math
+import streamlit as st
+from components.indice_listas import (
+    ORDENACOES_LISTAS, cursor_linha, localizar_cursor, ordenar_posicoes_lista
+)
+
+TAMANHOS_PAGINA = [10, 20, 50, 100]
+
+def controles_ordenacao_lista(chave, tamanho_padrao=10):
+    """
+    Seletores de ordenação e de itens por página da lista.
+
+    Returns:
+        tuple: (critério de ORDENACOES_LISTAS, itens por página)
+    """
+    col_ordem, col_tamanho = st.columns([3, 1])
+    with col_ordem:
+        criterio = st.selectbox(
+            "Ordenar por:",
+            options=list(ORDENACOES_LISTAS.keys()),
+            format_func=lambda c: ORDENACOES_LISTAS[c],
+            key=f"{chave}_ordenacao"
+        )
+    with col_tamanho:
+        tamanhos = sorted(set(TAMANHOS_PAGINA) | {tamanho_padrao})
+        tamanho = st.selectbox(
+            "Itens por página:",
+            options=tamanhos,
+            index=tamanhos.index(tamanho_padrao),
+            key=f"{chave}_tamanho_pagina"
+        )
+    return criterio, tamanho
+
+def pagina_lista(df, modulo, posicoes, criterio, tamanho, chave, assinatura):
+    """
+    Ordena as posições filtradas e localiza a página atual pelo cursor salvo na sessão.
+    A assinatura (filtros, busca, ordenação) volta a lista para o início quando muda.
+
+    Returns:
+        tuple: (posições ordenadas, índice do primeiro item da página)
+    """
+    posicoes_ordenadas = ordenar_posicoes_lista(df, modulo, posicoes, criterio)
+    total = len(posicoes_ordenadas)
+    estado = st.session_state.get(f"{chave}_cursor")
+
+    inicio = 0
+    if estado and estado["assinatura"] == assinatura and total:
+        inicio = localizar_cursor(df, modulo, posicoes_ordenadas, criterio, estado["cursor"])
+        if inicio is None:
+            # Registro âncora excluído: mantém a mesma altura da lista
+            inicio = estado["inicio"]
+        ultima = (math.ceil(total / tamanho) - 1) * tamanho
+        inicio = max(0, min(inicio, ultima))
+
+    return posicoes_ordenadas, inicio
+
+def _ir_para(df, modulo, posicoes_ordenadas, criterio, inicio, chave, assinatura):
+    """Salva o cursor do registro que abre a página e recarrega"""
+    st.session_state[f"{chave}_cursor"] = {
+        "assinatura": assinatura,
+        "cursor": cursor_linha(df, modulo, criterio, posicoes_ordenadas[inicio]),
+        "inicio": inicio,
+    }
+    st.rerun()
+
+def controles_paginacao_lista(df, modulo, posicoes_ordenadas, inicio, tamanho, criterio, chave, assinatura):
+    """Botões Primeira/Anterior/Próxima/Última da lista, navegando por cursor"""
+    total = len(posicoes_ordenadas)
+    total_paginas = math.ceil(total / tamanho) if tamanho > 0 else 1
+    if total_paginas <= 1:
+        return
+
+    pagina = inicio // tamanho + 1
+    ultima = (total_paginas - 1) * tamanho
+
+    st.markdown("---")
+    col_nav1, col_nav2, col_nav3 = st.columns([3, 2, 3])
+
+    with col_nav1:
+        if inicio > 0:
+            if st.button("<< Primeira", key=f"{chave}_primeira"):
+                _ir_para(df, modulo, posicoes_ordenadas, criterio, 0, chave, assinatura)
+            if st.button("< Anterior", key=f"{chave}_anterior"):
+                _ir_para(df, modulo, posicoes_ordenadas, criterio, max(inicio - tamanho, 0), chave, assinatura)
+
+    with col_nav2:
+        st.write(f"Página {pagina} de {total_paginas}")
+
+    with col_nav3:
+        if inicio + tamanho < total:
+            if st.button("Próxima >", key=f"{chave}_proxima"):
+                _ir_para(df, modulo, posicoes_ordenadas, criterio, inicio + tamanho, chave, assinatura)
+            if st.button("Última >>", key=f"{chave}_ultima"):
+                _ir_para(df, modulo, posicoes_ordenadas, criterio, ultima, chave, assinatura)
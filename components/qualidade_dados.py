@@ -0,0 +1,236 @@
+"""
+Qualidade dos dados das bases (RPV, Alvarás, Benefícios e Acordos)
+Verificações de integridade (IDs, processos repetidos, CPFs, mês de competência, anexos)
+calculadas de forma vetorizada uma vez por versão da base, gravadas como relatório e
+exibidas sob demanda na página de administração, junto com a fila de possíveis duplicatas
+"""
+
+import json
+import os
+from datetime import datetime
+import pandas as pd
+import streamlit as st
+from components.busca_textual import normalizar_texto
+from components.duplicatas import CAMPOS_DUPLICATAS, NOMES_MODULOS, interface_fila_duplicatas
+from components.indice_listas import (
+    ARQUIVOS_LISTAS, CHAVES_SHA_LISTAS, obter_por_versao, texto_coluna
+)
+
+# Relatórios gravados (um por base), reaproveitados enquanto o SHA da base não muda
+ARQUIVO_RELATORIOS_QUALIDADE = "relatorio_qualidade_dados.json"
+
+# Registros de exemplo (IDs) guardados por verificação
+LIMITE_EXEMPLOS = 200
+
+# Ano aceito no Mês Competência (mesma faixa de validar_mes_competencia)
+ANO_MINIMO_COMPETENCIA = 2020
+ANO_MAXIMO_COMPETENCIA = 2030
+
+# Palavras que identificam colunas de anexo (Comprovante Conta, PDF Alvará, Comprovante_Pago...)
+PALAVRAS_COLUNAS_ANEXO = ("COMPROVANTE", "PDF", "ANEXO")
+
+VERIFICACOES = {
+    "ids_ausentes": "🆔 Registros sem ID",
+    "ids_repetidos": "🆔 IDs repetidos",
+    "processos_duplicados": "📄 Processos repetidos",
+    "cpfs_invalidos": "🪪 CPFs inválidos",
+    "mes_competencia_invalido": "📅 Mês Competência fora do formato mm/aaaa",
+    "anexos_orfaos": "📎 Anexos órfãos",
+}
+
+# =====================================
+# VERIFICAÇÕES
+# =====================================
+
+def _digitos(serie):
+    return serie.str.replace(r"\D", "", regex=True)
+
+def _repetidos(texto):
+    """Máscara dos valores preenchidos que aparecem em mais de uma linha"""
+    return (texto != "") & texto.duplicated(keep=False)
+
+def _colunas_anexo(base):
+    return [c for c in base.columns if any(p in normalizar_texto(c) for p in PALAVRAS_COLUNAS_ANEXO)]
+
+def _mascara_anexos_orfaos(base, coluna_processo):
+    """
+    Anexos que não levam a um arquivo: texto solto sem link (ex: só o nome do arquivo),
+    "Drive:" sem o ID, ou arquivo do Drive salvo com o número de outro processo
+    """
+    processos = texto_coluna(base, coluna_processo).str.strip()
+    mascara = pd.Series(False, index=base.index)
+    for coluna in _colunas_anexo(base):
+        valores = texto_coluna(base, coluna).str.strip()
+        preenchido = (valores != "") & ~valores.str.lower().isin(["nan", "none"])
+        drive = valores.str.extract(r"^Drive:\s*(.+?)\s*\(ID:\s*[\w-]+\)$")[0]
+        link = valores.str.startswith("http")
+        sem_link = preenchido & drive.isna() & ~link
+
+        # Arquivos enviados pelo sistema começam com o número do processo (salvar_arquivo)
+        com_drive = drive.notna() & (processos != "")
+        outro_processo = pd.Series(False, index=base.index)
+        outro_processo[com_drive] = [
+            not nome.startswith(f"{processo}_") for nome, processo in zip(drive[com_drive], processos[com_drive])
+        ]
+        mascara |= sem_link | outro_processo
+    return mascara
+
+def verificar_integridade(base, modulo):
+    """
+    Executa as verificações da base de uma vez (máscaras sobre as colunas inteiras).
+
+    Returns:
+        dict: verificação -> posições (lista) das linhas com problema
+    """
+    campos = CAMPOS_DUPLICATAS[modulo]
+    mascaras = {}
+
+    ids = texto_coluna(base, "ID").str.strip()
+    mascaras["ids_ausentes"] = (ids == "") | ids.str.lower().isin(["nan", "none", "n/a"])
+    mascaras["ids_repetidos"] = _repetidos(ids) & ~mascaras["ids_ausentes"]
+
+    # Versão vetorizada da checagem de verificar_processos_duplicados_rpv (processo já cadastrado)
+    mascaras["processos_duplicados"] = _repetidos(texto_coluna(base, campos["processo"]).str.strip())
+
+    # Mesma regra de validar_cpf: 11 dígitos
+    cpfs = texto_coluna(base, campos["cpf"]).str.strip()
+    mascaras["cpfs_invalidos"] = (cpfs != "") & (_digitos(cpfs).str.len() != 11)
+
+    if modulo == "rpv" and "Mês Competência" in base.columns:
+        # Mesma regra de validar_mes_competencia: mm/aaaa, mês 01-12, ano na faixa aceita
+        competencia = texto_coluna(base, "Mês Competência").str.strip()
+        partes = competencia.str.extract(r"^(\d{2})/(\d{4})$").apply(pd.to_numeric)
+        valida = partes[0].between(1, 12) & partes[1].between(ANO_MINIMO_COMPETENCIA, ANO_MAXIMO_COMPETENCIA)
+        mascaras["mes_competencia_invalido"] = (competencia != "") & ~valida
+
+    mascaras["anexos_orfaos"] = _mascara_anexos_orfaos(base, campos["processo"])
+
+    return {nome: mascara.to_numpy().nonzero()[0].tolist() for nome, mascara in mascaras.items()}
+
+def obter_integridade(df, modulo):
+    """Resultado das verificações da base, calculado uma vez por versão"""
+    return obter_por_versao(df, modulo, "integridade", lambda base: verificar_integridade(base, modulo))
+
+# =====================================
+# RELATÓRIO GRAVADO
+# =====================================
+
+def carregar_relatorios():
+    """Relatórios gravados de todas as bases (dict módulo -> relatório)"""
+    try:
+        if os.path.exists(ARQUIVO_RELATORIOS_QUALIDADE):
+            with open(ARQUIVO_RELATORIOS_QUALIDADE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+    except Exception:
+        pass  # Arquivo corrompido: os relatórios são gerados de novo
+    return {}
+
+def _salvar_relatorios(relatorios):
+    try:
+        with open(ARQUIVO_RELATORIOS_QUALIDADE, 'w', encoding='utf-8') as f:
+            json.dump(relatorios, f, ensure_ascii=False)
+    except Exception:
+        pass  # Falha silenciosa: o relatório continua em cache na sessão
+
+def gerar_relatorio(df, modulo):
+    """Calcula (ou reaproveita da versão) as verificações da base e grava o relatório"""
+    campos = CAMPOS_DUPLICATAS[modulo]
+    resultado = obter_integridade(df, modulo)
+    colunas = [c for c in ["ID", campos["processo"], campos["nome"], campos["cpf"]] if c in df.columns]
+
+    relatorio = {
+        "sha": st.session_state.get(CHAVES_SHA_LISTAS[modulo]),
+        "gerado_em": datetime.now().strftime("%d/%m/%Y %H:%M"),
+        "total_registros": len(df),
+        "verificacoes": {
+            # IDs e não posições: inserções, exclusões e reordenações mudam as posições
+            nome: {
+                "quantidade": len(posicoes),
+                "ids": list(dict.fromkeys(texto_coluna(df.iloc[posicoes], "ID").str.strip()))[:LIMITE_EXEMPLOS],
+            }
+            for nome, posicoes in resultado.items()
+        },
+        "colunas": colunas,
+    }
+
+    relatorios = carregar_relatorios()
+    relatorios[modulo] = relatorio
+    _salvar_relatorios(relatorios)
+    return relatorio
+
+# =====================================
+# PÁGINA DE ADMINISTRAÇÃO
+# =====================================
+
+def _base_modulo(modulo):
+    """Base em edição na sessão ou, se a lista ainda não foi aberta, a do GitHub (sem alterar a sessão da lista)"""
+    chave_sessao = f"df_editado_{modulo}"
+    if chave_sessao in st.session_state:
+        return st.session_state[chave_sessao]
+
+    carregadas = st.session_state.setdefault("bases_qualidade_dados", {})
+    if modulo not in carregadas:
+        from components.functions_controle import load_data_from_github
+        df, file_sha = load_data_from_github(ARQUIVOS_LISTAS[modulo])
+        carregadas[modulo] = df
+        st.session_state.setdefault(CHAVES_SHA_LISTAS[modulo], file_sha)
+    return carregadas[modulo]
+
+def _exibir_relatorio(df, relatorio):
+    verificacoes = relatorio["verificacoes"]
+    st.caption(f"Relatório gerado em {relatorio['gerado_em']} · {relatorio['total_registros']} registro(s)")
+
+    colunas_metricas = st.columns(3)
+    for i, (nome, rotulo) in enumerate(VERIFICACOES.items()):
+        if nome in verificacoes:
+            with colunas_metricas[i % 3]:
+                st.metric(rotulo, verificacoes[nome]["quantidade"])
+
+    for nome, rotulo in VERIFICACOES.items():
+        item = verificacoes.get(nome)
+        if not item or not item["quantidade"]:
+            continue
+        with st.expander(f"{rotulo} ({item['quantidade']})", expanded=False):
+            colunas = [c for c in relatorio["colunas"] if c in df.columns]
+            # Registros localizados pelo ID na base atual (IDs que não existem mais ficam de fora)
+            linhas = texto_coluna(df, "ID").str.strip().isin(set(item["ids"])).to_numpy()
+            st.dataframe(df[linhas][colunas], hide_index=True, use_container_width=True)
+            if item["quantidade"] > len(item["ids"]):
+                st.caption(f"Mostrando os registros dos primeiros {len(item['ids'])} IDs")
+
+def interface_qualidade_dados():
+    """Página de qualidade dos dados (apenas Desenvolvedor)"""
+    st.header("🩺 Qualidade dos Dados")
+
+    modulo = st.selectbox(
+        "Base:",
+        options=list(NOMES_MODULOS.keys()),
+        format_func=lambda m: NOMES_MODULOS[m],
+        key="qualidade_dados_modulo"
+    )
+    df = _base_modulo(modulo)
+
+    relatorio = carregar_relatorios().get(modulo)
+    sha_atual = st.session_state.get(CHAVES_SHA_LISTAS[modulo])
+    desatualizado = relatorio is None or relatorio.get("sha") != sha_atual or relatorio.get("total_registros") != len(df)
+
+    col_info, col_botao = st.columns([3, 1])
+    with col_botao:
+        gerar = st.button("🔄 Gerar relatório", key="gerar_relatorio_qualidade", use_container_width=True)
+    with col_info:
+        if relatorio is None:
+            st.info("Nenhum relatório gerado para esta base.")
+        elif desatualizado:
+            st.warning("⚠️ A base mudou desde o último relatório.")
+
+    if gerar:
+        relatorio = gerar_relatorio(df, modulo)
+        st.success("✅ Relatório gerado!")
+
+    if relatorio is not None:
+        _exibir_relatorio(df, relatorio)
+
+    st.markdown("---")
+    st.subheader("👥 Possíveis Duplicatas")
+    if st.toggle("Analisar possíveis duplicatas", key=f"analisar_duplicatas_{modulo}"):
+        interface_fila_duplicatas(df, modulo)
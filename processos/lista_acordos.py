@@ -28,6 +28,7 @@ from components.funcoes_acordos import (
     interface_visualizar_dados_acordo,
     limpar_estados_dialogo_acordo
 )
+from components.abas_processos import seletor_abas
 
 def show():
     """Função principal do módulo Acordos"""
@@ -90,10 +91,14 @@ def show():
     # Limpar colunas sem nome
     df = df.loc[:, ~df.columns.str.contains('^Unnamed')]
     
-    # Abas - seguindo o padrão dos outros módulos
-    aba_selecionada = st.tabs(["📝 Cadastrar Acordo", "📊 Gerenciar Acordos", "📈 Visualizar Dados"])
+    # Abas - seguindo o padrão dos outros módulos; só a aba ativa é executada
+    aba_ativa = seletor_abas({
+        "cadastrar": "📝 Cadastrar Acordo",
+        "gerenciar": "📊 Gerenciar Acordos",
+        "visualizar": "📈 Visualizar Dados",
+    }, "aba_ativa_acordos")
     
-    with aba_selecionada[0]:
+    if aba_ativa == "cadastrar":
         # LIMPAR diálogos apenas quando mudando para aba de cadastro E não há diálogo ativo
         if (st.session_state.get("aba_atual_acordos") != "cadastrar" and
             not st.session_state.get("show_acordo_dialog", False)):
@@ -102,13 +107,13 @@ def show():
             st.session_state.aba_atual_acordos = "cadastrar"
         interface_cadastro_acordo(df, perfil_usuario)
     
-    with aba_selecionada[1]:
+    elif aba_ativa == "gerenciar":
         # Marcar que estamos na aba gerenciar
         if st.session_state.get("aba_atual_acordos") != "gerenciar":
             st.session_state.aba_atual_acordos = "gerenciar"
         interface_lista_acordos(df, perfil_usuario)
     
-    with aba_selecionada[2]:
+    elif aba_ativa == "visualizar":
         # LIMPAR diálogos apenas quando mudando para aba de visualização E não há diálogo ativo
         if (st.session_state.get("aba_atual_acordos") != "visualizar" and
             not st.session_state.get("show_acordo_dialog", False)):
@@ -26,6 +26,8 @@ from components.funcoes_alvaras import (
     render_tab_info_alvara, render_tab_acoes_alvara, render_tab_historico_alvara
 )
 
+from components.abas_processos import seletor_abas
+
 # Importar funções comuns que ainda estão no módulo de controle
 from components.functions_controle import (
     # Funções GitHub
@@ -65,16 +67,20 @@ def show():
     # Limpar colunas sem nome
     df = df.loc[:, ~df.columns.str.contains('^Unnamed')]
 
-    # Abas - adicionando aba Visualizar Dados
-    aba = st.tabs(["📝 Cadastrar Alvará", "📊 Gerenciar Alvarás", "📈 Visualizar Dados"])
+    # Abas - adicionando aba Visualizar Dados; só a aba ativa é executada
+    aba_ativa = seletor_abas({
+        "cadastrar": "📝 Cadastrar Alvará",
+        "gerenciar": "📊 Gerenciar Alvarás",
+        "visualizar": "📈 Visualizar Dados",
+    }, "aba_ativa_alvaras")
 
-    with aba[0]:
+    if aba_ativa == "cadastrar":
         interface_cadastro_alvara(df, perfil_usuario)
     
-    with aba[1]:
+    elif aba_ativa == "gerenciar":
         interface_lista_alvaras(df, perfil_usuario)
     
-    with aba[2]:
+    elif aba_ativa == "visualizar":
         interface_visualizar_dados_alvara(df)
 
     # ====== DIÁLOGO DE ALVARÁS (RENDERIZADO APÓS TODA A INTERFACE) ======
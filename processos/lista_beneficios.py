@@ -30,6 +30,7 @@ from components.funcoes_beneficios import (
     interface_visualizar_dados_beneficio,
     limpar_estados_dialogo_beneficio
 )
+from components.abas_processos import seletor_abas
 
 def show():
     """Função principal do módulo Benefícios"""
@@ -80,10 +81,14 @@ def show():
     # Limpar colunas sem nome
     df = df.loc[:, ~df.columns.str.contains('^Unnamed')]
     
-    # Abas - adicionando aba Visualizar Dados
-    aba_selecionada = st.tabs(["📝 Cadastrar Benefício", "📊 Gerenciar Benefícios", "📈 Visualizar Dados"])
+    # Abas - adicionando aba Visualizar Dados; só a aba ativa é executada
+    aba_ativa = seletor_abas({
+        "cadastrar": "📝 Cadastrar Benefício",
+        "gerenciar": "📊 Gerenciar Benefícios",
+        "visualizar": "📈 Visualizar Dados",
+    }, "aba_ativa_beneficios")
     
-    with aba_selecionada[0]:
+    if aba_ativa == "cadastrar":
         # LIMPAR diálogos apenas quando mudando para aba de cadastro E não há diálogo ativo
         if (st.session_state.get("aba_atual_beneficios") != "cadastrar" and
             not st.session_state.get("show_beneficio_dialog", False)):
@@ -92,13 +97,13 @@ def show():
             st.session_state.aba_atual_beneficios = "cadastrar"
         interface_cadastro_beneficio(df, perfil_usuario)
     
-    with aba_selecionada[1]:
+    elif aba_ativa == "gerenciar":
         # Marcar que estamos na aba gerenciar
         if st.session_state.get("aba_atual_beneficios") != "gerenciar":
             st.session_state.aba_atual_beneficios = "gerenciar"
         interface_lista_beneficios(df, perfil_usuario)
     
-    with aba_selecionada[2]:
+    elif aba_ativa == "visualizar":
         # LIMPAR diálogos apenas quando mudando para aba de visualização E não há diálogo ativo
         if (st.session_state.get("aba_atual_beneficios") != "visualizar" and
             not st.session_state.get("show_beneficio_dialog", False)):
@@ -27,6 +27,8 @@ from components.funcoes_rpv import (
     interface_visualizar_dados_rpv, interface_relatorio_certidao_rpv
 )
 
+from components.abas_processos import seletor_abas
+
 # Importar funções comuns que ainda estão no módulo de controle
 from components.functions_controle import (
     # Funções GitHub
@@ -84,10 +86,15 @@ def show():
     # Limpar colunas sem nome
     df = df.loc[:, ~df.columns.str.contains('^Unnamed')]
     
-    # Abas (adicionada quarta aba Relatório Certidão)
-    aba_selecionada = st.tabs(["📝 Cadastrar RPVs", "📊 Gerenciar RPVs", "📈 Visualizar Dados", "📋 Relatório Certidão"])
+    # Abas (adicionada quarta aba Relatório Certidão); só a aba ativa é executada
+    aba_ativa = seletor_abas({
+        "cadastrar": "📝 Cadastrar RPVs",
+        "gerenciar": "📊 Gerenciar RPVs",
+        "visualizar": "📈 Visualizar Dados",
+        "relatorio": "📋 Relatório Certidão",
+    }, "aba_ativa_rpv")
     
-    with aba_selecionada[0]:
+    if aba_ativa == "cadastrar":
         # LIMPAR diálogos apenas quando mudando para aba de cadastro E não há diálogo ativo
         if (st.session_state.get("aba_atual_rpv") != "cadastrar" and
             not st.session_state.get("show_rpv_dialog", False)):
@@ -96,13 +103,13 @@ def show():
             st.session_state.aba_atual_rpv = "cadastrar"
         interface_cadastro_rpv(df, perfil_usuario)
     
-    with aba_selecionada[1]:
+    elif aba_ativa == "gerenciar":
         # Marcar que estamos na aba gerenciar
         if st.session_state.get("aba_atual_rpv") != "gerenciar":
             st.session_state.aba_atual_rpv = "gerenciar"
         interface_lista_rpv(df, perfil_usuario)
     
-    with aba_selecionada[2]:
+    elif aba_ativa == "visualizar":
         # LIMPAR diálogos apenas quando mudando para aba de visualização E não há diálogo ativo
         if (st.session_state.get("aba_atual_rpv") != "visualizar" and
             not st.session_state.get("show_rpv_dialog", False)):
@@ -111,7 +118,7 @@ def show():
             st.session_state.aba_atual_rpv = "visualizar"
         interface_visualizar_dados_rpv(df)
     
-    with aba_selecionada[3]:
+    elif aba_ativa == "relatorio":
         # LIMPAR diálogos ao entrar na aba de relatório
         if (st.session_state.get("aba_atual_rpv") != "relatorio" and
             not st.session_state.get("show_rpv_dialog", False)):
@@ -0,0 +1,37 @@
+"""
+Índice de registros das listas: a atualização incremental (feita no salvamento)
+deve responder igual a um índice reconstruído do zero
+"""
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from components.busca_textual import IndiceRegistros
+
+
+def _respostas(indice, termos):
+    return {termo: (indice.buscar(termo).tolist(), indice.buscar_aproximado(termo)) for termo in termos}
+
+
+def test_atualizar_equivale_a_reconstruir():
+    textos = ["MARIA DA SILVA 0001", "JOSE SOUZA 0002", "ANA CONCEICAO 0003", "PEDRO ALVES 0004"]
+    digitos = ["111 0001", "222 0002", "333 0003", "444 0004"]
+    # Linhas que não mudam (a atualização recusa quando mais da metade da base mudou)
+    textos += [f"CLIENTE {i} 10{i}" for i in range(6)]
+    digitos += [f"10{i}" for i in range(6)]
+    indice = IndiceRegistros(textos, digitos)
+
+    novos_textos = ["MARIA DA SILVA 0001", "JOSE SOUSA 0002", "ANA CONCEICAO 0003", "PEDRO ALVES 0004",
+                    *textos[4:], "JOAO SOUZA 0005"]
+    novos_digitos = ["111 0001", "222 0002", "999 0003", "444 0004", *digitos[4:], "555 0005"]
+    assert indice.atualizar(novos_textos, novos_digitos)
+
+    termos = ["souza", "sousa", "jose", "conceição", "999", "333", "0005", "mar", "cliente"]
+    assert _respostas(indice, termos) == _respostas(IndiceRegistros(novos_textos, novos_digitos), termos)
+
+
+def test_atualizar_recusa_base_menor():
+    indice = IndiceRegistros(["MARIA", "JOSE"], ["1", "2"])
+    assert not indice.atualizar(["MARIA"], ["1"])
+    assert indice.buscar("jose").tolist() == [1]
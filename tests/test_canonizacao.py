@@ -0,0 +1,27 @@
+"""
+Agrupamento de variantes: siglas só juntam valores quando identificam o valor
+inteiro; nomes diferentes que dividem uma sigla ficam separados
+"""
+
+import pytest
+
+pytest.importorskip("pandas")
+pytest.importorskip("streamlit")
+
+from components.canonizacao import agrupar_variantes
+
+
+@pytest.mark.parametrize("valores", [
+    ["APOSENTADORIA POR IDADE (INSS)", "AUXILIO DOENCA (INSS)"],
+    ["JUSTIÇA FEDERAL (JFPE)", "VARA FEDERAL (JFPE)"],
+    ["VARA 2 CRIMINAL", "VARA 2 FAMILIA"],
+    ["TRF1", "TRF5"],
+    ["1ª Vara", "2ª Vara"],
+])
+def test_nao_junta_entidades_diferentes(valores):
+    assert agrupar_variantes(valores) == []
+
+
+def test_junta_sigla_e_nome_por_extenso():
+    valores = ["TRF5", "TRF 5A REGIAO", "TRIBUNAL REGIONAL FEDERAL DA 5.ª REGIÃO (TRF5)", "TRF1"]
+    assert agrupar_variantes(valores) == [valores[:3]]
@@ -0,0 +1,59 @@
+"""
+Detecção de duplicatas: chaves de bloco, CPF de preenchimento ignorado e comparação
+só dentro dos blocos (com janela de vizinhos nos blocos grandes)
+"""
+
+from itertools import combinations
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("streamlit")
+
+from components.duplicatas import (
+    JANELA_BLOCO_GRANDE, TAMANHO_MAXIMO_BLOCO, _cpf_valido, _pares_bloco, chaves_bloco, detectar_duplicatas
+)
+
+
+def test_cpf_valido():
+    assert _cpf_valido("12345678901") == "12345678901"
+    assert _cpf_valido("00000000000") == ""
+    assert _cpf_valido("11111111111") == ""
+    assert _cpf_valido("1234567890") == ""
+
+
+def test_chaves_bloco():
+    assert chaves_bloco("MARIA DA SILVA SOUZA", "12345678901", "00012345620208170001") == [
+        "nome:MARIA SILVA", "nome:MARIA SOUSA", "cpf:12345678901", "processo:00012345620208170001"
+    ]
+    # Dois nomes: primeiro+segundo e primeiro+último são a mesma chave; CPF vazio e processo curto ficam de fora
+    assert chaves_bloco("JOSE SOUZA", "", "123") == ["nome:JOSE SOUSA"]
+
+
+def test_detectar_pares_no_bloco():
+    base = pd.DataFrame({
+        "ID": ["1", "2", "3", "4", "5"],
+        "Beneficiário": ["MARIA DA SILVA", "MARIA DA SILVA", "JOSE SOUZA", "JOSÉ SOUSA", "ANA LIMA"],
+        "CPF": ["000.000.000-00", "000.000.000-00", "123.456.789-01", "", "123.456.789-01"],
+        "Processo": ["", "", "", "", ""],
+    })
+    pares = detectar_duplicatas(base, "rpv")
+
+    assert set(zip(pares["id_a"], pares["id_b"])) == {("1", "2"), ("3", "4"), ("3", "5")}
+    motivos = dict(zip(zip(pares["id_a"], pares["id_b"]), pares["motivos"]))
+    # CPF de preenchimento não conta como "mesmo CPF"
+    assert motivos[("1", "2")] == "mesmo nome"
+    assert motivos[("3", "5")] == "mesmo CPF"
+
+
+def test_bloco_grande_compara_so_vizinhos():
+    membros = list(range(TAMANHO_MAXIMO_BLOCO + 10))
+    nomes = [f"MARIA SILVA {i:03d}" for i in membros]
+
+    pares = list(_pares_bloco(membros, nomes))
+    assert len(pares) < len(list(combinations(membros, 2)))
+    assert all(0 < b - a <= JANELA_BLOCO_GRANDE for a, b in pares)
+    assert (0, JANELA_BLOCO_GRANDE) in pares and (0, JANELA_BLOCO_GRANDE + 1) not in pares
+
+    # Blocos pequenos comparam todos os pares
+    assert len(list(_pares_bloco(membros[:5], nomes))) == 10
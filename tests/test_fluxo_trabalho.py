@@ -0,0 +1,136 @@
+"""
+Fluxo de trabalho: permissões por perfil, validação das transições (condição e
+campos exigidos), a transição automática SAC + Administrativo -> Enviado para Rodrigo
+e a aplicação em massa (a base da sessão só muda depois do salvamento)
+"""
+
+import sys
+import types
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+st = pytest.importorskip("streamlit")
+
+from components import fluxo_trabalho
+from components.fluxo_trabalho import (
+    aplicar_automaticas, aplicar_em_massa, aplicar_transicao, mascara_transicao, pode_editar_status
+)
+
+
+class SessaoFalsa(dict):
+    __getattr__ = dict.get
+
+    def __setattr__(self, chave, valor):
+        self[chave] = valor
+
+
+@pytest.fixture
+def sessao(monkeypatch):
+    sessao = SessaoFalsa(usuario="teste")
+    monkeypatch.setattr(st, "session_state", sessao)
+    return sessao
+
+
+def test_pode_editar_status():
+    assert pode_editar_status("rpv", "Cadastro", "Cadastrador")
+    assert not pode_editar_status("rpv", "finalizado", "Cadastrador")
+    assert not pode_editar_status("rpv", "Cadastro", "Perfil inexistente")
+    # Status fora do fluxo não é editável nem pelo Desenvolvedor
+    assert not pode_editar_status("rpv", "Status inexistente", "Cadastrador")
+    assert not pode_editar_status("rpv", "Status inexistente", "Desenvolvedor")
+    assert all(pode_editar_status("beneficios", status, "Desenvolvedor") for status in fluxo_trabalho.FLUXOS["beneficios"]["estados"])
+
+
+def test_mascara_transicao_condicao():
+    df = pd.DataFrame({
+        "Status": ["SAC - documentação pronta"] * 3 + ["Cadastro"],
+        "SAC Documentacao Pronta": ["Sim", "Sim", "", "Sim"],
+        "Admin Documentacao Pronta": ["Sim", "Não", "Sim", "Sim"],
+    })
+    assert mascara_transicao(df, "rpv", "enviar_rodrigo", "SAC", df.index).tolist() == [True, False, False, False]
+    assert not mascara_transicao(df, "rpv", "enviar_rodrigo", "Cadastrador", df.index).any()
+
+
+def test_mascara_transicao_campos_exigidos():
+    df = pd.DataFrame({
+        "Status": ["Financeiro - Enviado para Rodrigo"] * 5 + ["Enviado para o Financeiro"],
+        "Comprovante Recebimento": ["comp.pdf", "", "nan", "comp.pdf", "comp.pdf", "comp.pdf"],
+        "Valor Sacado": ["R$ 1.234,56", "R$ 10,00", "R$ 10,00", "R$ 0,00", "", "R$ 10,00"],
+    })
+    assert mascara_transicao(df, "alvaras", "finalizar", "Financeiro", df.index).tolist() == [
+        True, False, False, False, False, False
+    ]
+    # Sem a coluna exigida nenhuma linha passa
+    assert not mascara_transicao(df.drop(columns="Valor Sacado"), "alvaras", "finalizar", "Financeiro", df.index).any()
+
+
+@pytest.mark.parametrize("ordem", [
+    ["documentacao_sac", "documentacao_admin"],
+    ["documentacao_admin", "documentacao_sac"],
+])
+def test_envio_automatico_para_rodrigo(sessao, ordem):
+    df = pd.DataFrame({"Status": ["Cadastro", "Cadastro"]})
+    aplicar_transicao(df, "rpv", [0, 1], "finalizar_cadastro")
+    assert df.loc[0, "Status Secundario"] == "Administrativo - aguardando documentação"
+
+    # Só a linha 0 conclui as duas documentações
+    assert aplicar_automaticas(aplicar_transicao(df, "rpv", [0, 1], ordem[0]), "rpv", [0, 1]) == {}
+    aplicar_transicao(df, "rpv", [0], ordem[1])
+    assert aplicar_automaticas(df, "rpv", [0, 1]) == {"enviar_rodrigo": [0]}
+
+    assert df.loc[0, "Status"] == "Enviado para Rodrigo"
+    assert df.loc[0, "Status Secundario"] == ""
+    assert df.loc[0, "Validado Por"] == "Sistema - Automatico SAC+Admin"
+    assert df.loc[1, "Status"] != "Enviado para Rodrigo"
+
+
+@pytest.fixture
+def salvamentos(sessao, monkeypatch):
+    """Substitui o salvamento no GitHub; sha = None simula falha"""
+    salvamentos = {"sha": "sha2", "bases": []}
+
+    def save_data_to_github_seguro(df, filename, session_state_key):
+        salvamentos["bases"].append(df.copy())
+        return salvamentos["sha"]
+
+    modulo = types.ModuleType("components.functions_controle")
+    modulo.save_data_to_github_seguro = save_data_to_github_seguro
+    monkeypatch.setitem(sys.modules, "components.functions_controle", modulo)
+
+    sessao.df_editado_beneficios = pd.DataFrame(
+        {"Status": ["Implantado", "Implantado", "Enviado para o SAC"]}, index=[10, 11, 12]
+    )
+    return salvamentos
+
+
+def test_em_massa_ignora_invalidas_e_removidas(sessao, salvamentos):
+    validas, ignoradas, avancadas = aplicar_em_massa("beneficios", [10, 12, 99], "enviar_sac", "Cadastrador")
+
+    assert list(validas) == [10]
+    assert sorted(ignoradas) == [12, 99]
+    assert avancadas == {}
+    assert sessao.df_editado_beneficios["Status"].tolist() == ["Enviado para o SAC", "Implantado", "Enviado para o SAC"]
+    assert sessao.df_editado_beneficios.loc[10, "Enviado SAC Por"] == "teste"
+
+
+def test_em_massa_sem_sha_mantem_base(sessao, salvamentos):
+    salvamentos["sha"] = None
+    base = sessao.df_editado_beneficios
+    original = base.copy()
+
+    assert aplicar_em_massa("beneficios", [10, 11], "enviar_sac", "Cadastrador") is None
+    assert sessao.df_editado_beneficios is base
+    pd.testing.assert_frame_equal(base, original)
+    # O que foi enviado ao salvamento era a cópia alterada
+    assert salvamentos["bases"][0]["Status"].tolist() == ["Enviado para o SAC"] * 3
+
+
+def test_em_massa_substitui_base_depois_do_sha(sessao, salvamentos):
+    base = sessao.df_editado_beneficios
+
+    aplicar_em_massa("beneficios", [10, 11], "enviar_sac", "Cadastrador")
+
+    assert sessao.df_editado_beneficios is not base
+    assert base["Status"].tolist() == ["Implantado", "Implantado", "Enviado para o SAC"]
+    pd.testing.assert_frame_equal(sessao.df_editado_beneficios, salvamentos["bases"][0])
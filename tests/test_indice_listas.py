@@ -0,0 +1,120 @@
+"""
+Cache por versão das listas: reruns da página (que recriam o DataFrame com
+df.loc[:, colunas sem nome]) devem reaproveitar os índices e filtros calculados;
+condições do filtro avançado (datas inclusivas, valores, vazio/preenchido, E/OU)
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+st = pytest.importorskip("streamlit")
+
+from components import indice_listas
+
+
+class SessaoFalsa(dict):
+    __getattr__ = dict.get
+
+    def __setattr__(self, chave, valor):
+        self[chave] = valor
+
+
+@pytest.fixture
+def sessao(monkeypatch):
+    sessao = SessaoFalsa()
+    monkeypatch.setattr(st, "session_state", sessao)
+    sessao.file_sha_rpv = "sha1"
+    sessao.df_editado_rpv = pd.DataFrame({
+        "ID": ["1", "2", "3"],
+        "Beneficiário": ["MARIA SILVA", "JOSE SOUZA", "MARIA SOUZA"],
+        "Processo": ["0001", "0002", "0003"],
+        "CPF": ["", "", ""],
+        "Status": ["Cadastro", "finalizado", "Cadastro"],
+        "Unnamed: 0": [0, 1, 2],
+    })
+    return sessao
+
+
+def _rerun_lista(sessao):
+    """Mesmo caminho de processos/lista_rpv.py: cópia sem as colunas sem nome a cada rerun"""
+    df = sessao.df_editado_rpv
+    return df.loc[:, ~df.columns.str.contains('^Unnamed')]
+
+
+def test_reruns_reaproveitam_cache(sessao, monkeypatch):
+    construcoes = []
+    original = indice_listas._filtrar_por_valores
+
+    def contar(*args, **kwargs):
+        construcoes.append(args[3])
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(indice_listas, "_filtrar_por_valores", contar)
+
+    primeiro = _rerun_lista(sessao)
+    posicoes = indice_listas.filtrar_posicoes_lista(primeiro, "rpv", filtros={"Status": "Cadastro"}, busca="maria")
+    codigos = indice_listas.obter_codigos_coluna(primeiro, "rpv", "Status")
+
+    segundo = _rerun_lista(sessao)
+    assert segundo is not primeiro
+    assert indice_listas.filtrar_posicoes_lista(segundo, "rpv", filtros={"Status": "Cadastro"}, busca="maria") is posicoes
+    assert indice_listas.obter_codigos_coluna(segundo, "rpv", "Status") is codigos
+    assert construcoes == ["Status"]
+    assert posicoes.tolist() == [0, 2]
+
+
+def test_salvamento_e_substituicao_invalidam_cache(sessao):
+    df = _rerun_lista(sessao)
+    codigos = indice_listas.obter_codigos_coluna(df, "rpv", "Status")
+
+    # Edição no próprio DataFrame seguida de salvamento
+    sessao.df_editado_rpv.loc[0, "Status"] = "finalizado"
+    indice_listas.marcar_base_alterada("lista_rpv.csv")
+    editado = indice_listas.obter_codigos_coluna(_rerun_lista(sessao), "rpv", "Status")
+    assert editado is not codigos
+    assert editado[0].tolist() == [0, 0, 1]
+
+    # Base substituída (ex: exclusão e cadastro) com o mesmo tamanho
+    sessao.df_editado_rpv = sessao.df_editado_rpv.iloc[[2, 1, 0]].reset_index(drop=True)
+    trocado = indice_listas.obter_codigos_coluna(_rerun_lista(sessao), "rpv", "Status")
+    assert trocado is not editado
+    assert trocado[0].tolist() == [0, 1, 1]
+
+
+@pytest.fixture
+def base_filtros(sessao):
+    sessao.df_editado_rpv = pd.DataFrame({
+        "Data Cadastro": ["01/03/2024 09:00", "31/03/2024 23:59", "01/04/2024 00:00", "", "15/03/2024"],
+        "Valor Cliente": ["R$ 100,00", "R$ 1.000,00", "", "abc", "R$ 50,00"],
+        "Observações": ["ok", "", None, "nan", "pendente"],
+        "Status": ["Cadastro", "finalizado", "Cadastro", "Cadastro", "finalizado"],
+    })
+    return _rerun_lista(sessao)
+
+
+def _filtrar(df, combinador, *condicoes):
+    return np.flatnonzero(indice_listas.compilar_filtro_avancado(df, "rpv", (combinador, condicoes))).tolist()
+
+
+def test_filtro_data_entre_inclui_dia_final(base_filtros):
+    assert _filtrar(base_filtros, "E", ("Data Cadastro", "entre", ("2024-03-01", "2024-03-31"))) == [0, 1, 4]
+    # Datas vazias ficam de fora mesmo sem limites
+    assert _filtrar(base_filtros, "E", ("Data Cadastro", "entre", (None, None))) == [0, 1, 2, 4]
+
+
+def test_filtro_valor_entre_exclui_vazios(base_filtros):
+    assert _filtrar(base_filtros, "E", ("Valor Cliente", "entre", (50, 100))) == [0, 4]
+    assert _filtrar(base_filtros, "E", ("Valor Cliente", "entre", (None, None))) == [0, 1, 4]
+
+
+def test_filtro_vazio_preenchido(base_filtros):
+    assert _filtrar(base_filtros, "E", ("Observações", "vazio", None)) == [1, 2, 3]
+    assert _filtrar(base_filtros, "E", ("Observações", "preenchido", None)) == [0, 4]
+
+
+def test_filtro_combinadores(base_filtros):
+    condicoes = (("Status", "em", ("finalizado",)), ("Valor Cliente", "entre", (None, 100)))
+    assert _filtrar(base_filtros, "E", *condicoes) == [4]
+    assert _filtrar(base_filtros, "OU", *condicoes) == [0, 1, 4]
+    assert _filtrar(base_filtros, "E") == [0, 1, 2, 3, 4]
@@ -0,0 +1,42 @@
+"""
+Conversão e formatação de reais: os formatos das bases ("R$ 1.234,56", "1234.56",
+"1.000") viram os mesmos centavos; vazio e texto inválido viram <NA>
+"""
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+np = pytest.importorskip("numpy")
+
+from components.moeda import converter_centavos, formatar_centavos, formatar_coluna_reais, formatar_reais, valor_reais
+
+
+@pytest.mark.parametrize("texto, centavos", [
+    ("R$ 1.234,56", 123456),
+    ("1234.56", 123456),
+    ("1.000", 100000),
+    ("R$ 111", 11100),
+    ("0,005", 1),
+    ("-1.234,56", -123456),
+    ("R$ -50,00", -5000),
+    ("-7.5", -750),
+])
+def test_converter_centavos(texto, centavos):
+    assert converter_centavos([texto]).tolist() == [centavos]
+
+
+@pytest.mark.parametrize("texto", ["", np.nan, None, "nan", "abc", "R$", "12,3,4"])
+def test_converter_centavos_vazio_ou_invalido(texto):
+    assert converter_centavos([texto]).isna().all()
+
+
+def test_formatar():
+    assert formatar_centavos(converter_centavos(["1234.5", "-7.5", ""])).tolist() == ["R$ 1.234,50", "R$ -7,50", ""]
+    assert formatar_reais(1234567.891) == "R$ 1.234.567,89"
+    assert formatar_coluna_reais(["1.000", "A definir", None]).tolist() == ["R$ 1.000,00", "A definir", ""]
+
+
+def test_valor_reais():
+    assert valor_reais("R$ 1.234,56") == 1234.56
+    assert valor_reais("abc", padrao=None) is None
+    assert valor_reais(float("nan"), padrao=None) is None